@@ -6,6 +6,7 @@ import copy
 import logging
 import re
 import sys
+import time
 
 import salt.utils.event
 import salt.utils.minion
@@ -25,6 +26,14 @@ class Beacon:
         self.functions = functions
         self.beacons = salt.loader.beacons(opts, functions)
         self.interval_map = dict()
+        # The data of the last event sent for each tag of the beacons with
+        # ``delta`` set
+        self.last_sent = {}
+        # The events recently sent by the beacons with ``dedupe_window`` set
+        self.recently_sent = {}
+        # The events held back by ``beacons_batch_window``
+        self.batch = []
+        self.batch_start = None
 
     def process(self, config, grains):
         """
@@ -132,6 +141,14 @@ class Beacon:
                         else:
                             log.info("Skipping beacon %s. State run in progress.", mod)
                         continue
+                delta = self._determine_beacon_config(current_beacon_config, "delta")
+                if delta:
+                    b_config = self._trim_config(b_config, mod, "delta")
+                dedupe_window = self._determine_beacon_config(
+                    current_beacon_config, "dedupe_window"
+                )
+                if dedupe_window:
+                    b_config = self._trim_config(b_config, mod, "dedupe_window")
                 # Update __grains__ on the beacon
                 self.beacons[fun_str].__globals__["__grains__"] = grains
 
@@ -159,6 +176,14 @@ class Beacon:
                             tag += data.pop("tag")
                         if "id" not in data:
                             data["id"] = self.opts["id"]
+                        if delta and not self._process_delta(mod, tag, data):
+                            log.trace("Skipping unchanged event %s", tag)
+                            continue
+                        if dedupe_window and not self._process_dedupe(
+                            mod, tag, data, dedupe_window
+                        ):
+                            log.trace("Skipping duplicate event %s", tag)
+                            continue
                         ret.append(
                             {"tag": tag, "data": data, "beacon_name": beacon_name}
                         )
@@ -166,6 +191,57 @@ class Beacon:
                         self.disable_beacon(mod)
             else:
                 log.warning("Unable to process beacon %s", mod)
+        return self._process_batch(ret)
+
+    def _process_delta(self, mod, tag, data):
+        """
+        Return True if the data of the event differs from the data of the last
+        event sent with the same tag
+        """
+        key = (mod, tag)
+        if self.last_sent.get(key) == data:
+            return False
+        self.last_sent[key] = copy.deepcopy(data)
+        return True
+
+    def _process_dedupe(self, mod, tag, data, window):
+        """
+        Return True if no identical event was sent in the last ``window``
+        seconds
+        """
+        now = time.time()
+        key = (mod, tag)
+        recent = [
+            (sent, sent_data)
+            for sent, sent_data in self.recently_sent.get(key, [])
+            if now - sent < window
+        ]
+        if any(sent_data == data for _, sent_data in recent):
+            self.recently_sent[key] = recent
+            return False
+        recent.append((now, copy.deepcopy(data)))
+        self.recently_sent[key] = recent
+        return True
+
+    def _process_batch(self, ret):
+        """
+        Hold the events back until ``beacons_batch_window`` seconds passed
+        since the first of them, to send them to the master at once
+        """
+        window = self.opts.get("beacons_batch_window")
+        if not window:
+            return ret
+        self.batch.extend(ret)
+        if not self.batch:
+            return ret
+        now = time.time()
+        if self.batch_start is None:
+            self.batch_start = now
+        if now - self.batch_start < window:
+            return []
+        ret = self.batch
+        self.batch = []
+        self.batch_start = None
         return ret
 
     def _trim_config(self, b_config, mod, key):
@@ -19,6 +19,7 @@ import fnmatch
 import logging
 import os
 import re
+import time
 
 import salt.utils.beacons
 
@@ -82,6 +83,121 @@ def _get_notifier(config):
     return __context__[notifier]
 
 
+def _summarize(path, burst):
+    """
+    Return the event summarising a burst of changes in a watched path
+    """
+    if burst["count"] == 1:
+        return burst["first"]
+    return {
+        "tag": path,
+        "path": path,
+        "change": "burst",
+        "count": burst["count"],
+        "changes": dict(burst["masks"]),
+        "paths": burst["paths"],
+        "truncated": burst["truncated"],
+    }
+
+
+def _add_to_burst(bursts, path, event, max_paths):
+    """
+    Add a change in a watched path to the burst of changes of that path
+    """
+    burst = bursts.get(path)
+    if burst is None:
+        burst = bursts[path] = {
+            "start": time.time(),
+            "first": event,
+            "count": 0,
+            "masks": collections.Counter(),
+            "paths": [],
+            "seen": set(),
+            "truncated": False,
+        }
+    burst["count"] += 1
+    burst["masks"][event["change"]] += 1
+    if event["path"] not in burst["seen"]:
+        if len(burst["paths"]) < max_paths:
+            burst["seen"].add(event["path"])
+            burst["paths"].append(event["path"])
+        else:
+            burst["truncated"] = True
+
+
+def _coalesce(config, events):
+    """
+    Collect the changes of every watched path over the configured window and
+    return one event per path for the bursts whose window elapsed. When more
+    changes than ``max_events`` are returned at once, they are summarised per
+    watched path too.
+    """
+    beacon_name = config.get("_beacon_name", "inotify")
+    max_paths = config.get("max_paths", 100)
+    window = config.get("window")
+    if window:
+        bursts = __context__.setdefault(f"{beacon_name}.bursts", {})
+        for path, event in events:
+            _add_to_burst(bursts, path, event, max_paths)
+        ret = []
+        now = time.time()
+        for path in list(bursts):
+            if now - bursts[path]["start"] >= window:
+                ret.append(_summarize(path, bursts.pop(path)))
+        return ret
+
+    ret = [event for _, event in events]
+    max_events = config.get("max_events")
+    if max_events and len(ret) > max_events:
+        log.debug(
+            "Summarising %s inotify events exceeding max_events %s",
+            len(ret),
+            max_events,
+        )
+        bursts = {}
+        for path, event in events:
+            _add_to_burst(bursts, path, event, max_paths)
+        ret = [_summarize(path, burst) for path, burst in bursts.items()]
+    return ret
+
+
+def _add_pending_watches(wm, config):
+    """
+    Watch the directories of the recursively watched paths, at most
+    ``watch_batch`` of them at every run of the beacon
+    """
+    beacon_name = config.get("_beacon_name", "inotify")
+    pending = __context__.get(f"{beacon_name}.pending")
+    if not pending:
+        return
+    budget = config["watch_batch"]
+    for path in list(pending):
+        watch = pending[path]
+        while watch["dirs"] and budget > 0:
+            dir_ = watch["dirs"].popleft()
+            if watch["exclude"] is not None and watch["exclude"](dir_):
+                continue
+            wm.add_watch(
+                dir_,
+                watch["mask"],
+                auto_add=watch["auto_add"],
+                exclude_filter=watch["exclude"],
+            )
+            budget -= 1
+            try:
+                with os.scandir(dir_) as entries:
+                    watch["dirs"].extend(
+                        entry.path
+                        for entry in entries
+                        if entry.is_dir(follow_symlinks=False)
+                    )
+            except OSError as exc:
+                log.debug("Unable to list %s: %s", dir_, exc)
+        if not watch["dirs"]:
+            log.debug("All of the directories in %s are watched", path)
+            del pending[path]
+
+
 def validate(config):
     """
     Validate the beacon configuration
@@ -113,6 +229,18 @@ def validate(config):
     else:
         config = salt.utils.beacons.list_to_dict(config)
 
+        for option in ("window", "max_events", "max_paths", "watch_batch"):
+            if option in config and (
+                not isinstance(config[option], (int, float))
+                or isinstance(config[option], bool)
+                or config[option] <= 0
+            ):
+                return (
+                    False,
+                    "Configuration for inotify beacon {} must be a positive"
+                    " number.".format(option),
+                )
+
         if "files" not in config:
             return False, "Configuration for inotify beacon must include files."
         else:
@@ -197,6 +325,9 @@ def beacon(config):
                     - /path/to/file/or/dir/regex[a-m]*$:
                         regex: True
             - coalesce: True
+            - window: 10
+            - max_events: 100
+            - watch_batch: 1000
 
     The mask list can contain the following events (the default mask is create,
     delete, and modify):
@@ -237,6 +368,30 @@ def beacon(config):
       This option is top-level (at the same level as the path) and therefore
       affects all paths that are being watched. This is due to this option
       being at the Notifier level in pyinotify.
+    window:
+      .. versionadded:: 3008.0
+
+      Collect the changes in each watched path for this many seconds and fire
+      a single event summarising them, with the number of changes, the count
+      of each kind of change and the changed paths. A burst made of a single
+      change fires the usual event. This option is top-level.
+    max_events:
+      .. versionadded:: 3008.0
+
+      When more changes than this come in at once and ``window`` is not set,
+      fire one event summarising them per watched path instead of an event
+      per change. This option is top-level.
+    max_paths:
+      .. versionadded:: 3008.0
+
+      The maximum number of changed paths listed in a summary event, defaults
+      to 100. This option is top-level.
+    watch_batch:
+      .. versionadded:: 3008.0
+
+      Watch the directories of the recursively watched paths this many at a
+      time at every run of the beacon, instead of walking the whole tree at
+      once. This option is top-level.
     """
 
     whitelist = ["_beacon_name"]
@@ -245,6 +400,7 @@ def beacon(config):
     config = salt.utils.beacons.list_to_dict(config)
 
     ret = []
+    events = []
     notifier = _get_notifier(config)
     wm = notifier._watch_manager
 
@@ -291,10 +447,12 @@ def beacon(config):
                     "path": event.pathname,
                     "change": event.maskname,
                 }
-                ret.append(sub)
+                events.append((path, sub))
             else:
                 log.info("Excluding %s from event for %s", event.pathname, path)
 
+    ret = _coalesce(config, events)
+
     # Get paths currently being watched
     current = set()
     for wd in wm.watches:
@@ -344,7 +502,23 @@ def beacon(config):
                         excl.append(exclude)
                 excl = pyinotify.ExcludeFilter(excl)
 
-            wm.add_watch(path, mask, rec=rec, auto_add=auto_add, exclude_filter=excl)
+            if rec and config.get("watch_batch") and os.path.isdir(path):
+                beacon_name = config.get("_beacon_name", "inotify")
+                pending = __context__.setdefault(f"{beacon_name}.pending", {})
+                if path not in pending:
+                    pending[path] = {
+                        "dirs": collections.deque([path]),
+                        "mask": mask,
+                        "auto_add": auto_add,
+                        "exclude": excl,
+                    }
+            else:
+                wm.add_watch(
+                    path, mask, rec=rec, auto_add=auto_add, exclude_filter=excl
+                )
+
+    if config.get("watch_batch"):
+        _add_pending_watches(wm, config)
 
     # Return event data
     return ret
@@ -357,3 +531,5 @@ def close(config):
     if notifier in __context__:
         __context__[notifier].stop()
         del __context__[notifier]
+    __context__.pop(f"{beacon_name}.bursts", None)
+    __context__.pop(f"{beacon_name}.pending", None)
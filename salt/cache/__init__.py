@@ -167,6 +167,39 @@ class Cache:
         fun = f"{self.driver}.fetch"
         return self.modules[fun](bank, key, **self._kwargs)
 
+    def fetch_many(self, banks, key):
+        """
+        Fetch the same key from several banks at once
+
+        Cache drivers providing a ``fetch_many`` function read all of the
+        banks in one operation, for the others the key is fetched from every
+        bank which contains it.
+
+        :param banks:
+            The names of the locations inside the cache which hold the key.
+
+        :param key:
+            The name of the key (or file inside a directory) which holds the
+            data. File extensions should not be provided, as they will be
+            added by the driver itself.
+
+        :return:
+            Return a dict mapping the names of the banks which contain the key
+            to the python object fetched from the cache for them.
+
+        :raises SaltCacheError:
+            Raises an exception if cache driver detected an error accessing data
+            in the cache backend (auth, permissions, etc).
+        """
+        fun = f"{self.driver}.fetch_many"
+        if fun in self.modules:
+            return self.modules[fun](list(banks), key, **self._kwargs)
+        ret = {}
+        for bank in banks:
+            if self.contains(bank, key):
+                ret[bank] = self.fetch(bank, key)
+        return ret
+
     def updated(self, bank, key):
         """
         Get the last updated epoch for the specified key
@@ -333,6 +366,34 @@ class MemCache(Cache):
         self.storage[(bank, key)] = [now, data]
         return data
 
+    def fetch_many(self, banks, key):
+        now = time.time()
+        ret = {}
+        missing = []
+        for bank in banks:
+            record = self.storage.get((bank, key))
+            # Empty values are what fetch caches for missing keys, fetch_many
+            # leaves the banks without the key out instead
+            if record is not None and record[0] + self.expire >= now and record[1]:
+                record[0] = now
+                self.storage.move_to_end((bank, key))
+                ret[bank] = record[1]
+            else:
+                missing.append(bank)
+        if not missing:
+            return ret
+        fetched = super().fetch_many(missing, key)
+        for bank, data in fetched.items():
+            self.storage.pop((bank, key), None)
+            if len(self.storage) >= self.max:
+                if self.cleanup:
+                    MemCache.__cleanup(self.expire)
+                if len(self.storage) >= self.max:
+                    self.storage.popitem(last=False)
+            self.storage[(bank, key)] = [now, data]
+        ret.update(fetched)
+        return ret
+
     def store(self, bank, key, data):
         self.storage.pop((bank, key), None)
         super().store(bank, key, data)
@@ -94,6 +94,25 @@ def fetch(bank, key, cachedir):
         )
 
 
+def fetch_many(banks, key, cachedir):
+    """
+    Fetch the same key from several banks, skipping the banks without it.
+    """
+    ret = {}
+    for bank in banks:
+        key_file = os.path.join(cachedir, os.path.normpath(bank), f"{key}.p")
+        try:
+            with salt.utils.files.fopen(key_file, "rb") as fh_:
+                ret[bank] = salt.payload.load(fh_)
+        except FileNotFoundError:
+            continue
+        except OSError as exc:
+            raise SaltCacheError(
+                f'There was an error reading the cache file "{key_file}": {exc}'
+            )
+    return ret
+
+
 def updated(bank, key, cachedir):
     """
     Return the epoch of the mtime for this cache file
@@ -422,6 +422,29 @@ def fetch(bank, key):
     return salt.payload.loads(redis_value)
 
 
+def fetch_many(banks, key):
+    """
+    Fetch the same key from several banks with a single Redis request.
+    """
+    redis_server = _get_redis_server()
+    redis_keys = [_get_key_redis_key(bank, key) for bank in banks]
+    if not redis_keys:
+        return {}
+    try:
+        redis_values = redis_server.mget(redis_keys)
+    except (RedisConnectionError, RedisResponseError) as rerr:
+        mesg = "Cannot fetch the Redis cache keys {rkeys}: {rerr}".format(
+            rkeys=redis_keys, rerr=rerr
+        )
+        log.error(mesg)
+        raise SaltCacheError(mesg)
+    return {
+        bank: salt.payload.loads(redis_value)
+        for bank, redis_value in zip(banks, redis_values)
+        if redis_value is not None
+    }
+
+
 def flush(bank, key=None):
     """
     Remove the key from the cache bank with all the key content. If no key is specified, remove
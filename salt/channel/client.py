@@ -4,6 +4,8 @@ Encapsulate the different transports available to Salt.
 This includes client side transport, for the ReqServer and the Publisher
 """
 
+import asyncio
+import collections
 import logging
 import os
 import time
@@ -87,6 +89,7 @@ class AsyncReqChannel:
         "_crypted_transfer",
         "_uncrypted_transfer",
         "send",
+        "send_pipelined",
         "connect",
     ]
     close_methods = [
@@ -336,6 +339,56 @@ class AsyncReqChannel:
                     continue
         raise tornado.gen.Return(ret)
 
+    @property
+    def pipelined(self):
+        """
+        Whether the transport can have several requests in flight at once
+        """
+        return getattr(self.transport, "pipelined", False)
+
+    async def send_pipelined(
+        self, loads, callback, window=8, tries=None, timeout=None, raw=False
+    ):
+        """
+        Send the loads yielded by ``loads`` keeping up to ``window`` requests
+        in flight and pass each reply to ``callback`` in the order the loads
+        were yielded. Stops once ``loads`` is exhausted or ``callback``
+        returns ``False``; replies still in flight at that point are dropped.
+
+        On transports which can not pipeline requests this sends one load at a
+        time.
+
+        :param iter loads: The loads to send across the wire
+        :param callable callback: Called with each reply
+        :param int window: The number of requests to keep in flight
+        """
+        if not self.pipelined:
+            window = 1
+        loads = iter(loads)
+        pending = collections.deque()
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) < window:
+                    try:
+                        load = next(loads)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    pending.append(
+                        asyncio.ensure_future(
+                            self.send(load, tries=tries, timeout=timeout, raw=raw)
+                        )
+                    )
+                if not pending:
+                    break
+                ret = await pending.popleft()
+                if callback(ret) is False:
+                    break
+        finally:
+            for future in pending:
+                future.cancel()
+
     def close(self):
         """
         Since the message_client creates sockets and assigns them to the IOLoop we have to
@@ -14,14 +14,17 @@ import pathlib
 import shutil
 
 import tornado.gen
+import tornado.ioloop
 
 import salt.crypt
 import salt.master
 import salt.payload
 import salt.transport.frame
+import salt.utils.atomicfile
 import salt.utils.channel
 import salt.utils.event
 import salt.utils.files
+import salt.utils.keyindex
 import salt.utils.minions
 import salt.utils.platform
 import salt.utils.stringutils
@@ -31,6 +34,10 @@ from salt.utils.cache import CacheCli
 
 log = logging.getLogger(__name__)
 
+# Seconds to wait for more minions to (dis)connect before rewriting the
+# presence file
+PRESENCE_WRITE_DELAY = 1
+
 
 class ReqServerChannel:
     """
@@ -386,11 +393,33 @@ class ReqServerChannel:
         pubfn_pend = os.path.join(pki_dir, "minions_pre", load["id"])
         pubfn_rejected = os.path.join(pki_dir, "minions_rejected", load["id"])
         pubfn_denied = os.path.join(pki_dir, "minions_denied", load["id"])
+
+        # Use the key index, if enabled, to avoid listing the key directories
+        # and reading the key files on every authentication
+        key_index = None
+        if self.opts.get("key_index", False):
+            key_index = salt.utils.keyindex.get_index(pki_dir)
+
+        def key_exists(path):
+            if key_index is not None:
+                keydir = os.path.basename(os.path.dirname(path))
+                return key_index.contains(keydir, load["id"])
+            return os.path.isfile(path)
+
+        def read_key(path):
+            if key_index is not None:
+                keydir = os.path.basename(os.path.dirname(path))
+                key = key_index.pub(keydir, load["id"])
+                if key is not None:
+                    return key
+            with salt.utils.files.fopen(path, "r") as fp_:
+                return fp_.read()
+
         if self.opts["open_mode"]:
             # open mode is turned on, nuts to checks and overwrite whatever
             # is there
             pass
-        elif os.path.isfile(pubfn_rejected):
+        elif key_exists(pubfn_rejected):
             # The key has been rejected, don't place it in pending
             log.info(
                 "Public key rejected for %s. Key is present in rejection key dir.",
@@ -405,37 +434,34 @@ class ReqServerChannel:
                 )
             else:
                 return {"enc": "clear", "load": {"ret": False}}
-        elif os.path.isfile(pubfn):
+        elif key_exists(pubfn):
             # The key has been accepted, check it
-            with salt.utils.files.fopen(pubfn, "r") as pubfn_handle:
-                if not self.compare_keys(pubfn_handle.read(), load["pub"]):
-                    log.error(
-                        "Authentication attempt from %s failed, the public "
-                        "keys did not match. This may be an attempt to compromise "
-                        "the Salt cluster.",
-                        load["id"],
+            if not self.compare_keys(read_key(pubfn), load["pub"]):
+                log.error(
+                    "Authentication attempt from %s failed, the public "
+                    "keys did not match. This may be an attempt to compromise "
+                    "the Salt cluster.",
+                    load["id"],
+                )
+                # put denied minion key into minions_denied
+                with salt.utils.files.fopen(pubfn_denied, "w+") as fp_:
+                    fp_.write(load["pub"])
+                eload = {
+                    "result": False,
+                    "id": load["id"],
+                    "act": "denied",
+                    "pub": load["pub"],
+                }
+                if self.opts.get("auth_events") is True:
+                    self.event.fire_event(eload, salt.utils.event.tagify(prefix="auth"))
+                if sign_messages:
+                    return self._clear_signed(
+                        {"ret": False, "nonce": load["nonce"]}, sig_algo
                     )
-                    # put denied minion key into minions_denied
-                    with salt.utils.files.fopen(pubfn_denied, "w+") as fp_:
-                        fp_.write(load["pub"])
-                    eload = {
-                        "result": False,
-                        "id": load["id"],
-                        "act": "denied",
-                        "pub": load["pub"],
-                    }
-                    if self.opts.get("auth_events") is True:
-                        self.event.fire_event(
-                            eload, salt.utils.event.tagify(prefix="auth")
-                        )
-                    if sign_messages:
-                        return self._clear_signed(
-                            {"ret": False, "nonce": load["nonce"]}, sig_algo
-                        )
-                    else:
-                        return {"enc": "clear", "load": {"ret": False}}
+                else:
+                    return {"enc": "clear", "load": {"ret": False}}
 
-        elif not os.path.isfile(pubfn_pend):
+        elif not key_exists(pubfn_pend) or os.path.isdir(pubfn_pend):
             # The key has not been accepted, this is a new minion
             if os.path.isdir(pubfn_pend):
                 # The key path is a directory, error out
@@ -487,7 +513,7 @@ class ReqServerChannel:
                 else:
                     return {"enc": "clear", "load": {"ret": key_result}}
 
-        elif os.path.isfile(pubfn_pend):
+        elif key_exists(pubfn_pend):
             # This key is in the pending dir and is awaiting acceptance
             if auto_reject:
                 # We don't care if the keys match, this minion is being
@@ -521,86 +547,84 @@ class ReqServerChannel:
                 # Check if the keys are the same and error out if this is the
                 # case. Otherwise log the fact that the minion is still
                 # pending.
-                with salt.utils.files.fopen(pubfn_pend, "r") as pubfn_handle:
-                    if not self.compare_keys(pubfn_handle.read(), load["pub"]):
-                        log.error(
-                            "Authentication attempt from %s failed, the public "
-                            "key in pending did not match. This may be an "
-                            "attempt to compromise the Salt cluster.",
-                            load["id"],
+                if not self.compare_keys(read_key(pubfn_pend), load["pub"]):
+                    log.error(
+                        "Authentication attempt from %s failed, the public "
+                        "key in pending did not match. This may be an "
+                        "attempt to compromise the Salt cluster.",
+                        load["id"],
+                    )
+                    # put denied minion key into minions_denied
+                    with salt.utils.files.fopen(pubfn_denied, "w+") as fp_:
+                        fp_.write(load["pub"])
+                    eload = {
+                        "result": False,
+                        "id": load["id"],
+                        "act": "denied",
+                        "pub": load["pub"],
+                    }
+                    if self.opts.get("auth_events") is True:
+                        self.event.fire_event(
+                            eload, salt.utils.event.tagify(prefix="auth")
+                        )
+                    if sign_messages:
+                        return self._clear_signed(
+                            {"ret": False, "nonce": load["nonce"]}, sig_algo
                         )
-                        # put denied minion key into minions_denied
-                        with salt.utils.files.fopen(pubfn_denied, "w+") as fp_:
-                            fp_.write(load["pub"])
-                        eload = {
-                            "result": False,
-                            "id": load["id"],
-                            "act": "denied",
-                            "pub": load["pub"],
-                        }
-                        if self.opts.get("auth_events") is True:
-                            self.event.fire_event(
-                                eload, salt.utils.event.tagify(prefix="auth")
-                            )
-                        if sign_messages:
-                            return self._clear_signed(
-                                {"ret": False, "nonce": load["nonce"]}, sig_algo
-                            )
-                        else:
-                            return {"enc": "clear", "load": {"ret": False}}
                     else:
-                        log.info(
-                            "Authentication failed from host %s, the key is in "
-                            "pending and needs to be accepted with salt-key "
-                            "-a %s",
-                            load["id"],
-                            load["id"],
+                        return {"enc": "clear", "load": {"ret": False}}
+                else:
+                    log.info(
+                        "Authentication failed from host %s, the key is in "
+                        "pending and needs to be accepted with salt-key "
+                        "-a %s",
+                        load["id"],
+                        load["id"],
+                    )
+                    eload = {
+                        "result": True,
+                        "act": "pend",
+                        "id": load["id"],
+                        "pub": load["pub"],
+                    }
+                    if self.opts.get("auth_events") is True:
+                        self.event.fire_event(
+                            eload, salt.utils.event.tagify(prefix="auth")
                         )
-                        eload = {
-                            "result": True,
-                            "act": "pend",
-                            "id": load["id"],
-                            "pub": load["pub"],
-                        }
-                        if self.opts.get("auth_events") is True:
-                            self.event.fire_event(
-                                eload, salt.utils.event.tagify(prefix="auth")
-                            )
-                        if sign_messages:
-                            return self._clear_signed(
-                                {"ret": True, "nonce": load["nonce"]}, sig_algo
-                            )
-                        else:
-                            return {"enc": "clear", "load": {"ret": True}}
+                    if sign_messages:
+                        return self._clear_signed(
+                            {"ret": True, "nonce": load["nonce"]}, sig_algo
+                        )
+                    else:
+                        return {"enc": "clear", "load": {"ret": True}}
             else:
                 # This key is in pending and has been configured to be
                 # auto-signed. Check to see if it is the same key, and if
                 # so, pass on doing anything here, and let it get automatically
                 # accepted below.
-                with salt.utils.files.fopen(pubfn_pend, "r") as pubfn_handle:
-                    if not self.compare_keys(pubfn_handle.read(), load["pub"]):
-                        log.error(
-                            "Authentication attempt from %s failed, the public "
-                            "keys in pending did not match. This may be an "
-                            "attempt to compromise the Salt cluster.",
-                            load["id"],
+                if not self.compare_keys(read_key(pubfn_pend), load["pub"]):
+                    log.error(
+                        "Authentication attempt from %s failed, the public "
+                        "keys in pending did not match. This may be an "
+                        "attempt to compromise the Salt cluster.",
+                        load["id"],
+                    )
+                    # put denied minion key into minions_denied
+                    with salt.utils.files.fopen(pubfn_denied, "w+") as fp_:
+                        fp_.write(load["pub"])
+                    eload = {"result": False, "id": load["id"], "pub": load["pub"]}
+                    if self.opts.get("auth_events") is True:
+                        self.event.fire_event(
+                            eload, salt.utils.event.tagify(prefix="auth")
+                        )
+                    if sign_messages:
+                        return self._clear_signed(
+                            {"ret": False, "nonce": load["nonce"]}, sig_algo
                         )
-                        # put denied minion key into minions_denied
-                        with salt.utils.files.fopen(pubfn_denied, "w+") as fp_:
-                            fp_.write(load["pub"])
-                        eload = {"result": False, "id": load["id"], "pub": load["pub"]}
-                        if self.opts.get("auth_events") is True:
-                            self.event.fire_event(
-                                eload, salt.utils.event.tagify(prefix="auth")
-                            )
-                        if sign_messages:
-                            return self._clear_signed(
-                                {"ret": False, "nonce": load["nonce"]}, sig_algo
-                            )
-                        else:
-                            return {"enc": "clear", "load": {"ret": False}}
                     else:
-                        os.remove(pubfn_pend)
+                        return {"enc": "clear", "load": {"ret": False}}
+                else:
+                    os.remove(pubfn_pend)
 
         else:
             # Something happened that I have not accounted for, FAIL!
@@ -618,7 +642,7 @@ class ReqServerChannel:
         log.info("Authentication accepted from %s", load["id"])
         # only write to disk if you are adding the file, and in open mode,
         # which implies we accept any key from a minion.
-        if not os.path.isfile(pubfn) and not self.opts["open_mode"]:
+        if not key_exists(pubfn) and not self.opts["open_mode"]:
             with salt.utils.files.fopen(pubfn, "w+") as fp_:
                 fp_.write(load["pub"])
         elif self.opts["open_mode"]:
@@ -648,7 +672,10 @@ class ReqServerChannel:
         # The key payload may sometimes be corrupt when using auto-accept
         # and an empty request comes in
         try:
-            pub = salt.crypt.PublicKey(pubfn)
+            if key_index is not None:
+                pub = key_index.public_key(load["id"])
+            else:
+                pub = salt.crypt.PublicKey(pubfn)
         except salt.crypt.InvalidKeyError as err:
             log.error('Corrupt public key "%s": %s', pubfn, err)
             if sign_messages:
@@ -778,6 +805,8 @@ class PubServerChannel:
         self.aes_funcs = salt.master.AESFuncs(self.opts)
         self.present = {}
         self.presence_events = presence_events
+        self.presence_file = None
+        self._presence_write_pending = False
         self.event = salt.utils.event.get_event("master", opts=self.opts, listen=False)
 
     @property
@@ -795,11 +824,13 @@ class PubServerChannel:
 
     def __setstate__(self, state):
         self.opts = state["opts"]
-        self.state = state["presence_events"]
+        self.presence_events = state["presence_events"]
         self.transport = state["transport"]
         self.event = salt.utils.event.get_event("master", opts=self.opts, listen=False)
         self.ckminions = salt.utils.minions.CkMinions(self.opts)
         self.present = {}
+        self.presence_file = None
+        self._presence_write_pending = False
         self.master_key = salt.crypt.MasterKeys(self.opts)
 
     def close(self):
@@ -833,6 +864,12 @@ class PubServerChannel:
         if secrets is not None:
             salt.master.SMaster.secrets = secrets
         self.master_key = salt.crypt.MasterKeys(self.opts)
+        if (
+            self.opts.get("transport_presence", False)
+            and self.transport.presence_support
+        ):
+            self.presence_file = salt.utils.minions.presence_path(self.opts)
+            self._write_presence()
         self.transport.publish_daemon(
             self.publish_payload, self.presence_callback, self.remove_presence_callback
         )
@@ -859,6 +896,7 @@ class PubServerChannel:
             clients.add(client)
         else:
             self.present[id_] = {client}
+            self._schedule_presence_write()
             if self.presence_events:
                 data = {"new": [id_], "lost": []}
                 self.event.fire_event(
@@ -887,6 +925,7 @@ class PubServerChannel:
         clients.remove(client)
         if len(clients) == 0:
             del self.present[id_]
+            self._schedule_presence_write()
             if self.presence_events:
                 data = {"new": [], "lost": [id_]}
                 self.event.fire_event(
@@ -897,6 +936,37 @@ class PubServerChannel:
                     data, salt.utils.event.tagify("present", "presence")
                 )
 
+    def _schedule_presence_write(self):
+        """
+        Write the presence file shortly, so that a burst of connections only
+        rewrites it once
+        """
+        if self.presence_file is None or self._presence_write_pending:
+            return
+        self._presence_write_pending = True
+        tornado.ioloop.IOLoop.current().call_later(
+            PRESENCE_WRITE_DELAY, self._write_presence
+        )
+
+    def _write_presence(self):
+        """
+        Record the connected minions and their addresses for
+        ``CkMinions.connected_ids``
+        """
+        self._presence_write_pending = False
+        present = {}
+        for id_, clients in self.present.items():
+            address = getattr(next(iter(clients)), "address", None)
+            if isinstance(address, (list, tuple)):
+                address = address[0]
+            present[id_] = address
+        data = {"pid": os.getpid(), "present": present}
+        try:
+            with salt.utils.atomicfile.atomic_open(self.presence_file, "wb") as fp_:
+                fp_.write(salt.payload.dumps(data))
+        except OSError as exc:
+            log.error("Unable to write presence file %s: %s", self.presence_file, exc)
+
     async def publish_payload(self, load, *args):
         load = salt.payload.loads(load)
         unpacked_package = self.wrap_payload(load)
@@ -178,6 +178,8 @@ VALID_OPTS = immutabletypes.freeze(
         # 'maint': Runs on a schedule as a part of the maintenance process.
         # '': Disable the key cache [default]
         "key_cache": str,
+        # Keep an in-memory index of the minion keys in the PKI dir
+        "key_index": bool,
         # The user under which the daemon should run
         "user": str,
         # The root directory prepended to these options: pki_dir, cachedir,
@@ -228,6 +230,10 @@ VALID_OPTS = immutabletypes.freeze(
         "renderer_whitelist": list,
         # Renderer blacklist. Renderers from this list are disallowed even if specified in whitelist.
         "renderer_blacklist": list,
+        # Cache the results of template renders whose inputs did not change
+        "render_cache": bool,
+        # The maximum number of templates kept in the render cache
+        "render_cache_size": int,
         # A flag indicating that a highstate run should immediately cease if a failure occurs.
         "failhard": bool,
         # A flag to indicate that highstate runs should force refresh the modules prior to execution
@@ -274,6 +280,14 @@ VALID_OPTS = immutabletypes.freeze(
         "decrypt_pillar_renderers": list,
         # Treat GPG decryption errors as renderer errors
         "gpg_decrypt_must_succeed": bool,
+        # The number of gpg processes used to decrypt the ciphertexts of a render
+        "gpg_decrypt_workers": int,
+        # Cache decrypted secrets in memory, keyed by the digest of their ciphertext
+        "secret_cache": bool,
+        # Decrypted secret cache TTL, in seconds
+        "secret_cache_ttl": int,
+        # Lock cached secrets into memory so that they are never swapped out
+        "secret_cache_mlock": bool,
         # The type of hashing algorithm to use when doing file comparisons
         "hash_type": str,
         # Order of preference for optimized .pyc files (PY3 only)
@@ -309,18 +323,41 @@ VALID_OPTS = immutabletypes.freeze(
         "multiprocessing": bool,
         # Maximum number of concurrently active processes at any given point in time
         "process_count_max": int,
+        # The number of pre-forked workers jobs are handed off to, 0 forks a
+        # process for every job
+        "job_pool_size": int,
+        # The number of jobs a job pool worker runs before it is replaced
+        "job_pool_max_jobs": int,
+        # The functions which always run in a process of their own
+        "job_pool_isolate": list,
+        # The number of milliseconds job returns are collected for before they
+        # are sent to the master together, 0 sends every return on its own
+        "return_batch_window": int,
+        # The size in bytes of the collected job returns at which they are sent
+        # to the master without waiting for the end of the window
+        "return_batch_size": int,
         # Whether or not the salt minion should run scheduled mine updates
         "mine_enabled": bool,
         # Whether or not scheduled mine updates should be accompanied by a job return for the job cache
         "mine_return_job": bool,
         # The number of minutes between mine updates.
         "mine_interval": int,
+        # Whether or not mine updates only send the functions whose data changed
+        "mine_delta": bool,
+        # The number of minutes after which mine updates send all of the functions again
+        "mine_delta_refresh": int,
+        # Whether or not the master stores the mine data of every function on its own
+        "mine_cache_per_function": bool,
         # The ipc strategy. (i.e., sockets versus tcp, etc)
         "ipc_mode": str,
         # Enable ipv6 support for daemons
         "ipv6": (type(None), bool),
         # The chunk size to use when streaming files with the file server
         "file_buffer_size": int,
+        # The number of file chunk requests a minion keeps in flight
+        "file_transfer_window": int,
+        # Index the files cached by the minion by content
+        "file_cache_index": bool,
         # The TCP port on which minion events should be published if ipc_mode is TCP
         "tcp_pub_port": int,
         # The TCP port on which minion events should be pulled if ipc_mode is TCP
@@ -551,8 +588,15 @@ VALID_OPTS = immutabletypes.freeze(
         "proxy_keep_alive_interval": int,
         # Update intervals
         "roots_update_interval": int,
+        "roots_index": bool,
         "gitfs_update_interval": int,
         "git_pillar_update_interval": int,
+        "gitfs_fetch_depth": int,
+        "gitfs_fetch_timeout": int,
+        "gitfs_fetch_workers": int,
+        "git_pillar_fetch_depth": int,
+        "git_pillar_fetch_timeout": int,
+        "git_pillar_fetch_workers": int,
         "hgfs_update_interval": int,
         "minionfs_update_interval": int,
         "s3fs_update_interval": int,
@@ -572,6 +616,8 @@ VALID_OPTS = immutabletypes.freeze(
         "git_pillar_passphrase": str,
         "git_pillar_refspecs": list,
         "git_pillar_includes": bool,
+        # Cache SLS renders of git_pillar keyed by the SHAs of the checked out trees
+        "git_pillar_compile_cache": bool,
         "git_pillar_verify_config": bool,
         # NOTE: gitfs_base, gitfs_fallback, gitfs_mountpoint, and gitfs_root omitted
         # here because their values could conceivably be loaded as non-string types,
@@ -590,6 +636,8 @@ VALID_OPTS = immutabletypes.freeze(
         "gitfs_ref_types": list,
         "gitfs_refspecs": list,
         "gitfs_disable_saltenv_mapping": bool,
+        # Serve gitfs files from the git object database through a tree index
+        "gitfs_serve_from_odb": bool,
         "hgfs_remotes": list,
         "hgfs_mountpoint": str,
         "hgfs_root": str,
@@ -611,6 +659,11 @@ VALID_OPTS = immutabletypes.freeze(
         "minionfs_blacklist": list,
         # Specify a list of external pillar systems to use
         "ext_pillar": list,
+        # Call the configured external pillars concurrently in a thread pool
+        "ext_pillar_parallel": bool,
+        # Timeout, in seconds, of each external pillar run in parallel. A dict
+        # sets the timeout per external pillar name.
+        "ext_pillar_parallel_timeout": (int, float, dict),
         # Reserved for future use to version the pillar structure
         "pillar_version": int,
         # Whether or not a copy of the master opts dict should be rendered into minion pillars
@@ -621,6 +674,12 @@ VALID_OPTS = immutabletypes.freeze(
         "pillar_cache_ttl": int,
         # Pillar cache backend. Defaults to `disk` which stores caches in the master cache
         "pillar_cache_backend": str,
+        # The maximum size, in bytes, of the in-memory pillar cache of each process
+        "pillar_cache_memory_max_size": int,
+        # Refresh the pillar cache of all accepted minions in a background process
+        "pillar_cache_precompile": bool,
+        # The maximum number of minions per second whose pillar is precompiled
+        "pillar_cache_precompile_rate": (int, float),
         # Cache the GPG data to avoid having to pass through the gpg renderer
         "gpg_cache": bool,
         # GPG data cache TTL, in seconds. Has no effect unless `gpg_cache` is True
@@ -720,6 +779,10 @@ VALID_OPTS = immutabletypes.freeze(
         "reactor_worker_threads": int,
         # The queue size for workers in the reactor
         "reactor_worker_hwm": int,
+        # Cache the rendered reaction SLS files whose inputs did not change
+        "reactor_render_cache": bool,
+        # The maximum number of seconds a local job of a reaction with a concurrency cap runs
+        "reactor_job_timeout": int,
         # Defines engines. See https://docs.saltproject.io/en/latest/topics/engines/
         "engines": list,
         # Whether or not to store runner returns in the job cache
@@ -930,6 +993,9 @@ VALID_OPTS = immutabletypes.freeze(
         # Controls whether beacons are set up before a connection
         # to the master is attempted.
         "beacons_before_connect": bool,
+        # The number of seconds the events of the beacons are held back for to
+        # send them to the master at once
+        "beacons_batch_window": (int, float),
         # Controls whether the scheduler is set up before a connection
         # to the master is attempted.
         "scheduler_before_connect": bool,
@@ -968,6 +1034,9 @@ VALID_OPTS = immutabletypes.freeze(
         "discovery": (dict, bool),
         # Scheduler should be a dictionary
         "schedule": dict,
+        # The number of threads running the scheduled jobs, 0 runs every job in a
+        # process or thread of its own
+        "schedule_thread_pool_size": int,
         # Whether to fire auth events
         "auth_events": bool,
         # Whether to fire Minion data cache refresh events
@@ -994,6 +1063,9 @@ VALID_OPTS = immutabletypes.freeze(
         # The port to be used when checking if a master is connected to a
         # minion
         "remote_minions_port": int,
+        # Track the connected minions in the publish daemons instead of
+        # scanning the TCP connections
+        "transport_presence": bool,
         # pass renderer: Fetch secrets only for the template variables matching the prefix
         "pass_variable_prefix": str,
         # pass renderer: Whether to error out when unable to fetch a secret
@@ -1058,6 +1130,8 @@ DEFAULT_MINION_OPTS = immutabletypes.freeze(
         "renderer": "jinja|yaml",
         "renderer_whitelist": [],
         "renderer_blacklist": [],
+        "render_cache": False,
+        "render_cache_size": 1000,
         "random_startup_delay": 0,
         "failhard": False,
         "autoload_dynamic_modules": True,
@@ -1075,6 +1149,7 @@ DEFAULT_MINION_OPTS = immutabletypes.freeze(
         "pillar_cache": False,
         "pillar_cache_ttl": 3600,
         "pillar_cache_backend": "disk",
+        "pillar_cache_memory_max_size": 104857600,
         "request_channel_timeout": 60,
         "request_channel_tries": 3,
         "gpg_cache": False,
@@ -1116,10 +1191,20 @@ DEFAULT_MINION_OPTS = immutabletypes.freeze(
         "decrypt_pillar_default": "gpg",
         "decrypt_pillar_renderers": ["gpg"],
         "gpg_decrypt_must_succeed": True,
+        "gpg_decrypt_workers": 1,
+        "secret_cache": False,
+        "secret_cache_ttl": 3600,
+        "secret_cache_mlock": False,
         # Update intervals
         "roots_update_interval": DEFAULT_INTERVAL,
         "gitfs_update_interval": DEFAULT_INTERVAL,
         "git_pillar_update_interval": DEFAULT_INTERVAL,
+        "gitfs_fetch_depth": 0,
+        "gitfs_fetch_timeout": 0,
+        "gitfs_fetch_workers": 1,
+        "git_pillar_fetch_depth": 0,
+        "git_pillar_fetch_timeout": 0,
+        "git_pillar_fetch_workers": 1,
         "hgfs_update_interval": DEFAULT_INTERVAL,
         "minionfs_update_interval": DEFAULT_INTERVAL,
         "s3fs_update_interval": DEFAULT_INTERVAL,
@@ -1139,6 +1224,7 @@ DEFAULT_MINION_OPTS = immutabletypes.freeze(
         "git_pillar_passphrase": "",
         "git_pillar_refspecs": _DFLT_REFSPECS,
         "git_pillar_includes": True,
+        "git_pillar_compile_cache": False,
         "gitfs_remotes": [],
         "gitfs_mountpoint": "",
         "gitfs_root": "",
@@ -1158,6 +1244,7 @@ DEFAULT_MINION_OPTS = immutabletypes.freeze(
         "gitfs_ref_types": ["branch", "tag", "sha"],
         "gitfs_refspecs": _DFLT_REFSPECS,
         "gitfs_disable_saltenv_mapping": False,
+        "gitfs_serve_from_odb": False,
         "unique_jid": False,
         "hash_type": DEFAULT_HASH_TYPE,
         "optimization_order": [0, 1, 2],
@@ -1180,13 +1267,22 @@ DEFAULT_MINION_OPTS = immutabletypes.freeze(
         "autosign_timeout": 120,
         "multiprocessing": True,
         "process_count_max": -1,
+        "job_pool_size": 0,
+        "job_pool_max_jobs": 100,
+        "job_pool_isolate": ["state.*", "saltutil.*", "pkg.*"],
+        "return_batch_window": 0,
+        "return_batch_size": 1048576,
         "mine_enabled": True,
         "mine_return_job": False,
         "mine_interval": 60,
+        "mine_delta": False,
+        "mine_delta_refresh": 60,
         "ipc_mode": _DFLT_IPC_MODE,
         "ipc_write_buffer": _DFLT_IPC_WBUFFER,
         "ipv6": None,
         "file_buffer_size": 262144,
+        "file_transfer_window": 8,
+        "file_cache_index": False,
         "tcp_pub_port": 4510,
         "tcp_pull_port": 4511,
         "tcp_authentication_retries": 5,
@@ -1307,6 +1403,7 @@ DEFAULT_MINION_OPTS = immutabletypes.freeze(
         "ssl": None,
         "multifunc_ordered": False,
         "beacons_before_connect": False,
+        "beacons_batch_window": 0,
         "scheduler_before_connect": False,
         "cache": "localfs",
         "salt_cp_chunk_size": 65536,
@@ -1315,6 +1412,7 @@ DEFAULT_MINION_OPTS = immutabletypes.freeze(
         "minion_sign_messages": False,
         "discovery": False,
         "schedule": {},
+        "schedule_thread_pool_size": 0,
         "ssh_merge_pillar": True,
         "disabled_requisites": [],
         "global_state_conditions": None,
@@ -1345,6 +1443,7 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze(
         "root_dir": salt.syspaths.ROOT_DIR,
         "pki_dir": os.path.join(salt.syspaths.LIB_STATE_DIR, "pki", "master"),
         "key_cache": "",
+        "key_index": False,
         "cachedir": os.path.join(salt.syspaths.CACHE_DIR, "master"),
         "file_roots": {
             "base": [salt.syspaths.BASE_FILE_ROOTS_DIR, salt.syspaths.SPM_FORMULA_PATH]
@@ -1359,6 +1458,10 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze(
         "decrypt_pillar_default": "gpg",
         "decrypt_pillar_renderers": ["gpg"],
         "gpg_decrypt_must_succeed": True,
+        "gpg_decrypt_workers": 1,
+        "secret_cache": False,
+        "secret_cache_ttl": 3600,
+        "secret_cache_mlock": False,
         "thoriumenv": None,
         "thorium_top": "top.sls",
         "thorium_interval": 0.5,
@@ -1373,8 +1476,15 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze(
         "local": True,
         # Update intervals
         "roots_update_interval": DEFAULT_INTERVAL,
+        "roots_index": False,
         "gitfs_update_interval": DEFAULT_INTERVAL,
         "git_pillar_update_interval": DEFAULT_INTERVAL,
+        "gitfs_fetch_depth": 0,
+        "gitfs_fetch_timeout": 0,
+        "gitfs_fetch_workers": 1,
+        "git_pillar_fetch_depth": 0,
+        "git_pillar_fetch_timeout": 0,
+        "git_pillar_fetch_workers": 1,
         "hgfs_update_interval": DEFAULT_INTERVAL,
         "minionfs_update_interval": DEFAULT_INTERVAL,
         "s3fs_update_interval": DEFAULT_INTERVAL,
@@ -1394,6 +1504,7 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze(
         "git_pillar_passphrase": "",
         "git_pillar_refspecs": _DFLT_REFSPECS,
         "git_pillar_includes": True,
+        "git_pillar_compile_cache": False,
         "git_pillar_verify_config": True,
         "gitfs_remotes": [],
         "gitfs_mountpoint": "",
@@ -1414,6 +1525,7 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze(
         "gitfs_ref_types": ["branch", "tag", "sha"],
         "gitfs_refspecs": _DFLT_REFSPECS,
         "gitfs_disable_saltenv_mapping": False,
+        "gitfs_serve_from_odb": False,
         "hgfs_remotes": [],
         "hgfs_mountpoint": "",
         "hgfs_root": "",
@@ -1440,6 +1552,8 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze(
         "minionfs_whitelist": [],
         "minionfs_blacklist": [],
         "ext_pillar": [],
+        "ext_pillar_parallel": False,
+        "ext_pillar_parallel_timeout": 60,
         "pillar_version": 2,
         "pillar_opts": False,
         "pillar_safe_render_error": True,
@@ -1449,6 +1563,9 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze(
         "pillar_cache": False,
         "pillar_cache_ttl": 3600,
         "pillar_cache_backend": "disk",
+        "pillar_cache_memory_max_size": 104857600,
+        "pillar_cache_precompile": False,
+        "pillar_cache_precompile_rate": 10,
         "gpg_cache": False,
         "gpg_cache_ttl": 86400,
         "gpg_cache_backend": "disk",
@@ -1494,6 +1611,8 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze(
         "renderer": "jinja|yaml",
         "renderer_whitelist": [],
         "renderer_blacklist": [],
+        "render_cache": False,
+        "render_cache_size": 1000,
         "failhard": False,
         "state_top": "top.sls",
         "state_top_saltenv": None,
@@ -1506,6 +1625,7 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze(
         "job_cache_store_endtime": False,
         "minion_data_cache": True,
         "enforce_mine_cache": False,
+        "mine_cache_per_function": False,
         "ipc_mode": _DFLT_IPC_MODE,
         "ipc_write_buffer": _DFLT_IPC_WBUFFER,
         # various subprocess niceness levels
@@ -1541,6 +1661,8 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze(
         "reactor_refresh_interval": 60,
         "reactor_worker_threads": 10,
         "reactor_worker_hwm": 10000,
+        "reactor_render_cache": False,
+        "reactor_job_timeout": 300,
         "engines": [],
         "event_return": "",
         "event_return_queue": 0,
@@ -1664,6 +1786,7 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze(
         "fips_mode": False,
         "detect_remote_minions": False,
         "remote_minions_port": 22,
+        "transport_presence": False,
         "pass_variable_prefix": "",
         "pass_strict_fetch": False,
         "pass_gnupghome": "",
@@ -437,6 +437,8 @@ class RemoteFuncs:
         self._serve_file = fs_.serve_file
         self._file_find = fs_._find_file
         self._file_hash = fs_.file_hash
+        self._file_hash_many = fs_.file_hash_many
+        self._file_manifest = fs_.file_manifest
         self._file_list = fs_.file_list
         self._file_list_emptydirs = fs_.file_list_emptydirs
         self._dir_list = fs_.dir_list
@@ -602,8 +604,11 @@ class RemoteFuncs:
         _res = checker.check_minions(load["tgt"], match_type, greedy=False)
         minions = _res["minions"]
         minion_side_acl = {}  # Cache minion-side ACL
+        all_mine_data = salt.utils.mine.fetch_mine_data(
+            self.cache, self.opts, minions, functions_allowed
+        )
         for minion in minions:
-            mine_data = self.cache.fetch(f"minions/{minion}", "mine")
+            mine_data = all_mine_data.get(minion)
             if not isinstance(mine_data, dict):
                 continue
             for function in functions_allowed:
@@ -654,14 +659,13 @@ class RemoteFuncs:
         if self.opts.get("minion_data_cache", False) or self.opts.get(
             "enforce_mine_cache", False
         ):
-            cbank = "minions/{}".format(load["id"])
-            ckey = "mine"
-            new_data = load["data"]
-            if not load.get("clear", False):
-                data = self.cache.fetch(cbank, ckey)
-                if isinstance(data, dict):
-                    data.update(new_data)
-            self.cache.store(cbank, ckey, data)
+            salt.utils.mine.store_mine_data(
+                self.cache,
+                self.opts,
+                load["id"],
+                load["data"],
+                clear=load.get("clear", False),
+            )
         return True
 
     def _mine_delete(self, load):
@@ -673,15 +677,11 @@ class RemoteFuncs:
         if self.opts.get("minion_data_cache", False) or self.opts.get(
             "enforce_mine_cache", False
         ):
-            cbank = "minions/{}".format(load["id"])
-            ckey = "mine"
             try:
-                data = self.cache.fetch(cbank, ckey)
-                if not isinstance(data, dict):
+                if not salt.utils.mine.delete_mine_function(
+                    self.cache, self.opts, load["id"], load["fun"]
+                ):
                     return False
-                if load["fun"] in data:
-                    del data[load["fun"]]
-                    self.cache.store(cbank, ckey, data)
             except OSError:
                 return False
         return True
@@ -695,7 +695,7 @@ class RemoteFuncs:
         if self.opts.get("minion_data_cache", False) or self.opts.get(
             "enforce_mine_cache", False
         ):
-            return self.cache.flush("minions/{}".format(load["id"]), "mine")
+            return salt.utils.mine.flush_mine_data(self.cache, self.opts, load["id"])
         return True
 
     def _file_recv(self, load):
@@ -24,6 +24,7 @@ import salt.loader
 import salt.payload
 import salt.utils.atomicfile
 import salt.utils.data
+import salt.utils.filecache
 import salt.utils.files
 import salt.utils.gzip_util
 import salt.utils.hashutils
@@ -41,6 +42,9 @@ from salt.utils.openstack.swift import SaltSwift
 
 log = logging.getLogger(__name__)
 MAX_FILENAME_LENGTH = 255
+# Seconds during which hashes fetched from the master with
+# hash_and_stat_files() are re-used instead of asking the master again
+HASH_PREFETCH_TTL = 30
 
 
 def get_file_client(opts, pillar=False):
@@ -85,6 +89,8 @@ class Client:
     def __init__(self, opts):
         self.opts = opts
         self.utils = salt.loader.utils(self.opts)
+        self._hash_prefetch = {}
+        self._cache_index = None
 
     # Add __setstate__ and __getstate__ so that the object may be
     # deep copied. It normally can't be deep copied because its
@@ -126,6 +132,36 @@ class Client:
 
         return filelist
 
+    def _get_cache_index(self):
+        """
+        Return the index of the cached files, if file_cache_index is enabled
+        """
+        if self._cache_index is None and self.opts.get("file_cache_index"):
+            self._cache_index = salt.utils.filecache.FileCacheIndex(self.opts)
+        return self._cache_index
+
+    def _hash_local_file(self, path, hash_type):
+        """
+        Hash a local file, re-using the hash recorded in the file cache index
+        for the files this client cached as long as they are unchanged
+        """
+        index = self._get_cache_index()
+        if index is not None and index.manages(path):
+            return index.get_hash(path, hash_type)
+        return salt.utils.hashutils.get_hash(path, form=hash_type)
+
+    def _index_cached_file(self, path):
+        """
+        Record a file which was just cached in the file cache index
+        """
+        index = self._get_cache_index()
+        if index is None or not index.manages(path):
+            return
+        try:
+            index.add(path)
+        except OSError as exc:
+            log.debug("Unable to index cached file %s: %s", path, exc)
+
     @contextlib.contextmanager
     def _cache_loc(self, path, saltenv="base", cachedir=None):
         """
@@ -203,10 +239,50 @@ class Client:
         ret = []
         if isinstance(paths, str):
             paths = paths.split(",")
+        self.prefetch_hashes(paths, saltenv)
         for path in paths:
             ret.append(self.cache_file(path, saltenv, cachedir=cachedir))
         return ret
 
+    def hash_and_stat_files(self, paths, saltenv="base"):
+        """
+        Return the hashes and stat results of several files as a dict mapping
+        each path to a ``(hash, stat)`` tuple, see hash_and_stat_file()
+        """
+        return {path: self.hash_and_stat_file(path, saltenv) for path in paths}
+
+    def prefetch_hashes(self, paths, saltenv="base"):
+        """
+        Get the hashes of the ``salt://`` paths in ``paths`` from the master in
+        as few requests as possible, so that caching these files does not take
+        a request per file to check whether the cached copies are current.
+        Paths can select their environment with ``?saltenv=``.
+        """
+        by_env = {}
+        for path in paths:
+            if not isinstance(path, str) or not path.startswith("salt://"):
+                continue
+            path, senv = salt.utils.url.split_env(path)
+            by_env.setdefault(senv or saltenv, []).append(path)
+        for senv, env_paths in by_env.items():
+            try:
+                self.hash_and_stat_files(env_paths, senv)
+            except (MinionError, SaltClientError) as exc:
+                log.debug("Unable to prefetch file hashes: %s", exc)
+
+    def _prefetched(self, path, saltenv):
+        """
+        Return the ``(hash, stat)`` tuple of a path fetched by
+        hash_and_stat_files() in the last HASH_PREFETCH_TTL seconds, or None
+        """
+        entry = self._hash_prefetch.get((saltenv, path))
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > HASH_PREFETCH_TTL:
+            self._hash_prefetch.pop((saltenv, path), None)
+            return None
+        return entry[1]
+
     def cache_master(self, saltenv="base", cachedir=None):
         """
         Download and cache all files on a master in a specified environment
@@ -242,17 +318,19 @@ class Client:
         log.info("Caching directory '%s' for environment '%s'", path, saltenv)
         # go through the list of all files finding ones that are in
         # the target directory and caching them
+        urls = []
         for fn_ in self.file_list(saltenv):
             fn_ = salt.utils.data.decode(fn_)
             if fn_.strip() and fn_.startswith(path):
                 if salt.utils.stringutils.check_include_exclude(
                     fn_, include_pat, exclude_pat
                 ):
-                    fn_ = self.cache_file(
-                        salt.utils.url.create(fn_), saltenv, cachedir=cachedir
-                    )
-                    if fn_:
-                        ret.append(fn_)
+                    urls.append(salt.utils.url.create(fn_))
+        self.prefetch_hashes(urls, saltenv)
+        for url in urls:
+            fn_ = self.cache_file(url, saltenv, cachedir=cachedir)
+            if fn_:
+                ret.append(fn_)
 
         if include_empty:
             # Break up the path into a list containing the bottom-level
@@ -1046,7 +1124,7 @@ class PillarClient(Client):
             fnd_path = fnd
 
         hash_type = self.opts.get("hash_type", DEFAULT_HASH_TYPE)
-        ret["hsum"] = salt.utils.hashutils.get_hash(fnd_path, form=hash_type)
+        ret["hsum"] = self._hash_local_file(fnd_path, hash_type)
         ret["hash_type"] = hash_type
         return ret
 
@@ -1077,7 +1155,7 @@ class PillarClient(Client):
                 fnd_stat = None
 
         hash_type = self.opts.get("hash_type", DEFAULT_HASH_TYPE)
-        ret["hsum"] = salt.utils.hashutils.get_hash(fnd_path, form=hash_type)
+        ret["hsum"] = self._hash_local_file(fnd_path, hash_type)
         ret["hash_type"] = hash_type
         return ret, fnd_stat
 
@@ -1154,11 +1232,57 @@ class RemoteClient(Client):
                 f"File client timed out after {int(time.monotonic() - start)} seconds"
             )
 
+    def _get_file_pipelined(self, load, fn_, chunk_size, size, window):
+        """
+        Fetch the rest of a ``size`` byte file from the master, keeping up to
+        ``window`` requests for ``chunk_size`` byte chunks in flight and
+        writing the chunks to ``fn_`` in order.
+
+        Stops at the first chunk which is not of the expected size, in which
+        case the caller carries on one chunk at a time from wherever this left
+        off.
+        """
+
+        def _loads():
+            for loc in range(fn_.tell(), size, chunk_size):
+                yield dict(load, loc=loc)
+
+        def _write(data):
+            data = decode_dict_keys_to_str(data)
+            if not isinstance(data, dict) or not data.get("data"):
+                return False
+            if data.get("gzip", None):
+                data = salt.utils.gzip_util.uncompress(data["data"])
+            else:
+                data = data["data"]
+            if isinstance(data, str):
+                data = data.encode()
+            fn_.write(data)
+            return len(data) == chunk_size
+
+        start = time.monotonic()
+        try:
+            self.channel.send_pipelined(
+                _loads(),
+                _write,
+                window=window,
+                raw=True,
+            )
+        except salt.exceptions.SaltReqTimeoutError:
+            log.warning(
+                "Pipelined transfer of '%s' timed out after %d seconds, "
+                "continuing one chunk at a time",
+                load["path"],
+                time.monotonic() - start,
+            )
+
     def destroy(self):
         if self._closing:
             return
 
         self._closing = True
+        if self._cache_index is not None:
+            self._cache_index.save(force=True)
         channel = None
         try:
             channel = self.channel
@@ -1257,6 +1381,11 @@ class RemoteClient(Client):
         else:
             log.debug("No dest file found")
 
+        # Only pipeline chunk requests on transports which support it
+        window = self.opts.get("file_transfer_window", 1)
+        if not getattr(self.channel, "pipelined", False):
+            window = 1
+        pipelined = False
         while True:
             if not fn_:
                 load["loc"] = 0
@@ -1300,6 +1429,9 @@ class RemoteClient(Client):
                             )
                             continue
                     break
+                # Masters which know the size of the file being served send it
+                # along with the chunks.
+                size = data.get("size")
                 if not fn_:
                     with self._cache_loc(
                         data["dest"], saltenv, cachedir=cachedir
@@ -1317,6 +1449,11 @@ class RemoteClient(Client):
                 if isinstance(data, str):
                     data = data.encode()
                 fn_.write(data)
+                if window > 1 and size and not pipelined:
+                    # The first chunk tells us how large the chunks the master
+                    # serves are, request the rest of them up front.
+                    pipelined = True
+                    self._get_file_pipelined(load, fn_, len(data), size, window)
             except (TypeError, KeyError) as exc:
                 try:
                     data_type = type(data).__name__
@@ -1345,6 +1482,7 @@ class RemoteClient(Client):
 
         if fn_:
             fn_.close()
+            self._index_cached_file(dest)
             log.info("Fetching file from saltenv '%s', ** done ** '%s'", saltenv, path)
         else:
             log.debug(
@@ -1404,7 +1542,7 @@ class RemoteClient(Client):
             else:
                 ret = {}
                 hash_type = self.opts.get("hash_type", DEFAULT_HASH_TYPE)
-                ret["hsum"] = salt.utils.hashutils.get_hash(path, form=hash_type)
+                ret["hsum"] = self._hash_local_file(path, hash_type)
                 ret["hash_type"] = hash_type
                 return ret
         load = {"path": path, "saltenv": saltenv, "cmd": "_file_hash"}
@@ -1418,6 +1556,9 @@ class RemoteClient(Client):
         master file server prepend the path with salt://<file on server>
         otherwise, prepend the file with / for a local file.
         """
+        prefetched = self._prefetched(path, saltenv)
+        if prefetched is not None:
+            return prefetched[0]
         return self.__hash_and_stat_file(path, saltenv)
 
     def hash_and_stat_file(self, path, saltenv="base"):
@@ -1425,6 +1566,9 @@ class RemoteClient(Client):
         The same as hash_file, but also return the file's mode, or None if no
         mode data is present.
         """
+        prefetched = self._prefetched(path, saltenv)
+        if prefetched is not None:
+            return prefetched
         hash_result = self.hash_file(path, saltenv)
         try:
             path = self._check_proto(path)
@@ -1446,6 +1590,64 @@ class RemoteClient(Client):
             stat_result = None
         return hash_result, stat_result
 
+    def hash_and_stat_files(self, paths, saltenv="base"):
+        """
+        Return the hashes and stat results of several files as a dict mapping
+        each path to a ``(hash, stat)`` tuple, asking the master for all the
+        ``salt://`` paths in a single request. The results are re-used by
+        hash_file() and hash_and_stat_file() for HASH_PREFETCH_TTL seconds.
+        """
+        ret = {}
+        remote = {}
+        for path in paths:
+            try:
+                remote[self._check_proto(path)] = path
+            except MinionError:
+                ret[path] = self.hash_and_stat_file(path, saltenv)
+        if not remote:
+            return ret
+        load = {"paths": list(remote), "saltenv": saltenv, "cmd": "_file_hash_many"}
+        result = self._channel_send(
+            load,
+        )
+        if not isinstance(result, dict) or not all(rel in result for rel in remote):
+            # The master does not know about _file_hash_many, older masters
+            # answer unknown commands with an empty dict
+            log.debug("Batch file hashing is not supported by the master")
+            for path in remote.values():
+                ret[path] = self.hash_and_stat_file(path, saltenv)
+            return ret
+        now = time.monotonic()
+        for key in [
+            key
+            for key, val in self._hash_prefetch.items()
+            if now - val[0] > HASH_PREFETCH_TTL
+        ]:
+            del self._hash_prefetch[key]
+        for rel, path in remote.items():
+            hash_result, stat_result = result[rel] or ("", None)
+            ret[path] = (hash_result, stat_result)
+            self._hash_prefetch[(saltenv, path)] = (now, ret[path])
+        return ret
+
+    def file_manifest(self, dirs, saltenvs):
+        """
+        Return the hashes of all the files below the top level directories in
+        ``dirs`` in each of the ``saltenvs``, in a single request. The result
+        maps ``files`` to a dict of saltenvs mapping each path to its hash,
+        and ``hash_type`` to the type of these hashes.
+
+        Returns None if the master does not support file manifests.
+        """
+        load = {"dirs": list(dirs), "saltenvs": list(saltenvs), "cmd": "_file_manifest"}
+        ret = self._channel_send(
+            load,
+        )
+        if not isinstance(ret, dict) or not isinstance(ret.get("files"), dict):
+            log.debug("File manifests are not supported by the master")
+            return None
+        return ret
+
     def list_env(self, saltenv="base"):
         """
         Return a list of the files in the file server's specified environment
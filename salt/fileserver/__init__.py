@@ -622,7 +622,12 @@ class Fileserver:
             return ret
         fstr = "{}.serve_file".format(fnd["back"])
         if fstr in self.servers:
-            return self.servers[fstr](load, fnd)
+            ret = self.servers[fstr](load, fnd)
+            # Lets the client request the following chunks without waiting
+            # for each one in turn. Backends like gitfs only report the file
+            # mode in the stat, those are served without the size.
+            if ret.get("data") and len(fnd.get("stat") or ()) > 6:
+                ret["size"] = fnd["stat"][6]
         return ret
 
     def __file_hash_and_stat(self, load):
@@ -667,6 +672,56 @@ class Fileserver:
         except (IndexError, TypeError):
             return "", None
 
+    def file_hash_many(self, load):
+        """
+        Return the hashes and stat results of several files, as a dict mapping
+        each of the paths in ``load["paths"]`` to a ``[hash, stat]`` list
+        """
+        if "env" in load:
+            # "env" is not supported; Use "saltenv".
+            load.pop("env")
+
+        paths = load.get("paths")
+        if not isinstance(paths, list) or "saltenv" not in load:
+            return {}
+        ret = {}
+        for path in paths:
+            if not isinstance(path, str):
+                continue
+            ret[path] = list(
+                self.file_hash_and_stat({"path": path, "saltenv": load["saltenv"]})
+            )
+        return ret
+
+    def file_manifest(self, load):
+        """
+        Return the hashes of all the files below the top level directories in
+        ``load["dirs"]`` in each of the saltenvs in ``load["saltenvs"]``
+
+        The result maps ``files`` to a dict of saltenvs, each mapping the
+        paths to their hashes, and ``hash_type`` to the type of the hashes.
+        """
+        dirs = load.get("dirs")
+        saltenvs = load.get("saltenvs")
+        if not isinstance(dirs, list) or not isinstance(saltenvs, list):
+            return {}
+        dirs = {str(x).strip("/") for x in dirs}
+        ret = {"files": {}, "hash_type": self.opts["hash_type"]}
+        for saltenv in saltenvs:
+            saltenv = str(saltenv)
+            paths = [
+                path
+                for path in self.file_list({"saltenv": saltenv})
+                if path.split("/", 1)[0] in dirs
+            ]
+            hashes = self.file_hash_many({"paths": paths, "saltenv": saltenv})
+            ret["files"][saltenv] = {
+                path: hash_and_stat[0]["hsum"]
+                for path, hash_and_stat in hashes.items()
+                if hash_and_stat[0]
+            }
+        return ret
+
     def clear_file_list_cache(self, load):
         """
         Deletes the file_lists cache files
@@ -26,6 +26,7 @@ import salt.utils.gzip_util
 import salt.utils.hashutils
 import salt.utils.path
 import salt.utils.platform
+import salt.utils.rootsindex
 import salt.utils.stringutils
 import salt.utils.verify
 import salt.utils.versions
@@ -80,6 +81,20 @@ def find_file(path, saltenv="base", **kwargs):
             log.error("Unable to stat file: %s", exc)
         return fnd
 
+    if (
+        __opts__.get("roots_index", False)
+        and saltenv != "__env__"
+        and "index" not in kwargs
+    ):
+        indexed = salt.utils.rootsindex.get_file_hash(__opts__, saltenv, path)
+        if indexed is not None:
+            # The file is not served if the index does not have it
+            if indexed:
+                fnd["path"] = indexed["path"]
+                fnd["rel"] = path
+                fnd["stat"] = indexed["stat"]
+            return fnd
+
     if "index" in kwargs:
         try:
             root = __opts__["file_roots"][saltenv][int(kwargs["index"])]
@@ -180,9 +195,15 @@ def update():
         # Hash file won't exist if no files have yet been served up
         pass
 
-    mtime_map_path = os.path.join(__opts__["cachedir"], "roots", "mtime_map")
     # data to send on event
     data = {"changed": False, "files": {"changed": []}, "backend": "roots"}
+    if __opts__.get("roots_index", False) and salt.utils.rootsindex.HAS_PYINOTIFY:
+        # The index is kept up to date by the FileserverUpdate process, which
+        # also fires the update events, so there is no need to walk the roots
+        data["files"].update({"added": [], "removed": []})
+        return data
+
+    mtime_map_path = os.path.join(__opts__["cachedir"], "roots", "mtime_map")
 
     # generate the new map
     new_mtime_map = salt.fileserver.generate_mtime_map(__opts__, __opts__["file_roots"])
@@ -257,6 +278,11 @@ def file_hash(load, fnd):
         saltenv = "__env__"
     ret = {}
 
+    if path and __opts__.get("roots_index", False) and saltenv != "__env__":
+        indexed = salt.utils.rootsindex.get_file_hash(__opts__, saltenv, fnd["rel"])
+        if indexed and indexed["path"] == path:
+            return {"hash_type": __opts__["hash_type"], "hsum": indexed["hsum"]}
+
     # if the file doesn't exist, we can't get a hash
     if not path or not os.path.isfile(path):
         return ret
@@ -342,6 +368,11 @@ def _file_lists(load, form):
         else:
             return []
 
+    if __opts__.get("roots_index", False) and saltenv != "__env__":
+        lists = salt.utils.rootsindex.get_file_lists(__opts__, saltenv)
+        if lists is not None:
+            return lists.get(form, [])
+
     list_cachedir = os.path.join(__opts__["cachedir"], "file_lists", "roots")
     if not os.path.isdir(list_cachedir):
         try:
@@ -22,6 +22,7 @@ import salt.utils.data
 import salt.utils.event
 import salt.utils.files
 import salt.utils.json
+import salt.utils.keyindex
 import salt.utils.kinds
 import salt.utils.master
 import salt.utils.sdb
@@ -533,6 +534,9 @@ class Key:
         """
         Return a dict of managed keys and what the key status are
         """
+        if self.opts.get("key_index", False):
+            return salt.utils.keyindex.get_index(self.pki_dir).list_keys()
+
         key_dirs = self._check_minions_directories()
 
         ret = {}
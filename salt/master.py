@@ -21,6 +21,7 @@ import tornado.gen
 
 import salt.acl
 import salt.auth
+import salt.cache
 import salt.channel.server
 import salt.client
 import salt.client.ssh.client
@@ -43,12 +44,16 @@ import salt.utils.event
 import salt.utils.files
 import salt.utils.gitfs
 import salt.utils.gzip_util
+import salt.utils.hashutils
 import salt.utils.jid
 import salt.utils.job
+import salt.utils.keyindex
 import salt.utils.master
 import salt.utils.minions
+import salt.utils.path
 import salt.utils.platform
 import salt.utils.process
+import salt.utils.rootsindex
 import salt.utils.schedule
 import salt.utils.ssdp
 import salt.utils.stringutils
@@ -442,6 +447,227 @@ class Maintenance(salt.utils.process.SignalHandlingProcess):
             old_present.update(present)
 
 
+class PillarPrecompile(salt.utils.process.SignalHandlingProcess):
+    """
+    Refresh the pillar cache of the accepted minions in the background, so
+    that pillar requests are served from a warm cache instead of every master
+    worker compiling pillar at once after the cache expired.
+
+    Minions are refreshed at most ``pillar_cache_precompile_rate`` per second.
+    Minions without cached pillar come first, then minions whose pillar inputs
+    (the git_pillar SHAs, the modification times under ``pillar_roots`` or
+    their grains) changed since they were last compiled, and finally minions
+    whose cached pillar is about to expire.
+
+    The fingerprints of the last compiles are kept in the master cachedir, so
+    that a restart of the master does not recompile the pillar of every minion.
+    """
+
+    def __init__(self, opts, **kwargs):
+        super().__init__(**kwargs)
+        self.opts = opts
+        self.loop_interval = int(self.opts["loop_interval"])
+        # A rate of 0 or less does not limit the precompilation
+        self.rate = float(self.opts["pillar_cache_precompile_rate"])
+        # Refresh cached pillar once this fraction of pillar_cache_ttl passed
+        self.refresh_after = self.opts["pillar_cache_ttl"] * 0.8
+        # minion id -> (inputs fingerprint, grains digest) of the last compile
+        self.compiled = {}
+        # The current inputs fingerprint and since when it is current
+        self.fingerprint = None
+        self.fingerprint_since = None
+        self.state_path = os.path.join(self.opts["cachedir"], "pillar_precompile.p")
+
+    def _post_fork_init(self):
+        """
+        Some things need to be init'd after the fork has completed
+        """
+        self.cache = salt.cache.factory(self.opts)
+        self.ckminions = salt.utils.minions.CkMinions(self.opts)
+        self.git_pillar = salt.daemons.masterapi.init_git_pillar(self.opts)
+        if self.opts["maintenance_niceness"] and not salt.utils.platform.is_windows():
+            os.nice(self.opts["maintenance_niceness"])
+
+    def roots_mtime(self):
+        """
+        Return the latest modification time under the pillar_roots
+        """
+        mtime = 0
+        for roots in self.opts["pillar_roots"].values():
+            for root in roots:
+                for path, _, files in salt.utils.path.os_walk(root):
+                    for name in [path] + [os.path.join(path, x) for x in files]:
+                        try:
+                            mtime = max(mtime, os.path.getmtime(name))
+                        except OSError:
+                            pass
+        return mtime
+
+    def inputs_fingerprint(self):
+        """
+        Return a digest of the pillar inputs shared by all minions: the SHAs
+        checked out by git_pillar and the latest modification time under the
+        pillar_roots.
+        """
+        shas = []
+        for git_pillar in self.git_pillar:
+            for repo in git_pillar.remotes:
+                try:
+                    shas.append((repo.id, repo.get_checkout_sha()))
+                except Exception:  # pylint: disable=broad-except
+                    log.debug("Failed to resolve SHA of git_pillar remote %s", repo.id)
+                    shas.append((repo.id, None))
+        return salt.utils.hashutils.sha256_digest(
+            salt.payload.dumps({"shas": shas, "mtime": self.roots_mtime()})
+        )
+
+    def track_fingerprint(self, fingerprint):
+        """
+        Remember since when the inputs fingerprint is current
+        """
+        if fingerprint == self.fingerprint:
+            return
+        if self.fingerprint is None and not self.git_pillar:
+            # Nothing is known about earlier compiles, but without git_pillar
+            # the inputs last changed with the latest file in pillar_roots.
+            self.fingerprint_since = self.roots_mtime()
+        else:
+            self.fingerprint_since = time.time()
+        self.fingerprint = fingerprint
+
+    def load_state(self):
+        """
+        Read the fingerprints of the last compiles saved by save_state
+        """
+        try:
+            with salt.utils.files.fopen(self.state_path, "rb") as fp_:
+                state = salt.payload.load(fp_)
+        except (OSError, salt.exceptions.SaltDeserializationError):
+            return
+        if not isinstance(state, dict):
+            return
+        self.compiled = {
+            minion_id: tuple(inputs)
+            for minion_id, inputs in state.get("compiled", {}).items()
+        }
+        self.fingerprint = state.get("fingerprint")
+        self.fingerprint_since = state.get("since")
+
+    def save_state(self):
+        """
+        Save the fingerprints of the last compiles to the master cachedir
+        """
+        state = {
+            "compiled": self.compiled,
+            "fingerprint": self.fingerprint,
+            "since": self.fingerprint_since,
+        }
+        try:
+            with salt.utils.atomicfile.atomic_open(self.state_path, "wb") as fp_:
+                fp_.write(salt.payload.dumps(state))
+        except OSError as exc:
+            log.error("Unable to write %s: %s", self.state_path, exc)
+
+    def minion_grains(self, minion_id):
+        """
+        Return the grains of a minion from the minion data cache
+        """
+        data = self.cache.fetch(f"minions/{minion_id}", "data")
+        if not isinstance(data, dict):
+            return None
+        return data.get("grains")
+
+    def pending(self, fingerprint):
+        """
+        Return the minions whose cached pillar should be refreshed, in the
+        order in which they should be refreshed
+        """
+        now = time.time()
+        queue = []
+        for minion_id in self.ckminions.check_minions("*", "glob")["minions"]:
+            grains = self.minion_grains(minion_id)
+            if not grains:
+                # The minion never sent its grains, so it never requested
+                # pillar either.
+                continue
+            inputs = (
+                fingerprint,
+                salt.utils.hashutils.sha256_digest(salt.payload.dumps(grains)),
+            )
+            path = os.path.join(self.opts["cachedir"], "pillar_cache", minion_id)
+            try:
+                cache_time = os.path.getmtime(path)
+            except OSError:
+                cache_time = None
+            if (
+                minion_id not in self.compiled
+                and cache_time is not None
+                and fingerprint == self.fingerprint
+                and cache_time >= self.fingerprint_since
+            ):
+                # The pillar was cached, by a worker or before the master was
+                # restarted, after the inputs last changed
+                self.compiled[minion_id] = inputs
+            if cache_time is None or now - cache_time >= self.opts["pillar_cache_ttl"]:
+                priority = 0
+            elif self.compiled.get(minion_id) != inputs:
+                priority = 1
+            elif now - cache_time >= self.refresh_after:
+                priority = 2
+            else:
+                continue
+            queue.append((priority, cache_time or 0, minion_id, grains, inputs))
+        queue.sort(key=lambda item: item[:3])
+        return queue
+
+    def refresh(self, minion_id, grains):
+        """
+        Compile the pillar of a minion into the pillar cache
+        """
+        pillar = salt.pillar.PillarCache(
+            self.opts, grains, minion_id, self.opts.get("saltenv")
+        )
+        for pillarenv in pillar.cached_pillarenvs() or [self.opts.get("pillarenv")]:
+            pillar.pillarenv = pillarenv
+            pillar.refresh_pillar()
+
+    def run(self):
+        """
+        Refresh the pillar cache until the process is stopped
+        """
+        self._post_fork_init()
+        self.load_state()
+        while True:
+            fingerprint = self.inputs_fingerprint()
+            self.track_fingerprint(fingerprint)
+            queue = self.pending(fingerprint)
+            if queue:
+                log.debug("Precompiling pillar for %d minions", len(queue))
+            changed = False
+            last_check = time.time()
+            for _, _, minion_id, grains, inputs in queue:
+                start = time.time()
+                try:
+                    self.refresh(minion_id, grains)
+                except Exception:  # pylint: disable=broad-except
+                    log.exception("Failed to precompile pillar for %s", minion_id)
+                else:
+                    self.compiled[minion_id] = inputs
+                # Walking the pillar_roots and resolving the git_pillar SHAs
+                # is expensive, only look for changed inputs once per interval
+                if time.time() - last_check >= self.loop_interval:
+                    last_check = time.time()
+                    if self.inputs_fingerprint() != fingerprint:
+                        # The inputs changed again, recompute the priorities
+                        changed = True
+                        break
+                if self.rate > 0:
+                    time.sleep(max(1 / self.rate - (time.time() - start), 0))
+            self.save_state()
+            if not changed:
+                time.sleep(self.loop_interval)
+
+
 class FileserverUpdate(salt.utils.process.SignalHandlingProcess):
     """
     A process from which to update any dynamic fileserver backends
@@ -575,6 +801,18 @@ class FileserverUpdate(salt.utils.process.SignalHandlingProcess):
         # Clean out the fileserver backend cache
         salt.daemons.masterapi.clean_fsbackend(self.opts)
 
+        if (
+            self.opts.get("roots_index", False)
+            and "roots" in self.fileserver.backends()
+        ):
+            # Keep the index of file_roots up to date for as long as the
+            # process runs
+            self.update_threads["roots_index"] = threading.Thread(
+                target=salt.utils.rootsindex.RootsIndexer(self.opts).run,
+                daemon=True,
+            )
+            self.update_threads["roots_index"].start()
+
         for interval in self.buckets:
             self.update_threads[interval] = threading.Thread(
                 target=self.update,
@@ -806,6 +1044,14 @@ class Master(SMaster):
                 "reload": salt.crypt.Crypticle.generate_key_string,
             }
 
+            if self.opts.get("key_index", False):
+                # Read the minion keys before forking, so that the workers
+                # start with a filled key index
+                pki_dir = self.opts["pki_dir"]
+                if self.opts["cluster_id"] and self.opts["cluster_pki_dir"]:
+                    pki_dir = self.opts["cluster_pki_dir"]
+                salt.utils.keyindex.get_index(pki_dir).load()
+
             log.info("Creating master process manager")
             # Since there are children having their own ProcessManager we should wait for kill more time.
             self.process_manager = salt.utils.process.ProcessManager(wait_for_kill=5)
@@ -855,6 +1101,18 @@ class Master(SMaster):
                 name="Maintenance",
             )
 
+            if self.opts["pillar_cache"] and self.opts.get("pillar_cache_precompile"):
+                if self.opts["pillar_cache_backend"] == "memory":
+                    log.warning(
+                        "pillar_cache_precompile has no effect with the memory "
+                        "pillar_cache_backend, pillar is not precompiled"
+                    )
+                else:
+                    log.info("Creating master pillar precompile process")
+                    self.process_manager.add_process(
+                        PillarPrecompile, args=(self.opts,), name="PillarPrecompile"
+                    )
+
             if self.opts.get("event_return"):
                 log.info("Creating master event return process")
                 self.process_manager.add_process(
@@ -1364,6 +1622,8 @@ class AESFuncs(TransportMethods):
         "_file_find",
         "_file_hash",
         "_file_hash_and_stat",
+        "_file_hash_many",
+        "_file_manifest",
         "_file_list",
         "_file_list_emptydirs",
         "_dir_list",
@@ -1410,6 +1670,8 @@ class AESFuncs(TransportMethods):
         self._file_find = self.fs_._find_file
         self._file_hash = self.fs_.file_hash
         self._file_hash_and_stat = self.fs_.file_hash_and_stat
+        self._file_hash_many = self.fs_.file_hash_many
+        self._file_manifest = self.fs_.file_manifest
         self._file_list = self.fs_.file_list
         self._file_list_emptydirs = self.fs_.file_list_emptydirs
         self._dir_list = self.fs_.dir_list
@@ -1835,9 +2097,26 @@ class AESFuncs(TransportMethods):
         Takes the return, verifies it and fires it on the master event bus.
         Typically, this event is consumed by the Salt CLI waiting on the other
         end of the event bus but could be heard by any listener on the bus.
+        The returns of several jobs sent together by a minion with
+        ``return_batch_window`` set are passed as a list under ``load``.
 
         :param dict load: The minion payload
         """
+        if "jid" not in load and isinstance(load.get("load"), list):
+            # Several returns coalesced by the minion into a single request
+            for ret in load["load"]:
+                if (
+                    not isinstance(ret, dict)
+                    or "jid" not in ret
+                    or ret.get("id") != load.get("id")
+                ):
+                    log.warning(
+                        "Dropping invalid return in the returns sent by %s",
+                        load.get("id"),
+                    )
+                    continue
+                self._return(ret)
+            return
         if self.opts["require_minion_sign_messages"] and "sig" not in load:
             log.critical(
                 "_return: Master is requiring minions to sign their "
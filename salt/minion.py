@@ -6,6 +6,8 @@ import asyncio
 import binascii
 import contextlib
 import copy
+import fnmatch
+import functools
 import logging
 import multiprocessing
 import os
@@ -49,6 +51,7 @@ import salt.utils.event
 import salt.utils.extmods
 import salt.utils.files
 import salt.utils.jid
+import salt.utils.jobpool
 import salt.utils.minion
 import salt.utils.minions
 import salt.utils.network
@@ -1255,6 +1258,11 @@ class Minion(MinionBase):
 
         self._running = None
         self.subprocess_list = salt.utils.process.SubprocessList()
+        self.job_pool = None
+        self.job_context = None
+        self._return_batch = []
+        self._return_batch_size = 0
+        self._return_batch_timer = None
         self.loaded_base_name = loaded_base_name
         self.connected = False
         self.restart = False
@@ -1765,6 +1773,7 @@ class Minion(MinionBase):
                 ) = self._load_modules()
                 self.schedule.functions = self.functions
                 self.schedule.returners = self.returners
+                self._stop_job_pool()
 
         if self.opts.get("grains_refresh_pre_exec"):
             if hasattr(self, "proxy"):
@@ -1801,6 +1810,23 @@ class Minion(MinionBase):
                 # running on windows
                 instance = None
                 creds_map = salt.crypt.AsyncAuth.creds_map
+            if self._use_job_pool(data):
+                if self.job_pool is None:
+                    self.job_pool = salt.utils.jobpool.JobPool(
+                        self.opts["job_pool_size"],
+                        functools.partial(
+                            self._job_worker_init,
+                            instance,
+                            self.opts,
+                            self.connected,
+                            creds_map,
+                        ),
+                        self._job_worker_target,
+                        max_jobs=self.opts.get("job_pool_max_jobs", 0),
+                        subprocess_list=self.subprocess_list,
+                    )
+                if self.job_pool.submit(data):
+                    return
             with default_signals(signal.SIGINT, signal.SIGTERM):
                 process = SignalHandlingProcess(
                     target=self._target,
@@ -1823,6 +1849,35 @@ class Minion(MinionBase):
             process.start()
         self.subprocess_list.add(process)
 
+    def _use_job_pool(self, data):
+        """
+        Return whether the job can be handed off to the job pool instead of
+        running in a process of its own
+        """
+        if not self.opts.get("job_pool_size") or self.opts.get(
+            "grains_refresh_pre_exec"
+        ):
+            return False
+        if isinstance(data["fun"], (list, tuple)):
+            funs = data["fun"]
+        else:
+            funs = [data["fun"]]
+        for fun in funs:
+            for pattern in self.opts.get("job_pool_isolate") or []:
+                if fnmatch.fnmatch(fun, pattern):
+                    return False
+        return True
+
+    def _stop_job_pool(self):
+        """
+        Stop the job pool workers once they are done with their current job,
+        new ones are started with the current modules and pillar when the
+        next job comes in.
+        """
+        if self.job_pool is not None:
+            self.job_pool.stop()
+            self.job_pool = None
+
     def ctx(self):
         """
         Return a single context manager for the minion's data
@@ -1835,6 +1890,19 @@ class Minion(MinionBase):
 
     @classmethod
     def _target(cls, minion_instance, opts, data, connected, creds_map):
+        minion_instance = cls._job_instance(minion_instance, opts, connected, creds_map)
+        with salt.utils.ctx.request_context({"data": data, "opts": opts}):
+            if isinstance(data["fun"], tuple) or isinstance(data["fun"], list):
+                return Minion._thread_multi_return(minion_instance, opts, data)
+            else:
+                return Minion._thread_return(minion_instance, opts, data)
+
+    @classmethod
+    def _job_instance(cls, minion_instance, opts, connected, creds_map):
+        """
+        Return the minion instance running jobs in this process, creating it
+        when the process was spawned
+        """
         if creds_map:
             salt.crypt.AsyncAuth.creds_map = creds_map
         if not minion_instance:
@@ -1854,12 +1922,44 @@ class Minion(MinionBase):
             if not hasattr(minion_instance, "proc_dir"):
                 uid = salt.utils.user.get_uid(user=opts.get("user", None))
                 minion_instance.proc_dir = get_proc_dir(opts["cachedir"], uid=uid)
+        return minion_instance
 
-        with salt.utils.ctx.request_context({"data": data, "opts": opts}):
-            if isinstance(data["fun"], tuple) or isinstance(data["fun"], list):
-                return Minion._thread_multi_return(minion_instance, opts, data)
-            else:
-                return Minion._thread_return(minion_instance, opts, data)
+    @classmethod
+    def _job_worker_init(cls, minion_instance, opts, connected, creds_map):
+        """
+        Prepare a job pool worker, the modules are loaded once and kept for
+        all of the jobs it runs
+        """
+        minion_instance = cls._job_instance(minion_instance, opts, connected, creds_map)
+        # The pool belongs to the parent process
+        minion_instance.job_pool = None
+        minion_instance.job_context = {}
+        minion_instance.gen_modules(context=minion_instance.job_context)
+        return minion_instance
+
+    @classmethod
+    def _job_worker_target(cls, minion_instance, data):
+        """
+        Run a job handed off to a job pool worker
+        """
+        try:
+            return cls._target(
+                minion_instance,
+                minion_instance.opts,
+                data,
+                minion_instance.connected,
+                None,
+            )
+        finally:
+            # The worker keeps running, the proc file would otherwise report
+            # the job as running until the worker exits and let a signal meant
+            # for it hit the next job of the worker
+            try:
+                os.remove(os.path.join(minion_instance.proc_dir, data["jid"]))
+            except OSError:
+                pass
+            # Every job runs in an event loop of its own
+            asyncio.get_event_loop_policy().get_event_loop().close()
 
     def _execute_job_function(
         self, function_name, function_args, executors, opts, data
@@ -1932,13 +2032,21 @@ class Minion(MinionBase):
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
 
-        minion_instance.gen_modules()
+        if minion_instance.job_context is None:
+            minion_instance.gen_modules()
+        else:
+            # A job pool worker keeps its modules loaded, only the context is
+            # reset between two jobs
+            minion_instance.job_context.clear()
         fn_ = os.path.join(minion_instance.proc_dir, data["jid"])
 
         salt.utils.process.appendproctitle(f"{cls.__name__}._thread_return")
 
         sdata = {"pid": os.getpid()}
         sdata.update(data)
+        if minion_instance.job_context is not None:
+            # Tells saltutil.signal_job that the process outlives the job
+            sdata["job_pool"] = True
         log.info("Starting a new job %s with PID %s", data["jid"], sdata["pid"])
         with salt.utils.files.fopen(fn_, "w+b") as fp_:
             fp_.write(salt.payload.dumps(sdata))
@@ -2136,13 +2244,21 @@ class Minion(MinionBase):
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
 
-        minion_instance.gen_modules()
+        if minion_instance.job_context is None:
+            minion_instance.gen_modules()
+        else:
+            # A job pool worker keeps its modules loaded, only the context is
+            # reset between two jobs
+            minion_instance.job_context.clear()
         fn_ = os.path.join(minion_instance.proc_dir, data["jid"])
 
         salt.utils.process.appendproctitle(f"{cls.__name__}._thread_multi_return")
 
         sdata = {"pid": os.getpid()}
         sdata.update(data)
+        if minion_instance.job_context is not None:
+            # Tells saltutil.signal_job that the process outlives the job
+            sdata["job_pool"] = True
         log.info("Starting a new job with PID %s", sdata["pid"])
         with salt.utils.files.fopen(fn_, "w+b") as fp_:
             fp_.write(salt.payload.dumps(sdata))
@@ -2401,6 +2517,49 @@ class Minion(MinionBase):
         log.trace("ret_val = %s", ret_val)  # pylint: disable=no-member
         return ret_val
 
+    def _batch_return(self, load):
+        """
+        Queue a job return to be sent to the master along with the other
+        returns coming in within ``return_batch_window`` milliseconds
+        """
+        self._return_batch.append(load)
+        self._return_batch_size += len(salt.payload.dumps(load))
+        if self._return_batch_size >= self.opts["return_batch_size"]:
+            self.io_loop.spawn_callback(self._flush_returns)
+        elif self._return_batch_timer is None:
+            self._return_batch_timer = self.io_loop.call_later(
+                self.opts["return_batch_window"] / 1000.0, self._flush_returns
+            )
+
+    @tornado.gen.coroutine
+    def _flush_returns(self):
+        """
+        Send the queued job returns to the master as a single request
+        """
+        if self._return_batch_timer is not None:
+            self.io_loop.remove_timeout(self._return_batch_timer)
+            self._return_batch_timer = None
+        loads, self._return_batch = self._return_batch, []
+        self._return_batch_size = 0
+        if not loads:
+            return
+        if len(loads) == 1:
+            load = loads[0]
+        else:
+            load = {"cmd": "_return", "id": self.opts["id"], "load": loads}
+        log.debug("Sending %d job returns to the master", len(loads))
+        try:
+            yield self.req_channel.send(
+                load,
+                timeout=self._return_retry_timer(),
+                tries=self.opts["return_retry_tries"],
+            )
+        except salt.exceptions.SaltReqTimeoutError:
+            log.error(
+                "Timeout encountered while sending the returns of jobs %s",
+                ", ".join(str(load.get("jid")) for load in loads),
+            )
+
     def _state_run(self):
         """
         Execute a state run based on information set in the minion config file
@@ -2479,6 +2638,7 @@ class Minion(MinionBase):
 
         self.schedule.functions = self.functions
         self.schedule.returners = self.returners
+        self._stop_job_pool()
 
         self.beacons_refresh()
 
@@ -2564,6 +2724,7 @@ class Minion(MinionBase):
                 )
                 self.opts["pillar"] = new_pillar
                 self.functions.pack["__pillar__"] = self.opts["pillar"]
+                self._stop_job_pool()
             finally:
                 async_pillar.destroy()
         self.matchers_refresh()
@@ -2745,7 +2906,14 @@ class Minion(MinionBase):
             )
         elif tag.startswith("__master_req_channel_payload"):
             job_master = tag.rsplit("/", 1)[1]
-            if job_master == self.opts["master"]:
+            if (
+                job_master == self.opts["master"]
+                and _minion is self
+                and data.get("cmd") == "_return"
+                and self.opts.get("return_batch_window")
+            ):
+                self._batch_return(data)
+            elif job_master == self.opts["master"]:
                 try:
                     yield _minion.req_channel.send(
                         data,
@@ -3251,15 +3419,39 @@ class Minion(MinionBase):
         self._running = False
         if hasattr(self, "schedule"):
             del self.schedule
+        if getattr(self, "job_pool", None) is not None:
+            self._stop_job_pool()
         if hasattr(self, "pub_channel") and self.pub_channel is not None:
             self.pub_channel.on_recv(None)
             self.pub_channel.close()
         if hasattr(self, "req_channel") and self.req_channel is not None:
-            self.req_channel.close()
+            self._close_req_channel()
         if hasattr(self, "periodic_callbacks"):
             for cb in self.periodic_callbacks.values():
                 cb.stop()
 
+    def _close_req_channel(self):
+        """
+        Close the request channel, sending the job returns still queued for
+        the next batch first
+        """
+        req_channel = self.req_channel
+        if getattr(self, "_return_batch_timer", None) is not None:
+            self.io_loop.remove_timeout(self._return_batch_timer)
+            self._return_batch_timer = None
+        if not getattr(self, "_return_batch", None):
+            req_channel.close()
+            return
+        if self.io_loop.asyncio_loop.is_running():
+            future = self._flush_returns()
+            future.add_done_callback(lambda _: req_channel.close())
+            return
+        try:
+            self.io_loop.run_sync(self._flush_returns)
+        except Exception as exc:  # pylint: disable=broad-except
+            log.error("Unable to send the queued job returns: %s", exc)
+        req_channel.close()
+
     # pylint: disable=W1701
     def __del__(self):
         self.destroy()
@@ -881,6 +881,38 @@ def hash_file(path, saltenv=None):
 hash_file_ssh = salt.utils.functools.alias_function(hash_file, "hash_file_ssh")
 
 
+def hash_files(paths, saltenv=None):
+    """
+    .. versionadded:: 3008.0
+
+    Return the hashes of several files as a dictionary mapping each path to
+    its hash. The hashes of the files on the salt master file server, whose
+    paths start with salt://, are fetched in a single request, and are re-used
+    by the following calls to :py:func:`cp.hash_file <salt.modules.cp.hash_file>`
+    and :py:func:`cp.cache_file <salt.modules.cp.cache_file>` made during the
+    same state run.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt '*' cp.hash_files salt://path/to/file1,salt://path/to/file2
+    """
+    if not saltenv:
+        saltenv = __opts__["saltenv"] or "base"
+
+    if isinstance(paths, str):
+        paths = paths.split(",")
+
+    ret = {}
+    with _client() as client:
+        client.prefetch_hashes(paths, saltenv)
+        for path in paths:
+            fn_, senv = salt.utils.url.split_env(path)
+            ret[path] = client.hash_file(fn_, senv or saltenv)
+    return ret
+
+
 def stat_file(path, saltenv=None, octal=True):
     """
     .. versionchanged:: 3005
@@ -2,7 +2,9 @@
 The function cache system allows for data to be stored on the master so it can be easily read by other minions
 """
 
+import hashlib
 import logging
+import os
 import time
 import traceback
 
@@ -11,13 +13,15 @@ import salt.crypt
 import salt.payload
 import salt.transport
 import salt.utils.args
+import salt.utils.atomicfile
 import salt.utils.dictupdate
 import salt.utils.event
+import salt.utils.files
 import salt.utils.functools
 import salt.utils.mine
 import salt.utils.minions
 import salt.utils.network
-from salt.exceptions import SaltClientError
+from salt.exceptions import SaltClientError, SaltDeserializationError
 
 MINE_INTERNAL_KEYWORDS = frozenset(
     [
@@ -79,6 +83,85 @@ def _mine_get(load, opts):
         return channel.send(load)
 
 
+def _mine_hashes_path():
+    return os.path.join(__opts__["cachedir"], "mine_hashes.p")
+
+
+def _mine_load_hashes():
+    """
+    Return the hashes of the mine data last sent to the master along with the
+    time all of the functions were last sent.
+    """
+    try:
+        with salt.utils.files.fopen(_mine_hashes_path(), "rb") as fp_:
+            state = salt.payload.load(fp_)
+    except (OSError, SaltDeserializationError):
+        return {"time": 0, "hashes": {}}
+    if not isinstance(state, dict) or not isinstance(state.get("hashes"), dict):
+        return {"time": 0, "hashes": {}}
+    return state
+
+
+def _mine_save_hashes(state):
+    try:
+        with salt.utils.atomicfile.atomic_open(_mine_hashes_path(), "wb") as fp_:
+            salt.payload.dump(state, fp_)
+    except OSError as exc:
+        log.debug("Unable to write the mine hashes: %s", exc)
+
+
+def _mine_forget_hashes(functions=None):
+    """
+    Forget the hashes of the given functions, or of all of them, so that the
+    next ``mine.update`` sends them to the master again.
+    """
+    if not __opts__.get("mine_delta", False):
+        return
+    if functions is None:
+        try:
+            os.remove(_mine_hashes_path())
+        except OSError:
+            pass
+        return
+    state = _mine_load_hashes()
+    forgotten = [state["hashes"].pop(function, None) for function in functions]
+    if any(forgotten):
+        _mine_save_hashes(state)
+
+
+def _mine_hash(function_data):
+    return hashlib.sha256(salt.payload.dumps(function_data)).hexdigest()
+
+
+def _mine_update_delta(mine_data, clear=False):
+    """
+    Send to the master only the functions whose data changed since they were
+    last sent. All of them are sent again every ``mine_delta_refresh``
+    minutes, so that the master's cache does not stay behind forever.
+    """
+    now = time.time()
+    state = _mine_load_hashes()
+    hashes = {function: _mine_hash(data) for function, data in mine_data.items()}
+    if clear or now - state["time"] >= __opts__.get("mine_delta_refresh", 60) * 60:
+        delta = mine_data
+        state = {"time": now, "hashes": hashes}
+    else:
+        delta = {
+            function: data
+            for function, data in mine_data.items()
+            if state["hashes"].get(function) != hashes[function]
+        }
+        state["hashes"].update(hashes)
+    if not delta and not clear:
+        log.debug("The mine data did not change, not sending it to the master")
+        return True
+    log.debug("Sending the changed mine functions %s to the master", list(delta))
+    ret = _mine_store(delta, clear)
+    if ret:
+        _mine_save_hashes(state)
+    return ret
+
+
 def _mine_store(mine_data, clear=False):
     """
     Helper function to store the provided mine data.
@@ -151,6 +234,11 @@ def update(clear=False, mine_functions=None):
         every 12 hours, while  `network.ip_addrs` would continue to be updated
         as specified in `mine_interval`.
 
+    .. versionchanged:: 3008.0
+
+        With :conf_minion:`mine_delta` enabled only the functions whose data
+        changed since they were last sent are sent to the master.
+
     The function cache will be populated with information from executing these
     functions
 
@@ -202,6 +290,8 @@ def update(clear=False, mine_functions=None):
             )
         else:
             mine_data[function_alias] = res
+    if __opts__["file_client"] != "local" and __opts__.get("mine_delta", False):
+        return _mine_update_delta(mine_data, clear)
     return _mine_store(mine_data, clear)
 
 
@@ -265,6 +355,7 @@ def send(name, *args, **kwargs):
         )
     else:
         mine_data[name] = res
+    _mine_forget_hashes([name])
     return _mine_store(mine_data)
 
 
@@ -389,6 +480,7 @@ def delete(fun):
         "id": __opts__["id"],
         "fun": fun,
     }
+    _mine_forget_hashes([fun])
     return _mine_send(load, __opts__)
 
 
@@ -411,6 +503,7 @@ def flush():
         "cmd": "_mine_flush",
         "id": __opts__["id"],
     }
+    _mine_forget_hashes()
     return _mine_send(load, __opts__)
 
 
@@ -69,6 +69,7 @@ __proxyenabled__ = ["*"]
 log = logging.getLogger(__name__)
 
 TOP_ENVS_CKEY = "saltutil._top_file_envs"
+SYNC_MANIFESTS_CKEY = "saltutil._sync_manifests"
 
 
 def _get_top_file_envs():
@@ -105,6 +106,7 @@ def _sync(form, saltenv=None, extmod_whitelist=None, extmod_blacklist=None):
         saltenv=saltenv,
         extmod_whitelist=extmod_whitelist,
         extmod_blacklist=extmod_blacklist,
+        manifests=__context__.get(SYNC_MANIFESTS_CKEY),
     )
     # Dest mod_dir is touched? trigger reload if requested
     if touched:
@@ -1117,6 +1119,11 @@ def sync_all(
     clean_pillar_cache=False,
 ):
     """
+    .. versionchanged:: 3008.0
+
+        The hashes of all the files to sync are fetched with a single request
+        to the master, and only the files which changed are downloaded.
+
     .. versionchanged:: 3007.0
 
         On masterless minions, master top modules are now synced as well.
@@ -1175,6 +1182,22 @@ def sync_all(
         salt '*' saltutil.sync_all extmod_whitelist={'modules': ['custom_module']}
     """
     log.debug("Syncing all")
+    # Share a single manifest of the files to sync between all the syncs below
+    __context__[SYNC_MANIFESTS_CKEY] = {}
+    try:
+        ret = _sync_all(saltenv, refresh, extmod_whitelist, extmod_blacklist)
+    finally:
+        __context__.pop(SYNC_MANIFESTS_CKEY, None)
+    if refresh:
+        # we don't need to call refresh_modules here because it's done by refresh_pillar
+        refresh_pillar(clean_cache=clean_pillar_cache)
+    return ret
+
+
+def _sync_all(saltenv, refresh, extmod_whitelist, extmod_blacklist):
+    """
+    Sync all of the dynamic modules, see sync_all()
+    """
     ret = {}
     if __opts__["file_client"] == "local":
         # Sync tops first since this might influence the other syncs
@@ -1213,9 +1236,6 @@ def sync_all(
         ret["wrapper"] = sync_wrapper(
             saltenv, False, extmod_whitelist, extmod_blacklist
         )
-    if refresh:
-        # we don't need to call refresh_modules here because it's done by refresh_pillar
-        refresh_pillar(clean_cache=clean_pillar_cache)
     return ret
 
 
@@ -1531,6 +1551,10 @@ def signal_job(jid, sig):
     """
     Sends a signal to the named salt job's process
 
+    A job run by a worker of the minion's job pool (see ``job_pool_size``) is
+    cancelled by signalling the worker, which is then replaced by a new one.
+    The signal is only sent while the worker is still running that job.
+
     CLI Example:
 
     .. code-block:: bash
@@ -1545,6 +1569,11 @@ def signal_job(jid, sig):
         )
     for data in running():
         if data["jid"] == jid:
+            path = os.path.join(__opts__["cachedir"], "proc", str(jid))
+            if data.get("job_pool") and not os.path.isfile(path):
+                # The job pool worker finished the job in the meantime and
+                # may already be running another one
+                return "Job {} was not running".format(jid)
             try:
                 if HAS_PSUTIL:
                     for proc in psutil.Process(pid=data["pid"]).children(
@@ -1559,7 +1588,6 @@ def signal_job(jid, sig):
                     int(sig), jid, data["pid"]
                 )
             except OSError:
-                path = os.path.join(__opts__["cachedir"], "proc", str(jid))
                 if os.path.isfile(path):
                     os.remove(path)
                 return "Job {} was not running and job data has been cleaned up".format(
@@ -3,11 +3,11 @@ Render the pillar data
 """
 
 import collections
+import concurrent.futures
 import copy
 import fnmatch
 import logging
 import os
-import sys
 import time
 import traceback
 
@@ -22,6 +22,7 @@ import salt.utils.cache
 import salt.utils.crypt
 import salt.utils.data
 import salt.utils.dictupdate
+import salt.utils.rendercache
 import salt.utils.url
 from salt.exceptions import SaltClientError
 from salt.template import compile_template
@@ -413,6 +414,10 @@ class PillarCache:
     }
     """
 
+    # The in-memory tier shared by all PillarCache objects of this process, used
+    # by the ``memory`` and ``tiered`` backends
+    _memory = None
+
     # TODO ABC?
     def __init__(
         self,
@@ -447,11 +452,33 @@ class PillarCache:
             self.saltenv = saltenv
 
         # Determine caching backend
-        self.cache = salt.utils.cache.CacheFactory.factory(
-            self.opts["pillar_cache_backend"],
-            self.opts["pillar_cache_ttl"],
-            minion_cache_path=self._minion_cache_path(minion_id),
-        )
+        if self.opts["pillar_cache_backend"] == "memory":
+            self.cache = self._memory_cache(self.opts)
+        elif self.opts["pillar_cache_backend"] == "tiered":
+            self.cache = salt.utils.cache.CacheFactory.factory(
+                "tiered",
+                self.opts["pillar_cache_ttl"],
+                minion_cache_path=self._minion_cache_path(minion_id),
+                memory=self._memory_cache(self.opts),
+            )
+        else:
+            self.cache = salt.utils.cache.CacheFactory.factory(
+                self.opts["pillar_cache_backend"],
+                self.opts["pillar_cache_ttl"],
+                minion_cache_path=self._minion_cache_path(minion_id),
+            )
+
+    @classmethod
+    def _memory_cache(cls, opts):
+        """
+        Return the size bounded in-memory cache shared by this process
+        """
+        if cls._memory is None:
+            cls._memory = salt.utils.cache.LRUCacheDict(
+                opts["pillar_cache_ttl"],
+                opts.get("pillar_cache_memory_max_size", 0),
+            )
+        return cls._memory
 
     def _minion_cache_path(self, minion_id):
         """
@@ -484,10 +511,42 @@ class PillarCache:
         """
         Clear the cache
         """
-        self.cache.clear()
+        if self.opts["pillar_cache_backend"] == "memory":
+            # The memory cache is shared by all minions
+            if self.minion_id in self.cache:
+                del self.cache[self.minion_id]
+        else:
+            self.cache.clear()
 
         return True
 
+    def cached_pillarenvs(self):
+        """
+        Return the pillarenvs for which pillar of the minion is cached
+        """
+        if self.minion_id not in self.cache:
+            return []
+        return list(self.cache[self.minion_id])
+
+    def refresh_pillar(self):
+        """
+        Compile the pillar and store it in the cache, regardless of whether a
+        cached copy exists. Used to precompile pillar ahead of requests.
+        """
+        fresh_pillar = self.fetch_pillar()
+        if self.minion_id in self.cache:
+            minion_cache = self.cache[self.minion_id]
+        else:
+            minion_cache = {}
+        minion_cache[self.pillarenv] = fresh_pillar
+        self.cache[self.minion_id] = minion_cache
+        log.debug(
+            "Pillar cache refreshed for pillarenv %s for minion %s",
+            self.pillarenv,
+            self.minion_id,
+        )
+        return fresh_pillar
+
     def compile_pillar(self, *args, **kwargs):  # Will likely just be pillar_dirs
         if self.clean_cache:
             self.clear_pillar()
@@ -512,7 +571,9 @@ class PillarCache:
                     self.minion_id,
                     self.pillarenv,
                 )
-                return self.cache[self.minion_id][self.pillarenv]
+                if self._memory is not None:
+                    log.debug("Pillar memory cache stats: %s", self._memory.stats())
+                return self._unshared(self.cache[self.minion_id][self.pillarenv])
             else:
                 # We found the minion but not the env. Store it.
                 fresh_pillar = self.fetch_pillar()
@@ -526,14 +587,23 @@ class PillarCache:
                     self.pillarenv,
                     self.minion_id,
                 )
-                return fresh_pillar
+                return self._unshared(fresh_pillar)
         else:
             # We haven't seen this minion yet in the cache. Store it.
             fresh_pillar = self.fetch_pillar()
             self.cache[self.minion_id] = {self.pillarenv: fresh_pillar}
             log.debug("Pillar cache miss for minion %s", self.minion_id)
             log.debug("Current pillar cache: %s", cache_dict)  # FIXME hack!
-            return fresh_pillar
+            return self._unshared(fresh_pillar)
+
+    def _unshared(self, pillar):
+        """
+        Return a copy of a pillar held by the shared memory cache, so callers
+        cannot modify what is served to later requests
+        """
+        if self.opts["pillar_cache_backend"] == "memory":
+            return copy.deepcopy(pillar)
+        return pillar
 
 
 class Pillar:
@@ -593,6 +663,7 @@ class Pillar:
         self.rend = salt.loader.render(
             self.opts, self.functions, self.client, file_client=self.client
         )
+        self.render_cache = salt.utils.rendercache.get_render_cache(self.opts)
         ext_pillar_opts = copy.deepcopy(self.opts)
         # Keep the incoming opts ID intact, ie, the master id
         if "id" in opts:
@@ -602,6 +673,8 @@ class Pillar:
             self.merge_strategy = opts["pillar_source_merging_strategy"]
 
         self.ext_pillars = salt.loader.pillars(ext_pillar_opts, self.functions)
+        # (ext_pillar, seconds) tuples recorded by the last ext_pillar() call
+        self.ext_pillar_timings = []
         self.ignored_pillars = {}
         self.pillar_override = pillar_override or {}
         if not isinstance(self.pillar_override, dict):
@@ -748,6 +821,7 @@ class Pillar:
                             self.opts["renderer_blacklist"],
                             self.opts["renderer_whitelist"],
                             saltenv=saltenv,
+                            render_cache=self.render_cache,
                             _pillar_rend=True,
                         )
                     )
@@ -782,6 +856,7 @@ class Pillar:
                                 self.opts["renderer_blacklist"],
                                 self.opts["renderer_whitelist"],
                                 saltenv=saltenv,
+                                render_cache=self.render_cache,
                                 _pillar_rend=True,
                             )
                         )
@@ -953,6 +1028,7 @@ class Pillar:
                 self.opts["renderer_whitelist"],
                 saltenv,
                 sls,
+                render_cache=self.render_cache,
                 _pillar_rend=True,
                 **defaults,
             )
@@ -1159,12 +1235,128 @@ class Pillar:
                 ext = self.ext_pillars[key](self.minion_id, pillar, val)
         return ext
 
+    def _ext_pillar_sources(self, errors):
+        """
+        Return the configured external pillars as a list of ``(key, val)``
+        tuples, in the configured order, or ``None`` if the ``ext_pillar``
+        option is malformed
+        """
+        sources = []
+        for run in self.opts["ext_pillar"]:
+            if not isinstance(run, dict):
+                errors.append('The "ext_pillar" option is malformed')
+                log.critical(errors[-1])
+                return None
+            if next(iter(run.keys())) in self.opts.get("exclude_ext_pillar", []):
+                continue
+            for key, val in run.items():
+                if key not in self.ext_pillars:
+                    log.critical(
+                        "ext_pillar interface named %s is unavailable. Make sure it is placed in the correct "
+                        "directory/location. Check https://docs.saltstack.com/en/latest/ref/configuration/master.html#extension-modules for details.",
+                        key,
+                    )
+                    continue
+                sources.append((key, val))
+        return sources
+
+    def _record_ext_pillar_time(self, key, duration):
+        """
+        Report the time taken by a single external pillar
+        """
+        self.ext_pillar_timings.append((key, duration))
+        log.profile(
+            "Time (in seconds) to compile ext_pillar '%s' for minion %s: %s",
+            key,
+            self.minion_id,
+            duration,
+        )
+
+    def _ext_pillar_error(self, key, exc, errors):
+        errors.append(f"Failed to load ext_pillar {key}: {exc}")
+        log.error(
+            "Exception caught loading ext_pillar '%s':\n%s",
+            key,
+            "".join(traceback.format_tb(exc.__traceback__)),
+        )
+
+    def _run_external_pillar(self, pillar, val, key, errors):
+        """
+        Call a single external pillar, recording its errors and timing
+        """
+        start = time.time()
+        try:
+            return self._external_pillar_data(pillar, val, key)
+        except Exception as exc:  # pylint: disable=broad-except
+            self._ext_pillar_error(key, exc, errors)
+        finally:
+            self._record_ext_pillar_time(key, time.time() - start)
+
+    def _ext_pillar_timeout(self, key):
+        """
+        Return the timeout, in seconds, of an external pillar run in parallel
+        """
+        timeout = self.opts.get("ext_pillar_parallel_timeout", 60)
+        if isinstance(timeout, dict):
+            timeout = timeout.get(key, 60)
+        return timeout
+
+    def _external_pillar_data_parallel(self, pillar, sources, errors):
+        """
+        Call the external pillars concurrently in a thread pool.
+
+        Every external pillar is passed its own copy of ``pillar`` as it was
+        before any of them ran. The results are returned, and errors recorded,
+        in the configured order so that merging them stays deterministic. An
+        external pillar which does not return within its timeout contributes
+        no data.
+        """
+        exts = [None] * len(sources)
+
+        def _call(key, val, data):
+            start = time.time()
+            ret = self._external_pillar_data(data, val, key)
+            return ret, time.time() - start
+
+        pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(len(sources), 1),
+            thread_name_prefix="ext_pillar",
+        )
+        try:
+            start = time.time()
+            futures = [
+                pool.submit(_call, key, val, copy.deepcopy(pillar))
+                for key, val in sources
+            ]
+            for idx, (key, _) in enumerate(sources):
+                timeout = self._ext_pillar_timeout(key)
+                remaining = max(start + timeout - time.time(), 0)
+                try:
+                    exts[idx], duration = futures[idx].result(timeout=remaining)
+                except concurrent.futures.TimeoutError:
+                    errors.append(
+                        f"Failed to load ext_pillar {key}: timed out after"
+                        f" {timeout} seconds"
+                    )
+                    log.error(errors[-1])
+                    self._record_ext_pillar_time(key, time.time() - start)
+                except Exception as exc:  # pylint: disable=broad-except
+                    self._ext_pillar_error(key, exc, errors)
+                    self._record_ext_pillar_time(key, time.time() - start)
+                else:
+                    self._record_ext_pillar_time(key, duration)
+        finally:
+            # Do not wait on external pillars which timed out
+            pool.shutdown(wait=False, cancel_futures=True)
+        return exts
+
     def ext_pillar(self, pillar, errors=None):
         """
         Render the external pillar data
         """
         if errors is None:
             errors = []
+        self.ext_pillar_timings = []
         try:
             # Make sure that on-demand git_pillar is fetched before we try to
             # compile the pillar data. git_pillar will fetch a remote when
@@ -1191,7 +1383,6 @@ class Pillar:
             errors.append('The "ext_pillar" option is malformed')
             log.critical(errors[-1])
             return pillar, errors
-        ext = None
         # Bring in CLI pillar data
         if self.pillar_override:
             pillar = merge(
@@ -1202,35 +1393,19 @@ class Pillar:
                 self.opts.get("pillar_merge_lists", False),
             )
 
-        for run in self.opts["ext_pillar"]:
-            if not isinstance(run, dict):
-                errors.append('The "ext_pillar" option is malformed')
-                log.critical(errors[-1])
-                return {}, errors
-            if next(iter(run.keys())) in self.opts.get("exclude_ext_pillar", []):
-                continue
-            for key, val in run.items():
-                if key not in self.ext_pillars:
-                    log.critical(
-                        "ext_pillar interface named %s is unavailable. Make sure it is placed in the correct "
-                        "directory/location. Check https://docs.saltstack.com/en/latest/ref/configuration/master.html#extension-modules for details.",
-                        key,
-                    )
-                    continue
-                try:
-                    ext = self._external_pillar_data(pillar, val, key)
-                except Exception as exc:  # pylint: disable=broad-except
-                    errors.append(
-                        "Failed to load ext_pillar {}: {}".format(
-                            key,
-                            exc,
-                        )
-                    )
-                    log.error(
-                        "Exception caught loading ext_pillar '%s':\n%s",
-                        key,
-                        "".join(traceback.format_tb(sys.exc_info()[2])),
-                    )
+        sources = self._ext_pillar_sources(errors)
+        if sources is None:
+            return {}, errors
+
+        if self.opts.get("ext_pillar_parallel", False):
+            exts = self._external_pillar_data_parallel(pillar, sources, errors)
+        else:
+            exts = None
+        for idx, (key, val) in enumerate(sources):
+            if exts is None:
+                ext = self._run_external_pillar(pillar, val, key, errors)
+            else:
+                ext = exts[idx]
             if ext:
                 pillar = merge(
                     pillar,
@@ -1239,7 +1414,15 @@ class Pillar:
                     self.opts.get("renderer", "yaml"),
                     self.opts.get("pillar_merge_lists", False),
                 )
-                ext = None
+        if self.ext_pillar_timings:
+            log.debug(
+                "ext_pillar timings for minion %s: %s",
+                self.minion_id,
+                ", ".join(
+                    f"{key}={duration:.3f}s"
+                    for key, duration in self.ext_pillar_timings
+                ),
+            )
         return pillar, errors
 
     def compile_pillar(self, ext=True):
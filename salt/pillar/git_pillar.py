@@ -393,18 +393,32 @@ import logging
 
 import salt.utils.dictupdate
 import salt.utils.gitfs
+import salt.utils.rendercache
 import salt.utils.stringutils
 import salt.utils.versions
 from salt.exceptions import FileserverConfigError
 from salt.pillar import Pillar
 
-PER_REMOTE_OVERRIDES = ("base", "env", "root", "ssl_verify", "refspecs", "fallback")
+PER_REMOTE_OVERRIDES = (
+    "base",
+    "env",
+    "root",
+    "ssl_verify",
+    "refspecs",
+    "fallback",
+    "fetch_depth",
+    "fetch_timeout",
+)
 PER_REMOTE_ONLY = ("name", "mountpoint", "all_saltenvs")
 GLOBAL_ONLY = ("branch",)
 
 # Set up logging
 log = logging.getLogger(__name__)
 
+# The render caches of the pillar environments, keyed by the environment and
+# its pillar_roots, along with the SHAs of the trees they were filled from
+_RENDER_CACHES = {}
+
 # Define the module's virtual name
 __virtualname__ = "git"
 
@@ -501,6 +515,9 @@ def ext_pillar(minion_id, pillar, *repos):  # pylint: disable=unused-argument
         opts["pillar_roots"] = {env: pillar_roots}
 
         local_pillar = Pillar(opts, __grains__, minion_id, env)
+        render_cache = _get_render_cache(env, pillar_roots, git_pillar)
+        if render_cache is not None:
+            local_pillar.render_cache = render_cache
         ret = salt.utils.dictupdate.merge(
             ret,
             local_pillar.compile_pillar(ext=False),
@@ -510,6 +527,43 @@ def ext_pillar(minion_id, pillar, *repos):  # pylint: disable=unused-argument
     return ret
 
 
+def _get_render_cache(env, pillar_roots, git_pillar):
+    """
+    Return the render cache for the pillar SLS of an environment, or ``None``
+    if ``git_pillar_compile_cache`` is disabled. The cache is replaced by an
+    empty one as soon as the SHA of any tree checked out for the environment
+    changes, that is once a fetch brought in new commits.
+    """
+    if not __opts__.get("git_pillar_compile_cache", False):
+        return None
+    shas = []
+    for pillar_dir in pillar_roots:
+        for repo in git_pillar.pillar_repos.get(pillar_dir, []):
+            try:
+                sha = repo.get_checkout_sha()
+            except Exception as exc:  # pylint: disable=broad-except
+                log.debug(
+                    "Failed to resolve SHA of git_pillar remote %s: %s", repo.id, exc
+                )
+                sha = None
+            if sha is None:
+                return None
+            shas.append(sha)
+    key = (env, tuple(pillar_roots))
+    cached = _RENDER_CACHES.get(key)
+    if cached is None or cached[0] != shas:
+        log.debug(
+            "git_pillar render cache for pillar env '%s' is keyed to %s",
+            env,
+            ", ".join(shas),
+        )
+        cached = _RENDER_CACHES[key] = (
+            shas,
+            salt.utils.rendercache.RenderCache(__opts__.get("render_cache_size", 1000)),
+        )
+    return cached[1]
+
+
 def _extract_key_val(kv, delimiter="="):
     """Extract key and value from key=val string.
 
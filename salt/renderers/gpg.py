@@ -335,6 +335,7 @@ In the Chlorine release, the default behavior will be reversed and an error
 message will be added to ``_errors`` by default.
 """
 
+import concurrent.futures
 import logging
 import os
 import re
@@ -343,6 +344,7 @@ from subprocess import PIPE, Popen
 import salt.syspaths
 import salt.utils.cache
 import salt.utils.path
+import salt.utils.secretcache
 import salt.utils.stringio
 import salt.utils.stringutils
 import salt.utils.versions
@@ -402,23 +404,47 @@ def _get_cache():
     return GPG_CACHE
 
 
-def _decrypt_ciphertext(cipher):
+def _normalize_cipher(cipher):
     """
-    Given a block of ciphertext as a string, and a gpg object, try to decrypt
-    the cipher and return the decrypted string. If the cipher cannot be
-    decrypted, log the error, and return the ciphertext back out.
+    Return a block of ciphertext as bytes with escaped newlines translated
     """
     try:
         cipher = salt.utils.stringutils.to_unicode(cipher).replace(r"\n", "\n")
     except UnicodeDecodeError:
         # ciphertext is binary
         pass
-    cipher = salt.utils.stringutils.to_bytes(cipher)
+    return salt.utils.stringutils.to_bytes(cipher)
+
+
+def _get_cached(cipher):
+    """
+    Return the cached plaintext of a block of ciphertext, or ``None``
+    """
+    secret_cache = salt.utils.secretcache.get_secret_cache(__opts__)
+    if secret_cache is not None:
+        decrypted_data = secret_cache.get(cipher)
+        if decrypted_data is not None:
+            return decrypted_data
     if __opts__.get("gpg_cache"):
         cache = _get_cache()
         if cipher in cache:
             return cache[cipher]
-    cmd = [
+    return None
+
+
+def _set_cached(cipher, decrypted_data):
+    secret_cache = salt.utils.secretcache.get_secret_cache(__opts__)
+    if secret_cache is not None:
+        secret_cache.set(cipher, decrypted_data)
+    if __opts__.get("gpg_cache"):
+        _get_cache()[cipher] = decrypted_data
+
+
+def _get_gpg_cmd():
+    """
+    return the command line used to decrypt a block of ciphertext
+    """
+    return [
         _get_gpg_exec(),
         "--homedir",
         _get_key_dir(),
@@ -427,8 +453,21 @@ def _decrypt_ciphertext(cipher):
         "--no-tty",
         "-d",
     ]
+
+
+def _run_gpg(cmd, cipher):
+    """
+    Run gpg to decrypt a block of ciphertext and return its output and errors
+    """
     proc = Popen(cmd, stdin=PIPE, stdout=PIPE, stderr=PIPE, shell=False)
-    decrypted_data, decrypt_error = proc.communicate(input=cipher)
+    return proc.communicate(input=cipher)
+
+
+def _gpg_result(cipher, decrypted_data, decrypt_error):
+    """
+    Return the plaintext of a block of ciphertext decrypted by gpg, or the
+    ciphertext if it could not be decrypted
+    """
     if not decrypted_data:
         log.warning("Could not decrypt cipher %r, received: %r", cipher, decrypt_error)
         if __opts__["gpg_decrypt_must_succeed"]:
@@ -440,19 +479,85 @@ def _decrypt_ciphertext(cipher):
             )
         return cipher
     else:
-        if __opts__.get("gpg_cache"):
-            cache[cipher] = decrypted_data
+        _set_cached(cipher, decrypted_data)
         return decrypted_data
 
 
-def _decrypt_ciphertexts(cipher, translate_newlines=False, encoding=None):
+def _decrypt_ciphertext(cipher, decrypted=None):
+    """
+    Given a block of ciphertext as a string, and a gpg object, try to decrypt
+    the cipher and return the decrypted string. If the cipher cannot be
+    decrypted, log the error, and return the ciphertext back out.
+
+    ``decrypted`` maps ciphertexts already decrypted by
+    :py:func:`_decrypt_batch` to their plaintext.
+    """
+    cipher = _normalize_cipher(cipher)
+    if decrypted and cipher in decrypted:
+        return decrypted[cipher]
+    decrypted_data = _get_cached(cipher)
+    if decrypted_data is not None:
+        return decrypted_data
+    return _gpg_result(cipher, *_run_gpg(_get_gpg_cmd(), cipher))
+
+
+def _find_ciphertexts(obj, translate_newlines=False):
+    """
+    Yield every block of ciphertext found in an object
+    """
+    if salt.utils.stringio.is_readable(obj):
+        yield from _find_ciphertexts(obj.getvalue(), translate_newlines)
+    elif isinstance(obj, (str, bytes)):
+        to_bytes = salt.utils.stringutils.to_bytes
+        obj = to_bytes(obj)
+        if translate_newlines:
+            obj = obj.replace(to_bytes(r"\n"), to_bytes("\n"))
+        for match in GPG_CIPHERTEXT.finditer(obj):
+            yield _normalize_cipher(match.group())
+    elif isinstance(obj, dict):
+        for value in obj.values():
+            yield from _find_ciphertexts(value, translate_newlines)
+    elif isinstance(obj, list):
+        for value in obj:
+            yield from _find_ciphertexts(value, translate_newlines)
+
+
+def _decrypt_batch(ciphers, workers):
+    """
+    Decrypt the distinct blocks of ciphertext which are not cached yet, up to
+    ``workers`` at a time, and return a dict mapping each to its plaintext.
+    """
+    decrypted = {}
+    pending = []
+    for cipher in ciphers:
+        if cipher in decrypted:
+            continue
+        decrypted[cipher] = _get_cached(cipher)
+        if decrypted[cipher] is None:
+            pending.append(cipher)
+    if not pending:
+        return decrypted
+    log.debug("Decrypting %d GPG ciphertexts with %d workers", len(pending), workers)
+    cmd = _get_gpg_cmd()
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=min(workers, len(pending)), thread_name_prefix="gpg"
+    ) as pool:
+        results = pool.map(lambda cipher: _run_gpg(cmd, cipher), pending)
+        for cipher, (decrypted_data, decrypt_error) in zip(pending, results):
+            decrypted[cipher] = _gpg_result(cipher, decrypted_data, decrypt_error)
+    return decrypted
+
+
+def _decrypt_ciphertexts(
+    cipher, translate_newlines=False, encoding=None, decrypted=None
+):
     to_bytes = salt.utils.stringutils.to_bytes
     cipher = to_bytes(cipher)
     if translate_newlines:
         cipher = cipher.replace(to_bytes(r"\n"), to_bytes("\n"))
 
     def replace(match):
-        result = to_bytes(_decrypt_ciphertext(match.group()))
+        result = to_bytes(_decrypt_ciphertext(match.group(), decrypted=decrypted))
         return result
 
     ret, num = GPG_CIPHERTEXT.subn(replace, to_bytes(cipher))
@@ -471,25 +576,32 @@ def _decrypt_ciphertexts(cipher, translate_newlines=False, encoding=None):
     return ret
 
 
-def _decrypt_object(obj, translate_newlines=False, encoding=None):
+def _decrypt_object(obj, translate_newlines=False, encoding=None, decrypted=None):
     """
     Recursively try to decrypt any object. If the object is a string
     or bytes and it contains a valid GPG header, decrypt it,
     otherwise keep going until a string is found.
     """
     if salt.utils.stringio.is_readable(obj):
-        return _decrypt_object(obj.getvalue(), translate_newlines)
+        return _decrypt_object(obj.getvalue(), translate_newlines, decrypted=decrypted)
     if isinstance(obj, (str, bytes)):
         return _decrypt_ciphertexts(
-            obj, translate_newlines=translate_newlines, encoding=encoding
+            obj,
+            translate_newlines=translate_newlines,
+            encoding=encoding,
+            decrypted=decrypted,
         )
     elif isinstance(obj, dict):
         for key, value in obj.items():
-            obj[key] = _decrypt_object(value, translate_newlines=translate_newlines)
+            obj[key] = _decrypt_object(
+                value, translate_newlines=translate_newlines, decrypted=decrypted
+            )
         return obj
     elif isinstance(obj, list):
         for key, value in enumerate(obj):
-            obj[key] = _decrypt_object(value, translate_newlines=translate_newlines)
+            obj[key] = _decrypt_object(
+                value, translate_newlines=translate_newlines, decrypted=decrypted
+            )
         return obj
     else:
         return obj
@@ -505,8 +617,15 @@ def render(gpg_data, saltenv="base", sls="", argline="", **kwargs):
     log.debug("Reading GPG keys from: %s", _get_key_dir())
 
     translate_newlines = kwargs.get("translate_newlines", False)
+    decrypted = None
+    workers = __opts__.get("gpg_decrypt_workers", 1)
+    if workers > 1:
+        decrypted = _decrypt_batch(
+            _find_ciphertexts(gpg_data, translate_newlines), workers
+        )
     return _decrypt_object(
         gpg_data,
         translate_newlines=translate_newlines,
         encoding=kwargs.get("encoding", None),
+        decrypted=decrypted,
     )
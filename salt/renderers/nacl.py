@@ -54,12 +54,29 @@ import logging
 import re
 
 import salt.syspaths
+import salt.utils.secretcache
 import salt.utils.stringio
 
 log = logging.getLogger(__name__)
 NACL_REGEX = r"^NACL\[(.*)\]$"
 
 
+def _decrypt(cipher, **kwargs):
+    """
+    Decrypt a ciphertext, using the secret cache shared with the gpg renderer
+    if it is enabled
+    """
+    secret_cache = salt.utils.secretcache.get_secret_cache(__opts__)
+    if secret_cache is not None:
+        decrypted_data = secret_cache.get(cipher)
+        if decrypted_data is not None:
+            return decrypted_data
+    decrypted_data = __salt__["nacl.dec"](cipher, **kwargs)
+    if secret_cache is not None and isinstance(decrypted_data, bytes):
+        secret_cache.set(cipher, decrypted_data)
+    return decrypted_data
+
+
 def _decrypt_object(obj, **kwargs):
     """
     Recursively try to decrypt any object. If the object is a str, and it
@@ -70,7 +87,7 @@ def _decrypt_object(obj, **kwargs):
         return _decrypt_object(obj.getvalue(), **kwargs)
     if isinstance(obj, str):
         if re.search(NACL_REGEX, obj) is not None:
-            return __salt__["nacl.dec"](re.search(NACL_REGEX, obj).group(1), **kwargs)
+            return _decrypt(re.search(NACL_REGEX, obj).group(1), **kwargs)
         else:
             return obj
     elif isinstance(obj, dict):
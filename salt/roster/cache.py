@@ -99,6 +99,7 @@ import re
 
 import salt.cache
 import salt.utils.data
+import salt.utils.mine
 import salt.utils.minions
 from salt._compat import ipaddress
 
@@ -177,7 +178,9 @@ def _load_minion(minion_id, cache):
         6: sorted(ipaddress.IPv6Address(addr) for addr in grains.get("ipv6", [])),
     }
 
-    mine = cache.fetch(f"minions/{minion_id}", "mine")
+    mine = salt.utils.mine.fetch_mine_data(cache, __opts__, [minion_id]).get(
+        minion_id, {}
+    )
 
     return grains, pillar, addrs, mine
 
@@ -83,9 +83,23 @@ def status(
         salt-run manage.status
         salt-run manage.status tgt="webservers" tgt_type="nodegroup"
         salt-run manage.status timeout=5 gather_job_timeout=10
+
+    .. versionchanged:: 3008.0
+
+        When :conf_master:`transport_presence` is enabled and every publish
+        daemon tracks its connections, the minions are not pinged and the
+        status is taken from the connections to the publish daemons.
     """
     ret = {}
 
+    present = salt.utils.minions.read_presence(__opts__)
+    if present is not None:
+        ckminions = salt.utils.minions.CkMinions(__opts__)
+        minions = ckminions.check_minions(tgt, tgt_type)["minions"]
+        ret["up"] = sorted(id_ for id_ in minions if id_ in present)
+        ret["down"] = sorted(id_ for id_ in minions if id_ not in present)
+        return ret
+
     if not timeout:
         timeout = __opts__["timeout"]
     if not gather_job_timeout:
@@ -3104,6 +3104,32 @@ class State:
         running.update(errors)
         return running
 
+    def _prefetch_file_hashes(self, chunks):
+        """
+        Get the hashes of the salt:// sources of all the chunks from the master
+        in one request per environment, instead of one request per file while
+        the states run
+        """
+        if not isinstance(self.file_client, salt.fileclient.RemoteClient) or isinstance(
+            self.file_client, salt.fileclient.FSClient
+        ):
+            return
+        by_env = {}
+        for chunk in chunks:
+            for key in ("source", "sources"):
+                sources = chunk.get(key)
+                if isinstance(sources, str):
+                    sources = [sources]
+                if not isinstance(sources, list):
+                    continue
+                saltenv = chunk.get("saltenv") or chunk.get("__env__") or "base"
+                by_env.setdefault(saltenv, set()).update(
+                    x for x in sources if isinstance(x, str) and x.startswith("salt://")
+                )
+        for saltenv, paths in by_env.items():
+            if paths:
+                self.file_client.prefetch_hashes(sorted(paths), saltenv)
+
     def call_high(
         self, high: HighData, orchestration_jid: Union[str, int, None] = None
     ) -> Union[dict, list]:
@@ -3130,6 +3156,7 @@ class State:
         # If there are extensions in the highstate, process them and update
         # the low data chunks
 
+        self._prefetch_file_hashes(chunks)
         ret = self.call_chunks(chunks, disabled_states=self.disabled_states)
         ret = self.call_listen(chunks, ret)
         ret = self.call_beacons(chunks, ret)
@@ -4896,6 +4896,10 @@ def recurse(
         merge_ret(os.path.join(name, srelpath), _ret)
     for dirname in mng_dirs:
         manage_directory(dirname)
+    if mng_files:
+        # Get the hashes of all the source files from the master at once
+        # instead of once for every file
+        __salt__["cp.hash_files"]([src for _, src in mng_files], senv)
     for dest, src in mng_files:
         manage_file(dest, src, replace)
 
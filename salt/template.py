@@ -10,6 +10,7 @@ import time
 
 import salt.utils.data
 import salt.utils.files
+import salt.utils.rendercache
 import salt.utils.sanitizers
 import salt.utils.stringio
 import salt.utils.versions
@@ -34,12 +35,21 @@ def compile_template(
     sls="",
     input_data="",
     context=None,
+    render_cache=None,
     **kwargs,
 ):
     """
     Take the path to a template and return the high data structure
     derived from the template.
 
+    :param render_cache:
+        A :py:class:`salt.utils.rendercache.RenderCache` instance, as returned
+        by :py:func:`salt.utils.rendercache.get_render_cache`. When given,
+        template renders whose inputs did not change, and data renders of
+        identical text, are served from the cache.
+
+        .. versionadded:: 3008.0
+
     Helpers:
 
     :param mask_value:
@@ -96,18 +106,35 @@ def compile_template(
         render_kwargs.update(kwargs)
         if argline:
             render_kwargs["argline"] = argline
+        renderer_name = render.__module__.split(".")[-1]
+        cached_text = None
+        if (
+            render_cache is not None
+            and renderer_name in salt.utils.rendercache.DATA_RENDERERS
+        ):
+            if salt.utils.stringio.is_readable(input_data):
+                cached_text = input_data.read()  # pylint: disable=no-member
+                input_data.seek(0)  # pylint: disable=no-member
+            elif isinstance(input_data, str):
+                cached_text = input_data
         start = time.time()
-        ret = render(input_data, saltenv, sls, **render_kwargs)
+        ret = None
+        if cached_text is not None:
+            ret = render_cache.fetch_data(renderer_name, argline, cached_text)
+        if ret is None:
+            ret = _render(render, render_cache, input_data, saltenv, sls, render_kwargs)
+            if cached_text is not None and ret is not None:
+                render_cache.store_data(renderer_name, argline, cached_text, ret)
         log.profile(
             "Time (in seconds) to render '%s' using '%s' renderer: %s",
             template,
-            render.__module__.split(".")[-1],
+            renderer_name,
             time.time() - start,
         )
         if ret is None:
             # The file is empty or is being written elsewhere
             time.sleep(0.01)
-            ret = render(input_data, saltenv, sls, **render_kwargs)
+            ret = _render(render, render_cache, input_data, saltenv, sls, render_kwargs)
         input_data = ret
         if log.isEnabledFor(logging.GARBAGE):  # pylint: disable=no-member
             # If ret is not a StringIO (which means it was rendered using
@@ -142,6 +169,17 @@ def compile_template(
     return ret
 
 
+def _render(render, render_cache, input_data, saltenv, sls, render_kwargs):
+    """
+    Call a single render function of the render pipe, making the render cache
+    available to it
+    """
+    if render_cache is None:
+        return render(input_data, saltenv, sls, **render_kwargs)
+    with render_cache.activate():
+        return render(input_data, saltenv, sls, **render_kwargs)
+
+
 def compile_template_str(template, renderers, default, blacklist, whitelist):
     """
     Take template as a string and return the high data structure
@@ -293,6 +293,10 @@ class RequestClient(Transport):
     replies from the RequestServer.
     """
 
+    # Whether replies are matched to their requests, allowing several requests
+    # to be in flight on one connection at once.
+    pipelined = False
+
     def __init__(self, opts, io_loop, **kwargs):
         super().__init__()
 
@@ -350,6 +354,14 @@ class PublishServer:
     service.
     """
 
+    @property
+    def presence_support(self):
+        """
+        Whether the publish daemon calls the presence callbacks when minions
+        connect and disconnect
+        """
+        return False
+
     def publish(self, payload, **kwargs):
         """
         Publish "load" to minions. This send the load to the publisher daemon
@@ -1343,6 +1343,10 @@ class PublishServer(salt.transport.base.DaemonizedPublishServer):
     def topic_support(self):
         return not self.opts.get("order_masters", False)
 
+    @property
+    def presence_support(self):
+        return True
+
     def __setstate__(self, state):
         self.__init__(**state)
 
@@ -1686,6 +1690,7 @@ class RequestClient(salt.transport.base.RequestClient):
     """
 
     ttype = "tcp"
+    pipelined = True
 
     def __init__(self, opts, io_loop, **kwargs):  # pylint: disable=W0231
         super().__init__(opts, io_loop, **kwargs)
@@ -1761,7 +1766,8 @@ class RequestClient(salt.transport.base.RequestClient):
         unpacker = salt.utils.msgpack.Unpacker()
         while not self._closing:
             try:
-                wire_bytes = await self._stream.read_bytes(4096, partial=True)
+                # Replies may carry whole file chunks, read them in large pieces
+                wire_bytes = await self._stream.read_bytes(65536, partial=True)
                 unpacker.feed(wire_bytes)
                 for framed_msg in unpacker:
                     framed_msg = salt.transport.frame.decode_embedded_strs(framed_msg)
@@ -2,12 +2,15 @@
 In-memory caching used by Salt
 """
 
+import collections
+import copy
 import functools
 import logging
 import os
 import re
 import shutil
 import time
+import zlib
 
 import salt.config
 import salt.payload
@@ -35,6 +38,10 @@ class CacheFactory:
             return CacheDict(ttl, *args, **kwargs)
         elif backend == "disk":
             return CacheDisk(ttl, kwargs["minion_cache_path"], *args, **kwargs)
+        elif backend == "tiered":
+            return TieredCacheDisk(
+                ttl, kwargs["minion_cache_path"], memory=kwargs.get("memory")
+            )
         else:
             log.error("CacheFactory received unrecognized cache type")
 
@@ -191,6 +198,190 @@ class CacheDisk(CacheDict):
             salt.utils.msgpack.dump(cache, fp_)
 
 
+class LRUCacheDict(CacheDict):
+    """
+    Subclass of CacheDict which evicts the least recently used items once the
+    serialized size of all items exceeds ``max_size`` bytes.
+
+    The number of hits, misses and evictions is kept in ``hits``, ``misses``
+    and ``evictions``.
+
+    .. versionadded:: 3008.0
+    """
+
+    def __init__(self, ttl, max_size=0, *args, **kwargs):
+        super().__init__(ttl, *args, **kwargs)
+        self._max_size = max_size
+        self._sizes = {}
+        self._order = collections.OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _forget(self, key):
+        self._order.pop(key, None)
+        self.size -= self._sizes.pop(key, 0)
+
+    def _enforce_ttl_key(self, key):
+        super()._enforce_ttl_key(key)
+        if not dict.__contains__(self, key):
+            self._forget(key)
+
+    def __getitem__(self, key):
+        try:
+            val = super().__getitem__(key)
+        except KeyError:
+            self.misses += 1
+            raise
+        self.hits += 1
+        self._order.move_to_end(key)
+        return val
+
+    def __setitem__(self, key, val):
+        self._forget(key)
+        super().__setitem__(key, val)
+        self._order[key] = None
+        if self._max_size:
+            self._sizes[key] = len(salt.payload.dumps(val))
+            self.size += self._sizes[key]
+            self._evict()
+
+    def __delitem__(self, key):
+        self._forget(key)
+        self._key_cache_time.pop(key, None)
+        dict.__delitem__(self, key)
+
+    def _evict(self):
+        """
+        Drop the least recently used items until the cache fits in max_size
+        """
+        while self.size > self._max_size and len(self._order) > 1:
+            key = next(iter(self._order))
+            log.debug("Evicting %s from the cache", key)
+            del self[key]
+            self.evictions += 1
+
+    def clear(self):
+        super().clear()
+        self._key_cache_time.clear()
+        self._order.clear()
+        self._sizes.clear()
+        self.size = 0
+
+    def stats(self):
+        """
+        Return the cache counters
+        """
+        return {
+            "items": len(self._order),
+            "size": self.size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class CompressedCacheDisk(CacheDisk):
+    """
+    Subclass of CacheDisk which stores its data zlib compressed. Files written
+    by CacheDisk are still read.
+
+    .. versionadded:: 3008.0
+    """
+
+    MAGIC = b"SALTZ1"
+
+    def _read(self):
+        """
+        Read in from disk
+        """
+        try:
+            with salt.utils.files.fopen(self._path, "rb") as fp_:
+                magic = fp_.read(len(self.MAGIC))
+                if magic != self.MAGIC:
+                    # Not compressed, let CacheDisk read it
+                    return super()._read()
+                data = zlib.decompress(fp_.read())
+            cache = salt.utils.msgpack.loads(data, raw=False)
+        except FileNotFoundError:
+            return
+        except (
+            salt.utils.msgpack.exceptions.UnpackException,
+            ValueError,
+            zlib.error,
+        ) as exc:
+            # File is unreadable, treat as empty cache
+            log.debug("Error reading cache file at %r: %s", self._path, exc)
+            return
+        self._dict = cache["CacheDisk_data"]
+        self._key_cache_time = cache["CacheDisk_cachetime"]
+
+    def _write(self):
+        """
+        Write out to disk
+        """
+        cache = {
+            "CacheDisk_data": self._dict,
+            "CacheDisk_cachetime": self._key_cache_time,
+        }
+        data = zlib.compress(salt.utils.msgpack.dumps(cache), 1)
+        with salt.utils.atomicfile.atomic_open(self._path, "wb+") as fp_:
+            fp_.write(self.MAGIC)
+            fp_.write(data)
+
+
+class TieredCacheDisk(CompressedCacheDisk):
+    """
+    A CompressedCacheDisk fronted by an in-memory LRUCacheDict which can be
+    shared by many instances, keyed by the path of each instance.
+
+    The memory tier is validated against the modification time of the file on
+    disk, so changes written by other processes are picked up.
+
+    .. versionadded:: 3008.0
+    """
+
+    def __init__(self, ttl, path, *args, memory=None, **kwargs):
+        self._memory = memory if memory is not None else LRUCacheDict(ttl)
+        super().__init__(ttl, path, *args, **kwargs)
+
+    def _mtime(self):
+        try:
+            return os.path.getmtime(self._path)
+        except OSError:
+            return None
+
+    def _read(self):
+        """
+        Read from the memory tier if it is current, else from disk
+        """
+        mtime = self._mtime()
+        if mtime is None:
+            return
+        try:
+            cached_mtime, data, cachetime = self._memory[self._path]
+        except KeyError:
+            cached_mtime = None
+        if cached_mtime == mtime:
+            self._dict = copy.deepcopy(data)
+            self._key_cache_time = dict(cachetime)
+            return
+        super()._read()
+        self._remember(mtime)
+
+    def _write(self):
+        super()._write()
+        self._remember(self._mtime())
+
+    def _remember(self, mtime):
+        self._memory[self._path] = (
+            mtime,
+            copy.deepcopy(self._dict),
+            dict(self._key_cache_time),
+        )
+
+
 class CacheCli:
     """
     Connection client for the ConCache. Should be used by all
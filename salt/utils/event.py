@@ -710,15 +710,25 @@ class SaltEvent:
         mtag, data = self.unpack(raw)
         return {"data": data, "tag": mtag}
 
-    def iter_events(self, tag="", full=False, match_type=None, auto_reconnect=False):
+    def iter_events(
+        self, tag="", full=False, match_type=None, auto_reconnect=False, wait=None
+    ):
         """
         Creates a generator that continuously listens for events
+
+        When ``wait`` is given, ``None`` is yielded whenever no event arrived
+        within ``wait`` seconds, so that the caller can do periodic work.
         """
+        kwargs = {} if wait is None else {"wait": wait}
         while True:
             data = self.get_event(
-                tag=tag, full=full, match_type=match_type, auto_reconnect=auto_reconnect
+                tag=tag,
+                full=full,
+                match_type=match_type,
+                auto_reconnect=auto_reconnect,
+                **kwargs,
             )
-            if data is None:
+            if data is None and wait is None:
                 continue
             yield data
 
@@ -4,6 +4,7 @@ Functions used to sync external modules
 
 import logging
 import os
+import re
 import shutil
 
 import salt.fileclient
@@ -12,9 +13,38 @@ import salt.utils.hashutils
 import salt.utils.path
 import salt.utils.url
 from salt.config import DEFAULT_HASH_TYPE
+from salt.exceptions import MinionError, SaltClientError
 
 log = logging.getLogger(__name__)
 
+# The types of modules synced by saltutil.sync_all, whose directories are
+# listed by the manifest it shares between its syncs
+SYNC_FORMS = (
+    "beacons",
+    "clouds",
+    "engines",
+    "executors",
+    "grains",
+    "log_handlers",
+    "matchers",
+    "modules",
+    "output",
+    "pillar",
+    "proxy",
+    "renderers",
+    "returners",
+    "sdb",
+    "serializers",
+    "states",
+    "thorium",
+    "tops",
+    "utils",
+    "wrapper",
+)
+
+# The files which are synced
+SYNC_PATTERN = re.compile(r"\.(pyx?|so|zip)$")
+
 
 def _list_emptydirs(rootdir):
     emptydirs = []
@@ -33,15 +63,106 @@ def _listdir_recursively(rootdir):
     return file_list
 
 
+def _excluded(form, relname, extmod_whitelist, extmod_blacklist):
+    """
+    Return whether a module is excluded by the whitelist or the blacklist
+    """
+    if (
+        extmod_whitelist
+        and form in extmod_whitelist
+        and relname not in extmod_whitelist[form]
+    ):
+        return True
+    if (
+        extmod_blacklist
+        and form in extmod_blacklist
+        and relname in extmod_blacklist[form]
+    ):
+        return True
+    return False
+
+
+def _get_manifest(fileclient, manifests, saltenv, form):
+    """
+    Return the manifest of the module directories in the given saltenvs,
+    asking the master for it the first time it is needed. Returns None if it
+    is not available.
+    """
+    if form not in SYNC_FORMS:
+        return None
+    key = ",".join(saltenv)
+    if key not in manifests:
+        try:
+            manifests[key] = fileclient.file_manifest(
+                ["_" + name for name in SYNC_FORMS], saltenv
+            )
+        except (MinionError, SaltClientError) as exc:
+            log.debug("Unable to get the file manifest: %s", exc)
+            manifests[key] = None
+    return manifests[key]
+
+
+def _sync_from_manifest(
+    fileclient,
+    manifest,
+    form,
+    saltenv,
+    mod_dir,
+    remote,
+    extmod_whitelist,
+    extmod_blacklist,
+):
+    """
+    Sync the modules of a saltenv listed in a manifest, only downloading the
+    files whose hash differs from the synced copy
+    """
+    ret = []
+    prefix = f"_{form}/"
+    hash_type = manifest["hash_type"]
+    changed = []
+    for path, hsum in sorted(manifest["files"].get(saltenv, {}).items()):
+        if not path.startswith(prefix) or not SYNC_PATTERN.search(path):
+            continue
+        relpath = os.path.normpath(path[len(prefix) :])
+        relname = os.path.splitext(relpath)[0].replace(os.sep, ".")
+        if _excluded(form, relname, extmod_whitelist, extmod_blacklist):
+            continue
+        remote.add(relpath)
+        dest = os.path.join(mod_dir, relpath)
+        if os.path.isfile(dest) and (
+            salt.utils.hashutils.get_hash(dest, hash_type) == hsum
+        ):
+            continue
+        changed.append((salt.utils.url.create(path), relname, dest))
+    if not changed:
+        return ret
+    cached = fileclient.cache_files([url for url, _, _ in changed], saltenv)
+    for (url, relname, dest), fn_ in zip(changed, cached):
+        if not fn_:
+            log.error("Unable to cache '%s' from environment '%s'", url, saltenv)
+            continue
+        log.info("Copying '%s' to '%s'", fn_, dest)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        shutil.copyfile(fn_, dest)
+        ret.append(f"{form}.{relname}")
+    return ret
+
+
 def sync(
     opts,
     form,
     saltenv=None,
     extmod_whitelist=None,
     extmod_blacklist=None,
+    manifests=None,
 ):
     """
     Sync custom modules into the extension_modules directory
+
+    When ``manifests`` is a dict, a single manifest of the hashes of all the
+    module directories is fetched from the master and kept in it, to be
+    shared by the syncs of all the module types. Only the files which differ
+    from the synced copies are then downloaded.
     """
     if saltenv is None:
         saltenv = ["base"]
@@ -83,8 +204,25 @@ def sync(
                         mod_dir,
                     )
             with salt.fileclient.get_file_client(opts) as fileclient:
+                manifest = None
+                if manifests is not None:
+                    manifest = _get_manifest(fileclient, manifests, saltenv, form)
                 for sub_env in saltenv:
                     log.info("Syncing %s for environment '%s'", form, sub_env)
+                    if manifest is not None:
+                        ret.extend(
+                            _sync_from_manifest(
+                                fileclient,
+                                manifest,
+                                form,
+                                sub_env,
+                                mod_dir,
+                                remote,
+                                extmod_whitelist,
+                                extmod_blacklist,
+                            )
+                        )
+                        continue
                     cache = []
                     log.info("Loading cache from %s, for %s", source, sub_env)
                     # Grab only the desired files (.py, .pyx, .so)
@@ -104,17 +242,7 @@ def sync(
                     for fn_ in cache:
                         relpath = os.path.relpath(fn_, local_cache_dir)
                         relname = os.path.splitext(relpath)[0].replace(os.sep, ".")
-                        if (
-                            extmod_whitelist
-                            and form in extmod_whitelist
-                            and relname not in extmod_whitelist[form]
-                        ):
-                            continue
-                        if (
-                            extmod_blacklist
-                            and form in extmod_blacklist
-                            and relname in extmod_blacklist[form]
-                        ):
+                        if _excluded(form, relname, extmod_whitelist, extmod_blacklist):
                             continue
                         remote.add(relpath)
                         dest = os.path.join(mod_dir, relpath)
@@ -0,0 +1,183 @@
+"""
+Content addressed index of the files cached by the minion's file client
+
+.. versionadded:: 3008.0
+
+When the ``file_cache_index`` option is enabled the file client keeps a
+persistent index mapping each file cached under ``cachedir/files`` to its
+hash, size, inode and modification time. Hashing a cached file whose size,
+inode and modification time are unchanged returns the hash from the index
+instead of reading the file again.
+
+Every indexed file is also hard-linked into a content addressed object store
+under ``cachedir/file_objects``. A file with the same content as one which is
+already cached, for example the same file served from several saltenvs, is
+replaced with a hard link to the stored object so that it is only stored once.
+"""
+
+import logging
+import os
+import time
+
+import salt.payload
+import salt.utils.atomicfile
+import salt.utils.files
+import salt.utils.hashutils
+
+log = logging.getLogger(__name__)
+
+# The minimum number of seconds between two writes of the index
+SAVE_INTERVAL = 1
+
+
+class FileCacheIndex:
+    """
+    Map the cached files to their hashes and deduplicate them by content
+    """
+
+    def __init__(self, opts):
+        self.cachedir = opts["cachedir"]
+        self.hash_type = opts.get("hash_type", "sha256")
+        self.files_dir = os.path.join(self.cachedir, "files")
+        self.objects_dir = os.path.join(self.cachedir, "file_objects")
+        self.path = os.path.join(self.cachedir, "file_cache.idx")
+        self.entries = {}
+        self._changes = {}
+        self._disk_stat = None
+        self._saved = 0
+        self._load()
+
+    def _load(self):
+        """
+        Read the index written by this or any other process
+        """
+        try:
+            with salt.utils.files.fopen(self.path, "rb") as fp_:
+                stat = os.fstat(fp_.fileno())
+                entries = salt.payload.load(fp_)
+        except FileNotFoundError:
+            return
+        except Exception as exc:  # pylint: disable=broad-except
+            log.warning("Unable to read file cache index %s: %s", self.path, exc)
+            return
+        if not isinstance(entries, dict):
+            return
+        self.entries = entries
+        self.entries.update(self._changes)
+        for path, entry in self._changes.items():
+            if entry is None:
+                self.entries.pop(path, None)
+        self._disk_stat = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def manages(self, path):
+        """
+        Return whether ``path`` is a file cached by the file client
+        """
+        path = os.path.abspath(path)
+        return path.startswith(self.files_dir + os.sep) or path.startswith(
+            self.objects_dir + os.sep
+        )
+
+    def _set(self, path, entry):
+        self.entries[path] = entry
+        self._changes[path] = entry
+
+    def _drop(self, path):
+        if self.entries.pop(path, None) is not None:
+            self._changes[path] = None
+
+    def get_hash(self, path, hash_type=None):
+        """
+        Return the hash of ``path``, only reading the file when its size,
+        inode or modification time changed since it was last hashed.
+        """
+        hash_type = hash_type or self.hash_type
+        path = os.path.abspath(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self._drop(path)
+            raise
+        key = [hash_type, stat.st_size, stat.st_ino, stat.st_mtime_ns]
+        entry = self.entries.get(path)
+        if entry is not None and entry[:4] == key:
+            return entry[4]
+        hsum = salt.utils.hashutils.get_hash(path, form=hash_type)
+        self._set(path, key + [hsum])
+        return hsum
+
+    def _object_path(self, hash_type, hsum):
+        return os.path.join(self.objects_dir, hash_type, hsum[:2], hsum)
+
+    def add(self, path):
+        """
+        Index a file which was just cached and store its content only once,
+        replacing it with a hard link to an identical file which is already
+        cached. Returns the hash of the file.
+        """
+        path = os.path.abspath(path)
+        old = self.entries.get(path)
+        hsum = self.get_hash(path)
+        obj = self._object_path(self.hash_type, hsum)
+        try:
+            try:
+                stored = self.get_hash(obj) == hsum
+            except FileNotFoundError:
+                stored = False
+            if not stored:
+                os.makedirs(os.path.dirname(obj), exist_ok=True)
+                tmp = f"{obj}.{os.getpid()}.tmp"
+                os.link(path, tmp)
+                os.replace(tmp, obj)
+                self._set(obj, list(self.entries[path]))
+            elif not os.path.samefile(path, obj):
+                tmp = f"{path}.{os.getpid()}.tmp"
+                os.link(obj, tmp)
+                os.replace(tmp, path)
+                self._set(path, list(self.entries[obj]))
+        except OSError as exc:
+            log.debug("Unable to deduplicate cached file %s: %s", path, exc)
+        if old is not None and old[4] != hsum:
+            self._prune(self._object_path(old[0], old[4]))
+        self.save()
+        return hsum
+
+    def _prune(self, obj):
+        """
+        Remove a stored object which no cached file links to anymore
+        """
+        try:
+            if os.stat(obj).st_nlink > 1:
+                return
+            os.remove(obj)
+        except OSError:
+            pass
+        self._drop(obj)
+
+    def save(self, force=False):
+        """
+        Write the changes made by this process to the index, merging them with
+        those written by other processes in the meantime.
+        """
+        if not self._changes:
+            return
+        if not force and time.monotonic() - self._saved < SAVE_INTERVAL:
+            return
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            pass
+        else:
+            if (stat.st_ino, stat.st_mtime_ns, stat.st_size) != self._disk_stat:
+                self._load()
+        try:
+            os.makedirs(self.cachedir, exist_ok=True)
+            with salt.utils.atomicfile.atomic_open(self.path, "wb") as fp_:
+                salt.payload.dump(self.entries, fp_)
+            stat = os.stat(self.path)
+        except OSError as exc:
+            log.warning("Unable to write file cache index %s: %s", self.path, exc)
+            return
+        self._disk_stat = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        self._changes = {}
+        self._saved = time.monotonic()
@@ -3,6 +3,7 @@ Classes which provide the shared base for GitFS, git_pillar, and winrepo
 """
 
 import base64
+import collections
 import contextlib
 import copy
 import errno
@@ -14,10 +15,13 @@ import logging
 import multiprocessing
 import os
 import pathlib
+import posixpath
+import queue
 import shlex
 import shutil
 import stat
 import subprocess
+import threading
 import time
 import weakref
 from datetime import datetime
@@ -29,6 +33,7 @@ import salt.utils.cache
 import salt.utils.configparser
 import salt.utils.data
 import salt.utils.files
+import salt.utils.gitindex
 import salt.utils.gzip_util
 import salt.utils.hashutils
 import salt.utils.itertools
@@ -57,6 +62,12 @@ GLOBAL_ONLY = ()
 
 SYMLINK_RECURSE_DEPTH = 100
 
+# When serving files from the object database, the index of the current tree of
+# every environment of a gitfs remote is kept. This is the number of other
+# tree indexes kept for each remote, superseded ones on disk and the ones of
+# environments which are not refs of the remote, such as SHAs, in memory.
+ODB_INDEXES_PER_REMOTE = 4
+
 # Auth support (auth params can be global or per-remote, too)
 AUTH_PROVIDERS = ("pygit2",)
 AUTH_PARAMS = ("user", "password", "pubkey", "privkey", "passphrase", "insecure_auth")
@@ -182,6 +193,8 @@ def enforce_types(key, val):
         "refspecs": "stringlist",
         "ref_types": "stringlist",
         "update_interval": int,
+        "fetch_depth": int,
+        "fetch_timeout": int,
     }
 
     def _find_global(key):
@@ -1245,6 +1258,29 @@ class GitProvider:
             return self.base if target == "base" else str(target)
         return self.branch
 
+    def get_checkout_sha(self):
+        """
+        Return the SHA of the tree which is checked out for this remote, or
+        ``None`` if the checkout target cannot be resolved
+        """
+        tgt_ref = self.get_checkout_target()
+        for ref_type in self.ref_types:
+            func = getattr(self, f"get_tree_from_{ref_type}", None)
+            if func is None:
+                continue
+            tree = func(tgt_ref)
+            if tree is not None:
+                return self.tree_sha(tree)
+        return None
+
+    def odb_index(self, tgt_env):  # pylint: disable=unused-argument
+        """
+        Return a salt.utils.gitindex.TreeIndex of the tree for the target
+        environment, or ``None`` if the provider cannot serve files from the
+        object database
+        """
+        return None
+
     def get_tree(self, tgt_env):
         """
         Return a tree object for the specified environment
@@ -1567,10 +1603,13 @@ class GitPython(GitProvider):
         local copy was already up-to-date, return False.
         """
         origin = self.repo.remotes[0]
+        fetch_kwargs = {}
+        if getattr(self, "fetch_depth", 0) > 0:
+            fetch_kwargs["depth"] = self.fetch_depth
         try:
-            fetch_results = origin.fetch()
+            fetch_results = origin.fetch(**fetch_kwargs)
         except AssertionError:
-            fetch_results = origin.fetch()
+            fetch_results = origin.fetch(**fetch_kwargs)
 
         new_objs = False
         for fetchinfo in fetch_results:
@@ -1714,6 +1753,12 @@ class GitPython(GitProvider):
         except (gitdb.exc.ODBError, AttributeError):
             return None
 
+    def tree_sha(self, tree):
+        """
+        Return the SHA of a git.Tree object
+        """
+        return tree.hexsha
+
     def write_file(self, blob, dest):
         """
         Using the blob object, write the file to the destination path
@@ -1738,6 +1783,11 @@ class Pygit2(GitProvider):
         role="gitfs",
     ):
         self.provider = "pygit2"
+        # Open indexes of the trees served from the object database, by SHA,
+        # and the SHA of the tree served for each environment
+        self._odb_indexes = {}
+        self._odb_env_trees = OrderedDict()
+        self._odb_blob = None
         super().__init__(
             opts,
             remote,
@@ -2116,8 +2166,23 @@ class Pygit2(GitProvider):
         except AttributeError:
             # pruning only available in pygit2 >= 0.26.2
             pass
+        if getattr(self, "fetch_depth", 0) > 0:
+            fetch_kwargs["depth"] = self.fetch_depth
         try:
-            fetch_results = origin.fetch(**fetch_kwargs)
+            try:
+                fetch_results = origin.fetch(**fetch_kwargs)
+            except TypeError:
+                if "depth" not in fetch_kwargs:
+                    raise
+                # shallow fetches only available in pygit2 >= 1.14.0
+                log.warning(
+                    "The installed version of pygit2 does not support shallow "
+                    "fetches, ignoring fetch_depth for %s remote '%s'",
+                    self.role,
+                    self.id,
+                )
+                fetch_kwargs.pop("depth")
+                fetch_results = origin.fetch(**fetch_kwargs)
         except GitError as exc:  # pylint: disable=broad-except
             exc_str = get_error_message(exc).lower()
             if "unsupported url protocol" in exc_str and isinstance(
@@ -2280,6 +2345,173 @@ class Pygit2(GitProvider):
             return blob, blob.hex, mode
         return None, None, None
 
+    def odb_index(self, tgt_env):
+        """
+        Return a salt.utils.gitindex.TreeIndex of the tree for the target
+        environment. The index is written once per tree SHA and shared with
+        the other processes through the filesystem.
+        """
+        tree = self.get_tree(tgt_env)
+        if not tree:
+            return None
+        tree_sha = self.tree_sha(tree)
+        moved = self._odb_env_trees.get(tgt_env) != tree_sha
+        self._odb_env_trees[tgt_env] = tree_sha
+        self._odb_env_trees.move_to_end(tgt_env)
+        if tree_sha in self._odb_indexes:
+            if moved:
+                self._prune_odb_indexes()
+            return self._odb_indexes[tree_sha]
+        index_dir = salt.utils.path.join(self._salt_working_dir, "odb_index")
+        index_path = salt.utils.path.join(
+            index_dir, "{}.{}.idx".format(tree_sha, self.opts["hash_type"])
+        )
+        try:
+            index = salt.utils.gitindex.TreeIndex(index_path)
+        except (OSError, ValueError):
+            self._write_odb_index(tree, index_dir, index_path)
+            index = salt.utils.gitindex.TreeIndex(index_path)
+        self._odb_indexes[tree_sha] = index
+        self._prune_odb_indexes()
+        return index
+
+    def _odb_live_trees(self):
+        """
+        Return the SHAs of the trees currently served for the environments of
+        the remote
+        """
+        live = set()
+        for env in self.envs():
+            tree = self.get_tree(env)
+            if tree:
+                live.add(self.tree_sha(tree))
+        return live
+
+    def _prune_odb_indexes(self):
+        """
+        Close the open indexes of the trees no environment is served from
+        anymore, and of the least recently used environments which are not
+        refs of the remote past ODB_INDEXES_PER_REMOTE of them
+        """
+        envs = self.envs()
+        others = [env for env in self._odb_env_trees if env not in envs]
+        for env in others[: max(len(others) - ODB_INDEXES_PER_REMOTE, 0)]:
+            del self._odb_env_trees[env]
+        served = set(self._odb_env_trees.values())
+        for tree_sha in list(self._odb_indexes):
+            if tree_sha not in served:
+                self._odb_indexes.pop(tree_sha).close()
+
+    def _write_odb_index(self, tree, index_dir, index_path):
+        """
+        Walk a tree and write the index of its blobs. The hashes of blobs found
+        in the indexes of other trees are reused instead of being computed
+        again.
+        """
+        start = time.time()
+        known = {}
+        if os.path.isdir(index_dir):
+            for name in os.listdir(index_dir):
+                if not name.endswith(".{}.idx".format(self.opts["hash_type"])):
+                    continue
+                try:
+                    other = salt.utils.gitindex.TreeIndex(
+                        salt.utils.path.join(index_dir, name)
+                    )
+                except (OSError, ValueError):
+                    continue
+                try:
+                    for entry in other:
+                        if not entry.is_link:
+                            known[entry.blob_sha] = entry
+                finally:
+                    other.close()
+        else:
+            os.makedirs(index_dir)
+
+        def _traverse(tree, prefix):
+            for entry in iter(tree):
+                if entry.id not in self.repo:
+                    # Entry is a submodule, skip it
+                    continue
+                obj = self.repo[entry.id]
+                path = salt.utils.path.join(prefix, entry.name, use_posixpath=True)
+                if isinstance(obj, pygit2.Tree):
+                    yield from _traverse(obj, path)
+                elif isinstance(obj, pygit2.Blob):
+                    blob_sha = str(obj.id)
+                    if stat.S_ISLNK(entry.filemode):
+                        yield salt.utils.gitindex.IndexEntry(
+                            path, blob_sha, entry.filemode, obj.size, False, obj.data
+                        )
+                    elif blob_sha in known:
+                        yield salt.utils.gitindex.IndexEntry(
+                            path,
+                            blob_sha,
+                            entry.filemode,
+                            known[blob_sha].size,
+                            known[blob_sha].binary,
+                            known[blob_sha].extra,
+                        )
+                    else:
+                        data = obj.data
+                        hsum = getattr(hashlib, self.opts["hash_type"])(data)
+                        known[blob_sha] = salt.utils.gitindex.IndexEntry(
+                            path,
+                            blob_sha,
+                            entry.filemode,
+                            len(data),
+                            salt.utils.gitindex.is_binary(data),
+                            hsum.hexdigest(),
+                        )
+                        yield known[blob_sha]
+
+        salt.utils.gitindex.write_index(index_path, _traverse(tree, ""))
+        log.profile(
+            "%s remote '%s' indexed tree %s in %s seconds",
+            self.role,
+            self.id,
+            os.path.basename(index_path),
+            time.time() - start,
+        )
+        # Keep the indexes of the trees served for every environment, and the
+        # most recent other ones, which other processes may still be serving
+        # until they notice the environment moved on.
+        live = self._odb_live_trees()
+        live.update(self._odb_env_trees.values())
+        stale = sorted(
+            (
+                salt.utils.path.join(index_dir, name)
+                for name in os.listdir(index_dir)
+                if name.endswith(".idx")
+                and salt.utils.path.join(index_dir, name) != index_path
+                and name.split(".", 1)[0] not in live
+            ),
+            key=lambda x: os.path.getmtime(x) if os.path.exists(x) else 0,
+            reverse=True,
+        )
+        for path in stale[ODB_INDEXES_PER_REMOTE:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def read_blob(self, blob_sha, loc, size):
+        """
+        Return up to ``size`` bytes of a blob starting at offset ``loc``. The
+        last blob read is kept so that serving a file in chunks only looks it
+        up in the object database once.
+        """
+        if self._odb_blob is None or self._odb_blob[0] != blob_sha:
+            blob = self.repo[pygit2.Oid(hex=blob_sha)]
+            try:
+                data = memoryview(blob)
+            except TypeError:
+                # Older pygit2 releases do not support the buffer protocol
+                data = memoryview(blob.data)
+            self._odb_blob = (blob_sha, data)
+        return self._odb_blob[1][loc : loc + size].tobytes()
+
     def get_tree_from_branch(self, ref):
         """
         Return a pygit2.Tree object matching a head ref fetched into
@@ -2310,6 +2542,12 @@ class Pygit2(GitProvider):
         except (KeyError, TypeError, ValueError, AttributeError):
             return None
 
+    def tree_sha(self, tree):
+        """
+        Return the SHA of a pygit2.Tree object
+        """
+        return str(tree.id)
+
     def setup_callbacks(self):
         """
         Assign attributes for pygit2 callbacks
@@ -2762,6 +3000,150 @@ class GitBase:
 
         return cleared, errors
 
+    def _place_fetch_requests(self, repo):
+        """
+        Find and place fetch_request file for all the other branches for this
+        repo
+        """
+        repo_work_hash = os.path.split(repo.get_salt_working_dir())[0]
+        for branch in os.listdir(repo_work_hash):
+            # Don't place fetch request in current branch being updated
+            if branch == repo.get_cache_basename():
+                continue
+            branch_salt_dir = salt.utils.path.join(repo_work_hash, branch)
+            fetch_path = salt.utils.path.join(branch_salt_dir, "fetch_request")
+            if os.path.isdir(branch_salt_dir):
+                try:
+                    with salt.utils.files.fopen(fetch_path, "w"):
+                        pass
+                except OSError as exc:  # pylint: disable=broad-except
+                    log.error(
+                        "Failed to make fetch request: %s %s",
+                        fetch_path,
+                        exc,
+                        exc_info=True,
+                    )
+            else:
+                log.error("Failed to make fetch request: %s", fetch_path)
+
+    def _fetch_remote(self, repo):
+        """
+        Fetch a single remote and return a dict describing the outcome, for
+        use in fetch_remotes()
+        """
+        result = {"remote": repo.id, "changed": False, "result": True}
+        start = time.monotonic()
+        try:
+            self._place_fetch_requests(repo)
+            result["changed"] = bool(repo.fetch())
+        except Exception as exc:  # pylint: disable=broad-except
+            log.error(
+                "Exception caught while fetching %s remote '%s': %s",
+                self.role,
+                repo.id,
+                exc,
+                exc_info=True,
+            )
+            result["result"] = False
+        result["duration"] = time.monotonic() - start
+        return result
+
+    def _fetch_concurrently(self, repos, workers):
+        """
+        Fetch the passed remotes in at most ``workers`` threads, giving up on
+        remotes which take longer than their ``fetch_timeout``.
+
+        The threads are daemon threads, so a fetch which hangs past its
+        ``fetch_timeout`` neither blocks the remaining remotes, for which a
+        new thread is started, nor the shutdown of the process. A remote
+        which timed out keeps its update lock until the fetch finishes in the
+        background, so later updates skip it instead of starting a second
+        fetch of the same repo.
+        """
+        if not repos:
+            return []
+        results = {}
+        started = {}
+        todo = collections.deque(repos)
+        finished = queue.Queue()
+
+        def _worker():
+            while True:
+                try:
+                    repo = todo.popleft()
+                except IndexError:
+                    return
+                started[repo.id] = time.monotonic()
+                try:
+                    finished.put((repo, self._fetch_remote(repo), None))
+                except Exception as exc:  # pylint: disable=broad-except
+                    finished.put((repo, None, exc))
+
+        def _start_worker():
+            threading.Thread(
+                target=_worker, name=f"{self.role}-fetch", daemon=True
+            ).start()
+
+        for _ in range(max(1, min(workers, len(repos)))):
+            _start_worker()
+
+        pending = {repo.id: repo for repo in repos}
+        while pending:
+            try:
+                repo, result, exc = finished.get(timeout=0.1)
+            except queue.Empty:
+                pass
+            else:
+                # Results of remotes which already timed out are dropped
+                if pending.pop(repo.id, None) is not None:
+                    if exc is not None:
+                        raise exc
+                    results[repo.id] = result
+            now = time.monotonic()
+            for repo in list(pending.values()):
+                timeout = getattr(repo, "fetch_timeout", 0)
+                if (
+                    timeout > 0
+                    and repo.id in started
+                    and now - started[repo.id] > timeout
+                ):
+                    log.error(
+                        "Timed out after %d seconds fetching %s remote '%s'",
+                        timeout,
+                        self.role,
+                        repo.id,
+                    )
+                    del pending[repo.id]
+                    results[repo.id] = {
+                        "remote": repo.id,
+                        "changed": False,
+                        "result": False,
+                        "duration": now - started[repo.id],
+                        "timeout": True,
+                    }
+                    if todo:
+                        # The thread fetching this remote is stuck, keep
+                        # fetching the remaining remotes in a new one
+                        _start_worker()
+        return [results[repo.id] for repo in repos]
+
+    def _fire_fetch_events(self, results):
+        """
+        Fire an event reporting how long the fetch of each remote took
+        """
+        if not results or not self.opts.get("fileserver_events", False):
+            return
+        with salt.utils.event.get_event(
+            "master",
+            self.opts["sock_dir"],
+            opts=self.opts,
+            listen=False,
+        ) as event:
+            for result in results:
+                event.fire_event(
+                    result, tagify([self.role, "fetch"], prefix="fileserver")
+                )
+
     def fetch_remotes(self, remotes=None):
         """
         Fetch all remotes and return a boolean to let the calling function know
@@ -2779,50 +3161,24 @@ class GitBase:
             )
             remotes = []
 
-        changed = False
+        selected = []
         for repo in self.remotes:
             name = getattr(repo, "name", None)
             if not remotes or (repo.id, name) in remotes or name in remotes:
-                try:
-                    # Find and place fetch_request file for all the other branches for this repo
-                    repo_work_hash = os.path.split(repo.get_salt_working_dir())[0]
-                    for branch in os.listdir(repo_work_hash):
-                        # Don't place fetch request in current branch being updated
-                        if branch == repo.get_cache_basename():
-                            continue
-                        branch_salt_dir = salt.utils.path.join(repo_work_hash, branch)
-                        fetch_path = salt.utils.path.join(
-                            branch_salt_dir, "fetch_request"
-                        )
-                        if os.path.isdir(branch_salt_dir):
-                            try:
-                                with salt.utils.files.fopen(fetch_path, "w"):
-                                    pass
-                            except OSError as exc:  # pylint: disable=broad-except
-                                log.error(
-                                    "Failed to make fetch request: %s %s",
-                                    fetch_path,
-                                    exc,
-                                    exc_info=True,
-                                )
-                        else:
-                            log.error("Failed to make fetch request: %s", fetch_path)
-                    if repo.fetch():
-                        # We can't just use the return value from repo.fetch()
-                        # because the data could still have changed if old
-                        # remotes were cleared above. Additionally, we're
-                        # running this in a loop and later remotes without
-                        # changes would override this value and make it
-                        # incorrect.
-                        changed = True
-                except Exception as exc:  # pylint: disable=broad-except
-                    log.error(
-                        "Exception caught while fetching %s remote '%s': %s",
-                        self.role,
-                        repo.id,
-                        exc,
-                        exc_info=True,
-                    )
+                selected.append(repo)
+
+        workers = self.opts.get(f"{self.role}_fetch_workers", 1)
+        if workers > 1 or any(getattr(x, "fetch_timeout", 0) for x in selected):
+            results = self._fetch_concurrently(selected, workers)
+        else:
+            results = [self._fetch_remote(repo) for repo in selected]
+
+        # We can't just use the return value from repo.fetch() because the
+        # data could still have changed if old remotes were cleared above.
+        # Additionally, later remotes without changes must not override the
+        # value of an earlier remote which did change.
+        changed = any(result["changed"] for result in results)
+        self._fire_fetch_events(results)
         return changed
 
     def lock(self, remote=None):
@@ -3203,6 +3559,9 @@ class GitFS(GitBase):
         if os.path.isabs(path):
             return fnd
 
+        if self._serve_from_odb():
+            return self._find_file_odb(path, tgt_env)
+
         dest = salt.utils.path.join(self.cache_root, "refs", tgt_env, path)
         hashes_glob = salt.utils.path.join(
             self.hash_cachedir, tgt_env, f"{path}.hash.*"
@@ -3297,6 +3656,91 @@ class GitFS(GitBase):
         # so the calling function knows the file could not be found.
         return fnd
 
+    def _serve_from_odb(self):
+        """
+        Return whether files are served from the object database of the
+        remotes instead of being written to the cache directory
+        """
+        return self.opts.get("gitfs_serve_from_odb", False) and (
+            self.provider == "pygit2"
+        )
+
+    def _odb_lookup(self, index, repo_path):
+        """
+        Look up a path in a tree index, following symlinks
+        """
+        for _ in range(SYMLINK_RECURSE_DEPTH):
+            entry = index.lookup(repo_path)
+            if entry is None or not entry.is_link:
+                return entry
+            repo_path = posixpath.normpath(
+                posixpath.join(
+                    posixpath.dirname(repo_path),
+                    salt.utils.stringutils.to_unicode(entry.link_target),
+                )
+            )
+        return None
+
+    def _find_file_odb(self, path, tgt_env):
+        """
+        Find the first file to match the path and ref in the tree indexes of
+        the remotes. Nothing is written to the cache directory, the returned
+        dict carries what serve_file and file_hash need to read the blob from
+        the object database.
+        """
+        fnd = {"path": "", "rel": ""}
+        for repo in self.remotes:
+            if repo.mountpoint(tgt_env) and not path.startswith(
+                repo.mountpoint(tgt_env) + os.sep
+            ):
+                continue
+            if (
+                not salt.utils.stringutils.is_hex(tgt_env)
+                and tgt_env not in self.envs()
+                and not repo.fallback
+            ):
+                continue
+            repo_path = path[len(repo.mountpoint(tgt_env)) :].lstrip(os.sep)
+            if repo.root(tgt_env):
+                repo_path = salt.utils.path.join(repo.root(tgt_env), repo_path)
+
+            index = repo.odb_index(tgt_env)
+            if index is None:
+                continue
+            entry = self._odb_lookup(index, repo_path)
+            if entry is None:
+                continue
+            fnd["rel"] = path
+            # There is no file on disk, the path is only informational
+            fnd["path"] = salt.utils.path.join(self.cache_root, "refs", tgt_env, path)
+            fnd["stat"] = [entry.mode]
+            fnd["remote"] = repo.id
+            fnd["blob"] = entry.blob_sha
+            fnd["size"] = entry.size
+            fnd["binary"] = entry.binary
+            fnd["hsum"] = entry.hsum
+            return fnd
+        return fnd
+
+    def _serve_file_odb(self, load, fnd, ret):
+        """
+        Return a chunk of a file read from the object database
+        """
+        for repo in self.remotes:
+            if repo.id == fnd["remote"]:
+                break
+        else:
+            return ret
+        data = repo.read_blob(fnd["blob"], load["loc"], self.opts["file_buffer_size"])
+        if data and not fnd["binary"]:
+            data = data.decode(__salt_system_encoding__)
+        gzip = load.get("gzip", None)
+        if gzip and data:
+            data = salt.utils.gzip_util.compress(data, gzip)
+            ret["gzip"] = gzip
+        ret["data"] = data
+        return ret
+
     def serve_file(self, load, fnd):
         """
         Return a chunk from a file based on the data received
@@ -3316,6 +3760,8 @@ class GitFS(GitBase):
         if not fnd["path"]:
             return ret
         ret["dest"] = fnd["rel"]
+        if "blob" in fnd:
+            return self._serve_file_odb(load, fnd, ret)
         gzip = load.get("gzip", None)
         fpath = os.path.normpath(fnd["path"])
         with salt.utils.files.fopen(fpath, "rb") as fp_:
@@ -3340,6 +3786,10 @@ class GitFS(GitBase):
         if not all(x in load for x in ("path", "saltenv")):
             return "", None
         ret = {"hash_type": self.opts["hash_type"]}
+        if "hsum" in fnd:
+            # Served from the object database, the hash is in the tree index
+            ret["hsum"] = fnd["hsum"]
+            return ret
         relpath = fnd["rel"]
         path = fnd["path"]
         lc_hash_type = self.opts["hash_type"]
@@ -3405,10 +3855,19 @@ class GitFS(GitBase):
                     or repo.fallback
                 ):
                     start = time.time()
-                    repo_files, repo_symlinks = repo.file_list(load["saltenv"])
+                    index = None
+                    if self._serve_from_odb():
+                        index = repo.odb_index(load["saltenv"])
+                    if index is not None:
+                        repo_files, repo_symlinks, repo_dirs = self._odb_file_lists(
+                            repo, index, load["saltenv"]
+                        )
+                    else:
+                        repo_files, repo_symlinks = repo.file_list(load["saltenv"])
+                        repo_dirs = repo.dir_list(load["saltenv"])
                     ret["files"].update(repo_files)
                     ret["symlinks"].update(repo_symlinks)
-                    ret["dirs"].update(repo.dir_list(load["saltenv"]))
+                    ret["dirs"].update(repo_dirs)
                     log.profile(
                         "gitfs file_name cache rebuild repo=%s duration=%s seconds",
                         repo.id,
@@ -3429,6 +3888,37 @@ class GitFS(GitBase):
         # Shouldn't get here, but if we do, this prevents a TypeError
         return {} if form == "symlinks" else []
 
+    def _odb_file_lists(self, repo, index, tgt_env):
+        """
+        Return the files, symlinks and directories of a remote from its tree
+        index, the same way as the file_list and dir_list methods of the
+        provider do from the tree.
+        """
+        files = set()
+        symlinks = {}
+        dirs = set()
+        root = repo.root(tgt_env)
+        mountpoint = repo.mountpoint(tgt_env)
+        prefix = root.rstrip("/") + "/" if root else ""
+
+        def add_mountpoint(path):
+            return salt.utils.path.join(mountpoint, path, use_posixpath=True)
+
+        for entry in index:
+            if not entry.path.startswith(prefix):
+                continue
+            rel = entry.path[len(prefix) :]
+            files.add(add_mountpoint(rel))
+            if entry.is_link:
+                symlinks[add_mountpoint(rel)] = entry.link_target
+            parent = os.path.dirname(rel)
+            while parent and add_mountpoint(parent) not in dirs:
+                dirs.add(add_mountpoint(parent))
+                parent = os.path.dirname(parent)
+        if mountpoint:
+            dirs.add(mountpoint)
+        return files, symlinks, dirs
+
     def file_list(self, load):
         """
         Return a list of all files on the file server in a specified
@@ -3480,6 +3970,7 @@ class GitPillar(GitBase):
         """
         self.pillar_dirs = OrderedDict()
         self.pillar_linked_dirs = []
+        self.pillar_repos = {}
         for repo in self.remotes:
             cachedir = self.do_checkout(repo, fetch_on_fail=fetch_on_fail)
             if cachedir is not None:
@@ -3500,8 +3991,12 @@ class GitPillar(GitBase):
                     if self.link_mountpoint(repo):
                         self.pillar_dirs[repo.get_linkdir()] = env
                         self.pillar_linked_dirs.append(repo.get_linkdir())
+                        self.pillar_repos.setdefault(repo.get_linkdir(), []).append(
+                            repo
+                        )
                 else:
                     self.pillar_dirs[cachedir] = env
+                    self.pillar_repos.setdefault(cachedir, []).append(repo)
 
     def link_mountpoint(self, repo):
         """
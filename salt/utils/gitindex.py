@@ -0,0 +1,182 @@
+"""
+Memory-mapped index of the blobs in a git tree
+
+.. versionadded:: 3008.0
+
+Used by gitfs when :conf_master:`gitfs_serve_from_odb` is enabled to look up
+files by path without walking the tree or writing the blobs to the cache
+directory. An index is written once per tree SHA and opened with ``mmap`` by
+every master worker, so the index data is shared through the page cache
+instead of being copied into each process.
+
+The index file consists of a header, a table of record offsets sorted by path,
+and the records themselves. Each record holds the path of a blob relative to
+the root of the tree, the raw SHA-1 of the blob, its file mode, its size, a
+flag telling whether its contents are binary, and either the hash of its
+contents (for files) or the target (for symlinks).
+"""
+
+import logging
+import mmap
+import os
+import stat
+import struct
+
+import salt.utils.atomicfile
+import salt.utils.files
+import salt.utils.stringutils
+
+log = logging.getLogger(__name__)
+
+MAGIC = b"SGITIDX1"
+_HEADER = struct.Struct("<8sQ")
+_OFFSET = struct.Struct("<Q")
+_PATH_LEN = struct.Struct("<H")
+_FIELDS = struct.Struct("<20sIQBH")
+
+
+class IndexEntry:
+    """
+    A blob found in a :py:class:`TreeIndex`
+    """
+
+    __slots__ = ("path", "blob_sha", "mode", "size", "binary", "extra")
+
+    def __init__(self, path, blob_sha, mode, size, binary, extra):
+        self.path = path
+        self.blob_sha = blob_sha
+        self.mode = mode
+        self.size = size
+        self.binary = binary
+        self.extra = extra
+
+    @property
+    def is_link(self):
+        return stat.S_ISLNK(self.mode)
+
+    @property
+    def hsum(self):
+        """
+        The hash of the contents of a file
+        """
+        return salt.utils.stringutils.to_unicode(self.extra)
+
+    @property
+    def link_target(self):
+        """
+        The target of a symlink
+        """
+        return self.extra
+
+
+def is_binary(data):
+    """
+    Detect if the start of a blob is binary, the same way as
+    :py:func:`salt.utils.files.is_binary` does for files
+    """
+    try:
+        data = data[:2048].decode(__salt_system_encoding__)
+    except UnicodeDecodeError:
+        return True
+    return salt.utils.stringutils.is_binary(data)
+
+
+def write_index(path, entries):
+    """
+    Write an index file from an iterable of :py:class:`IndexEntry` objects
+    """
+    records = []
+    for entry in entries:
+        path_bytes = salt.utils.stringutils.to_bytes(entry.path)
+        extra = salt.utils.stringutils.to_bytes(entry.extra)
+        records.append(
+            (
+                path_bytes,
+                _PATH_LEN.pack(len(path_bytes))
+                + path_bytes
+                + _FIELDS.pack(
+                    bytes.fromhex(entry.blob_sha),
+                    entry.mode,
+                    entry.size,
+                    int(bool(entry.binary)),
+                    len(extra),
+                )
+                + extra,
+            )
+        )
+    records.sort(key=lambda x: x[0])
+    offset = _HEADER.size + _OFFSET.size * len(records)
+    with salt.utils.atomicfile.atomic_open(path, "wb") as fp_:
+        fp_.write(_HEADER.pack(MAGIC, len(records)))
+        for _, record in records:
+            fp_.write(_OFFSET.pack(offset))
+            offset += len(record)
+        for _, record in records:
+            fp_.write(record)
+
+
+class TreeIndex:
+    """
+    A read-only, memory-mapped index file written by :py:func:`write_index`
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with salt.utils.files.fopen(path, "rb") as fp_:
+            if not os.fstat(fp_.fileno()).st_size:
+                raise ValueError(f"Index file {path} is empty")
+            self._map = mmap.mmap(fp_.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a git tree index")
+
+    def __len__(self):
+        return self._count
+
+    def _offset(self, idx):
+        return _OFFSET.unpack_from(self._map, _HEADER.size + idx * _OFFSET.size)[0]
+
+    def _path_at(self, offset):
+        (path_len,) = _PATH_LEN.unpack_from(self._map, offset)
+        start = offset + _PATH_LEN.size
+        return self._map[start : start + path_len]
+
+    def _entry_at(self, offset):
+        path = self._path_at(offset)
+        start = offset + _PATH_LEN.size + len(path)
+        blob_sha, mode, size, binary, extra_len = _FIELDS.unpack_from(self._map, start)
+        start += _FIELDS.size
+        return IndexEntry(
+            salt.utils.stringutils.to_unicode(path),
+            blob_sha.hex(),
+            mode,
+            size,
+            bool(binary),
+            self._map[start : start + extra_len],
+        )
+
+    def lookup(self, path):
+        """
+        Return the :py:class:`IndexEntry` of ``path``, or ``None``
+        """
+        key = salt.utils.stringutils.to_bytes(path)
+        low, high = 0, self._count
+        while low < high:
+            mid = (low + high) // 2
+            offset = self._offset(mid)
+            mid_path = self._path_at(offset)
+            if mid_path == key:
+                return self._entry_at(offset)
+            if mid_path < key:
+                low = mid + 1
+            else:
+                high = mid
+        return None
+
+    def __iter__(self):
+        for idx in range(self._count):
+            yield self._entry_at(self._offset(idx))
+
+    def close(self):
+        self._map.close()
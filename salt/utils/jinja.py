@@ -25,6 +25,7 @@ from jinja2.ext import Extension
 import salt.utils.data
 import salt.utils.files
 import salt.utils.json
+import salt.utils.rendercache
 import salt.utils.stringutils
 import salt.utils.url
 import salt.utils.yaml
@@ -182,6 +183,7 @@ class SaltCacheLoader(BaseLoader):
                     with salt.utils.files.fopen(filepath, "rb") as ifile:
                         contents = ifile.read().decode(self.encoding)
                         mtime = os.path.getmtime(filepath)
+                        salt.utils.rendercache.record_dependency(filepath, mtime)
 
                         def uptodate():
                             try:
@@ -0,0 +1,169 @@
+"""
+A pool of pre-forked processes running the jobs published to a minion
+
+.. versionadded:: 3008.0
+
+When ``multiprocessing`` is enabled the minion runs every job in a process of
+its own, which has to load the execution modules again before running it. With
+``job_pool_size`` set, jobs are handed off to idle workers of a pool instead.
+The workers load the modules once, keep them across the jobs they run and are
+replaced once they ran ``job_pool_max_jobs`` jobs. A job for which no worker is
+idle, or whose function matches ``job_pool_isolate``, still runs in a process
+of its own.
+"""
+
+import logging
+import multiprocessing
+import os
+import signal
+
+import salt.utils.process
+
+log = logging.getLogger(__name__)
+
+
+class JobWorker(salt.utils.process.SignalHandlingProcess):
+    """
+    A process receiving jobs from the pool through a pipe and running them
+    one after the other
+    """
+
+    def __init__(self, init, target, conn, max_jobs=0, **kwargs):
+        super().__init__(**kwargs)
+        self.init = init
+        self.target = target
+        self.conn = conn
+        self.max_jobs = max_jobs
+
+    def run(self):
+        state = self.init()
+        done = 0
+        while True:
+            try:
+                data = self.conn.recv()
+            except (EOFError, OSError):
+                break
+            if data is None:
+                break
+            try:
+                self.target(state, data)
+            except Exception:  # pylint: disable=broad-except
+                log.exception("Job %s failed in %s", data.get("jid"), self.name)
+            done += 1
+            # Tell the pool this worker is idle again, or that it is about to
+            # exit so that no other job is sent to it
+            retire = bool(self.max_jobs) and done >= self.max_jobs
+            try:
+                self.conn.send(retire)
+            except OSError:
+                break
+            if retire:
+                break
+
+
+class _Worker:
+    """
+    The pool's side of a worker
+    """
+
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+        self.busy = False
+        self.retired = False
+
+
+class JobPool:
+    """
+    Run jobs in a pool of ``size`` workers. ``init`` is called once in every
+    worker and its return value is passed to ``target`` along with the data of
+    each job the worker runs.
+    """
+
+    def __init__(
+        self, size, init, target, max_jobs=0, name="JobWorker", subprocess_list=None
+    ):
+        self.size = size
+        self.init = init
+        self.target = target
+        self.max_jobs = max_jobs
+        self.name = name
+        self.subprocess_list = subprocess_list
+        self.workers = []
+        self._spawned = 0
+        self._pid = os.getpid()
+
+    def _spawn(self):
+        conn, child_conn = multiprocessing.Pipe()
+        self._spawned += 1
+        with salt.utils.process.default_signals(signal.SIGINT, signal.SIGTERM):
+            # Reset current signals before starting the process in order not
+            # to inherit the current signal handlers
+            process = JobWorker(
+                self.init,
+                self.target,
+                child_conn,
+                max_jobs=self.max_jobs,
+                name=f"{self.name}-{self._spawned}",
+            )
+            process.start()
+        child_conn.close()
+        if self.subprocess_list is not None:
+            self.subprocess_list.add(process)
+        self.workers.append(_Worker(process, conn))
+
+    def _reap(self):
+        """
+        Collect the workers which finished their job, replace those which
+        exited and start the pool if needed
+        """
+        for worker in list(self.workers):
+            try:
+                while worker.conn.poll():
+                    worker.busy = False
+                    if worker.conn.recv():
+                        worker.retired = True
+            except (EOFError, OSError):
+                worker.retired = True
+            if worker.retired or not worker.process.is_alive():
+                self.workers.remove(worker)
+                worker.conn.close()
+        while len(self.workers) < self.size:
+            self._spawn()
+
+    def submit(self, data):
+        """
+        Hand the job off to an idle worker. Returns ``False`` when all of the
+        workers are busy.
+        """
+        self._reap()
+        for worker in self.workers:
+            if worker.busy:
+                continue
+            try:
+                worker.conn.send(data)
+            except (OSError, ValueError) as exc:
+                log.debug("Unable to send job to %s: %s", worker.process.name, exc)
+                worker.retired = True
+                continue
+            worker.busy = True
+            log.debug("Job %s handed off to %s", data.get("jid"), worker.process.name)
+            return True
+        return False
+
+    def stop(self):
+        """
+        Stop the workers once they are done with their current job
+        """
+        if os.getpid() != self._pid:
+            # Only the process which started the workers may stop them, not
+            # a job process forked from it
+            self.workers = []
+            return
+        for worker in self.workers:
+            try:
+                worker.conn.send(None)
+            except (OSError, ValueError):
+                pass
+            worker.conn.close()
+        self.workers = []
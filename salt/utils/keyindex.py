@@ -0,0 +1,189 @@
+"""
+In-memory index of the minion keys stored in the master's PKI directory.
+
+The index remembers the contents of the ``minions``, ``minions_pre``,
+``minions_rejected`` and ``minions_denied`` directories, the public keys read
+from them and, for accepted keys, the parsed key objects. Everything is
+validated against the modification time of the directory or file it was read
+from, so changes made by other processes, the key wheel or ``salt-key`` are
+picked up on the next lookup, while unchanged keys are neither listed, read
+nor parsed again.
+
+There is one index per PKI directory and process. The master fills it before
+forking its workers, so they start with the keys already read.
+"""
+
+import logging
+import os
+import threading
+import time
+
+import salt.crypt
+import salt.utils.data
+import salt.utils.files
+import salt.utils.stringutils
+
+log = logging.getLogger(__name__)
+
+ACC = "minions"
+PEND = "minions_pre"
+REJ = "minions_rejected"
+DEN = "minions_denied"
+KEY_DIRS = (ACC, PEND, REJ, DEN)
+
+# Entries modified less than this many nanoseconds before they were read are
+# not cached, since a file system with a coarse timestamp granularity could
+# record a later change with the same modification time.
+RACY_WINDOW = 2 * 10**9
+
+_INDEXES = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_index(pki_dir):
+    """
+    Return the key index of the given PKI directory
+    """
+    with _INDEXES_LOCK:
+        if pki_dir not in _INDEXES:
+            _INDEXES[pki_dir] = KeyIndex(pki_dir)
+        return _INDEXES[pki_dir]
+
+
+def _stamp(path):
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+def _settled(stamp):
+    return time.time_ns() - stamp[0] > RACY_WINDOW
+
+
+class KeyIndex:
+    """
+    The minion keys of a PKI directory and their state
+    """
+
+    def __init__(self, pki_dir):
+        self.pki_dir = pki_dir
+        self._lock = threading.RLock()
+        # key dir -> (stamp, (sorted key names, set of key names))
+        self._dirs = {}
+        # (key dir, minion id) -> [stamp, public key string, parsed key]
+        self._keys = {}
+
+    def _listing(self, keydir):
+        path = os.path.join(self.pki_dir, keydir)
+        with self._lock:
+            try:
+                stamp = _stamp(path)
+            except OSError:
+                self._dirs.pop(keydir, None)
+                return None
+            cached = self._dirs.get(keydir)
+            if cached is not None and cached[0] == stamp:
+                return cached[1]
+            try:
+                names = tuple(
+                    salt.utils.data.sorted_ignorecase(
+                        salt.utils.stringutils.to_unicode(fn_)
+                        for fn_ in os.listdir(path)
+                        if not fn_.startswith(".")
+                    )
+                )
+            except OSError:
+                return None
+            listing = (names, frozenset(names))
+            if _settled(stamp):
+                self._dirs[keydir] = (stamp, listing)
+            else:
+                self._dirs.pop(keydir, None)
+            return listing
+
+    def names(self, keydir):
+        """
+        Return the sorted names of the keys in a key directory, or None if the
+        directory does not exist
+        """
+        listing = self._listing(keydir)
+        return None if listing is None else listing[0]
+
+    def contains(self, keydir, minion_id):
+        """
+        Return whether a key directory holds the key of a minion
+        """
+        listing = self._listing(keydir)
+        return listing is not None and minion_id in listing[1]
+
+    def state(self, minion_id):
+        """
+        Return the key directory holding the key of a minion, looking at the
+        rejected, accepted and pending keys in that order, or None if the
+        minion has no such key
+        """
+        for keydir in (REJ, ACC, PEND):
+            if self.contains(keydir, minion_id):
+                return keydir
+        return None
+
+    def list_keys(self):
+        """
+        Return a dict of the key names in each key directory, the directories
+        which do not exist yet are empty
+        """
+        return {keydir: list(self.names(keydir) or ()) for keydir in KEY_DIRS}
+
+    def _entry(self, keydir, minion_id):
+        path = os.path.join(self.pki_dir, keydir, minion_id)
+        try:
+            stamp = _stamp(path)
+        except OSError:
+            self._keys.pop((keydir, minion_id), None)
+            return None
+        entry = self._keys.get((keydir, minion_id))
+        if entry is not None and entry[0] == stamp:
+            return entry
+        try:
+            with salt.utils.files.fopen(path, "r") as fp_:
+                pub = fp_.read()
+        except OSError:
+            return None
+        entry = [stamp, pub, None]
+        if _settled(stamp):
+            self._keys[(keydir, minion_id)] = entry
+        else:
+            self._keys.pop((keydir, minion_id), None)
+        return entry
+
+    def pub(self, keydir, minion_id):
+        """
+        Return the public key of a minion stored in a key directory, or None
+        if it cannot be read
+        """
+        with self._lock:
+            entry = self._entry(keydir, minion_id)
+            return None if entry is None else entry[1]
+
+    def public_key(self, minion_id):
+        """
+        Return the parsed accepted public key of a minion
+
+        Raises ``salt.crypt.InvalidKeyError`` if the key cannot be parsed.
+        """
+        with self._lock:
+            entry = self._entry(ACC, minion_id)
+            if entry is not None and entry[2] is not None:
+                return entry[2]
+            key = salt.crypt.PublicKey(os.path.join(self.pki_dir, ACC, minion_id))
+            if entry is not None:
+                entry[2] = key
+            return key
+
+    def load(self):
+        """
+        Read the key directories and the accepted public keys into the index
+        """
+        for minion_id in self.names(ACC) or ():
+            self.pub(ACC, minion_id)
+        for keydir in KEY_DIRS[1:]:
+            self.names(keydir)
@@ -18,6 +18,7 @@ import salt.payload
 import salt.pillar
 import salt.utils.atomicfile
 import salt.utils.files
+import salt.utils.mine
 import salt.utils.minions
 import salt.utils.platform
 import salt.utils.stringutils
@@ -240,12 +241,14 @@ class MasterPillarUtil:
             return mine_data
         if not minion_ids:
             minion_ids = self.cache.list("minions")
-        for minion_id in minion_ids:
-            if not salt.utils.verify.valid_id(self.opts, minion_id):
-                continue
-            mdata = self.cache.fetch(f"minions/{minion_id}", "mine")
-            if isinstance(mdata, dict):
-                mine_data[minion_id] = mdata
+        minion_ids = [
+            minion_id
+            for minion_id in minion_ids
+            if salt.utils.verify.valid_id(self.opts, minion_id)
+        ]
+        mine_data.update(
+            salt.utils.mine.fetch_mine_data(self.cache, self.opts, minion_ids)
+        )
         return mine_data
 
     def _get_cached_minion_data(self, *minion_ids):
@@ -572,13 +575,12 @@ class MasterPillarUtil:
                     self.cache.store(bank, "data", {"pillar": minion_pillar})
                 if clear_mine:
                     # Delete the whole mine file
-                    self.cache.flush(bank, "mine")
+                    salt.utils.mine.flush_mine_data(self.cache, self.opts, minion_id)
                 elif clear_mine_func is not None:
                     # Delete a specific function from the mine file
-                    mine_data = self.cache.fetch(bank, "mine")
-                    if isinstance(mine_data, dict):
-                        if mine_data.pop(clear_mine_func, False):
-                            self.cache.store(bank, "mine", mine_data)
+                    salt.utils.mine.delete_mine_function(
+                        self.cache, self.opts, minion_id, clear_mine_func
+                    )
         except OSError:
             return True
         return True
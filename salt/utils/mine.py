@@ -107,3 +107,156 @@ def parse_function_definition(function_definition):
     )
 
     return (function_name, function_args, function_kwargs, minion_acl)
+
+
+def _per_function(opts):
+    return opts.get("mine_cache_per_function", False)
+
+
+def _mine_bank(minion_id):
+    return f"minions/{minion_id}/mine"
+
+
+def store_mine_data(cache, opts, minion_id, mine_data, clear=False):
+    """
+    Helper function to store the mine data of a minion in the master's cache.
+
+    With ``mine_cache_per_function`` every function is kept under its own key
+    in the ``minions/<minion_id>/mine`` bank, so that only the functions in
+    ``mine_data`` are written. Otherwise the ``mine`` key of the
+    ``minions/<minion_id>`` bank holds all of the functions of the minion.
+
+    :param cache: The master's cache.
+    :param dict opts: The master's configuration.
+    :param str minion_id: The minion the mine data originated from.
+    :param dict mine_data: Dictionary with function_name: function_data to store.
+    :param bool clear: Whether or not to replace (`True`) all of the mine data
+        of the minion with ``mine_data``, or update it (`False`).
+    """
+    cbank = f"minions/{minion_id}"
+    if not _per_function(opts):
+        data = mine_data
+        if not clear:
+            data = cache.fetch(cbank, "mine")
+            if isinstance(data, dict):
+                data.update(mine_data)
+            else:
+                data = mine_data
+        cache.store(cbank, "mine", data)
+        return
+    mine_bank = _mine_bank(minion_id)
+    if clear:
+        cache.flush(mine_bank)
+    if cache.contains(cbank, "mine"):
+        # Move the functions stored before mine_cache_per_function was enabled
+        if not clear:
+            legacy = cache.fetch(cbank, "mine")
+            if isinstance(legacy, dict):
+                for function, function_data in legacy.items():
+                    if function not in mine_data:
+                        cache.store(mine_bank, function, function_data)
+        cache.flush(cbank, "mine")
+    for function, function_data in mine_data.items():
+        cache.store(mine_bank, function, function_data)
+
+
+def fetch_mine_data(cache, opts, minion_ids, functions=None):
+    """
+    Helper function to fetch the mine data of several minions from the master's
+    cache.
+
+    When ``functions`` are given, every one of them is read for all of the
+    minions with a single bulk read of the cache.
+
+    :param cache: The master's cache.
+    :param dict opts: The master's configuration.
+    :param list minion_ids: The minions to fetch the mine data of.
+    :param list functions: The functions to fetch, all of them if not given.
+
+    :rtype: dict
+    :return: Dictionary with minion_id as first level key, and mine function
+        as 2nd level key. Minions without mine data are left out.
+    """
+    ret = {}
+    if not _per_function(opts):
+        banks = {f"minions/{minion_id}": minion_id for minion_id in minion_ids}
+        for bank, data in cache.fetch_many(banks, "mine").items():
+            if not isinstance(data, dict):
+                continue
+            if functions is not None:
+                data = {
+                    function: data[function]
+                    for function in functions
+                    if function in data
+                }
+            if data:
+                ret[banks[bank]] = data
+        return ret
+    banks = {_mine_bank(minion_id): minion_id for minion_id in minion_ids}
+    if functions is None:
+        for bank, minion_id in banks.items():
+            for function in cache.list(bank):
+                try:
+                    data = cache.fetch(bank, function)
+                except KeyError:
+                    # The function was deleted since the bank was listed. The
+                    # localfs driver then looks the function up in the mine.p
+                    # file of the old layout, which does not hold it.
+                    continue
+                ret.setdefault(minion_id, {})[function] = data
+    else:
+        for function in functions:
+            for bank, data in cache.fetch_many(banks, function).items():
+                ret.setdefault(banks[bank], {})[function] = data
+    # Fall back to the mine data stored before mine_cache_per_function was
+    # enabled for the minions which have not updated their mine since
+    legacy = [
+        minion_id
+        for bank, minion_id in banks.items()
+        if minion_id not in ret and not cache.contains(bank)
+    ]
+    if legacy:
+        opts = dict(opts, mine_cache_per_function=False)
+        ret.update(fetch_mine_data(cache, opts, legacy, functions))
+    return ret
+
+
+def delete_mine_function(cache, opts, minion_id, function):
+    """
+    Helper function to delete one function from the mine data of a minion in
+    the master's cache.
+
+    :param cache: The master's cache.
+    :param dict opts: The master's configuration.
+    :param str minion_id: The minion whose mine data to delete the function from.
+    :param str function: The function to delete.
+
+    :rtype: bool
+    :return: Whether there was mine data for the minion.
+    """
+    cbank = f"minions/{minion_id}"
+    if _per_function(opts) and cache.contains(_mine_bank(minion_id)):
+        cache.flush(_mine_bank(minion_id), function)
+        return True
+    data = cache.fetch(cbank, "mine")
+    if not isinstance(data, dict):
+        return False
+    if function in data:
+        del data[function]
+        cache.store(cbank, "mine", data)
+    return True
+
+
+def flush_mine_data(cache, opts, minion_id):
+    """
+    Helper function to delete all of the mine data of a minion in the master's
+    cache.
+
+    :param cache: The master's cache.
+    :param dict opts: The master's configuration.
+    :param str minion_id: The minion whose mine data to delete.
+    """
+    ret = cache.flush(f"minions/{minion_id}", "mine")
+    # The functions stored with mine_cache_per_function are flushed even if it
+    # has been disabled since
+    return cache.flush(_mine_bank(minion_id)) or ret
@@ -12,14 +12,21 @@ import salt.cache
 import salt.payload
 import salt.roster
 import salt.transport
+import salt.utils.channel
 import salt.utils.data
 import salt.utils.files
+import salt.utils.keyindex
 import salt.utils.network
+import salt.utils.process
 import salt.utils.stringutils
 import salt.utils.versions
 from salt._compat import ipaddress
 from salt.defaults import DEFAULT_TARGET_DELIM
-from salt.exceptions import CommandExecutionError, SaltCacheError
+from salt.exceptions import (
+    CommandExecutionError,
+    SaltCacheError,
+    SaltDeserializationError,
+)
 
 HAS_RANGE = False
 try:
@@ -41,6 +48,9 @@ TARGET_REX = re.compile(
         (?P<pattern>.+)$"""  # The pattern passed to the target engine
 )
 
+# path -> ((mtime, size), present) of the presence files read so far
+_PRESENCE_FILES = {}
+
 
 def _nodegroup_regex(nodegroup, words, opers):
     opers_set = set(opers)
@@ -196,6 +206,59 @@ def nodegroup_comp(nodegroup, nodegroups, skip=None, first_call=True):
         return ret
 
 
+def presence_path(opts):
+    """
+    Return the path of the file in which the publish daemon serving the given
+    transport options records the connected minions
+    """
+    name = "presence_{}_{}.p".format(opts["transport"], opts["publish_port"])
+    return os.path.join(opts["cachedir"], name)
+
+
+def _read_presence_file(path):
+    """
+    Return the minions recorded in a presence file, or None if the file does
+    not exist or the publish daemon which wrote it is gone
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _PRESENCE_FILES.get(path)
+    if cached is None or cached[0] != key:
+        try:
+            with salt.utils.files.fopen(path, "rb") as fp_:
+                data = salt.payload.load(fp_)
+        except (OSError, SaltDeserializationError) as exc:
+            log.debug("Unable to read presence file %s: %s", path, exc)
+            return None
+        if not isinstance(data, dict) or "present" not in data:
+            return None
+        cached = _PRESENCE_FILES[path] = (key, data)
+    data = cached[1]
+    if not data.get("pid") or not salt.utils.process.os_is_running(data["pid"]):
+        return None
+    return data["present"]
+
+
+def read_presence(opts):
+    """
+    Return a dict mapping the ids of the minions connected to the publish
+    daemons to the address they connect from, or None if the connections are
+    not tracked by every configured transport
+    """
+    if not opts.get("transport_presence", False):
+        return None
+    present = {}
+    for _, t_opts in salt.utils.channel.iter_transport_opts(opts):
+        data = _read_presence_file(presence_path(t_opts))
+        if data is None:
+            return None
+        present.update(data)
+    return present
+
+
 class CkMinions:
     """
     Used to check what minions should respond from a target
@@ -262,6 +325,9 @@ class CkMinions:
         Retrieve complete minion list from PKI dir.
         Respects cache if configured
         """
+        if self.opts.get("key_index", False):
+            index = salt.utils.keyindex.get_index(self.pki_dir)
+            return list(index.names(self.acc) or ())
         minions = []
         pki_cache_fn = os.path.join(self.pki_dir, self.acc, ".key_cache")
         try:
@@ -626,6 +692,13 @@ class CkMinions:
         Return a set of all connected minion ids, optionally within a subset
         """
         minions = set()
+        present = read_presence(self.opts)
+        if present is not None:
+            if subset:
+                present = {id_: present[id_] for id_ in subset if id_ in present}
+            if show_ip:
+                return set(present.items())
+            return set(present)
         if self.opts.get("minion_data_cache", False):
             search = self.cache.list("minions")
             if search is None:
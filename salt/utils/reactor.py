@@ -2,13 +2,18 @@
 Functions which implement running reactor jobs
 """
 
+import collections
+import copy
 import fnmatch
 import glob
 import logging
 import os
+import threading
+import time
 
 import salt.client
 import salt.defaults.exitcodes
+import salt.payload
 import salt.runner
 import salt.state
 import salt.utils.args
@@ -18,6 +23,7 @@ import salt.utils.event
 import salt.utils.files
 import salt.utils.master
 import salt.utils.process
+import salt.utils.rendercache
 import salt.utils.yaml
 import salt.wheel
 
@@ -27,6 +33,84 @@ REACTOR_INTERNAL_KEYWORDS = frozenset(
     ["__id__", "__sls__", "name", "order", "fun", "key", "state"]
 )
 
+# The target types whose targets can be combined into a list of minion ids
+MERGEABLE_TGT_TYPES = ("glob", "list")
+
+
+class _TagTrieNode:
+    __slots__ = ("children", "entries")
+
+    def __init__(self):
+        self.children = {}
+        self.entries = []
+
+
+class TagIndex:
+    """
+    Index of the reactor configuration which returns the reactors of an event
+    tag without matching the tag against every configured glob.
+
+    The globs are stored in a trie keyed by their literal prefix, the part
+    before their first wildcard. Looking up a tag walks the trie along the
+    characters of the tag, so that only the globs whose literal prefix the tag
+    starts with are matched. The reactors of the most recently seen tags are
+    memoized.
+
+    .. versionadded:: 3008.0
+    """
+
+    def __init__(self, react_map, cache_size=10000):
+        self._root = _TagTrieNode()
+        self._cache = collections.OrderedDict()
+        self._cache_size = cache_size
+        for order, ropt in enumerate(react_map):
+            if not isinstance(ropt, dict):
+                continue
+            if len(ropt) != 1:
+                continue
+            key = next(iter(ropt.keys()))
+            val = ropt[key]
+            if isinstance(val, str):
+                val = [val]
+            elif not isinstance(val, list):
+                continue
+            node = self._root
+            for char in self._literal_prefix(str(key)):
+                node = node.children.setdefault(char, _TagTrieNode())
+            node.entries.append((order, str(key), val))
+
+    @staticmethod
+    def _literal_prefix(pattern):
+        for idx, char in enumerate(pattern):
+            if char in "*?[":
+                return pattern[:idx]
+        return pattern
+
+    def match(self, tag):
+        """
+        Return the list of the reactors configured for ``tag``
+        """
+        try:
+            self._cache.move_to_end(tag)
+            return list(self._cache[tag])
+        except KeyError:
+            pass
+        candidates = list(self._root.entries)
+        node = self._root
+        for char in tag:
+            node = node.children.get(char)
+            if node is None:
+                break
+            candidates.extend(node.entries)
+        reactors = []
+        for _, pattern, val in sorted(candidates, key=lambda entry: entry[0]):
+            if fnmatch.fnmatch(tag, pattern):
+                reactors.extend(val)
+        self._cache[tag] = tuple(reactors)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return reactors
+
 
 class Reactor(salt.utils.process.SignalHandlingProcess, salt.state.Compiler):
     """
@@ -47,6 +131,15 @@ class Reactor(salt.utils.process.SignalHandlingProcess, salt.state.Compiler):
         self.minion = salt.minion.MasterMinion(local_minion_opts)
         salt.state.Compiler.__init__(self, opts, self.minion.rend)
         self.is_leader = True
+        self._tag_index = None
+        self._react_map_source = None
+        self.render_cache = None
+        if opts.get("reactor_render_cache", False):
+            self.render_cache = salt.utils.rendercache.RenderCache(
+                opts.get("render_cache_size", 1000),
+                referenced_only=True,
+                jinja_env=opts.get("jinja_sls_env") or opts.get("jinja_env"),
+            )
 
     def render_reaction(self, glob_ref, tag, data):
         """
@@ -66,7 +159,9 @@ class Reactor(salt.utils.process.SignalHandlingProcess, salt.state.Compiler):
             )
         for fn_ in globbed_ref:
             try:
-                res = self.render_template(fn_, tag=tag, data=data)
+                res = self.render_template(
+                    fn_, tag=tag, data=data, render_cache=self.render_cache
+                )
 
                 # for #20841, inject the sls name here since verify_high()
                 # assumes it exists in case there are any errors
@@ -84,32 +179,41 @@ class Reactor(salt.utils.process.SignalHandlingProcess, salt.state.Compiler):
         process
         """
         log.debug("Gathering reactors for tag %s", tag)
-        reactors = []
+        return self.tag_index().match(tag)
+
+    def tag_index(self):
+        """
+        Return the :py:class:`TagIndex` of the reactor configuration, building
+        it again when the configuration changed
+        """
         if isinstance(self.opts["reactor"], str):
+            try:
+                stat = os.stat(self.opts["reactor"])
+                source = (self.opts["reactor"], stat.st_mtime, stat.st_size)
+            except OSError:
+                source = None
+            if source is not None and source == self._react_map_source:
+                return self._tag_index
+            react_map = []
             try:
                 with salt.utils.files.fopen(self.opts["reactor"]) as fp_:
-                    react_map = salt.utils.yaml.safe_load(fp_)
+                    react_map = salt.utils.yaml.safe_load(fp_) or []
             except OSError:
                 log.error('Failed to read reactor map: "%s"', self.opts["reactor"])
+                source = None
             except Exception:  # pylint: disable=broad-except
                 log.error(
                     'Failed to parse YAML in reactor map: "%s"', self.opts["reactor"]
                 )
+                source = None
         else:
             react_map = self.opts["reactor"]
-        for ropt in react_map:
-            if not isinstance(ropt, dict):
-                continue
-            if len(ropt) != 1:
-                continue
-            key = next(iter(ropt.keys()))
-            val = ropt[key]
-            if fnmatch.fnmatch(tag, key):
-                if isinstance(val, str):
-                    reactors.append(val)
-                elif isinstance(val, list):
-                    reactors.extend(val)
-        return reactors
+            if self._tag_index is not None and react_map == self._react_map_source:
+                return self._tag_index
+            source = copy.deepcopy(react_map)
+        self._tag_index = TagIndex(react_map)
+        self._react_map_source = source
+        return self._tag_index
 
     def list_all(self):
         """
@@ -228,7 +332,18 @@ class Reactor(salt.utils.process.SignalHandlingProcess, salt.state.Compiler):
         ) as event:
             self.wrap = ReactWrap(self.opts)
 
-            for data in event.iter_events(full=True):
+            for data in event.iter_events(full=True, wait=1):
+                # send out the reactions held back by their debounce or
+                # concurrency settings which are due
+                self.wrap.flush()
+                if data is None:
+                    continue
+
+                if data["tag"].startswith("salt/job/") and "/ret/" in data["tag"]:
+                    self.wrap.job_returned(
+                        data["data"].get("jid"), data["data"].get("id")
+                    )
+
                 # skip all events fired by ourselves
                 if data["data"].get("user") == self.wrap.event_user:
                     continue
@@ -316,6 +431,16 @@ class ReactWrap:
             self.opts["reactor_worker_threads"],  # number of workers for runner/wheel
             queue_size=self.opts["reactor_worker_hwm"],  # queue size for those workers
         )
+        # Reactions held back by their debounce or concurrency settings
+        self._held = collections.OrderedDict()
+        # The number of running jobs of the reactions with a concurrency cap
+        self._running = collections.Counter()
+        self._running_lock = threading.Lock()
+        # jid: [reaction, minions which did not return yet, deadline]
+        self._jobs = {}
+        # The reaction whose held back jobs are being started
+        self._tracking = None
+        self._started = False
 
     def populate_client_cache(self, low):
         """
@@ -346,10 +471,167 @@ class ReactWrap:
                 )
         # pylint: enable=unsupported-membership-test,unsupported-assignment-operation
 
+    @staticmethod
+    def _tgt_list(tgt, tgt_type):
+        """
+        Return ``tgt`` as a list of minion ids, or ``None`` if it is not one
+        """
+        if tgt_type not in MERGEABLE_TGT_TYPES:
+            return None
+        if tgt_type == "list":
+            if isinstance(tgt, str):
+                tgt = tgt.split(",")
+            if not isinstance(tgt, (list, tuple)):
+                return None
+            tgts = [str(item) for item in tgt]
+        elif isinstance(tgt, str):
+            tgts = [tgt]
+        else:
+            return None
+        if any(char in item for item in tgts for char in "*?[,"):
+            return None
+        return tgts
+
+    def hold(self, low):
+        """
+        Hold back a reaction with ``debounce`` or ``concurrency`` settings
+
+        The reactions rendered from the same SLS and ID which are identical but
+        for their target are collected for ``debounce`` seconds and started as
+        one job. The targets of ``local`` reactions which are minion ids are
+        combined into a list. At most ``concurrency`` jobs of the reaction
+        run at once, the reactions received in the meantime are held back
+        until one of them finished.
+        """
+        low = dict(low)
+        debounce = low.pop("debounce", 0) or 0
+        concurrency = low.pop("concurrency", 0) or 0
+        reaction = (low.get("__sls__"), low.get("__id__"))
+        tgts = None
+        if low["state"] == "local":
+            tgts = self._tgt_list(low.get("tgt"), low.get("tgt_type", "glob"))
+        ident = {
+            key: val
+            for key, val in low.items()
+            if tgts is None or key not in ("tgt", "tgt_type")
+        }
+        try:
+            key = (reaction, salt.payload.dumps(ident))
+        except Exception:  # pylint: disable=broad-except
+            log.warning(
+                "Reactor '%s' cannot be held back, running it now", low["__id__"]
+            )
+            self.run(low)
+            return
+        bucket = self._held.get(key)
+        if bucket is None:
+            bucket = self._held[key] = {
+                "low": low,
+                "tgts": [],
+                "count": 0,
+                "due": time.time() + debounce,
+                "reaction": reaction,
+                "concurrency": concurrency,
+            }
+        bucket["count"] += 1
+        for tgt in tgts or ():
+            if tgt not in bucket["tgts"]:
+                bucket["tgts"].append(tgt)
+        self.flush()
+
+    def flush(self):
+        """
+        Start the jobs of the held back reactions which are due
+        """
+        if not self._held and not self._jobs:
+            return
+        now = time.time()
+        for jid, job in list(self._jobs.items()):
+            if job[2] <= now:
+                log.debug("Reactor job %s timed out, not waiting for it anymore", jid)
+                del self._jobs[jid]
+                self._release(job[0])
+        for key, bucket in list(self._held.items()):
+            if bucket["due"] > now:
+                continue
+            if bucket["concurrency"]:
+                with self._running_lock:
+                    if self._running[bucket["reaction"]] >= bucket["concurrency"]:
+                        continue
+                    self._running[bucket["reaction"]] += 1
+            del self._held[key]
+            self._start(bucket)
+
+    def _start(self, bucket):
+        low = bucket["low"]
+        if len(bucket["tgts"]) > 1:
+            low["tgt"] = bucket["tgts"]
+            low["tgt_type"] = "list"
+        if bucket["count"] > 1:
+            log.debug(
+                "Reactor '%s' collapsed %d reactions into one",
+                low["__id__"],
+                bucket["count"],
+            )
+        if not bucket["concurrency"]:
+            self.run(low)
+            return
+        self._tracking = bucket["reaction"]
+        self._started = False
+        try:
+            self.run(low)
+        finally:
+            self._tracking = None
+            if not self._started:
+                # The job was not started or has already finished
+                self._release(bucket["reaction"])
+
+    def _release(self, reaction):
+        with self._running_lock:
+            self._running[reaction] -= 1
+            if self._running[reaction] <= 0:
+                del self._running[reaction]
+
+    def job_returned(self, jid, minion):
+        """
+        Record the return of a minion to a job started by a reaction with a
+        concurrency cap
+        """
+        job = self._jobs.get(jid)
+        if job is None:
+            return
+        job[1].discard(minion)
+        if not job[1]:
+            del self._jobs[jid]
+            self._release(job[0])
+
+    def _fire_async(self, func, args):
+        """
+        Run ``func`` in the thread pool, keeping track of when it finished if
+        it is the job of a reaction with a concurrency cap
+        """
+        reaction = self._tracking
+        if reaction is None:
+            return self.pool.fire_async(func, args=args)
+
+        def _tracked(*args):
+            try:
+                return func(*args)
+            finally:
+                self._release(reaction)
+
+        ret = self.pool.fire_async(_tracked, args=args)
+        if ret is not False:
+            self._started = True
+        return ret
+
     def run(self, low):
         """
         Execute a reaction by invoking the proper wrapper func
         """
+        if "debounce" in low or "concurrency" in low:
+            self.hold(low)
+            return
         self.populate_client_cache(low)
         try:
             l_fun = getattr(self, low["state"])
@@ -473,19 +755,29 @@ class ReactWrap:
         """
         Wrap RunnerClient for executing :ref:`runner modules <all-salt.runners>`
         """
-        return self.pool.fire_async(self.client_cache["runner"].low, args=(fun, kwargs))
+        return self._fire_async(self.client_cache["runner"].low, (fun, kwargs))
 
     def wheel(self, fun, **kwargs):
         """
         Wrap Wheel to enable executing :ref:`wheel modules <all-salt.wheel>`
         """
-        return self.pool.fire_async(self.client_cache["wheel"].low, args=(fun, kwargs))
+        return self._fire_async(self.client_cache["wheel"].low, (fun, kwargs))
 
     def local(self, fun, tgt, **kwargs):
         """
         Wrap LocalClient for running :ref:`execution modules <all-salt.modules>`
         """
-        self.client_cache["local"].cmd_async(tgt, fun, **kwargs)
+        if self._tracking is None:
+            self.client_cache["local"].cmd_async(tgt, fun, **kwargs)
+            return
+        pub_data = self.client_cache["local"].run_job(tgt, fun, listen=False, **kwargs)
+        if pub_data and pub_data.get("jid") and pub_data.get("minions"):
+            self._jobs[pub_data["jid"]] = [
+                self._tracking,
+                set(pub_data["minions"]),
+                time.time() + self.opts.get("reactor_job_timeout", 300),
+            ]
+            self._started = True
 
     def caller(self, fun, **kwargs):
         """
@@ -0,0 +1,518 @@
+"""
+Cache template render results across renders that see the same inputs
+
+.. versionadded:: 3008.0
+
+Many SLS and pillar files render identically for large groups of minions. A
+``map.jinja`` driven file, for example, usually only depends on a handful of
+grains such as ``os_family``. When the ``render_cache`` option is enabled,
+:py:func:`salt.template.compile_template` activates a :py:class:`RenderCache`
+for the duration of a render. Template renderers wrap the values of their
+context in tracking objects which record exactly which grains, pillar keys,
+options and pure execution functions the template read, together with the
+modification times of any file it imported. A later render of the same
+template source is served from the cache when all those recorded inputs
+still produce the same values.
+
+Renders which call execution functions that are not known to be free of side
+effects (anything other than :py:data:`PURE_FUNCTIONS`) are never cached.
+"""
+
+import collections
+import contextlib
+import contextvars
+import copy
+import hashlib
+import logging
+import os
+import threading
+
+import jinja2
+import jinja2.meta
+
+import salt.utils.msgpack
+import salt.utils.stringutils
+
+log = logging.getLogger(__name__)
+
+# Execution functions whose result only depends on their arguments and on the
+# grains/pillar/opts of the loader. Calls to these functions are recorded as
+# render inputs instead of making the render uncacheable.
+PURE_FUNCTIONS = frozenset(
+    (
+        "grains.get",
+        "grains.item",
+        "grains.filter_by",
+        "pillar.get",
+        "pillar.item",
+        "config.get",
+    )
+)
+
+# The context keys holding loader objects. Any access to these, except for
+# calls to ``PURE_FUNCTIONS`` on ``salt``, makes the render uncacheable.
+IMPURE_CONTEXT_KEYS = frozenset(("salt", "proxy"))
+
+# Renderers which turn text into data without consulting anything but their
+# input. Their results are cached by the digest of their input.
+DATA_RENDERERS = frozenset(("yaml", "yamlex", "json", "json5", "hjson", "toml"))
+
+# The maximum number of different input combinations kept per template
+MAX_VARIANTS = 32
+
+_ACTIVE_CACHE = contextvars.ContextVar("render_cache", default=None)
+_ACTIVE_TRACKER = contextvars.ContextVar("render_tracker", default=None)
+
+_RENDER_CACHE = None
+_RENDER_CACHE_LOCK = threading.Lock()
+
+_WHOLE = "__whole__"
+_MISSING = "__missing__"
+
+# The options of the jinja environment which change how a template is parsed
+_JINJA_SYNTAX_OPTIONS = (
+    "block_start_string",
+    "block_end_string",
+    "variable_start_string",
+    "variable_end_string",
+    "comment_start_string",
+    "comment_end_string",
+    "line_statement_prefix",
+    "line_comment_prefix",
+)
+
+
+class Uncacheable(Exception):
+    """
+    Raised when a value which is part of a render's inputs cannot be digested
+    """
+
+
+def digest(value):
+    """
+    Return a stable digest of a msgpack serializable value
+    """
+    try:
+        packed = salt.utils.msgpack.packb(value, use_bin_type=True)
+    except (TypeError, ValueError, OverflowError) as exc:
+        raise Uncacheable(str(exc))
+    return hashlib.sha256(packed).hexdigest()
+
+
+class RenderTracker:
+    """
+    Record the inputs read during a single template render
+    """
+
+    def __init__(self):
+        self.reads = {}
+        self.calls = {}
+        self.deps = {}
+        self.pure = True
+
+    def read(self, name, key, value):
+        if not self.pure or (name, key) in self.reads:
+            return
+        try:
+            self.reads[(name, key)] = digest(value)
+        except Uncacheable:
+            self.taint(f"{name}[{key!r}] cannot be serialized")
+
+    def call(self, fun, args, kwargs, value):
+        if not self.pure:
+            return
+        try:
+            self.calls[digest([fun, args, kwargs])] = (fun, args, kwargs, digest(value))
+        except Uncacheable:
+            self.taint(f"the call to {fun} cannot be serialized")
+
+    def depend(self, path, mtime):
+        self.deps[path] = mtime
+
+    def taint(self, reason):
+        if self.pure:
+            log.trace("Render is not cacheable: %s", reason)
+        self.pure = False
+
+
+class TrackedDict(dict):
+    """
+    A dict which records every key read from it into a :py:class:`RenderTracker`
+
+    Only the top level keys are tracked, the digest of a read key covers its
+    whole value. Any operation which exposes all of the keys records the
+    whole dict as read.
+    """
+
+    def __init__(self, data, name, tracker):
+        super().__init__(data)
+        self._name = name
+        self._tracker = tracker
+
+    def _read_whole(self):
+        self._tracker.read(self._name, _WHOLE, dict(super().items()))
+
+    def __getitem__(self, key):
+        try:
+            value = super().__getitem__(key)
+        except KeyError:
+            self._tracker.read(self._name, key, _MISSING)
+            raise
+        self._tracker.read(self._name, key, value)
+        return value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        self._read_whole()
+        return super().__iter__()
+
+    def __len__(self):
+        self._read_whole()
+        return super().__len__()
+
+    def __eq__(self, other):
+        self._read_whole()
+        return super().__eq__(other)
+
+    __hash__ = None
+
+    def keys(self):
+        self._read_whole()
+        return super().keys()
+
+    def values(self):
+        self._read_whole()
+        return super().values()
+
+    def items(self):
+        self._read_whole()
+        return super().items()
+
+    def copy(self):
+        self._read_whole()
+        return dict(super().items())
+
+    def __reduce__(self):
+        self._read_whole()
+        return dict, (dict(super().items()),)
+
+    def __repr__(self):
+        self._read_whole()
+        return super().__repr__()
+
+
+class TrackedFunctions:
+    """
+    Wrap the ``salt`` functions of a template context
+
+    Calls to :py:data:`PURE_FUNCTIONS` are recorded with their results, every
+    other access marks the render as uncacheable.
+    """
+
+    def __init__(self, functions, tracker):
+        self._functions = functions
+        self._tracker = tracker
+
+    def __getitem__(self, fun):
+        func = self._functions[fun]
+        if fun not in PURE_FUNCTIONS:
+            self._tracker.taint(f"the template calls {fun}")
+            return func
+
+        def _tracked(*args, **kwargs):
+            ret = func(*args, **kwargs)
+            self._tracker.call(fun, list(args), kwargs, ret)
+            return ret
+
+        return _tracked
+
+    def __contains__(self, fun):
+        return fun in self._functions
+
+    def __getattr__(self, name):
+        self._tracker.taint(f"the template accesses salt.{name}")
+        return getattr(self._functions, name)
+
+
+class _Impure:
+    """
+    Wrap a loader object whose use makes a render uncacheable
+    """
+
+    def __init__(self, wrapped, name, tracker):
+        self._wrapped = wrapped
+        self._name = name
+        self._tracker = tracker
+
+    def __getitem__(self, key):
+        self._tracker.taint(f"the template uses {self._name}")
+        return self._wrapped[key]
+
+    def __contains__(self, key):
+        return key in self._wrapped
+
+    def __getattr__(self, name):
+        self._tracker.taint(f"the template uses {self._name}")
+        return getattr(self._wrapped, name)
+
+
+def _is_scalar(value):
+    return value is None or isinstance(value, (str, bytes, int, float, bool))
+
+
+def _text_digest(text):
+    return hashlib.sha256(salt.utils.stringutils.to_bytes(text)).hexdigest()
+
+
+def _current_value(context, name, key):
+    """
+    Look up what a recorded read would return with the given context
+    """
+    source = context.get(name, {})
+    if hasattr(source, "value") and callable(source.value):
+        # NamedLoaderContext
+        source = source.value()
+    if key == _WHOLE:
+        return dict(source)
+    return source.get(key, _MISSING)
+
+
+class RenderCache:
+    """
+    A size bounded LRU cache of template and data render results
+
+    The scalar values of the context are part of the key of a template render
+    since their reads cannot be tracked. With ``referenced_only`` only the
+    scalars which the jinja template references are, so that for example the
+    reactions to the events of different minions share a render if the
+    reaction does not use the event tag. Templates which include or import
+    other templates always key on all of the scalars. ``jinja_env`` holds the
+    ``jinja_env`` or ``jinja_sls_env`` options the templates are rendered
+    with, in case they change the delimiters of the jinja syntax.
+    """
+
+    def __init__(self, maxsize=1000, referenced_only=False, jinja_env=None):
+        self.maxsize = maxsize
+        self.referenced_only = referenced_only
+        self._jinja_syntax = {
+            key: value
+            for key, value in (jinja_env or {}).items()
+            if key in _JINJA_SYNTAX_OPTIONS
+        }
+        self._templates = collections.OrderedDict()
+        self._data = collections.OrderedDict()
+        self._names = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _evict(self, store):
+        while len(store) > self.maxsize:
+            store.popitem(last=False)
+
+    def referenced_names(self, tmplstr):
+        """
+        Return the names of the context values a jinja template references, or
+        ``None`` if they cannot be determined
+        """
+        key = _text_digest(tmplstr)
+        with self._lock:
+            if key in self._names:
+                self._names.move_to_end(key)
+                return self._names[key]
+        # Imported here to avoid a circular import
+        import salt.utils.jinja  # pylint: disable=import-outside-toplevel
+
+        try:
+            env = jinja2.Environment(
+                extensions=[
+                    "jinja2.ext.do",
+                    "jinja2.ext.loopcontrols",
+                    salt.utils.jinja.SerializerExtension,
+                ],
+                **self._jinja_syntax,
+            )
+            ast = env.parse(tmplstr)
+            if any(True for _ in jinja2.meta.find_referenced_templates(ast)):
+                names = None
+            else:
+                names = frozenset(jinja2.meta.find_undeclared_variables(ast))
+        except Exception:  # pylint: disable=broad-except
+            names = None
+        with self._lock:
+            self._names[key] = names
+            self._evict(self._names)
+        return names
+
+    def template_key(self, tmplstr, tmplpath, context):
+        """
+        Return the key for a template source and the scalar values of the
+        context it is rendered with, or ``None`` if the context cannot be
+        digested.
+        """
+        names = self.referenced_names(tmplstr) if self.referenced_only else None
+        scalars = sorted(
+            (key, value)
+            for key, value in context.items()
+            if (_is_scalar(value) or isinstance(value, (list, tuple)))
+            and (names is None or key in names)
+        )
+        try:
+            return digest([tmplstr, tmplpath, scalars])
+        except Uncacheable:
+            return None
+
+    def fetch_template(self, key, context):
+        """
+        Return the cached output of a template render whose recorded inputs
+        match ``context``, or ``None``
+        """
+        with self._lock:
+            variants = self._templates.get(key)
+            if variants is None:
+                self.misses += 1
+                return None
+            self._templates.move_to_end(key)
+            variants = list(variants)
+        for tracker, output in variants:
+            if self._matches(tracker, context):
+                self.hits += 1
+                return output
+        self.misses += 1
+        return None
+
+    def _matches(self, tracker, context):
+        for path, mtime in tracker.deps.items():
+            try:
+                if os.path.getmtime(path) != mtime:
+                    return False
+            except OSError:
+                return False
+        try:
+            for (name, key), value_digest in tracker.reads.items():
+                if digest(_current_value(context, name, key)) != value_digest:
+                    return False
+            for fun, args, kwargs, value_digest in tracker.calls.values():
+                if digest(context["salt"][fun](*args, **kwargs)) != value_digest:
+                    return False
+        except Exception:  # pylint: disable=broad-except
+            return False
+        return True
+
+    def store_template(self, key, tracker, output):
+        """
+        Store the output of a template render along with the inputs it read
+        """
+        if not tracker.pure:
+            return
+        with self._lock:
+            variants = self._templates.setdefault(key, [])
+            variants.append((tracker, output))
+            del variants[:-MAX_VARIANTS]
+            self._templates.move_to_end(key)
+            self._evict(self._templates)
+
+    def fetch_data(self, renderer, argline, text):
+        """
+        Return a copy of the cached result of a data renderer, or ``None``
+        """
+        key = (renderer, argline, _text_digest(text))
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return copy.deepcopy(self._data[key])
+
+    def store_data(self, renderer, argline, text, data):
+        """
+        Store a copy of the result of a data renderer
+        """
+        key = (renderer, argline, _text_digest(text))
+        with self._lock:
+            self._data[key] = copy.deepcopy(data)
+            self._evict(self._data)
+
+    @contextlib.contextmanager
+    def activate(self):
+        """
+        Make this cache available to the renderers called in this context
+        """
+        token = _ACTIVE_CACHE.set(self)
+        try:
+            yield self
+        finally:
+            _ACTIVE_CACHE.reset(token)
+
+    def clear(self):
+        with self._lock:
+            self._templates.clear()
+            self._data.clear()
+            self._names.clear()
+
+
+def active_cache():
+    """
+    Return the render cache activated by the current render, if any
+    """
+    return _ACTIVE_CACHE.get()
+
+
+def record_dependency(path, mtime):
+    """
+    Record a file read by the template being rendered, such as a jinja import
+    """
+    tracker = _ACTIVE_TRACKER.get()
+    if tracker is not None:
+        tracker.depend(path, mtime)
+
+
+@contextlib.contextmanager
+def track(context):
+    """
+    Yield a :py:class:`RenderTracker` and a copy of ``context`` whose values
+    record their reads into it
+    """
+    tracker = RenderTracker()
+    tracked = {}
+    for name, value in context.items():
+        if hasattr(value, "value") and callable(value.value):
+            # NamedLoaderContext
+            value = value.value()
+        if name == "salt":
+            tracked[name] = TrackedFunctions(value, tracker)
+        elif name in IMPURE_CONTEXT_KEYS:
+            tracked[name] = _Impure(value, name, tracker)
+        elif isinstance(value, dict):
+            tracked[name] = TrackedDict(value, name, tracker)
+        else:
+            tracked[name] = value
+    token = _ACTIVE_TRACKER.set(tracker)
+    try:
+        yield tracker, tracked
+    finally:
+        _ACTIVE_TRACKER.reset(token)
+
+
+def get_render_cache(opts):
+    """
+    Return the process wide render cache if ``render_cache`` is enabled
+    """
+    global _RENDER_CACHE
+    if not opts.get("render_cache", False):
+        return None
+    with _RENDER_CACHE_LOCK:
+        if _RENDER_CACHE is None:
+            _RENDER_CACHE = RenderCache(opts.get("render_cache_size", 1000))
+        return _RENDER_CACHE
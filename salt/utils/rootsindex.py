@@ -0,0 +1,798 @@
+"""
+Incrementally maintained index of the files served by the roots fileserver
+
+.. versionadded:: 3008.0
+
+When :conf_master:`roots_index` is enabled, the ``FileserverUpdate`` process
+watches the directories in :conf_master:`file_roots` with inotify and keeps the
+file lists, directory lists, symlinks and file hashes of every fileserver
+environment up to date as files change, only rescanning the paths reported by
+inotify. The lists and hashes are written to the master cache directory, from
+which the roots fileserver backend in the master workers reads them instead of
+walking the file roots.
+
+The hashes and stat results of the files of all environments are kept in a
+single hash table keyed by the environment and the path of the file, which
+every master worker maps into memory with ``mmap``. Changed files are updated
+in place, and the file is only replaced atomically when the table has to grow,
+so workers look files up without taking any lock and without touching the
+disk, and share the pages of the table through the page cache.
+
+The ``__env__`` environment is not indexed, since the environments it maps to
+are only known when they are requested.
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+import posixpath
+import shutil
+import struct
+import threading
+import time
+
+import salt.fileserver
+import salt.payload
+import salt.utils.atomicfile
+import salt.utils.event
+import salt.utils.files
+import salt.utils.hashutils
+import salt.utils.path
+import salt.utils.platform
+import salt.utils.stringutils
+import salt.utils.verify
+
+try:
+    import pyinotify
+
+    HAS_PYINOTIFY = True
+    WATCH_MASK = (
+        pyinotify.IN_CREATE
+        | pyinotify.IN_DELETE
+        | pyinotify.IN_CLOSE_WRITE
+        | pyinotify.IN_MOVED_FROM
+        | pyinotify.IN_MOVED_TO
+        | pyinotify.IN_ATTRIB
+    )
+except ImportError:
+    HAS_PYINOTIFY = False
+    WATCH_MASK = None
+
+log = logging.getLogger(__name__)
+
+# Milliseconds without new events after which queued changes are indexed
+COALESCE_DELAY = 500
+# Seconds after which queued changes are indexed even if events keep coming
+MAX_DELAY = 5
+
+# Seconds between checks of the workers for a new hash index
+HASH_INDEX_CHECK_INTERVAL = 1
+
+HASH_INDEX_MAGIC = b"SROOTHI1"
+_HEADER = struct.Struct("<8s16sQQ")
+_SLOT = struct.Struct("<Q")
+_RECORD = struct.Struct("<HHB")
+_STAT = struct.Struct("<10q")
+# Slot offset of a removed record, lookups probe past it
+_TOMBSTONE = 1
+
+_LOADED = {}
+_LOADED_LOCK = threading.Lock()
+_HASH_INDEX = {}
+
+
+def _translate_sep(path):
+    """
+    Translate path separators for Windows masterless minions
+    """
+    return path.replace("\\", "/") if os.path.sep == "\\" else path
+
+
+def index_dir(opts):
+    """
+    Return the directory holding the index files
+    """
+    return os.path.join(opts["cachedir"], "roots", "index")
+
+
+def _index_path(opts, saltenv, kind):
+    return os.path.join(
+        index_dir(opts), f"{salt.utils.files.safe_filename_leaf(saltenv)}.{kind}.p"
+    )
+
+
+def _load(path):
+    """
+    Load an index file, re-using the data loaded by a previous call unless the
+    file has been replaced since
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    key = (st.st_ino, st.st_mtime_ns, st.st_size)
+    with _LOADED_LOCK:
+        cached = _LOADED.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+    try:
+        with salt.utils.files.fopen(path, "rb") as fp_:
+            data = salt.payload.load(fp_)
+    except (OSError, ValueError) as exc:
+        log.debug("Unable to load roots index %s: %s", path, exc)
+        return None
+    with _LOADED_LOCK:
+        _LOADED[path] = (key, data)
+    return data
+
+
+def get_file_lists(opts, saltenv):
+    """
+    Return the file lists of ``saltenv`` from the index, or ``None`` if the
+    environment has not been indexed
+    """
+    return _load(_index_path(opts, saltenv, "lists"))
+
+
+def _hash_key(saltenv, rel):
+    key = salt.utils.stringutils.to_bytes(f"{saltenv}\0{rel}")
+    return key, int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+def _pack_record(saltenv, rel, abs_path, hsum, stat):
+    """
+    Return the key, the hash of the key and the record of a file
+    """
+    key, hval = _hash_key(saltenv, rel)
+    abs_path = salt.utils.stringutils.to_bytes(abs_path)
+    hsum = salt.utils.stringutils.to_bytes(hsum)
+    record = (
+        _RECORD.pack(len(key), len(abs_path), len(hsum))
+        + key
+        + abs_path
+        + hsum
+        + _STAT.pack(*stat)
+    )
+    return key, hval, record
+
+
+def write_hash_index(path, hash_type, files):
+    """
+    Write a hash index from an iterable of ``(saltenv, rel, path, hsum, stat)``
+    tuples, ``stat`` being the stat result of the file as a list.
+    """
+    HashIndexWriter(path, hash_type).rewrite(files)
+
+
+class HashIndexWriter:
+    """
+    Write and update the hash index read by :py:class:`HashIndex`
+
+    The index is an open addressing hash table with linear probing: a header,
+    a table of record offsets (``0`` for empty slots, ``1`` for removed
+    records) at least twice the size of the number of files, and the records
+    themselves.
+
+    Changed files are updated in place: their new records are appended to the
+    file first and the slots are pointed at them afterwards, so workers which
+    mapped the index before only ever see complete records. The index is
+    rewritten once it would be more than half full, or holds more bytes of
+    replaced records than of current ones.
+    """
+
+    def __init__(self, path, hash_type):
+        self.path = path
+        self.hash_type = hash_type
+        self.nslots = 0
+        # The record offset of every slot
+        self.table = []
+        # key -> (slot, record length) of every indexed file
+        self.keys = {}
+        self.used = 0
+        self.size = 0
+        self.live = 0
+
+    def _header(self):
+        return _HEADER.pack(
+            HASH_INDEX_MAGIC,
+            salt.utils.stringutils.to_bytes(self.hash_type),
+            self.nslots,
+            len(self.keys),
+        )
+
+    def _free_slot(self, hval):
+        idx = hval & (self.nslots - 1)
+        while self.table[idx]:
+            idx = (idx + 1) & (self.nslots - 1)
+        return idx
+
+    def rewrite(self, files):
+        """
+        Write the index of the files in an iterable of ``(saltenv, rel, path,
+        hsum, stat)`` tuples, replacing the index file atomically
+        """
+        records = [_pack_record(*item) for item in files]
+        self.nslots = 8
+        while self.nslots < len(records) * 2:
+            self.nslots *= 2
+        self.table = [0] * self.nslots
+        self.keys = {}
+        offset = _HEADER.size + _SLOT.size * self.nslots
+        for key, hval, record in records:
+            idx = self._free_slot(hval)
+            self.table[idx] = offset
+            self.keys[key] = (idx, len(record))
+            offset += len(record)
+        self.used = len(records)
+        self.size = offset
+        self.live = offset - _HEADER.size - _SLOT.size * self.nslots
+        with salt.utils.atomicfile.atomic_open(self.path, "wb") as fp_:
+            fp_.write(self._header())
+            fp_.write(b"".join(_SLOT.pack(x) for x in self.table))
+            for _, _, record in records:
+                fp_.write(record)
+
+    def update(self, upserts, removals):
+        """
+        Update the index file in place with the added or changed files in
+        ``upserts``, an iterable of ``(saltenv, rel, path, hsum, stat)``
+        tuples, and the removed files in ``removals``, an iterable of
+        ``(saltenv, rel)`` tuples.
+
+        Returns ``False`` if the index has to be rewritten instead.
+        """
+        if not self.nslots:
+            return False
+        records = [_pack_record(*item) for item in upserts]
+        removed = [_hash_key(saltenv, rel)[0] for saltenv, rel in removals]
+        added = sum(1 for key, _, _ in records if key not in self.keys)
+        if (self.used + added) * 2 > self.nslots:
+            return False
+        appended = sum(len(record) for _, _, record in records)
+        records_size = self.size - _HEADER.size - _SLOT.size * self.nslots
+        if (records_size + appended) > 2 * (self.live + appended):
+            return False
+        try:
+            with salt.utils.files.fopen(self.path, "r+b") as fp_:
+                fp_.seek(self.size)
+                offsets = []
+                for _, _, record in records:
+                    offsets.append(self.size)
+                    fp_.write(record)
+                    self.size += len(record)
+                # The records have to be complete before any slot points to
+                # them
+                fp_.flush()
+                for (key, hval, record), offset in zip(records, offsets):
+                    if key in self.keys:
+                        idx, length = self.keys[key]
+                        self.live -= length
+                    else:
+                        idx = self._free_slot(hval)
+                        self.used += 1
+                    self.table[idx] = offset
+                    self.keys[key] = (idx, len(record))
+                    self.live += len(record)
+                    fp_.seek(_HEADER.size + idx * _SLOT.size)
+                    fp_.write(_SLOT.pack(offset))
+                for key in removed:
+                    if key not in self.keys:
+                        continue
+                    idx, length = self.keys.pop(key)
+                    self.live -= length
+                    self.table[idx] = _TOMBSTONE
+                    fp_.seek(_HEADER.size + idx * _SLOT.size)
+                    fp_.write(_SLOT.pack(_TOMBSTONE))
+                fp_.seek(0)
+                fp_.write(self._header())
+        except OSError as exc:
+            log.debug("Unable to update roots hash index %s: %s", self.path, exc)
+            self.nslots = 0
+            return False
+        return True
+
+
+class HashIndex:
+    """
+    A read-only, memory-mapped hash index written by
+    :py:func:`write_hash_index`
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with salt.utils.files.fopen(path, "rb") as fp_:
+            if not os.fstat(fp_.fileno()).st_size:
+                raise ValueError(f"Hash index {path} is empty")
+            self._map = mmap.mmap(fp_.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, hash_type, self._nslots, self._count = _HEADER.unpack_from(self._map, 0)
+        if magic != HASH_INDEX_MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a roots hash index")
+        self.hash_type = salt.utils.stringutils.to_unicode(hash_type.rstrip(b"\0"))
+
+    def __len__(self):
+        return self._count
+
+    def lookup(self, saltenv, rel):
+        """
+        Return a dict with the path, hash and stat result of the file ``rel``
+        in ``saltenv``, or ``None``
+
+        Raises ``ValueError`` if the file has been updated since it was
+        mapped and the record lies beyond the mapping.
+        """
+        key, hval = _hash_key(saltenv, rel)
+        idx = hval & (self._nslots - 1)
+        while True:
+            (offset,) = _SLOT.unpack_from(self._map, _HEADER.size + idx * _SLOT.size)
+            if not offset:
+                return None
+            if offset == _TOMBSTONE:
+                idx = (idx + 1) & (self._nslots - 1)
+                continue
+            if offset >= len(self._map):
+                raise ValueError(f"Hash index {self.path} was updated")
+            key_len, path_len, hsum_len = _RECORD.unpack_from(self._map, offset)
+            start = offset + _RECORD.size
+            if self._map[start : start + key_len] == key:
+                start += key_len
+                abs_path = self._map[start : start + path_len]
+                start += path_len
+                hsum = self._map[start : start + hsum_len]
+                stat = list(_STAT.unpack_from(self._map, start + hsum_len))
+                return {
+                    "path": salt.utils.stringutils.to_unicode(abs_path),
+                    "hsum": salt.utils.stringutils.to_unicode(hsum),
+                    "stat": stat,
+                }
+            idx = (idx + 1) & (self._nslots - 1)
+
+
+def get_hash_index(opts):
+    """
+    Return the hash index of this process, re-mapping it when the fileserver
+    update process has replaced it. The index file is checked at most once
+    every ``HASH_INDEX_CHECK_INTERVAL`` seconds.
+    """
+    path = os.path.join(index_dir(opts), "hashes.idx")
+    now = time.monotonic()
+    with _LOADED_LOCK:
+        cached = _HASH_INDEX.get(path)
+        if cached is not None and now - cached[0] < HASH_INDEX_CHECK_INTERVAL:
+            return cached[2]
+    try:
+        st = os.stat(path)
+    except OSError:
+        index, key = None, None
+    else:
+        key = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if cached is not None and cached[1] == key:
+            index = cached[2]
+        else:
+            try:
+                # A replaced index is unmapped once it is no longer referenced,
+                # so lookups running in other threads are not affected
+                index = HashIndex(path)
+            except (OSError, ValueError) as exc:
+                log.debug("Unable to load roots hash index %s: %s", path, exc)
+                index, key = None, None
+    with _LOADED_LOCK:
+        _HASH_INDEX[path] = (now, key, index)
+    return index
+
+
+def get_file_hash(opts, saltenv, rel):
+    """
+    Return a dict with the path, hash and stat result of the file ``rel`` in
+    ``saltenv`` from the hash index, ``False`` if the index does not have the
+    file, or ``None`` if there is no usable index
+    """
+    index = get_hash_index(opts)
+    if index is None or index.hash_type != opts["hash_type"]:
+        return None
+    try:
+        return index.lookup(saltenv, _translate_sep(rel)) or False
+    except (ValueError, struct.error) as exc:
+        # The index was updated in place after it was mapped, it is mapped
+        # again on the next check
+        log.debug("Unable to look up %s in the roots hash index: %s", rel, exc)
+        return None
+
+
+def _index_value(value):
+    """
+    Return the ``(path, hsum, stat)`` of a file in the hash index without the
+    access time, which changes whenever the file is hashed
+    """
+    if value is None:
+        return None
+    abs_path, hsum, stat = value
+    return abs_path, hsum, stat[:7] + stat[8:]
+
+
+class _Entry:
+    """
+    A file or directory found under a root
+    """
+
+    __slots__ = (
+        "is_dir",
+        "is_link",
+        "link_dest",
+        "ignored",
+        "empty",
+        "hsum",
+        "stat",
+        "servable",
+    )
+
+    def __init__(self):
+        self.is_link = self.servable = False
+        self.link_dest = self.empty = self.hsum = self.stat = None
+
+    @property
+    def mtime(self):
+        return self.stat[8] if self.stat is not None else None
+
+
+class RootIndex:
+    """
+    The files and directories found under a single directory of
+    :conf_master:`file_roots`, using the same rules as the roots fileserver
+    backend uses when walking the root
+    """
+
+    def __init__(self, opts, root, watch=None):
+        self.opts = opts
+        self.root = os.path.normpath(root)
+        self.watch = watch
+        self.entries = {}
+        # Names of the items found in every directory which was walked, the
+        # root itself is the empty string
+        self.children = {}
+
+    def _rel(self, abs_path):
+        rel = _translate_sep(os.path.relpath(abs_path, self.root))
+        return "" if rel == "." else rel
+
+    def _abs(self, rel):
+        return os.path.join(self.root, *rel.split("/")) if rel else self.root
+
+    def contains(self, abs_path):
+        return abs_path == self.root or abs_path.startswith(
+            self.root.rstrip(os.sep) + os.sep
+        )
+
+    def is_empty(self, rel, entry):
+        if entry.empty is not None:
+            return entry.empty
+        return not self.children.get(rel)
+
+    def _link_dest(self, abs_path):
+        """
+        Return the destination of a symlink, or None if the link must not be
+        listed
+        """
+        link_dest = salt.utils.path.readlink(abs_path)
+        if salt.utils.platform.is_windows() and link_dest.startswith("\\\\"):
+            # Symlink points to a network path. Since you can't join UNC and
+            # non-UNC paths, just assume the original path.
+            link_dest = abs_path
+        if link_dest.startswith(".."):
+            joined = os.path.join(abs_path, link_dest)
+        else:
+            joined = os.path.join(os.path.dirname(abs_path), link_dest)
+        rel_dest = _translate_sep(
+            os.path.relpath(
+                os.path.realpath(os.path.normpath(joined)),
+                os.path.realpath(self.root),
+            )
+        )
+        # Only count the link if it does not point outside of the root, unless
+        # symlinks are not followed
+        if not rel_dest.startswith("..") or not self.opts["fileserver_followsymlinks"]:
+            return link_dest
+        return None
+
+    def _add(self, rel, is_dir):
+        abs_path = self._abs(rel)
+        entry = _Entry()
+        entry.is_dir = is_dir
+        entry.ignored = salt.fileserver.is_file_ignored(self.opts, rel)
+        try:
+            entry.is_link = salt.utils.path.islink(abs_path)
+            if entry.is_link:
+                entry.link_dest = self._link_dest(abs_path)
+            if is_dir:
+                if entry.is_link and not self.opts["fileserver_followsymlinks"]:
+                    # The contents of this directory are not walked
+                    entry.empty = not os.listdir(abs_path)
+            elif not entry.ignored:
+                entry.stat = list(os.stat(abs_path))
+                entry.hsum = salt.utils.hashutils.get_hash(
+                    abs_path, self.opts["hash_type"]
+                )
+                # Same check as the roots backend does before serving a file
+                entry.servable = bool(
+                    salt.utils.verify.clean_path(
+                        self.root,
+                        abs_path,
+                        subdir=True,
+                        realpath=not self.opts["fileserver_followsymlinks"],
+                    )
+                )
+        except OSError as exc:
+            # Dangling symlinks and files removed while being indexed
+            log.trace("roots index: unable to index %s: %s", abs_path, exc)
+        self.entries[rel] = entry
+        parent, name = posixpath.split(rel)
+        self.children.setdefault(parent, set()).add(name)
+
+    def _walk(self, rel):
+        for root, dirs, files in salt.utils.path.os_walk(
+            self._abs(rel), followlinks=self.opts["fileserver_followsymlinks"]
+        ):
+            parent = self._rel(root)
+            self.children.setdefault(parent, set())
+            if self.watch is not None:
+                self.watch(root)
+            for name in dirs:
+                self._add(posixpath.join(parent, name), True)
+            for name in files:
+                self._add(posixpath.join(parent, name), False)
+
+    def _subtree(self, rel, pop=False):
+        """
+        Return the entries of ``rel`` and everything below it, removing them
+        from the index if ``pop`` is True
+        """
+        ret = {}
+        stack = [rel]
+        while stack:
+            cur = stack.pop()
+            entry = (self.entries.pop if pop else self.entries.get)(cur, None)
+            if entry is not None:
+                ret[cur] = entry
+            names = (self.children.pop if pop else self.children.get)(cur, ())
+            stack.extend(posixpath.join(cur, name) for name in names)
+        if pop and rel:
+            parent, name = posixpath.split(rel)
+            self.children.get(parent, set()).discard(name)
+        return ret
+
+    def refresh(self, abs_path=None):
+        """
+        Re-index ``abs_path`` and everything below it, the whole root if no
+        path is passed. Return the old and new entries of the paths which were
+        re-indexed.
+        """
+        rel = self._rel(abs_path) if abs_path is not None else ""
+        old = self._subtree(rel, pop=True)
+        if not rel:
+            if os.path.isdir(self.root):
+                self._walk(rel)
+        elif os.path.lexists(abs_path):
+            is_dir = os.path.isdir(abs_path)
+            self._add(rel, is_dir)
+            if is_dir and (
+                self.opts["fileserver_followsymlinks"] or not self.entries[rel].is_link
+            ):
+                self._walk(rel)
+        return old, self._subtree(rel)
+
+
+class RootsIndexer:
+    """
+    Maintain the indexes of all fileserver environments in
+    :conf_master:`file_roots`
+    """
+
+    def __init__(self, opts):
+        self.opts = opts
+        self.saltenvs = {}
+        self.roots = {}
+        for saltenv, paths in opts["file_roots"].items():
+            if saltenv == "__env__":
+                log.debug("roots index: not indexing the __env__ environment")
+                continue
+            self.saltenvs[saltenv] = [os.path.normpath(path) for path in paths]
+            for path in self.saltenvs[saltenv]:
+                if path not in self.roots:
+                    self.roots[path] = RootIndex(opts, path, watch=self._watch)
+        # The files served by every environment, keyed by their path relative
+        # to the environment
+        self.hashes = {}
+        # The last written file lists of every environment
+        self.lists = {}
+        self.hash_index = HashIndexWriter(
+            os.path.join(index_dir(opts), "hashes.idx"), opts["hash_type"]
+        )
+        self.pending = set()
+        self.first_pending = None
+        self._wm = None
+
+    def _watch(self, path):
+        if self._wm is not None:
+            # Watching an already watched directory updates its path in the
+            # watch manager, which keeps moved directories right
+            self._wm.add_watch(path, WATCH_MASK, quiet=True)
+
+    def _queue_event(self, event):
+        if event.mask & pyinotify.IN_Q_OVERFLOW:
+            log.warning("roots index: inotify queue overflowed, rescanning")
+            self.pending.update(self.roots)
+        elif event.pathname:
+            self.pending.add(os.path.normpath(event.pathname))
+        if self.first_pending is None:
+            self.first_pending = time.monotonic()
+
+    def build(self):
+        """
+        Index all roots and write the indexes of all environments
+        """
+        self.lists = {}
+        for index in self.roots.values():
+            index.refresh()
+        for saltenv in self.saltenvs:
+            self.write(saltenv)
+        self.write_hash_index()
+
+    def process(self, paths):
+        """
+        Re-index the passed paths, write the indexes of the environments they
+        are in and return the files which were added, removed or changed
+        """
+        changes = {"changed": [], "added": [], "removed": []}
+        old_hashes = dict(self.hashes)
+        dirty = set()
+        outer = []
+        for path in sorted(paths):
+            # Paths below a path which is re-indexed anyway are skipped
+            if outer and (path + os.sep).startswith(outer[-1].rstrip(os.sep) + os.sep):
+                continue
+            outer.append(path)
+        for path in outer:
+            for root, index in self.roots.items():
+                if not index.contains(path):
+                    continue
+                dirty.add(root)
+                old, new = index.refresh(path)
+                old = {k: v for k, v in old.items() if v.mtime is not None}
+                new = {k: v for k, v in new.items() if v.mtime is not None}
+                for rel in new.keys() - old.keys():
+                    changes["added"].append(index._abs(rel))
+                for rel in old.keys() - new.keys():
+                    changes["removed"].append(index._abs(rel))
+                for rel in old.keys() & new.keys():
+                    if (old[rel].hsum, old[rel].mtime) != (
+                        new[rel].hsum,
+                        new[rel].mtime,
+                    ):
+                        changes["changed"].append(index._abs(rel))
+        for saltenv, roots in self.saltenvs.items():
+            if dirty.intersection(roots):
+                self.write(saltenv)
+        if dirty:
+            self.write_hash_index(old_hashes)
+        return changes
+
+    def write(self, saltenv):
+        """
+        Write the file lists of an environment, unless they did not change,
+        and collect the files it serves for the hash index
+        """
+        lists = {"files": set(), "dirs": set(), "empty_dirs": set(), "links": {}}
+        hashes = {}
+        for root in self.saltenvs[saltenv]:
+            index = self.roots[root]
+            for rel, entry in index.entries.items():
+                if entry.ignored:
+                    continue
+                if entry.hsum is not None and entry.servable and rel not in hashes:
+                    # The first root holding the file is the one it is served
+                    # from
+                    hashes[rel] = (index._abs(rel), entry.hsum, entry.stat)
+                if entry.is_link and self.opts["fileserver_ignoresymlinks"]:
+                    continue
+                if entry.is_dir:
+                    lists["dirs"].add(rel)
+                    if index.is_empty(rel, entry):
+                        lists["empty_dirs"].add(rel)
+                else:
+                    lists["files"].add(rel)
+                if entry.link_dest is not None:
+                    lists["links"][rel] = entry.link_dest
+        for form in ("files", "dirs", "empty_dirs"):
+            lists[form] = sorted(lists[form])
+        self.hashes[saltenv] = hashes
+        if self.lists.get(saltenv) == lists:
+            return
+        self.lists[saltenv] = lists
+
+        os.makedirs(index_dir(self.opts), exist_ok=True)
+        with salt.utils.atomicfile.atomic_open(
+            _index_path(self.opts, saltenv, "lists"), "wb"
+        ) as fp_:
+            salt.payload.dump(lists, fp_)
+
+    def write_hash_index(self, old_hashes=None):
+        """
+        Write the hash index of the files of all environments. When passed
+        the files served before, only the files which changed since are
+        updated in the index.
+        """
+        if old_hashes is not None:
+            upserts = []
+            removals = []
+            for saltenv in set(old_hashes).union(self.hashes):
+                old = old_hashes.get(saltenv, {})
+                new = self.hashes.get(saltenv, {})
+                for rel, value in new.items():
+                    if _index_value(old.get(rel)) != _index_value(value):
+                        upserts.append((saltenv, rel) + value)
+                removals.extend((saltenv, rel) for rel in old.keys() - new.keys())
+            if not upserts and not removals:
+                return
+            if self.hash_index.update(upserts, removals):
+                return
+        os.makedirs(index_dir(self.opts), exist_ok=True)
+        self.hash_index.rewrite(
+            (saltenv, rel, abs_path, hsum, stat)
+            for saltenv, hashes in self.hashes.items()
+            for rel, (abs_path, hsum, stat) in hashes.items()
+        )
+
+    def flush(self):
+        """
+        Index the queued paths and fire an update event for the changes
+        """
+        paths, self.pending, self.first_pending = self.pending, set(), None
+        changes = self.process(paths)
+        if not any(changes.values()):
+            return
+        log.debug("roots index: updated after changes to %d paths", len(paths))
+        if self.opts.get("fileserver_events", False):
+            with salt.utils.event.get_event(
+                "master",
+                self.opts["sock_dir"],
+                opts=self.opts,
+                listen=False,
+            ) as event:
+                event.fire_event(
+                    {"changed": True, "files": changes, "backend": "roots"},
+                    salt.utils.event.tagify(["roots", "update"], prefix="fileserver"),
+                )
+
+    def run(self):
+        """
+        Build the indexes and keep them up to date, this never returns
+        """
+        if not HAS_PYINOTIFY:
+            log.error("roots_index is enabled but pyinotify is not installed")
+            return
+        # Do not let workers read the indexes of a previous run while building
+        shutil.rmtree(index_dir(self.opts), ignore_errors=True)
+        self._wm = pyinotify.WatchManager()
+        notifier = pyinotify.Notifier(self._wm, default_proc_fun=self._queue_event)
+        start = time.monotonic()
+        self.build()
+        log.info(
+            "roots index: indexed %d roots in %.1f seconds",
+            len(self.roots),
+            time.monotonic() - start,
+        )
+        while True:
+            if notifier.check_events(timeout=COALESCE_DELAY):
+                notifier.read_events()
+                notifier.process_events()
+                if (
+                    self.first_pending is None
+                    or time.monotonic() - self.first_pending < MAX_DELAY
+                ):
+                    continue
+            if self.pending:
+                try:
+                    self.flush()
+                except Exception:  # pylint: disable=broad-except
+                    log.exception("roots index: failed to update the index")
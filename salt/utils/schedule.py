@@ -14,9 +14,11 @@ Requires that python-dateutil is installed on the minion.
 import copy
 import datetime
 import errno
+import heapq
 import itertools
 import logging
 import os
+import queue
 import random
 import signal
 import sys
@@ -73,6 +75,7 @@ class Schedule:
     """
 
     instance = None
+    _scheduling_items = ("seconds", "minutes", "hours", "days", "once", "when", "cron")
 
     def __new__(
         cls,
@@ -185,6 +188,13 @@ class Schedule:
             self._subprocess_list = salt.utils.process.SubprocessList()
         else:
             self._subprocess_list = _subprocess_list
+        self._job_queue = None
+        self._job_pending = {}
+        self._job_lock = threading.Lock()
+        # A heap of the times at which the jobs have to be evaluated again, it
+        # is rebuilt by evaluating every job whenever the schedule changes
+        self._deadlines = None
+        self._deadlines_key = None
 
     def __getnewargs__(self):
         return self.opts, self.functions, self.returners, self.intervals, None
@@ -225,6 +235,57 @@ class Schedule:
             return _schedule
         return schedule
 
+    def _due_jobs(self, schedule, now):
+        """
+        Return the names of the jobs which have to be evaluated at ``now``, or
+        ``None`` when the schedule changed and all of them have to be.
+        """
+        key = (
+            self.opts.get("schedule"),
+            self.opts.get("pillar"),
+            self.opts.get("grains"),
+            self.opts["loop_interval"],
+            list(schedule),
+        )
+        if (
+            self._deadlines is None
+            or self._deadlines_key is None
+            or any(
+                new is not old and new != old
+                for new, old in zip(key, self._deadlines_key)
+            )
+        ):
+            self._deadlines = []
+            self._deadlines_key = key
+            return None
+        due = set()
+        while self._deadlines and self._deadlines[0][0] <= now:
+            due.add(heapq.heappop(self._deadlines)[1])
+        return due
+
+    def _next_deadline(self, data, now, loop_interval):
+        """
+        Return the time at which a job has to be evaluated again, ``None``
+        when it can not run before the schedule changes
+        """
+        if not isinstance(data, dict) or data.get("_error"):
+            return None
+        if not any(item in data for item in self._scheduling_items):
+            return None
+        if data.get("_run_on_start") or "run_explicit" in data:
+            return now
+        fire = data.get("_splay") or data.get("_next_fire_time")
+        if not isinstance(fire, datetime.datetime):
+            # The "when" times can be relative to the current day
+            return now
+        if "once" in data and fire < now - loop_interval:
+            return None
+        if "when" in data and not data.get("_run"):
+            # The last time the job fired is only dropped from its "when"
+            # times once the loop interval elapsed
+            fire += loop_interval
+        return fire - datetime.timedelta(microseconds=fire.microsecond)
+
     def _check_max_running(self, func, data, opts, now):
         """
         Return the schedule data structure
@@ -319,6 +380,7 @@ class Schedule:
         """
         Deletes a job from the scheduler. Ignore jobs from pillar
         """
+        self._deadlines = None
         # ensure job exists, then delete it
         if name in self.opts["schedule"]:
             del self.opts["schedule"][name]
@@ -346,6 +408,7 @@ class Schedule:
         """
         Reset the scheduler to defaults
         """
+        self._deadlines = None
         self.skip_function = None
         self.skip_during_range = None
         self.enabled = True
@@ -356,6 +419,7 @@ class Schedule:
         """
         Deletes a job from the scheduler. Ignores jobs from pillar
         """
+        self._deadlines = None
         # ensure job exists, then delete it
         for job in list(self.opts["schedule"].keys()):
             if job.startswith(name):
@@ -388,6 +452,7 @@ class Schedule:
         the configuration file. See the docs on how YAML is interpreted into
         python data-structures to make sure, you pass correct dictionaries.
         """
+        self._deadlines = None
 
         # we don't do any checking here besides making sure its a dict.
         # eval() already does for us and raises errors accordingly
@@ -432,6 +497,7 @@ class Schedule:
         """
         Enable a job in the scheduler. Ignores jobs from pillar
         """
+        self._deadlines = None
         # ensure job exists, then enable it
         if name in self.opts["schedule"]:
             self.opts["schedule"][name]["enabled"] = True
@@ -456,6 +522,7 @@ class Schedule:
         """
         Disable a job in the scheduler. Ignores jobs from pillar
         """
+        self._deadlines = None
         # ensure job exists, then disable it
         if name in self.opts["schedule"]:
             self.opts["schedule"][name]["enabled"] = False
@@ -480,6 +547,7 @@ class Schedule:
         """
         Modify a job in the scheduler. Ignores jobs from pillar
         """
+        self._deadlines = None
         # ensure job exists, then replace it
         if name in self.opts["schedule"]:
             self.delete_job(name, persist, fire_event)
@@ -530,6 +598,7 @@ class Schedule:
         """
         Enable the scheduler.
         """
+        self._deadlines = None
         self.opts["schedule"]["enabled"] = True
 
         if fire_event:
@@ -549,6 +618,7 @@ class Schedule:
         """
         Disable the scheduler.
         """
+        self._deadlines = None
         self.opts["schedule"]["enabled"] = False
 
         if fire_event:
@@ -568,6 +638,7 @@ class Schedule:
         """
         Reload the schedule from saved schedule file.
         """
+        self._deadlines = None
         # Remove all jobs from self.intervals
         self.intervals = {}
 
@@ -616,6 +687,7 @@ class Schedule:
         Postpone a job in the scheduler.
         Ignores jobs from pillar
         """
+        self._deadlines = None
         time = data["time"]
         new_time = data["new_time"]
         time_fmt = data.get("time_fmt", "%Y-%m-%dT%H:%M:%S")
@@ -652,6 +724,7 @@ class Schedule:
         Skip a job at a specific time in the scheduler.
         Ignores jobs from pillar
         """
+        self._deadlines = None
         time = data["time"]
         time_fmt = data.get("time_fmt", "%Y-%m-%dT%H:%M:%S")
 
@@ -719,11 +792,13 @@ class Schedule:
             schedule = self._get_schedule()
             return schedule.get(name, {})
 
-    def handle_func(self, multiprocessing_enabled, func, data, jid=None):
+    def handle_func(
+        self, multiprocessing_enabled, func, data, jid=None, reload_modules=True
+    ):
         """
         Execute this method in a multiprocess or thread
         """
-        if (
+        if reload_modules and (
             salt.utils.platform.spawning_platform()
             or self.opts.get("transport") == "zeromq"
         ):
@@ -1493,6 +1568,14 @@ class Schedule:
         if "splay" in schedule:
             self.splay = schedule["splay"]
 
+        if not now:
+            now = datetime.datetime.now()
+
+        # Only the jobs which may fire by now are evaluated, unless the
+        # schedule changed since the last evaluation
+        due = self._due_jobs(schedule, now)
+        evaluated = []
+
         _hidden = ["enabled", "skip_function", "skip_during_range", "splay"]
         for job, data in schedule.items():
 
@@ -1500,6 +1583,10 @@ class Schedule:
             if job in _hidden:
                 continue
 
+            if due is not None and job not in due:
+                continue
+            evaluated.append(job)
+
             # Clear these out between runs
             for item in [
                 "_continue",
@@ -1551,9 +1638,6 @@ class Schedule:
             ):
                 data["_run_on_start"] = True
 
-            if not now:
-                now = datetime.datetime.now()
-
             # Used for quick lookups when detecting invalid option
             # combinations.
             schedule_keys = set(data.keys())
@@ -1816,6 +1900,11 @@ class Schedule:
                         data["_next_fire_time"] = now + datetime.timedelta(
                             seconds=data["_seconds"]
                         )
+
+        for job in evaluated:
+            deadline = self._next_deadline(schedule[job], now, loop_interval)
+            if deadline is not None:
+                heapq.heappush(self._deadlines, (deadline, job))
         return jids
 
     def _run_job(self, func, data, jid=None):
@@ -1834,6 +1923,10 @@ class Schedule:
             self.handle_func(False, func, data, jid)
             return
 
+        if self.opts.get("schedule_thread_pool_size"):
+            self._submit_job(func, data, jid)
+            return
+
         if multiprocessing_enabled and salt.utils.platform.spawning_platform():
             # Temporarily stash our function references.
             # You can't pickle function references, and pickling is
@@ -1878,6 +1971,57 @@ class Schedule:
                 self.returners = returners
                 self.utils = utils
 
+    def _submit_job(self, func, data, jid):
+        """
+        Run a scheduled job in the bounded pool of threads, it is queued while
+        all of the threads are busy. No more runs of a job than its
+        ``maxrunning`` are queued or running at the same time.
+        """
+        name = data["name"]
+        limit = data.get("maxrunning") if data.get("jid_include", True) else None
+        with self._job_lock:
+            pending = self._job_pending.get(name, 0)
+            if limit and pending >= limit:
+                log.warning(
+                    "schedule: Not running job %s, %s runs of it are already "
+                    "queued or running",
+                    name,
+                    pending,
+                )
+                return
+            self._job_pending[name] = pending + 1
+            if self._job_queue is None:
+                self._job_queue = queue.Queue()
+                for idx in range(self.opts["schedule_thread_pool_size"]):
+                    # Daemon threads, a hung job must not keep the process
+                    # from exiting
+                    thread = threading.Thread(
+                        target=self._job_worker,
+                        args=(self._job_queue,),
+                        name=f"Schedule-{idx}",
+                        daemon=True,
+                    )
+                    thread.start()
+        self._job_queue.put((func, data, jid))
+
+    def _job_worker(self, job_queue):
+        """
+        Run the jobs put in the queue of the pool of threads
+        """
+        while True:
+            func, data, jid = job_queue.get()
+            try:
+                # The threads share the loaded modules, they are not reloaded
+                # for every run as they are in a process of its own
+                self.handle_func(False, func, data, jid, reload_modules=False)
+            except Exception:  # pylint: disable=broad-except
+                log.exception("Unhandled exception running scheduled job %s", func)
+            finally:
+                with self._job_lock:
+                    self._job_pending[data["name"]] -= 1
+                    if not self._job_pending[data["name"]]:
+                        del self._job_pending[data["name"]]
+
     def cleanup_subprocesses(self):
         self._subprocess_list.cleanup()
 
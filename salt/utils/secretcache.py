@@ -0,0 +1,175 @@
+"""
+In-memory cache of decrypted secrets shared by the decrypting renderers
+
+.. versionadded:: 3008.0
+
+The :py:mod:`gpg <salt.renderers.gpg>` and :py:mod:`nacl <salt.renderers.nacl>`
+renderers store the plaintext of every ciphertext they decrypt in a
+:py:class:`SecretCache` when ``secret_cache`` is enabled. Entries are keyed by
+the SHA-256 digest of the ciphertext, so the ciphertext itself is not kept,
+and expire after ``secret_cache_ttl`` seconds. The plaintext is held in
+buffers which are overwritten with zeros when an entry expires or is cleared.
+With ``secret_cache_mlock`` enabled these buffers are locked into memory with
+``mlock(2)`` so that they are never written to swap. Secrets which cannot be
+locked, for example because ``RLIMIT_MEMLOCK`` is exhausted, are not cached.
+
+Only the cache itself is protected, the rendered data handed back to the
+caller is an ordinary Python object.
+"""
+
+import ctypes
+import ctypes.util
+import hashlib
+import logging
+import threading
+import time
+
+import salt.utils.platform
+import salt.utils.stringutils
+
+log = logging.getLogger(__name__)
+
+_SECRET_CACHE = None
+_SECRET_CACHE_LOCK = threading.Lock()
+
+_LIBC = None
+
+
+def _libc():
+    """
+    Return the C library providing ``mlock``, or ``None``
+    """
+    global _LIBC
+    if _LIBC is None:
+        _LIBC = False
+        if not salt.utils.platform.is_windows():
+            libc_name = ctypes.util.find_library("c")
+            try:
+                libc = ctypes.CDLL(libc_name, use_errno=True)
+                libc.mlock.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+                libc.munlock.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+            except (OSError, AttributeError) as exc:
+                log.debug("mlock is not available: %s", exc)
+            else:
+                _LIBC = libc
+    return _LIBC or None
+
+
+class _Secret:
+    """
+    A plaintext held in a buffer which can be locked into memory and wiped
+    """
+
+    __slots__ = ("buf", "size", "expires", "locked")
+
+    def __init__(self, plaintext, expires):
+        self.size = len(plaintext)
+        # Always allocate at least one byte so that the buffer has an address
+        self.buf = ctypes.create_string_buffer(plaintext, max(self.size, 1))
+        self.expires = expires
+        self.locked = False
+
+    def lock(self):
+        libc = _libc()
+        if libc is None:
+            return False
+        if libc.mlock(ctypes.addressof(self.buf), len(self.buf)) != 0:
+            log.warning(
+                "Could not lock a secret into memory: errno %s", ctypes.get_errno()
+            )
+            return False
+        self.locked = True
+        return True
+
+    def value(self):
+        return self.buf.raw[: self.size]
+
+    def wipe(self):
+        ctypes.memset(ctypes.addressof(self.buf), 0, len(self.buf))
+        if self.locked:
+            _libc().munlock(ctypes.addressof(self.buf), len(self.buf))
+            self.locked = False
+
+
+class SecretCache:
+    """
+    A TTL bound cache of decrypted secrets keyed by the digest of their
+    ciphertext
+    """
+
+    def __init__(self, ttl, mlock=False):
+        self.ttl = ttl
+        self.mlock = mlock
+        self._secrets = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(ciphertext):
+        return hashlib.sha256(salt.utils.stringutils.to_bytes(ciphertext)).digest()
+
+    def _expire(self, now):
+        for key in [key for key, val in self._secrets.items() if val.expires <= now]:
+            self._secrets.pop(key).wipe()
+
+    def get(self, ciphertext):
+        """
+        Return the cached plaintext of ``ciphertext`` as bytes, or ``None``
+        """
+        key = self._key(ciphertext)
+        with self._lock:
+            secret = self._secrets.get(key)
+            if secret is not None and secret.expires <= time.time():
+                self._secrets.pop(key).wipe()
+                secret = None
+            if secret is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return secret.value()
+
+    def set(self, ciphertext, plaintext):
+        """
+        Cache the plaintext of ``ciphertext``
+        """
+        now = time.time()
+        secret = _Secret(salt.utils.stringutils.to_bytes(plaintext), now + self.ttl)
+        if self.mlock and not secret.lock():
+            # Do not keep secrets which could be swapped out
+            secret.wipe()
+            return
+        with self._lock:
+            self._expire(now)
+            old = self._secrets.pop(self._key(ciphertext), None)
+            if old is not None:
+                old.wipe()
+            self._secrets[self._key(ciphertext)] = secret
+
+    def clear(self):
+        """
+        Wipe and drop all cached secrets
+        """
+        with self._lock:
+            for secret in self._secrets.values():
+                secret.wipe()
+            self._secrets.clear()
+
+    def __len__(self):
+        return len(self._secrets)
+
+
+def get_secret_cache(opts):
+    """
+    Return the process wide secret cache if ``secret_cache`` is enabled
+    """
+    global _SECRET_CACHE
+    if not opts.get("secret_cache", False):
+        return None
+    with _SECRET_CACHE_LOCK:
+        if _SECRET_CACHE is None:
+            _SECRET_CACHE = SecretCache(
+                opts.get("secret_cache_ttl", 3600),
+                mlock=opts.get("secret_cache_mlock", False),
+            )
+        return _SECRET_CACHE
@@ -25,6 +25,7 @@ import salt.utils.http
 import salt.utils.jinja
 import salt.utils.network
 import salt.utils.platform
+import salt.utils.rendercache
 import salt.utils.stringutils
 import salt.utils.yamlencoding
 from salt import __path__ as saltpath
@@ -147,7 +148,7 @@ def generate_sls_context(tmplpath, sls):
     return sls_context
 
 
-def wrap_tmpl_func(render_str):
+def wrap_tmpl_func(render_str, cacheable=False):
     """
     Each template processing function below, ``render_*_tmpl``, is wrapped by
     ``render_tmpl`` before being inserted into the ``TEMPLATE_REGISTRY``.  Some
@@ -158,6 +159,11 @@ def wrap_tmpl_func(render_str):
         Each function is responsible for rendering the source data for its
         repective template language.
 
+    :param bool cacheable: Whether the renders of this template language can
+        be served from the :py:mod:`render cache <salt.utils.rendercache>`.
+        This requires that every input of a render is read either from the
+        context or through the tracked template loader.
+
     :returns function render_tmpl: The wrapper function
     """
 
@@ -207,7 +213,9 @@ def wrap_tmpl_func(render_str):
             tmplstr = tmplsrc.read()
             tmplsrc.close()
         try:
-            output = render_str(tmplstr, context, tmplpath)
+            output = _render_str_cached(
+                render_str, cacheable, tmplstr, context, tmplpath
+            )
             if salt.utils.platform.is_windows():
                 newline = False
                 if salt.utils.stringutils.to_unicode(
@@ -243,6 +251,26 @@ def wrap_tmpl_func(render_str):
     return render_tmpl
 
 
+def _render_str_cached(render_str, cacheable, tmplstr, context, tmplpath):
+    """
+    Render ``tmplstr`` using the active render cache, if there is one
+    """
+    render_cache = salt.utils.rendercache.active_cache() if cacheable else None
+    if render_cache is None:
+        return render_str(tmplstr, context, tmplpath)
+    cache_key = render_cache.template_key(tmplstr, tmplpath, context)
+    if cache_key is None:
+        return render_str(tmplstr, context, tmplpath)
+    output = render_cache.fetch_template(cache_key, context)
+    if output is not None:
+        log.trace("Rendered template %s from the render cache", tmplpath)
+        return output
+    with salt.utils.rendercache.track(context) as (tracker, tracked_context):
+        output = render_str(tmplstr, tracked_context, tmplpath)
+    render_cache.store_template(cache_key, tracker, output)
+    return output
+
+
 def _get_jinja_error_slug(tb_data):
     """
     Return the line number where the template error was found
@@ -699,7 +727,7 @@ def py(sfn, string=False, **kwargs):  # pylint: disable=C0103
         return {"result": False, "data": trb}
 
 
-JINJA = wrap_tmpl_func(render_jinja_tmpl)
+JINJA = wrap_tmpl_func(render_jinja_tmpl, cacheable=True)
 MAKO = wrap_tmpl_func(render_mako_tmpl)
 WEMPY = wrap_tmpl_func(render_wempy_tmpl)
 GENSHI = wrap_tmpl_func(render_genshi_tmpl)
@@ -13,6 +13,7 @@ import collections
 import yaml  # pylint: disable=blacklisted-import
 
 import salt.utils.context
+import salt.utils.rendercache
 from salt.utils.odict import OrderedDict
 
 try:
@@ -89,6 +90,15 @@ SafeOrderedDumper.add_representer(
     yaml.representer.SafeRepresenter.represent_dict,
 )
 
+OrderedDumper.add_representer(
+    salt.utils.rendercache.TrackedDict,
+    yaml.representer.SafeRepresenter.represent_dict,
+)
+SafeOrderedDumper.add_representer(
+    salt.utils.rendercache.TrackedDict,
+    yaml.representer.SafeRepresenter.represent_dict,
+)
+
 OrderedDumper.add_representer(
     "tag:yaml.org,2002:timestamp", OrderedDumper.represent_scalar
 )
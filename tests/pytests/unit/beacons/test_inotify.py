@@ -1,10 +1,12 @@
 import logging
 import os
+import time
 
 import pytest
 
 import salt.utils.files
 from salt.beacons import inotify
+from tests.support.mock import patch
 
 try:
     import pyinotify  # pylint: disable=unused-import
@@ -212,6 +214,122 @@ def test_dir_recurse_auto_add(tmp_path):
     assert ret[0]["change"] == "IN_DELETE"
 
 
+@pytest.mark.skip_on_freebsd(
+    reason="Skip on FreeBSD - does not yet have full inotify/watchdog support",
+)
+def test_dir_recurse_watch_batch(tmp_path):
+    dp1 = str(tmp_path / "subdir1")
+    dp2 = os.path.join(dp1, "subdir2")
+    os.makedirs(dp2)
+    fp = os.path.join(dp2, "tmpfile")
+    config = [
+        {
+            "files": {str(tmp_path): {"mask": ["create"], "recurse": True}},
+            "watch_batch": 2,
+        }
+    ]
+    ret = inotify.validate(config)
+    assert ret == (True, "Valid beacon configuration")
+
+    # The tree is watched over two runs of the beacon
+    assert inotify.beacon(config) == []
+    wm = inotify.__context__["inotify.notifier"]._watch_manager
+    assert {watch.path for watch in wm.watches.values()} == {str(tmp_path), dp1}
+    assert inotify.beacon(config) == []
+    assert {watch.path for watch in wm.watches.values()} == {
+        str(tmp_path),
+        dp1,
+        dp2,
+    }
+    assert not inotify.__context__.get("inotify.pending")
+    with salt.utils.files.fopen(fp, "w"):
+        pass
+    ret = inotify.beacon(config)
+    assert len(ret) == 1
+    assert ret[0]["path"] == fp
+    assert ret[0]["change"] == "IN_CREATE"
+
+
+@pytest.mark.skip_on_freebsd(
+    reason="Skip on FreeBSD - does not yet have full inotify/watchdog support",
+)
+def test_window(tmp_path):
+    config = [
+        {
+            "files": {str(tmp_path): {"mask": ["create"]}},
+            "window": 5,
+            "max_paths": 2,
+        }
+    ]
+    ret = inotify.validate(config)
+    assert ret == (True, "Valid beacon configuration")
+
+    assert inotify.beacon(config) == []
+    for name in ("foo", "bar", "baz"):
+        with salt.utils.files.fopen(str(tmp_path / name), "w"):
+            pass
+    # The changes are held back until the window elapsed
+    assert inotify.beacon(config) == []
+    with patch("time.time", return_value=time.time() + 5):
+        ret = inotify.beacon(config)
+    assert ret == [
+        {
+            "tag": str(tmp_path),
+            "path": str(tmp_path),
+            "change": "burst",
+            "count": 3,
+            "changes": {"IN_CREATE": 3},
+            "paths": [str(tmp_path / "foo"), str(tmp_path / "bar")],
+            "truncated": True,
+        }
+    ]
+    assert inotify.beacon(config) == []
+
+    # A single change is returned as is
+    fp = str(tmp_path / "qux")
+    with salt.utils.files.fopen(fp, "w"):
+        pass
+    assert inotify.beacon(config) == []
+    with patch("time.time", return_value=time.time() + 5):
+        ret = inotify.beacon(config)
+    assert ret == [{"tag": str(tmp_path), "path": fp, "change": "IN_CREATE"}]
+
+
+@pytest.mark.skip_on_freebsd(
+    reason="Skip on FreeBSD - does not yet have full inotify/watchdog support",
+)
+def test_max_events(tmp_path):
+    config = [{"files": {str(tmp_path): {"mask": ["create"]}}, "max_events": 2}]
+    ret = inotify.validate(config)
+    assert ret == (True, "Valid beacon configuration")
+
+    assert inotify.beacon(config) == []
+    for name in ("foo", "bar"):
+        with salt.utils.files.fopen(str(tmp_path / name), "w"):
+            pass
+    assert len(inotify.beacon(config)) == 2
+    for name in ("baz", "qux", "quux"):
+        with salt.utils.files.fopen(str(tmp_path / name), "w"):
+            pass
+    ret = inotify.beacon(config)
+    assert len(ret) == 1
+    assert ret[0]["change"] == "burst"
+    assert ret[0]["count"] == 3
+    assert ret[0]["paths"] == [
+        str(tmp_path / "baz"),
+        str(tmp_path / "qux"),
+        str(tmp_path / "quux"),
+    ]
+
+
+def test_invalid_window():
+    config = [{"files": {"/tmp": {}}, "window": -1}]
+    assert inotify.validate(config) == (
+        False,
+        "Configuration for inotify beacon window must be a positive number.",
+    )
+
+
 @pytest.mark.skip_on_freebsd(
     reason="Skip on FreeBSD - does not yet have full inotify/watchdog support",
 )
@@ -190,3 +190,27 @@ def test_fetch_debug(cache, opts):
             # Check debug data
             assert cache.call == 6
             assert cache.hit == 3
+
+
+def test_fetch_many(cache):
+    with patch(
+        "salt.cache.Cache.fetch_many", return_value={"bank1": "fake_data"}
+    ) as fetch_many_mock, patch("salt.loader.cache", return_value={}):
+        with patch("time.time", return_value=0):
+            ret = cache.fetch_many(["bank1", "bank2"], "key")
+        assert ret == {"bank1": "fake_data"}
+        assert salt.cache.MemCache.data == {
+            "fake_driver": {("bank1", "key"): [0, "fake_data"]}
+        }
+        fetch_many_mock.assert_called_once_with(["bank1", "bank2"], "key")
+        fetch_many_mock.reset_mock()
+
+        # Only the banks which are not cached are fetched again
+        fetch_many_mock.return_value = {}
+        with patch("time.time", return_value=1):
+            ret = cache.fetch_many(["bank1", "bank2"], "key")
+        assert ret == {"bank1": "fake_data"}
+        fetch_many_mock.assert_called_once_with(["bank2"], "key")
+        assert salt.cache.MemCache.data == {
+            "fake_driver": {("bank1", "key"): [1, "fake_data"]}
+        }
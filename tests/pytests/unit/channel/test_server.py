@@ -1,6 +1,8 @@
 import pytest
 
 import salt.channel.server as server
+import salt.utils.minions
+from tests.support.mock import MagicMock, patch
 
 
 @pytest.fixture
@@ -41,3 +43,29 @@ def test_compare_keys_newline_tgt(key_data, linesep):
     assert not src_key.endswith(linesep)
     assert tgt_key.endswith("\n")
     assert server.ReqServerChannel.compare_keys(src_key, tgt_key) is True
+
+
+def test_presence_file(tmp_path):
+    opts = {
+        "cachedir": str(tmp_path),
+        "transport": "tcp",
+        "publish_port": 4505,
+        "transport_presence": True,
+    }
+    channel = server.PubServerChannel.__new__(server.PubServerChannel)
+    channel.opts = opts
+    channel.present = {}
+    channel.presence_events = False
+    channel.presence_file = salt.utils.minions.presence_path(opts)
+    channel._presence_write_pending = False
+    client = MagicMock(id_="minion", address=("203.0.113.1", 50000))
+    with patch("tornado.ioloop.IOLoop.current") as current:
+        channel._add_client_present(client)
+        current.return_value.call_later.assert_called_once_with(
+            server.PRESENCE_WRITE_DELAY, channel._write_presence
+        )
+        channel._write_presence()
+        assert salt.utils.minions.read_presence(opts) == {"minion": "203.0.113.1"}
+        channel._remove_client_present(client)
+        channel._write_presence()
+        assert salt.utils.minions.read_presence(opts) == {}
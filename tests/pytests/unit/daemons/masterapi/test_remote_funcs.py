@@ -2,6 +2,7 @@ import pytest
 
 import salt.config
 import salt.daemons.masterapi as masterapi
+import salt.utils.mine
 import salt.utils.platform
 from tests.support.mock import MagicMock, patch
 
@@ -18,7 +19,25 @@ class FakeCache:
         self.data[bank, key] = value
 
     def fetch(self, bank, key):
-        return self.data[bank, key]
+        return self.data.get((bank, key), {})
+
+    def fetch_many(self, banks, key):
+        return {
+            bank: self.data[bank, key] for bank in banks if (bank, key) in self.data
+        }
+
+    def contains(self, bank, key=None):
+        if key is None:
+            return any(bank_ == bank for bank_, _ in self.data)
+        return (bank, key) in self.data
+
+    def list(self, bank):
+        return [key for bank_, key in self.data if bank_ == bank]
+
+    def flush(self, bank, key=None):
+        for bank_, key_ in list(self.data):
+            if bank_ == bank and key in (None, key_):
+                del self.data[bank_, key_]
 
 
 @pytest.fixture
@@ -203,3 +222,95 @@ def test_mine_get_acl_rejected(funcs):
             }
         )
     assert ret == {}
+
+
+def test_mine_per_function(funcs):
+    """
+    Asserts that with ``mine_cache_per_function`` every function is stored
+    under its own key and that ``mine_get`` reads them back.
+    """
+    funcs.opts["minion_data_cache"] = True
+    funcs.opts["mine_cache_per_function"] = True
+    funcs._mine({"id": "webserver", "data": {"ip_addr": "2001:db8::1:3"}})
+    funcs._mine({"id": "webserver", "data": {"ip4_addr": "127.0.0.1"}})
+    assert funcs.cache.data == {
+        ("minions/webserver/mine", "ip_addr"): "2001:db8::1:3",
+        ("minions/webserver/mine", "ip4_addr"): "127.0.0.1",
+    }
+    with patch(
+        "salt.utils.minions.CkMinions._check_compound_minions",
+        MagicMock(return_value=dict(minions=["webserver", "dbserver"], missing=[])),
+    ):
+        ret = funcs._mine_get(
+            {
+                "id": "requester_minion",
+                "tgt": "G@roles:web",
+                "fun": "ip_addr,ip4_addr",
+                "tgt_type": "compound",
+            }
+        )
+    assert ret == dict(
+        ip_addr=dict(webserver="2001:db8::1:3"),
+        ip4_addr=dict(webserver="127.0.0.1"),
+    )
+
+    funcs._mine_delete({"id": "webserver", "fun": "ip_addr"})
+    assert funcs.cache.data == {
+        ("minions/webserver/mine", "ip4_addr"): "127.0.0.1",
+    }
+    funcs._mine_flush({"id": "webserver"})
+    assert funcs.cache.data == {}
+
+
+def test_mine_per_function_legacy(funcs):
+    """
+    Asserts that with ``mine_cache_per_function`` the mine data stored in the
+    ``mine`` key is still returned, and moved on the next update.
+    """
+    funcs.opts["minion_data_cache"] = True
+    funcs.opts["mine_cache_per_function"] = True
+    funcs.cache.store(
+        "minions/webserver",
+        "mine",
+        dict(ip_addr="2001:db8::1:3", ip4_addr="127.0.0.1"),
+    )
+    with patch(
+        "salt.utils.minions.CkMinions._check_compound_minions",
+        MagicMock(return_value=dict(minions=["webserver"], missing=[])),
+    ):
+        ret = funcs._mine_get(
+            {
+                "id": "requester_minion",
+                "tgt": "G@roles:web",
+                "fun": "ip_addr",
+                "tgt_type": "compound",
+            }
+        )
+    assert ret == dict(webserver="2001:db8::1:3")
+
+    funcs._mine({"id": "webserver", "data": {"ip4_addr": "127.0.0.2"}})
+    assert funcs.cache.data == {
+        ("minions/webserver/mine", "ip_addr"): "2001:db8::1:3",
+        ("minions/webserver/mine", "ip4_addr"): "127.0.0.2",
+    }
+
+
+def test_mine_per_function_deleted(funcs):
+    """
+    Asserts that a function deleted while the mine data is read is left out.
+    """
+    funcs.opts["mine_cache_per_function"] = True
+    funcs.cache.store("minions/webserver/mine", "ip_addr", "2001:db8::1:3")
+    funcs.cache.store("minions/webserver/mine", "ip4_addr", "127.0.0.1")
+    fetch = funcs.cache.fetch
+
+    def fetch_deleted(bank, key):
+        if key == "ip4_addr":
+            # What the localfs driver raises once the file of the function is
+            # gone and the mine.p file of the old layout is read instead
+            raise KeyError(key)
+        return fetch(bank, key)
+
+    with patch.object(funcs.cache, "fetch", fetch_deleted):
+        ret = salt.utils.mine.fetch_mine_data(funcs.cache, funcs.opts, ["webserver"])
+    assert ret == {"webserver": {"ip_addr": "2001:db8::1:3"}}
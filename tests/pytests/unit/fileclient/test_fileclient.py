@@ -9,8 +9,9 @@ import os
 import pytest
 
 import salt.utils.files
+import salt.utils.hashutils
 from salt import fileclient
-from tests.support.mock import AsyncMock, MagicMock, Mock, patch
+from tests.support.mock import AsyncMock, MagicMock, Mock, call, patch
 
 log = logging.getLogger(__name__)
 
@@ -239,3 +240,144 @@ def test_get_url_with_hash(client_opts):
                 result = client.get_url(url, dest)
 
                 assert result == "/path/to/file#with#hash"
+
+
+@pytest.fixture
+def remote_client(minion_opts):
+    channel = MagicMock()
+    with patch("salt.channel.client.ReqChannel.factory", return_value=channel):
+        client = fileclient.RemoteClient(minion_opts)
+    yield client
+
+
+def test_hash_and_stat_files(remote_client):
+    hsum = {"hsum": "abc", "hash_type": "sha256"}
+    remote_client.channel.send.return_value = {
+        "foo.conf": [hsum, [1] * 10],
+        "missing.conf": ["", None],
+    }
+    ret = remote_client.hash_and_stat_files(
+        ["salt://foo.conf", "salt://missing.conf"], "base"
+    )
+    assert ret == {
+        "salt://foo.conf": (hsum, [1] * 10),
+        "salt://missing.conf": ("", None),
+    }
+    remote_client.channel.send.assert_called_once_with(
+        {
+            "paths": ["foo.conf", "missing.conf"],
+            "saltenv": "base",
+            "cmd": "_file_hash_many",
+        },
+        raw=False,
+    )
+    # The hashes are re-used without asking the master again
+    assert remote_client.hash_file("salt://foo.conf", "base") == hsum
+    assert remote_client.hash_and_stat_file("salt://missing.conf", "base") == (
+        "",
+        None,
+    )
+    assert remote_client.channel.send.call_count == 1
+    # but not for another environment or once they expired
+    remote_client.channel.send.return_value = hsum
+    assert remote_client.hash_file("salt://foo.conf", "dev") == hsum
+    with patch.object(fileclient, "HASH_PREFETCH_TTL", -1):
+        assert remote_client.hash_file("salt://foo.conf", "base") == hsum
+    assert remote_client.channel.send.call_count == 3
+
+
+@pytest.mark.parametrize("unsupported", [{}, False])
+def test_hash_and_stat_files_old_master(remote_client, unsupported):
+    """
+    Masters without _file_hash_many answer it with an empty dict
+    """
+    hsum = {"hsum": "abc", "hash_type": "sha256"}
+    remote_client.channel.send.side_effect = [
+        unsupported,
+        hsum,
+        {"stat": [1] * 10},
+    ]
+    ret = remote_client.hash_and_stat_files(["salt://foo.conf"], "base")
+    assert ret == {"salt://foo.conf": (hsum, [1] * 10)}
+    assert [x.args[0]["cmd"] for x in remote_client.channel.send.call_args_list] == [
+        "_file_hash_many",
+        "_file_hash",
+        "_file_find",
+    ]
+    assert remote_client._prefetched("salt://foo.conf", "base") is None
+
+
+def test_cache_files_prefetches_hashes(remote_client):
+    with patch.object(remote_client, "hash_and_stat_files") as hash_files, patch.object(
+        remote_client, "cache_file"
+    ) as cache_file:
+        remote_client.cache_files(
+            ["salt://foo.conf", "salt://bar.conf?saltenv=dev", "/etc/baz.conf"],
+            "base",
+        )
+    assert hash_files.call_args_list == [
+        call(["salt://foo.conf"], "base"),
+        call(["salt://bar.conf"], "dev"),
+    ]
+    assert cache_file.call_count == 3
+
+
+@pytest.mark.parametrize("pipelined", [True, False])
+def test_get_file_pipelined(remote_client, tmp_path, pipelined):
+    content = os.urandom(10 * 1024 + 10)
+    chunk_size = 1024
+    locs = []
+
+    def serve(load, raw=False):
+        locs.append(load["loc"])
+        chunk = content[load["loc"] : load["loc"] + chunk_size]
+        return {b"data": chunk, b"dest": b"foo.bin", b"size": len(content)}
+
+    def send_pipelined(loads, callback, window=1, raw=False):
+        for load in loads:
+            if callback(serve(load)) is False:
+                break
+
+    remote_client.opts["file_transfer_window"] = 4
+    remote_client.channel.pipelined = pipelined
+    remote_client.channel.send.side_effect = serve
+    remote_client.channel.send_pipelined.side_effect = send_pipelined
+    dest = str(tmp_path / "foo.bin")
+    with patch.object(remote_client, "hash_file", return_value={"hsum": "abc"}):
+        assert remote_client.get_file("salt://foo.bin", dest) == dest
+    with salt.utils.files.fopen(dest, "rb") as fp_:
+        assert fp_.read() == content
+    assert locs == list(range(0, len(content), chunk_size)) + [len(content)]
+    if pipelined:
+        # Only the first chunk and the final empty read are requested on their
+        # own
+        assert remote_client.channel.send.call_count == 2
+        remote_client.channel.send_pipelined.assert_called_once()
+    else:
+        assert remote_client.channel.send.call_count == len(locs)
+        remote_client.channel.send_pipelined.assert_not_called()
+
+
+def test_get_file_cache_index(remote_client, tmp_path):
+    remote_client.opts["cachedir"] = str(tmp_path / "cache")
+    remote_client.opts["file_cache_index"] = True
+    content = b"foo"
+
+    def send(load, raw=False):
+        if load["cmd"] == "_file_hash":
+            return {"hsum": "abc", "hash_type": "sha256"}
+        return {"data": content[load["loc"] :], "dest": "foo.conf"}
+
+    remote_client.channel.send.side_effect = send
+    dest = remote_client.get_file("salt://foo.conf")
+    index = remote_client._get_cache_index()
+    assert dest in index.entries
+    # The cached copy is checked against the master's hash without being read
+    # again
+    with patch("salt.utils.hashutils.get_hash") as get_hash:
+        ret = remote_client.hash_file(dest)
+    get_hash.assert_not_called()
+    assert ret == {
+        "hsum": salt.utils.hashutils.get_hash(dest, "sha256"),
+        "hash_type": "sha256",
+    }
@@ -26,6 +26,7 @@ import pathlib
 import pytest
 import tornado.ioloop
 
+import salt.fileserver
 import salt.fileserver.gitfs as gitfs
 import salt.utils.files
 import salt.utils.gitfs
@@ -269,6 +270,29 @@ def test_find_and_serve_file(repo_dir):
         assert ret == {"data": data, "dest": "testfile"}
 
 
+def test_fileserver_serve_file(repo_dir):
+    """
+    gitfs only reports the file mode in the stat, so the fileserver serves
+    its files without the size
+    """
+    funcs = {
+        "gitfs.envs": gitfs.envs,
+        "gitfs.find_file": gitfs.find_file,
+        "gitfs.serve_file": gitfs.serve_file,
+    }
+    with patch.dict(gitfs.__opts__, {"file_buffer_size": 262144}), patch(
+        "salt.loader.fileserver", return_value=funcs
+    ):
+        gitfs.update()
+        fs = salt.fileserver.Fileserver(gitfs.__opts__)
+        ret = fs.serve_file({"saltenv": "base", "path": "testfile", "loc": 0})
+
+    with salt.utils.files.fopen(os.path.join(repo_dir, "testfile"), "r") as fp_:
+        data = fp_.read()
+
+    assert ret == {"data": data, "dest": "testfile"}
+
+
 def test_file_list_fallback(unicode_filename, unicode_dirname):
     with patch.dict(gitfs.__opts__, {"gitfs_fallback": "master"}):
         gitfs.update()
@@ -379,6 +379,51 @@ def test_update_master():
         assert mine.update() == mock_load
 
 
+def test_update_master_delta(tmp_path):
+    """
+    Tests whether the ``update``-function with ``mine_delta`` only sends the
+    functions whose data changed to the master.
+    """
+    ip_ret = "2001:db8::1:3"
+    config_mine_functions = {
+        "network.ip_addrs": [],
+        "foo.bar": {},
+    }
+    foo_bar = MagicMock(return_value="baz")
+    mine_send = MagicMock(side_effect=lambda x, y: x)
+    with patch.object(mine, "_mine_send", mine_send), patch.dict(
+        mine.__opts__,
+        {
+            "file_client": "remote",
+            "id": "webserver",
+            "cachedir": str(tmp_path),
+            "mine_delta": True,
+        },
+    ), patch.dict(
+        mine.__salt__,
+        {
+            "config.merge": MagicMock(return_value=config_mine_functions),
+            "network.ip_addrs": MagicMock(return_value=ip_ret),
+            "foo.bar": foo_bar,
+        },
+    ):
+        assert mine.update()["data"] == {"network.ip_addrs": ip_ret, "foo.bar": "baz"}
+        # Nothing changed, nothing is sent
+        assert mine.update() is True
+        assert mine_send.call_count == 1
+        foo_bar.return_value = "qux"
+        assert mine.update()["data"] == {"foo.bar": "qux"}
+        # Sending a function on its own makes the next update send it again
+        mine.send("network.ip_addrs")
+        assert mine.update()["data"] == {"network.ip_addrs": ip_ret}
+        # All of the functions are sent again once mine_delta_refresh passed
+        with patch.dict(mine.__opts__, {"mine_delta_refresh": 0}):
+            assert mine.update()["data"] == {
+                "network.ip_addrs": ip_ret,
+                "foo.bar": "qux",
+            }
+
+
 def test_delete_local(mock_cache):
     """
     Tests the ``delete``-function on the minion's local cache.
@@ -198,3 +198,46 @@ def test_clear_job_cache(salt_call_cli, minion_opts):
 def test_regen_keys(salt_call_cli, minion_opts):
     pathlib.Path(minion_opts["pki_dir"], "dummydir").mkdir(parents=True, exist_ok=True)
     saltutil.regen_keys()
+
+
+def test_sync_all_shares_manifests():
+    with patch(
+        "salt.utils.extmods.sync", return_value=([], False)
+    ) as extmods_sync, patch("salt.modules.saltutil.refresh_pillar"):
+        saltutil.sync_all(saltenv="base")
+    manifests = [x.kwargs["manifests"] for x in extmods_sync.call_args_list]
+    assert len(manifests) > 1
+    assert all(x is manifests[0] for x in manifests)
+    assert manifests[0] == {}
+    assert saltutil.SYNC_MANIFESTS_CKEY not in saltutil.__context__
+    # Syncing a single type of modules does not use a manifest
+    with patch("salt.utils.extmods.sync", return_value=([], False)) as extmods_sync:
+        saltutil.sync_modules(saltenv="base", refresh=False)
+    assert extmods_sync.call_args.kwargs["manifests"] is None
+
+
+def test_signal_job_pool_job_done(minion_opts):
+    """
+    A job pool worker is not signalled once it is done with the job, it may
+    already be running another one.
+    """
+    data = {"jid": "20240101000000000000", "pid": 1234, "job_pool": True}
+    with patch("salt.utils.minion.running", return_value=[data]), patch(
+        "os.kill"
+    ) as kill:
+        ret = saltutil.signal_job("20240101000000000000", 15)
+    assert ret == "Job 20240101000000000000 was not running"
+    kill.assert_not_called()
+
+
+def test_signal_job_pool_job(minion_opts):
+    data = {"jid": "20240101000000000000", "pid": 1234, "job_pool": True}
+    proc_dir = pathlib.Path(minion_opts["cachedir"], "proc")
+    proc_dir.mkdir(parents=True, exist_ok=True)
+    (proc_dir / "20240101000000000000").write_bytes(b"")
+    with patch("salt.utils.minion.running", return_value=[data]), patch(
+        "os.kill"
+    ) as kill, patch.object(saltutil, "HAS_PSUTIL", False):
+        ret = saltutil.signal_job("20240101000000000000", 15)
+    assert ret == "Signal 15 sent to job 20240101000000000000 at pid 1234"
+    kill.assert_called_once_with(1234, 15)
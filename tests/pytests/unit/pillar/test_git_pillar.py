@@ -0,0 +1,52 @@
+"""
+Unit tests for the git_pillar external pillar
+"""
+
+import pytest
+
+import salt.pillar.git_pillar as git_pillar
+from tests.support.mock import MagicMock, patch
+
+
+@pytest.fixture
+def configure_loader_modules(master_opts):
+    master_opts["git_pillar_compile_cache"] = True
+    return {git_pillar: {"__opts__": master_opts}}
+
+
+@pytest.fixture
+def gitpillar():
+    repo = MagicMock(id="repo")
+    repo.get_checkout_sha.return_value = "abc"
+    obj = MagicMock()
+    obj.pillar_repos = {"/pillar": [repo]}
+    with patch.object(git_pillar, "_RENDER_CACHES", {}):
+        yield obj, repo
+
+
+def test_get_render_cache_keyed_by_sha(gitpillar):
+    obj, repo = gitpillar
+    render_cache = git_pillar._get_render_cache("base", ["/pillar"], obj)
+    assert render_cache is not None
+    assert git_pillar._get_render_cache("base", ["/pillar"], obj) is render_cache
+    # Another environment gets its own cache
+    assert git_pillar._get_render_cache("dev", ["/pillar"], obj) is not render_cache
+    # New commits were fetched
+    repo.get_checkout_sha.return_value = "def"
+    new_cache = git_pillar._get_render_cache("base", ["/pillar"], obj)
+    assert new_cache is not render_cache
+    assert git_pillar._get_render_cache("base", ["/pillar"], obj) is new_cache
+
+
+def test_get_render_cache_unresolved_sha(gitpillar):
+    obj, repo = gitpillar
+    repo.get_checkout_sha.return_value = None
+    assert git_pillar._get_render_cache("base", ["/pillar"], obj) is None
+    repo.get_checkout_sha.side_effect = Exception("bad repo")
+    assert git_pillar._get_render_cache("base", ["/pillar"], obj) is None
+
+
+def test_get_render_cache_disabled(gitpillar):
+    obj, _ = gitpillar
+    with patch.dict(git_pillar.__opts__, {"git_pillar_compile_cache": False}):
+        assert git_pillar._get_render_cache("base", ["/pillar"], obj) is None
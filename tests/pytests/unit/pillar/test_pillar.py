@@ -208,3 +208,25 @@ def test_remote_pillar_timeout(temp_salt_minion, tmp_path):
     msg = r"^Pillar timed out after \d{1,4} seconds$"
     with pytest.raises(salt.exceptions.SaltClientError):
         pillar.compile_pillar()
+
+
+def test_pillar_cache_refresh_pillar(temp_salt_minion, tmp_path):
+    opts = temp_salt_minion.config.copy()
+    opts["pillarenv"] = None
+    opts["pillar_cache"] = True
+    opts["cachedir"] = str(tmp_path)
+    (tmp_path / "pillar_cache").mkdir()
+
+    pillar = salt.pillar.PillarCache(
+        opts=opts,
+        grains={},
+        minion_id=temp_salt_minion.id,
+        saltenv="base",
+    )
+    assert pillar.cached_pillarenvs() == []
+    pillar.fetch_pillar = MagicMock(side_effect=[{"foo": 1}, {"foo": 2}])
+    assert pillar.refresh_pillar() == {"foo": 1}
+    # refresh_pillar() compiles even though the pillar is cached
+    assert pillar.refresh_pillar() == {"foo": 2}
+    assert pillar.cached_pillarenvs() == [None]
+    assert pillar.compile_pillar() == {"foo": 2}
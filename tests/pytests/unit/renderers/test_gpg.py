@@ -5,6 +5,7 @@ from textwrap import dedent
 import pytest
 
 import salt.renderers.gpg as gpg
+import salt.utils.secretcache
 from salt.exceptions import SaltRenderError
 from tests.support.mock import MagicMock, Mock, call, patch
 
@@ -317,3 +318,48 @@ def test_render_with_cache(minion_opts):
                                 )
                             ]
                         )
+
+
+def test_render_batch():
+    key_dir = "/etc/salt/gpgkeys"
+    crypted_a = "-----BEGIN PGP MESSAGE-----\naaa\n-----END PGP MESSAGE-----"
+    crypted_b = "-----BEGIN PGP MESSAGE-----\nbbb\n-----END PGP MESSAGE-----"
+    secrets = {crypted_a.encode(): b"secret a", crypted_b.encode(): b"secret b"}
+
+    def popen(*args, **kwargs):
+        return Mock(
+            communicate=lambda *args, **kwargs: (secrets[kwargs["input"]], None),
+        )
+
+    with patch.dict(gpg.__opts__, {"gpg_decrypt_workers": 4}), patch(
+        "salt.renderers.gpg.Popen", side_effect=popen
+    ) as popen_mock, patch(
+        "salt.renderers.gpg._get_gpg_exec", MagicMock(return_value="/usr/bin/gpg")
+    ), patch(
+        "salt.renderers.gpg._get_key_dir", MagicMock(return_value=key_dir)
+    ):
+        ret = gpg.render({"a": crypted_a, "b": [crypted_b, crypted_a]})
+        assert ret == {"a": "secret a", "b": ["secret b", "secret a"]}
+        # Every distinct ciphertext is decrypted once
+        assert popen_mock.call_count == 2
+
+
+def test_render_with_secret_cache():
+    key_dir = "/etc/salt/gpgkeys"
+    crypted = "-----BEGIN PGP MESSAGE-----\naaa\n-----END PGP MESSAGE-----"
+    secret_cache = salt.utils.secretcache.SecretCache(60)
+
+    with patch(
+        "salt.utils.secretcache.get_secret_cache", return_value=secret_cache
+    ), patch("salt.renderers.gpg.Popen") as popen_mock, patch(
+        "salt.renderers.gpg._get_gpg_exec", MagicMock(return_value="/usr/bin/gpg")
+    ), patch(
+        "salt.renderers.gpg._get_key_dir", MagicMock(return_value=key_dir)
+    ):
+        popen_mock.return_value = Mock(
+            communicate=lambda *args, **kwargs: (b"secret", None),
+        )
+        assert gpg.render(crypted) == "secret"
+        assert gpg.render(crypted) == "secret"
+        popen_mock.assert_called_once()
+        assert secret_cache.get(crypted) == b"secret"
@@ -1,6 +1,7 @@
 import pytest
 
 import salt.renderers.nacl as nacl
+import salt.utils.secretcache
 from tests.support.mock import MagicMock, patch
 
 
@@ -38,3 +39,18 @@ def test_render():
     crypted = "NACL[MRN3cc+fmdxyQbz6WMF+jq1hKdU5X5BBI7OjK+atvHo1ll+w1gZ7XyWtZVfq9gK9rQaMfkDxmidJKwE0Mw==]"
     with patch.dict(nacl.__salt__, {"nacl.dec": MagicMock(return_value=secret)}):
         assert nacl.render(crypted) == secret
+
+
+def test_render_with_secret_cache():
+    """
+    test that decrypted secrets are cached in the secret cache
+    """
+    crypted = "NACL[MRN3cc+fmdxyQbz6WMF+jq1hKdU5X5BBI7OjK+atvHo1ll+w1gZ7XyWtZVfq9gK9rQaMfkDxmidJKwE0Mw==]"
+    secret_cache = salt.utils.secretcache.SecretCache(60)
+    dec = MagicMock(return_value=b"Use more salt.")
+    with patch(
+        "salt.utils.secretcache.get_secret_cache", return_value=secret_cache
+    ), patch.dict(nacl.__salt__, {"nacl.dec": dec}):
+        assert nacl.render(crypted) == b"Use more salt."
+        assert nacl.render(crypted) == b"Use more salt."
+        dec.assert_called_once()
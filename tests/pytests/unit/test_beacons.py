@@ -3,6 +3,7 @@ unit tests for the beacon_module parameter
 """
 
 import logging
+import time
 
 import salt.beacons
 from tests.support.mock import MagicMock, call, patch
@@ -121,3 +122,73 @@ def test_beacon_module(minion_opts):
     with patch.object(beacon, "beacons", mocked) as patched:
         beacon.process(minion_opts["beacons"], minion_opts["grains"])
         patched[name].assert_has_calls(calls)
+
+
+def test_beacon_delta_dedupe_batch(minion_opts):
+    """
+    Test that only the changed, not recently sent events are returned, and
+    that they are held back for beacons_batch_window
+    """
+    minion_opts["id"] = "minion"
+    minion_opts["__role"] = "minion"
+    minion_opts["beacons"] = {
+        "watch_apache": [
+            {"processes": {"apache2": "stopped"}},
+            {"beacon_module": "ps"},
+            {"delta": True},
+        ],
+        "watch_nginx": [
+            {"processes": {"nginx": "stopped"}},
+            {"beacon_module": "ps"},
+            {"dedupe_window": 60},
+        ],
+    }
+    beacon = salt.beacons.Beacon(minion_opts, [])
+    states = {
+        "watch_apache": iter(["stopped", "running", "running", "stopped"]),
+        "watch_nginx": iter(["stopped", "stopped", "running", "stopped"]),
+    }
+
+    def _beacon(config):
+        return [{"tag": "ps", "state": next(states[config[-1]["_beacon_name"]])}]
+
+    mocked = {"ps.beacon": MagicMock(side_effect=_beacon)}
+    mocked["ps.beacon"].__globals__ = {}
+
+    def _process():
+        return [
+            (event["tag"], event["data"]["state"])
+            for event in beacon.process(minion_opts["beacons"], minion_opts["grains"])
+        ]
+
+    with patch.object(beacon, "beacons", mocked):
+        assert _process() == [
+            ("salt/beacon/minion/watch_apache/ps", "stopped"),
+            ("salt/beacon/minion/watch_nginx/ps", "stopped"),
+        ]
+        assert _process() == [("salt/beacon/minion/watch_apache/ps", "running")]
+        assert _process() == [("salt/beacon/minion/watch_nginx/ps", "running")]
+        with patch("time.time", return_value=time.time() + 60):
+            assert _process() == [
+                ("salt/beacon/minion/watch_apache/ps", "stopped"),
+                ("salt/beacon/minion/watch_nginx/ps", "stopped"),
+            ]
+        # The options are not passed to the beacon
+        mocked["ps.beacon"].assert_called_with(
+            [
+                {"processes": {"nginx": "stopped"}},
+                {"beacon_module": "ps"},
+                {"_beacon_name": "watch_nginx"},
+            ]
+        )
+
+    minion_opts["beacons_batch_window"] = 5
+    minion_opts["beacons"] = {"watch_apache": minion_opts["beacons"]["watch_apache"]}
+    states["watch_apache"] = iter(["running", "stopped"])
+    with patch.object(beacon, "beacons", mocked):
+        assert _process() == []
+        with patch("time.time", return_value=time.time() + 5):
+            assert _process() == [
+                ("salt/beacon/minion/watch_apache/ps", "running"),
+                ("salt/beacon/minion/watch_apache/ps", "stopped"),
+            ]
@@ -4,6 +4,7 @@ import time
 
 import salt.fileserver
 import salt.utils.files
+import salt.utils.hashutils
 
 
 def test_diff_with_diffent_keys():
@@ -121,3 +122,81 @@ def test_file_server_serve_url_escape(tmp_path):
         }
     )
     assert ret == {"data": "", "dest": ""}
+
+
+def test_file_hash_many(tmp_path, master_opts):
+    fileroot = tmp_path / "srv" / "salt"
+    fileroot.mkdir(parents=True)
+    (fileroot / "foo.conf").write_text("foo")
+    (fileroot / "bar.conf").write_text("bar")
+    master_opts.update(
+        {
+            "fileserver_backend": ["roots"],
+            "file_roots": {"base": [str(fileroot)]},
+            "cachedir": str(tmp_path / "cache"),
+        }
+    )
+    fs = salt.fileserver.Fileserver(master_opts)
+    ret = fs.file_hash_many(
+        {"paths": ["foo.conf", "bar.conf", "missing.conf"], "saltenv": "base"}
+    )
+    for name in ("foo.conf", "bar.conf"):
+        hash_result, stat_result = ret[name]
+        assert hash_result == fs.file_hash({"path": name, "saltenv": "base"})
+        assert stat_result == list(os.stat(fileroot / name))
+    assert ret["missing.conf"] == ["", None]
+    assert fs.file_hash_many({"paths": "foo.conf", "saltenv": "base"}) == {}
+
+
+def test_serve_file_size(tmp_path, master_opts):
+    fileroot = tmp_path / "srv" / "salt"
+    fileroot.mkdir(parents=True)
+    (fileroot / "foo.conf").write_bytes(b"foo" * 10)
+    master_opts.update(
+        {
+            "fileserver_backend": ["roots"],
+            "file_roots": {"base": [str(fileroot)]},
+            "cachedir": str(tmp_path / "cache"),
+            "file_buffer_size": 8,
+        }
+    )
+    fs = salt.fileserver.Fileserver(master_opts)
+    ret = fs.serve_file({"path": "foo.conf", "saltenv": "base", "loc": 8})
+    assert ret == {"data": b"ofoofoof", "dest": "foo.conf", "size": 30}
+    ret = fs.serve_file({"path": "foo.conf", "saltenv": "base", "loc": 30})
+    assert ret == {"data": b"", "dest": "foo.conf"}
+
+
+def test_file_manifest(tmp_path, master_opts):
+    roots = {}
+    for saltenv in ("base", "dev"):
+        fileroot = tmp_path / "srv" / saltenv
+        (fileroot / "_modules" / "sub").mkdir(parents=True)
+        (fileroot / "_modules" / "sub" / "foo.py").write_text(saltenv)
+        (fileroot / "_modules_old").mkdir()
+        (fileroot / "_modules_old" / "bar.py").write_text("bar")
+        (fileroot / "top.sls").write_text("base: {}")
+        roots[saltenv] = [str(fileroot)]
+    master_opts.update(
+        {
+            "fileserver_backend": ["roots"],
+            "file_roots": roots,
+            "cachedir": str(tmp_path / "cache"),
+        }
+    )
+    fs = salt.fileserver.Fileserver(master_opts)
+    ret = fs.file_manifest({"dirs": ["_modules", "_states"], "saltenvs": ["base"]})
+    assert ret == {
+        "hash_type": master_opts["hash_type"],
+        "files": {
+            "base": {
+                "_modules/sub/foo.py": salt.utils.hashutils.get_hash(
+                    str(tmp_path / "srv" / "base" / "_modules" / "sub" / "foo.py"),
+                    master_opts["hash_type"],
+                )
+            }
+        },
+    }
+    ret = fs.file_manifest({"dirs": ["_modules"], "saltenvs": ["base", "dev"]})
+    assert ret["files"]["base"] != ret["files"]["dev"]
+    assert fs.file_manifest({"dirs": "_modules", "saltenvs": ["base"]}) == {}
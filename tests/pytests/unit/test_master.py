@@ -7,6 +7,8 @@ import time
 import pytest
 
 import salt.master
+import salt.payload
+import salt.utils.hashutils
 import salt.utils.platform
 from tests.support.mock import MagicMock, patch
 
@@ -1057,3 +1059,169 @@ def test_syndic_return_cache_dir_creation_traversal(encrypted_requests):
     )
     assert not (cachedir / "syndics").exists()
     assert not (cachedir / "mamajama").exists()
+
+
+def test_return_batch(encrypted_requests):
+    """
+    The returns coalesced by a minion are stored one by one, dropping those
+    claiming to come from another minion
+    """
+    rets = [
+        {"id": "minion", "jid": "1", "fun": "test.ping", "return": True},
+        {"id": "minion", "jid": "2", "fun": "test.ping", "return": True},
+        {"id": "other", "jid": "3", "fun": "test.ping", "return": True},
+    ]
+    encrypted_requests.opts["require_minion_sign_messages"] = False
+    with patch("salt.utils.job.store_job") as store_job:
+        encrypted_requests._return({"cmd": "_return", "id": "minion", "load": rets})
+    assert [x.args[1] for x in store_job.call_args_list] == rets[:2]
+
+
+@pytest.fixture
+def pillar_precompile(master_opts, tmp_path):
+    opts = master_opts.copy()
+    opts.update(
+        pillar_cache=True,
+        pillar_cache_ttl=3600,
+        pillar_cache_precompile=True,
+        pillar_roots={"base": [str(tmp_path / "pillar")]},
+    )
+    (tmp_path / "pillar").mkdir()
+    os.makedirs(os.path.join(opts["cachedir"], "pillar_cache"), exist_ok=True)
+    precompile = salt.master.PillarPrecompile(opts)
+    precompile.cache = MagicMock()
+    precompile.cache.fetch.side_effect = lambda bank, key: {
+        "grains": {"id": bank.split("/")[-1]}
+    }
+    precompile.ckminions = MagicMock()
+    precompile.ckminions.check_minions.return_value = {
+        "minions": ["cached", "changed", "expiring", "uncached"]
+    }
+    precompile.git_pillar = []
+    return precompile
+
+
+def test_pillar_precompile_pending_order(pillar_precompile):
+    """
+    Minions without cached pillar come first, then minions whose inputs
+    changed, then minions whose cached pillar is about to expire.
+    """
+    opts = pillar_precompile.opts
+    fingerprint = pillar_precompile.inputs_fingerprint()
+    now = time.time()
+    for minion_id, age in (("cached", 10), ("changed", 10), ("expiring", 3000)):
+        path = os.path.join(opts["cachedir"], "pillar_cache", minion_id)
+        pathlib.Path(path).touch()
+        os.utime(path, (now - age, now - age))
+    for minion_id in ("cached", "expiring"):
+        grains = pillar_precompile.minion_grains(minion_id)
+        pillar_precompile.compiled[minion_id] = (
+            fingerprint,
+            salt.utils.hashutils.sha256_digest(salt.payload.dumps(grains)),
+        )
+    pillar_precompile.compiled["changed"] = ("old", "old")
+
+    queue = pillar_precompile.pending(fingerprint)
+    assert [(item[0], item[2]) for item in queue] == [
+        (0, "uncached"),
+        (1, "changed"),
+        (2, "expiring"),
+    ]
+
+
+def test_pillar_precompile_fingerprint_follows_pillar_roots(
+    pillar_precompile, tmp_path
+):
+    fingerprint = pillar_precompile.inputs_fingerprint()
+    assert pillar_precompile.inputs_fingerprint() == fingerprint
+    sls = tmp_path / "pillar" / "top.sls"
+    sls.write_text("base: {}")
+    os.utime(sls, (time.time() + 10, time.time() + 10))
+    assert pillar_precompile.inputs_fingerprint() != fingerprint
+
+
+def test_pillar_precompile_seeds_compiled(pillar_precompile):
+    """
+    Pillar cached after the inputs last changed is not compiled again after
+    a restart, pillar cached before that is.
+    """
+    opts = pillar_precompile.opts
+    fingerprint = pillar_precompile.inputs_fingerprint()
+    pillar_precompile.track_fingerprint(fingerprint)
+    pillar_precompile.fingerprint_since = time.time() - 100
+    now = time.time()
+    for minion_id, age in (("cached", 10), ("changed", 200), ("expiring", 3000)):
+        path = os.path.join(opts["cachedir"], "pillar_cache", minion_id)
+        pathlib.Path(path).touch()
+        os.utime(path, (now - age, now - age))
+
+    queue = pillar_precompile.pending(fingerprint)
+    assert [(item[0], item[2]) for item in queue] == [
+        (0, "uncached"),
+        (1, "expiring"),
+        (1, "changed"),
+    ]
+    assert "cached" in pillar_precompile.compiled
+
+
+def test_pillar_precompile_state(pillar_precompile):
+    pillar_precompile.track_fingerprint("fingerprint")
+    pillar_precompile.compiled["minion"] = ("fingerprint", "grains")
+    pillar_precompile.save_state()
+
+    precompile = salt.master.PillarPrecompile(pillar_precompile.opts)
+    precompile.load_state()
+    assert precompile.compiled == {"minion": ("fingerprint", "grains")}
+    assert precompile.fingerprint == "fingerprint"
+    assert precompile.fingerprint_since == pillar_precompile.fingerprint_since
+
+
+def test_pillar_precompile_no_state(pillar_precompile):
+    """
+    A fresh master has no state file yet
+    """
+    assert not os.path.exists(pillar_precompile.state_path)
+    pillar_precompile.load_state()
+    assert pillar_precompile.compiled == {}
+    assert pillar_precompile.fingerprint is None
+    assert pillar_precompile.fingerprint_since is None
+
+
+def test_pillar_precompile_corrupt_state(pillar_precompile):
+    state_path = pathlib.Path(pillar_precompile.state_path)
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    state_path.write_bytes(b"\xc1")
+    pillar_precompile.load_state()
+    assert pillar_precompile.compiled == {}
+
+
+def test_pillar_precompile_unlimited_rate(pillar_precompile):
+    """
+    A rate of 0 does not limit the precompilation, and the inputs are not
+    fingerprinted again after every minion.
+    """
+    pillar_precompile.rate = 0
+    pillar_precompile.loop_interval = 60
+    queue = [(0, 0, "minion1", {}, ("a", "b")), (0, 0, "minion2", {}, ("a", "b"))]
+    patch_init = patch.object(pillar_precompile, "_post_fork_init")
+    patch_pending = patch.object(pillar_precompile, "pending", return_value=queue)
+    patch_refresh = patch.object(pillar_precompile, "refresh")
+    patch_fingerprint = patch.object(
+        pillar_precompile, "inputs_fingerprint", return_value="a"
+    )
+    patch_sleep = patch("time.sleep", side_effect=KeyboardInterrupt)
+    with patch_init, patch_pending, patch_refresh as refresh:
+        with patch_fingerprint as inputs_fingerprint, patch_sleep as sleep:
+            with pytest.raises(KeyboardInterrupt):
+                pillar_precompile.run()
+    assert refresh.call_count == 2
+    inputs_fingerprint.assert_called_once_with()
+    sleep.assert_called_once_with(60)
+    assert os.path.exists(pillar_precompile.state_path)
+
+
+def test_pillar_precompile_refresh(pillar_precompile):
+    with patch("salt.pillar.PillarCache") as pillar_cache:
+        pillar_cache.return_value.cached_pillarenvs.return_value = ["dev", None]
+        pillar_precompile.refresh("minion", {"id": "minion"})
+    assert pillar_cache.return_value.refresh_pillar.call_count == 2
@@ -18,7 +18,7 @@ import salt.utils.platform
 import salt.utils.process
 from salt._compat import ipaddress
 from salt.exceptions import SaltClientError, SaltMasterUnresolvableError, SaltSystemExit
-from tests.support.mock import MagicMock, patch
+from tests.support.mock import AsyncMock, MagicMock, patch
 
 log = logging.getLogger(__name__)
 
@@ -494,6 +494,143 @@ async def test_process_count_max(minion_opts, io_loop):
             minion.destroy()
 
 
+async def test_handle_decoded_payload_job_pool(minion_opts, io_loop):
+    """
+    Tests that jobs are handed off to the job pool when it has an idle worker,
+    and that isolated functions and jobs finding all workers busy are run in a
+    process of their own.
+    """
+    minion_opts["multiprocessing"] = True
+    minion_opts["job_pool_size"] = 2
+    minion_opts["job_pool_isolate"] = ["state.*"]
+    with patch(
+        "salt.utils.process.SignalHandlingProcess.start",
+        MagicMock(return_value=True),
+    ), patch("salt.utils.jobpool.JobPool") as job_pool:
+        job_pool.return_value.submit.return_value = True
+        minion = salt.minion.Minion(minion_opts, jid_queue=[], io_loop=io_loop)
+        try:
+            await minion._handle_decoded_payload(
+                {"fun": "test.ping", "jid": "1", "arg": []}
+            )
+            job_pool.return_value.submit.assert_called_once()
+            await minion._handle_decoded_payload(
+                {"fun": ["test.ping", "state.apply"], "jid": "2", "arg": [[], []]}
+            )
+            assert job_pool.return_value.submit.call_count == 1
+            job_pool.return_value.submit.return_value = False
+            await minion._handle_decoded_payload(
+                {"fun": "test.ping", "jid": "3", "arg": []}
+            )
+            assert job_pool.return_value.submit.call_count == 2
+            assert salt.utils.process.SignalHandlingProcess.start.call_count == 2
+            job_pool.assert_called_once()
+
+            # The workers are replaced once the modules are refreshed
+            minion.schedule = MagicMock()
+            with patch.object(minion, "_load_modules", return_value=[None] * 4):
+                minion.module_refresh()
+            job_pool.return_value.stop.assert_called_once()
+            assert minion.job_pool is None
+        finally:
+            minion.destroy()
+
+
+async def test_return_batch(minion_opts, io_loop):
+    """
+    Tests that the job returns are sent to the master together once the
+    return_batch_window elapsed or return_batch_size is reached
+    """
+    minion_opts["return_batch_window"] = 50
+    minion_opts["return_batch_size"] = 1024
+    minion = salt.minion.Minion(minion_opts, io_loop=io_loop)
+    try:
+        minion.ready = True
+        minion.req_channel = MagicMock()
+        minion.req_channel.send = AsyncMock()
+        tag = f"__master_req_channel_payload/{minion_opts['master']}"
+        rets = [
+            {"cmd": "_return", "id": minion_opts["id"], "jid": str(x), "return": x}
+            for x in range(3)
+        ]
+        for ret in rets[:2]:
+            await minion.handle_event(event.SaltEvent.pack(tag, ret))
+        minion.req_channel.send.assert_not_called()
+        await asyncio.sleep(0.2)
+        minion.req_channel.send.assert_called_once()
+        assert minion.req_channel.send.call_args.args[0] == {
+            "cmd": "_return",
+            "id": minion_opts["id"],
+            "load": rets[:2],
+        }
+
+        # A single return is sent as is, as soon as the batch is large enough
+        rets[2]["return"] = "x" * 1024
+        await minion.handle_event(event.SaltEvent.pack(tag, rets[2]))
+        await asyncio.sleep(0)
+        assert minion.req_channel.send.call_count == 2
+        assert minion.req_channel.send.call_args.args[0] == rets[2]
+        assert minion._return_batch_timer is None
+    finally:
+        minion.destroy()
+
+
+async def test_return_batch_destroy(minion_opts, io_loop):
+    """
+    Tests that the queued job returns are sent before the request channel is
+    closed when the minion is torn down
+    """
+    minion_opts["return_batch_window"] = 5000
+    minion_opts["return_batch_size"] = 1024
+    minion = salt.minion.Minion(minion_opts, io_loop=io_loop)
+    minion.ready = True
+    req_channel = minion.req_channel = MagicMock()
+    req_channel.send = AsyncMock()
+    tag = f"__master_req_channel_payload/{minion_opts['master']}"
+    ret = {"cmd": "_return", "id": minion_opts["id"], "jid": "1", "return": 1}
+    await minion.handle_event(event.SaltEvent.pack(tag, ret))
+    assert minion._return_batch_timer is not None
+    minion.destroy()
+    assert minion._return_batch_timer is None
+    await asyncio.sleep(0)
+    req_channel.send.assert_called_once()
+    assert req_channel.send.call_args.args[0] == ret
+    req_channel.close.assert_called_once()
+
+
+def test_return_batch_destroy_stopped_loop(minion_opts, io_loop):
+    """
+    Tests that the queued job returns are sent when the minion is torn down
+    after its event loop stopped
+    """
+    minion = salt.minion.Minion(minion_opts, io_loop=io_loop)
+    req_channel = minion.req_channel = MagicMock()
+    req_channel.send = AsyncMock()
+    ret = {"cmd": "_return", "id": minion_opts["id"], "jid": "1", "return": 1}
+    minion._return_batch.append(ret)
+    minion.destroy()
+    req_channel.send.assert_called_once()
+    assert req_channel.send.call_args.args[0] == ret
+    req_channel.close.assert_called_once()
+    assert minion._return_batch == []
+
+
+def test_job_worker_target_removes_proc_file(minion_opts, tmp_path):
+    """
+    Tests that a job pool worker removes the proc file of a job once it is
+    done with it, since the worker outlives the job.
+    """
+    minion_instance = MagicMock(opts=minion_opts, proc_dir=str(tmp_path))
+    proc_file = tmp_path / "20240101000000000000"
+    proc_file.write_bytes(b"")
+    with patch.object(salt.minion.Minion, "_target") as target:
+        salt.minion.Minion._job_worker_target(
+            minion_instance, {"fun": "test.ping", "jid": "20240101000000000000"}
+        )
+    target.assert_called_once()
+    assert not proc_file.exists()
+
+
 @pytest.mark.slow_test
 def test_beacons_before_connect(minion_opts):
     """
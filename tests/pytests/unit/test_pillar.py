@@ -11,12 +11,14 @@ import os
 import shutil
 import tempfile
 import textwrap
+import time
 
 import pytest
 
 import salt.config
 import salt.exceptions
 import salt.fileclient
+import salt.utils.cache
 import salt.utils.stringutils
 from salt.utils.files import fopen
 from tests.support.mock import MagicMock, patch
@@ -1217,6 +1219,56 @@ def test_compile_pillar_memory_cache(master_opts):
         assert pillar.cache["mocked_minion"] == expected_cache
 
 
+def test_compile_pillar_memory_cache_shared(master_opts, grains):
+    master_opts.update({"pillar_cache_backend": "memory", "pillar_cache_ttl": 3600})
+
+    with patch.object(salt.pillar.PillarCache, "_memory", None), patch(
+        "salt.pillar.PillarCache.fetch_pillar",
+        side_effect=[{"foo": "bar"}, {"foo": "baz"}],
+    ):
+        ret = salt.pillar.PillarCache(
+            master_opts, grains, "minion1", "base"
+        ).compile_pillar()
+        assert ret == {"foo": "bar"}
+        # Callers may modify the returned pillar without affecting the cache
+        ret["foo"] = "modified"
+        pillar = salt.pillar.PillarCache(master_opts, grains, "minion1", "base")
+        assert pillar.compile_pillar() == {"foo": "bar"}
+        assert pillar.cache.hits == 2
+
+        salt.pillar.PillarCache(master_opts, grains, "minion2", "base").compile_pillar()
+        # Clearing the pillar of a minion leaves the others alone
+        pillar.clear_pillar()
+        assert "minion1" not in pillar.cache
+        assert "minion2" in pillar.cache
+
+
+def test_compile_pillar_tiered_cache(master_opts, grains, tmp_path):
+    master_opts.update(
+        {
+            "pillar_cache_backend": "tiered",
+            "pillar_cache_ttl": 3600,
+            "cachedir": str(tmp_path),
+        }
+    )
+    (tmp_path / "pillar_cache").mkdir()
+
+    with patch.object(salt.pillar.PillarCache, "_memory", None), patch(
+        "salt.pillar.PillarCache.fetch_pillar",
+        side_effect=[{"foo": "bar"}, {"foo": "baz"}],
+    ):
+        pillar = salt.pillar.PillarCache(
+            master_opts, grains, "mocked_minion", "fake_env", pillarenv="base"
+        )
+        assert isinstance(pillar.cache, salt.utils.cache.TieredCacheDisk)
+        assert pillar.compile_pillar() == {"foo": "bar"}
+        pillar = salt.pillar.PillarCache(
+            master_opts, grains, "mocked_minion", "fake_env", pillarenv="base"
+        )
+        assert pillar.compile_pillar() == {"foo": "bar"}
+        assert (tmp_path / "pillar_cache" / "mocked_minion").exists()
+
+
 def test_compile_pillar_disk_cache(master_opts, grains):
     master_opts.update({"pillar_cache_backend": "disk", "pillar_cache_ttl": 3600})
 
@@ -1259,3 +1311,93 @@ def test_compile_pillar_disk_cache(master_opts, grains):
                 "mocked_minion": {"base": {"foo": "bar"}, "dev": {"foo": "baz"}}
             }
             assert pillar.cache._dict == expected_cache
+
+
+def _ext_pillar_opts(**kwargs):
+    opts = {
+        "optimization_order": [0, 1, 2],
+        "renderer": "json",
+        "renderer_blacklist": [],
+        "renderer_whitelist": [],
+        "state_top": "",
+        "pillar_roots": {"base": []},
+        "file_roots": {"base": []},
+        "extension_modules": "",
+        "fileserver_backend": "",
+        "cachedir": "",
+        "ext_pillar": [{"first": "a"}, {"second": "b"}, {"third": "c"}],
+    }
+    opts.update(kwargs)
+    return opts
+
+
+def _sleeping_ext_pillar(delay, ret):
+    def ext_pillar(minion_id, pillar, arg):
+        time.sleep(delay)
+        if isinstance(ret, Exception):
+            raise ret
+        return dict(ret, seen=sorted(pillar))
+
+    return ext_pillar
+
+
+def test_ext_pillar_parallel_merges_in_configured_order():
+    ext_pillars = {
+        "first": _sleeping_ext_pillar(0.3, {"key": "first", "first": True}),
+        "second": _sleeping_ext_pillar(0.1, {"key": "second"}),
+        "third": _sleeping_ext_pillar(0, {"key": "third", "third": True}),
+    }
+    opts = _ext_pillar_opts(ext_pillar_parallel=True)
+    with patch("salt.loader.pillars", MagicMock(return_value=ext_pillars)):
+        pillar = salt.pillar.Pillar(opts, {}, "mocked-minion", "base")
+    start = time.time()
+    ret, errors = pillar.ext_pillar({"base": True})
+    assert time.time() - start < 0.6
+    assert not errors
+    # The last configured ext_pillar wins, regardless of completion order
+    assert ret["key"] == "third"
+    assert ret["first"] is True
+    assert ret["third"] is True
+    # Every ext_pillar only sees the pillar data from before the ext_pillars
+    assert ret["seen"] == ["base"]
+    assert [key for key, _ in pillar.ext_pillar_timings] == [
+        "first",
+        "second",
+        "third",
+    ]
+
+
+def test_ext_pillar_parallel_timeout_and_errors():
+    ext_pillars = {
+        "first": _sleeping_ext_pillar(2, {"first": True}),
+        "second": _sleeping_ext_pillar(0, Exception("boom")),
+        "third": _sleeping_ext_pillar(0, {"third": True}),
+    }
+    opts = _ext_pillar_opts(
+        ext_pillar_parallel=True, ext_pillar_parallel_timeout={"first": 0.2}
+    )
+    with patch("salt.loader.pillars", MagicMock(return_value=ext_pillars)):
+        pillar = salt.pillar.Pillar(opts, {}, "mocked-minion", "base")
+    ret, errors = pillar.ext_pillar({})
+    assert errors == [
+        "Failed to load ext_pillar first: timed out after 0.2 seconds",
+        "Failed to load ext_pillar second: boom",
+    ]
+    assert ret == {"third": True, "seen": []}
+
+
+def test_ext_pillar_sequential_passes_merged_pillar(caplog):
+    ext_pillars = {
+        "first": _sleeping_ext_pillar(0, {"first": True}),
+        "second": _sleeping_ext_pillar(0, {"second": True}),
+        "third": _sleeping_ext_pillar(0, {"third": True}),
+    }
+    opts = _ext_pillar_opts()
+    with patch("salt.loader.pillars", MagicMock(return_value=ext_pillars)):
+        pillar = salt.pillar.Pillar(opts, {}, "mocked-minion", "base")
+    with caplog.at_level(logging.DEBUG):
+        ret, errors = pillar.ext_pillar({})
+    assert not errors
+    assert ret["seen"] == ["first", "second", "seen"]
+    assert len(pillar.ext_pillar_timings) == 3
+    assert "ext_pillar timings for minion mocked-minion: first=" in caplog.text
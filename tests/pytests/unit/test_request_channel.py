@@ -1699,3 +1699,147 @@ def test_req_server_auth_garbage_enc_algo(pki_dir, minion_opts, master_opts, cap
         assert "load" in ret
         assert "ret" in ret["load"]
         assert ret["load"]["ret"] == "bad enc algo"
+
+
+@pytest.fixture
+def key_index_server(master_opts, pki_dir):
+    SMaster.secrets["aes"] = {
+        "secret": multiprocessing.Array(
+            ctypes.c_char,
+            salt.utils.stringutils.to_bytes(salt.crypt.Crypticle.generate_key_string()),
+        ),
+        "reload": salt.crypt.Crypticle.generate_key_string,
+    }
+    master_opts.update(
+        {
+            "pki_dir": str(pki_dir.joinpath("master")),
+            "key_index": True,
+            "auth_events": False,
+            "max_minions": 0,
+            "auto_accept": False,
+            "open_mode": False,
+            "master_sign_pubkey": False,
+            "auth_mode": 1,
+        }
+    )
+    server = salt.channel.server.ReqServerChannel.factory(master_opts)
+    server.auto_key = salt.daemons.masterapi.AutoKey(server.opts)
+    server.cache_cli = False
+    server.master_key = salt.crypt.MasterKeys(server.opts)
+    try:
+        yield server
+    finally:
+        server.close()
+
+
+@pytest.fixture
+def key_index_load(pki_dir, encryption_algorithm, signing_algorithm):
+    # We need to read the public key with fopen otherwise the newlines might
+    # not match on windows.
+    with salt.utils.files.fopen(
+        str(pki_dir.joinpath("minion", "minion.pub")), "r"
+    ) as fp:
+        pub_key = salt.crypt.clean_key(fp.read())
+    return {
+        "cmd": "_auth",
+        "id": "minion",
+        "token": salt.utils.stringutils.to_bytes(
+            salt.crypt.Crypticle.generate_key_string()
+        ),
+        "pub": pub_key,
+        "enc_algo": encryption_algorithm,
+        "sig_algo": signing_algorithm,
+    }
+
+
+def test_req_server_auth_key_index_accepted(key_index_server, key_index_load):
+    ret = key_index_server._auth(key_index_load, sign_messages=False)
+    assert ret["enc"] == "pub"
+    assert "aes" in ret
+    # The parsed key is kept in the index for the next authentication
+    ret = key_index_server._auth(key_index_load, sign_messages=False)
+    assert ret["enc"] == "pub"
+
+
+def test_req_server_auth_key_index_pending(key_index_server, key_index_load, pki_dir):
+    madir = pki_dir / "master"
+    os.rename(madir / "minions" / "minion", madir / "minions_pre" / "minion")
+    ret = key_index_server._auth(key_index_load, sign_messages=False)
+    assert ret == {"enc": "clear", "load": {"ret": True}}
+    assert not (madir / "minions" / "minion").exists()
+
+    # Accepting the key is picked up by the index
+    os.rename(madir / "minions_pre" / "minion", madir / "minions" / "minion")
+    ret = key_index_server._auth(key_index_load, sign_messages=False)
+    assert ret["enc"] == "pub"
+
+
+def test_req_server_auth_key_index_new(key_index_server, key_index_load, pki_dir):
+    madir = pki_dir / "master"
+    (madir / "minions" / "minion").unlink()
+    ret = key_index_server._auth(key_index_load, sign_messages=False)
+    assert ret == {"enc": "clear", "load": {"ret": True}}
+    assert (madir / "minions_pre" / "minion").read_text() == key_index_load["pub"]
+
+
+def test_req_server_auth_key_index_rejected(key_index_server, key_index_load, pki_dir):
+    madir = pki_dir / "master"
+    os.rename(madir / "minions" / "minion", madir / "minions_rejected" / "minion")
+    ret = key_index_server._auth(key_index_load, sign_messages=False)
+    assert ret == {"enc": "clear", "load": {"ret": False}}
+
+
+def test_req_server_auth_key_index_mismatch(key_index_server, key_index_load, pki_dir):
+    madir = pki_dir / "master"
+    key_index_load["pub"] = salt.crypt.clean_key(MASTER_PUB_KEY.strip())
+    ret = key_index_server._auth(key_index_load, sign_messages=False)
+    assert ret == {"enc": "clear", "load": {"ret": False}}
+    assert (madir / "minions_denied" / "minion").read_text() == key_index_load["pub"]
+
+
+class PipelinedTransport:
+    ttype = "tcp"
+    pipelined = True
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.sent = []
+
+    async def send(self, load, timeout=60):
+        self.sent.append(load["load"]["loc"])
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        # Answer out of order to make sure replies are handed back in order
+        await asyncio.sleep(0.01 * (3 - load["load"]["loc"] % 3))
+        self.in_flight -= 1
+        return {"loc": load["load"]["loc"]}
+
+    def close(self):
+        pass
+
+
+@pytest.mark.parametrize("pipelined", [True, False])
+async def test_req_chan_send_pipelined(minion_opts, pipelined):
+    transport = PipelinedTransport()
+    transport.pipelined = pipelined
+    client = salt.channel.client.AsyncReqChannel(minion_opts, transport, None)
+    replies = []
+
+    def callback(ret):
+        replies.append(ret["loc"])
+        return ret["loc"] < 7
+
+    await client.send_pipelined(
+        ({"cmd": "_serve_file", "loc": loc} for loc in range(20)), callback, window=4
+    )
+    assert replies == list(range(8))
+    if pipelined:
+        assert transport.max_in_flight == 4
+        # Requests past the one the callback stopped at may already have been
+        # sent, their replies are dropped
+        assert transport.sent[:8] == list(range(8))
+        assert len(transport.sent) <= 11
+    else:
+        assert transport.max_in_flight == 1
+        assert transport.sent == list(range(8))
@@ -1121,3 +1121,47 @@ def test_eval_when_splay_in_past(schedule):
     ret = schedule.job_status(job_name)
     assert "_last_run" not in ret
     assert ret["_next_fire_time"] is None
+
+
+def test_eval_only_due_jobs(schedule):
+    """
+    verify that the jobs are only evaluated again once they are due, or when
+    the schedule changes
+    """
+    job = {
+        "schedule": {
+            "job1": {"function": "test.ping", "when": "11/29/2017 4:00pm"},
+            "job2": {"function": "test.ping", "seconds": 10},
+        }
+    }
+    schedule.opts.update(job)
+    run_time = dateutil.parser.parse("11/29/2017 3:59:50pm")
+
+    with patch.object(
+        salt.utils.schedule.dateutil_parser,
+        "parse",
+        MagicMock(side_effect=dateutil.parser.parse),
+    ) as parse, patch.object(schedule, "_run_job") as run_job:
+        schedule.eval(now=run_time)
+        assert parse.call_count == 1
+        for seconds in range(1, 10):
+            schedule.eval(now=run_time + datetime.timedelta(seconds=seconds))
+        assert parse.call_count == 1
+        run_job.assert_not_called()
+
+        # Both jobs fire at 4:00pm
+        schedule.eval(now=run_time + datetime.timedelta(seconds=10))
+        assert parse.call_count == 2
+        assert run_job.call_count == 2
+
+        # Changing the schedule evaluates all of the jobs again
+        schedule.add_job(
+            {"job3": {"function": "test.ping", "seconds": 60}},
+            persist=False,
+            fire_event=False,
+        )
+        schedule.eval(now=run_time + datetime.timedelta(seconds=11))
+        assert parse.call_count == 3
+    assert schedule.job_status("job2")["_next_fire_time"] == dateutil.parser.parse(
+        "11/29/2017 4:00:10pm"
+    )
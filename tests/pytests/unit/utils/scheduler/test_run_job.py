@@ -1,4 +1,8 @@
 import logging
+import threading
+import time
+
+from tests.support.mock import patch
 
 log = logging.getLogger(__name__)
 
@@ -17,3 +21,37 @@ def test_run_job(schedule):
     ret = schedule.job_status(job_name)
     expected = {"function": "test.ping", "run": True, "name": "test_run_job"}
     assert ret == expected
+
+
+def test_run_job_thread_pool(schedule):
+    """
+    verify that scheduled jobs run in the pool of threads and that no more
+    runs of a job than its maxrunning are queued
+    """
+    schedule.opts["schedule_thread_pool_size"] = 1
+    release = threading.Event()
+    ran = []
+
+    def handle_func(multiprocessing_enabled, func, data, jid, reload_modules=True):
+        assert not multiprocessing_enabled
+        assert not reload_modules
+        ran.append((data["name"], threading.current_thread().name))
+        release.wait(30)
+
+    with patch.object(schedule, "handle_func", side_effect=handle_func):
+        schedule._run_job("test.ping", {"name": "job1", "maxrunning": 2}, jid="1")
+        schedule._run_job("test.ping", {"name": "job1", "maxrunning": 2}, jid="2")
+        # job1 has two runs queued or running already
+        schedule._run_job("test.ping", {"name": "job1", "maxrunning": 2}, jid="3")
+        schedule._run_job("test.ping", {"name": "job2", "maxrunning": 1}, jid="4")
+        assert schedule._job_pending == {"job1": 2, "job2": 1}
+        release.set()
+        start = time.monotonic()
+        while schedule._job_pending and time.monotonic() - start < 30:
+            time.sleep(0.05)
+    assert schedule._job_pending == {}
+    assert ran == [
+        ("job1", "Schedule-0"),
+        ("job1", "Schedule-0"),
+        ("job2", "Schedule-0"),
+    ]
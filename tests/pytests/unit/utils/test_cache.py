@@ -6,6 +6,7 @@
 """
 
 import logging
+import os
 import pathlib
 import time
 
@@ -272,3 +273,87 @@ def test_cache_corruption(cache_dir):
     # if the file did not exist in the first place), and should raise a KeyError
     with pytest.raises(KeyError):
         assert cd["test-key"]
+
+
+def test_lru_cache_dict_eviction():
+    """
+    Test that LRUCacheDict evicts the least recently used items once the
+    size limit is exceeded.
+    """
+    item_size = len(salt.payload.dumps("x" * 100))
+    lru = cache.LRUCacheDict(60, item_size * 2)
+    lru["a"] = "x" * 100
+    lru["b"] = "x" * 100
+    # Make "a" the most recently used
+    assert lru["a"] == "x" * 100
+    lru["c"] = "x" * 100
+    assert "b" not in lru
+    assert "a" in lru
+    assert "c" in lru
+    with pytest.raises(KeyError):
+        lru["b"]  # pylint: disable=pointless-statement
+    assert lru.stats() == {
+        "items": 2,
+        "size": item_size * 2,
+        "hits": 1,
+        "misses": 1,
+        "evictions": 1,
+    }
+    del lru["a"]
+    assert lru.size == item_size
+    lru.clear()
+    assert lru.size == 0
+    assert "c" not in lru
+
+
+def test_lru_cache_dict_ttl():
+    lru = cache.LRUCacheDict(0.1, 1024)
+    lru["foo"] = "bar"
+    time.sleep(0.2)
+    assert "foo" not in lru
+    assert lru.size == 0
+
+
+def test_compressed_cache_disk(cache_dir):
+    path = cache_dir / "minion"
+    cd = cache.CompressedCacheDisk(60, str(path))
+    cd["foo"] = {"bar": "baz" * 100}
+    assert path.read_bytes().startswith(cache.CompressedCacheDisk.MAGIC)
+    assert path.stat().st_size < 300
+    cd2 = cache.CompressedCacheDisk(60, str(path))
+    assert cd2["foo"] == {"bar": "baz" * 100}
+
+
+def test_compressed_cache_disk_reads_uncompressed(cache_dir):
+    path = str(cache_dir / "minion")
+    cd = cache.CacheDisk(60, path)
+    cd["foo"] = "bar"
+    cd2 = cache.CompressedCacheDisk(60, path)
+    assert cd2["foo"] == "bar"
+
+
+def test_tiered_cache_disk(cache_dir):
+    path = str(cache_dir / "minion")
+    memory = cache.LRUCacheDict(60)
+    cd = cache.TieredCacheDisk(60, path, memory=memory)
+    cd["foo"] = {"bar": "baz"}
+    assert path in memory
+
+    # Served from memory
+    with patch.object(cache.CompressedCacheDisk, "_read") as read:
+        cd2 = cache.CacheFactory.factory(
+            "tiered", 60, minion_cache_path=path, memory=memory
+        )
+        read.assert_not_called()
+    assert cd2["foo"] == {"bar": "baz"}
+    # Changes to the copy are not visible in memory
+    cd2["foo"]["bar"] = "changed"
+    assert memory[path][1]["foo"] == {"bar": "baz"}
+
+    # A file changed by another process is read again
+    other = cache.TieredCacheDisk(60, path, memory=cache.LRUCacheDict(60))
+    other["foo"] = {"bar": "qux"}
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+    cd3 = cache.TieredCacheDisk(60, path, memory=memory)
+    assert cd3["foo"] == {"bar": "qux"}
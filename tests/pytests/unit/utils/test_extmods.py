@@ -0,0 +1,78 @@
+import os
+
+import pytest
+
+import salt.fileclient
+import salt.utils.extmods
+from tests.support.mock import patch
+
+
+@pytest.fixture
+def file_roots(tmp_path):
+    root = tmp_path / "srv"
+    (root / "_modules").mkdir(parents=True)
+    (root / "_modules" / "foo.py").write_text("foo")
+    (root / "_modules" / "bar.py").write_text("bar")
+    (root / "_modules" / "README.txt").write_text("readme")
+    (root / "_states").mkdir()
+    (root / "_states" / "baz.py").write_text("baz")
+    return root
+
+
+@pytest.fixture
+def opts(minion_opts, file_roots, tmp_path):
+    minion_opts.update(
+        {
+            "file_client": "local",
+            "fileserver_backend": ["roots"],
+            "file_roots": {"base": [str(file_roots)]},
+            "extension_modules": str(tmp_path / "extmods"),
+        }
+    )
+    return minion_opts
+
+
+def test_sync_from_manifest(opts, file_roots):
+    manifests = {}
+    file_manifest = salt.fileclient.FSClient.file_manifest
+    with patch.object(
+        salt.fileclient.FSClient, "file_manifest", autospec=True
+    ) as manifest_mock:
+        manifest_mock.side_effect = file_manifest
+        ret = salt.utils.extmods.sync(opts, "modules", manifests=manifests)
+        assert sorted(ret[0]) == ["modules.bar", "modules.foo"]
+        assert ret[1] is True
+        assert sorted(
+            os.listdir(os.path.join(opts["extension_modules"], "modules"))
+        ) == ["bar.py", "foo.py"]
+        ret = salt.utils.extmods.sync(opts, "states", manifests=manifests)
+        assert ret == (["states.baz"], True)
+    # The manifest is fetched once for all the module types
+    manifest_mock.assert_called_once()
+    assert set(manifests["base"]["files"]["base"]) == {
+        "_modules/bar.py",
+        "_modules/foo.py",
+        "_modules/README.txt",
+        "_states/baz.py",
+    }
+
+    # Nothing is downloaded again while the synced copies are current
+    (file_roots / "_modules" / "foo.py").write_text("changed")
+    (file_roots / "_modules" / "bar.py").unlink()
+    with patch.object(
+        salt.fileclient.FSClient,
+        "cache_files",
+        autospec=True,
+        side_effect=salt.fileclient.FSClient.cache_files,
+    ) as cache_files:
+        ret = salt.utils.extmods.sync(opts, "modules", manifests={})
+    assert ret == (["modules.foo"], True)
+    cache_files.assert_called_once()
+    assert cache_files.call_args.args[1] == ["salt://_modules/foo.py"]
+    assert os.listdir(os.path.join(opts["extension_modules"], "modules")) == ["foo.py"]
+
+
+def test_sync_without_manifest(opts):
+    with patch.object(salt.fileclient.FSClient, "file_manifest", return_value=None):
+        ret = salt.utils.extmods.sync(opts, "modules", manifests={})
+    assert sorted(ret[0]) == ["modules.bar", "modules.foo"]
@@ -0,0 +1,83 @@
+import os
+
+import pytest
+
+import salt.utils.filecache
+import salt.utils.hashutils
+from tests.support.mock import patch
+
+
+@pytest.fixture
+def opts(tmp_path):
+    return {"cachedir": str(tmp_path / "cache"), "hash_type": "sha256"}
+
+
+@pytest.fixture
+def cached(opts):
+    def _cached(saltenv, name, content):
+        path = os.path.join(opts["cachedir"], "files", saltenv, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as fp_:
+            fp_.write(content)
+        return path
+
+    return _cached
+
+
+def test_get_hash_is_cached(opts, cached):
+    path = cached("base", "foo.conf", b"foo")
+    index = salt.utils.filecache.FileCacheIndex(opts)
+    assert index.manages(path)
+    assert not index.manages(os.path.join(opts["cachedir"], "extmods", "foo.py"))
+    expected = salt.utils.hashutils.get_hash(path, "sha256")
+    assert index.get_hash(path) == expected
+    index.save(force=True)
+
+    index = salt.utils.filecache.FileCacheIndex(opts)
+    with patch("salt.utils.hashutils.get_hash") as get_hash:
+        assert index.get_hash(path) == expected
+    get_hash.assert_not_called()
+
+    # A change in size or mtime makes the file be hashed again
+    with open(path, "wb") as fp_:
+        fp_.write(b"changed")
+    assert index.get_hash(path) == salt.utils.hashutils.get_hash(path, "sha256")
+    os.remove(path)
+    with pytest.raises(FileNotFoundError):
+        index.get_hash(path)
+    assert path not in index.entries
+
+
+def test_add_deduplicates(opts, cached):
+    base = cached("base", "foo.conf", b"foo")
+    dev = cached("dev", "foo.conf", b"foo")
+    index = salt.utils.filecache.FileCacheIndex(opts)
+    hsum = index.add(base)
+    assert index.add(dev) == hsum
+    assert os.path.samefile(base, dev)
+    obj = os.path.join(opts["cachedir"], "file_objects", "sha256", hsum[:2], hsum)
+    assert os.path.samefile(base, obj)
+    assert os.stat(obj).st_nlink == 3
+
+    # Replacing a cached file removes the stored object once nothing links to
+    # it anymore
+    for path in (base, dev):
+        os.remove(path)
+        cached(*os.path.relpath(path, index.files_dir).split(os.sep), b"new")
+        new = index.add(path)
+    assert not os.path.exists(obj)
+    assert obj not in index.entries
+    assert os.path.samefile(base, dev)
+    assert index.get_hash(dev) == new
+
+
+def test_save_merges(opts, cached):
+    foo = cached("base", "foo.conf", b"foo")
+    bar = cached("base", "bar.conf", b"bar")
+    first = salt.utils.filecache.FileCacheIndex(opts)
+    second = salt.utils.filecache.FileCacheIndex(opts)
+    first.get_hash(foo)
+    first.save(force=True)
+    second.get_hash(bar)
+    second.save(force=True)
+    assert set(salt.utils.filecache.FileCacheIndex(opts).entries) == {foo, bar}
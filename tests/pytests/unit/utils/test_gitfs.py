@@ -1,4 +1,5 @@
 import os
+import threading
 import time
 
 import pytest
@@ -249,3 +250,116 @@ def test_checkout_pygit2(_prepare_provider):
 )
 def test_get_cachedir_basename_pygit2(_prepare_provider):
     assert "_" == _prepare_provider.get_cache_basename()
+
+
+@pytest.fixture
+def fetch_gitfs(minion_opts, tmp_path):
+    """
+    A GitFS instance which fetches the fake remotes assigned to it
+    """
+
+    def _remote(remote_id, fetch, fetch_timeout=0):
+        working_dir = tmp_path / remote_id / "_"
+        working_dir.mkdir(parents=True)
+        repo = MagicMock(id=remote_id, fetch_timeout=fetch_timeout)
+        repo.name = None
+        repo.fetch = fetch
+        repo.get_salt_working_dir.return_value = str(working_dir)
+        repo.get_cache_basename.return_value = "_"
+        return repo
+
+    with patch.object(
+        salt.utils.gitfs.GitFS, "verify_gitpython", MagicMock(return_value=True)
+    ), patch.object(
+        salt.utils.gitfs.GitFS, "verify_pygit2", MagicMock(return_value=False)
+    ):
+        gitfs = salt.utils.gitfs.GitFS(minion_opts, {}, init_remotes=False)
+    gitfs.make_remote = _remote
+    return gitfs
+
+
+def test_fetch_remotes_concurrently(fetch_gitfs):
+    barrier = threading.Barrier(2, timeout=10)
+
+    def _fetch():
+        # Only returns if both remotes are fetched at the same time
+        barrier.wait()
+        return True
+
+    fetch_gitfs.remotes = [
+        fetch_gitfs.make_remote("one", _fetch),
+        fetch_gitfs.make_remote("two", MagicMock(side_effect=_fetch)),
+    ]
+    with patch.dict(fetch_gitfs.opts, {"gitfs_fetch_workers": 2}):
+        assert fetch_gitfs.fetch_remotes() is True
+    assert not barrier.broken
+
+
+def test_fetch_remotes_timeout(fetch_gitfs):
+    release = threading.Event()
+    fetch_gitfs.remotes = [
+        fetch_gitfs.make_remote("slow", lambda: release.wait(30), fetch_timeout=1),
+        fetch_gitfs.make_remote("fast", MagicMock(return_value=None)),
+    ]
+    start = time.monotonic()
+    try:
+        results = fetch_gitfs._fetch_concurrently(fetch_gitfs.remotes, 2)
+    finally:
+        release.set()
+    assert time.monotonic() - start < 10
+    assert results[0]["remote"] == "slow"
+    assert results[0]["timeout"] is True
+    assert results[0]["result"] is False
+    assert results[1] == {
+        "remote": "fast",
+        "changed": False,
+        "result": True,
+        "duration": results[1]["duration"],
+    }
+
+
+def test_fetch_remotes_timeout_does_not_block(fetch_gitfs):
+    """
+    A remote which hangs past its fetch_timeout neither keeps the remaining
+    remotes from being fetched nor the process from exiting.
+    """
+    release = threading.Event()
+    daemon = []
+
+    def _fetch():
+        daemon.append(threading.current_thread().daemon)
+
+    fetch_gitfs.remotes = [
+        fetch_gitfs.make_remote("slow", lambda: release.wait(30), fetch_timeout=1),
+        fetch_gitfs.make_remote("fast", _fetch),
+    ]
+    start = time.monotonic()
+    try:
+        results = fetch_gitfs._fetch_concurrently(fetch_gitfs.remotes, 1)
+    finally:
+        release.set()
+    assert time.monotonic() - start < 10
+    assert results[0]["timeout"] is True
+    assert results[1]["result"] is True
+    assert daemon == [True]
+
+
+def test_fetch_remotes_events(fetch_gitfs):
+    fetch_gitfs.remotes = [
+        fetch_gitfs.make_remote("one", MagicMock(return_value=True)),
+        fetch_gitfs.make_remote("two", MagicMock(side_effect=Exception("boom"))),
+    ]
+    event = MagicMock()
+    get_event = MagicMock()
+    get_event.return_value.__enter__.return_value = event
+    with patch.dict(fetch_gitfs.opts, {"fileserver_events": True}), patch(
+        "salt.utils.event.get_event", get_event
+    ):
+        assert fetch_gitfs.fetch_remotes() is True
+    fired = [call.args for call in event.fire_event.call_args_list]
+    assert [tag for _, tag in fired] == ["salt/fileserver/gitfs/fetch"] * 2
+    assert [(data["remote"], data["changed"], data["result"]) for data, _ in fired] == [
+        ("one", True, True),
+        ("two", False, False),
+    ]
+    assert all(data["duration"] >= 0 for data, _ in fired)
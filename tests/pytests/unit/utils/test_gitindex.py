@@ -0,0 +1,206 @@
+"""
+Tests for salt.utils.gitindex and serving gitfs files from the object database
+"""
+
+import os
+import time
+
+import pytest
+
+import salt.config
+import salt.fileserver.gitfs
+import salt.utils.files
+import salt.utils.gitfs
+import salt.utils.gitindex
+import salt.utils.hashutils
+
+try:
+    HAS_PYGIT2 = (
+        salt.utils.gitfs.PYGIT2_VERSION
+        and salt.utils.gitfs.PYGIT2_VERSION >= salt.utils.gitfs.PYGIT2_MINVER
+        and salt.utils.gitfs.LIBGIT2_VERSION
+        and salt.utils.gitfs.LIBGIT2_VERSION >= salt.utils.gitfs.LIBGIT2_MINVER
+    )
+except AttributeError:
+    HAS_PYGIT2 = False
+
+
+if HAS_PYGIT2:
+    import pygit2
+
+
+def _entry(path, sha="ab" * 20, mode=0o100644, extra="hash"):
+    return salt.utils.gitindex.IndexEntry(path, sha, mode, 10, False, extra)
+
+
+def test_index_lookup(tmp_path):
+    path = str(tmp_path / "tree.idx")
+    salt.utils.gitindex.write_index(
+        path,
+        [
+            _entry("b/c.sls", extra="c"),
+            _entry("a.sls", sha="cd" * 20, extra="a"),
+            _entry("b/link", mode=0o120000, extra=b"c.sls"),
+        ],
+    )
+    index = salt.utils.gitindex.TreeIndex(path)
+    try:
+        assert len(index) == 3
+        entry = index.lookup("a.sls")
+        assert entry.blob_sha == "cd" * 20
+        assert entry.size == 10
+        assert entry.hsum == "a"
+        assert not entry.is_link
+        link = index.lookup("b/link")
+        assert link.is_link
+        assert link.link_target == b"c.sls"
+        assert index.lookup("b") is None
+        assert index.lookup("z.sls") is None
+        assert [entry.path for entry in index] == ["a.sls", "b/c.sls", "b/link"]
+    finally:
+        index.close()
+
+
+def test_empty_index(tmp_path):
+    path = str(tmp_path / "tree.idx")
+    salt.utils.gitindex.write_index(path, [])
+    index = salt.utils.gitindex.TreeIndex(path)
+    assert index.lookup("a.sls") is None
+    assert list(index) == []
+
+
+def test_invalid_index(tmp_path):
+    path = tmp_path / "tree.idx"
+    path.write_bytes(b"garbage" * 10)
+    with pytest.raises(ValueError):
+        salt.utils.gitindex.TreeIndex(str(path))
+    path.write_bytes(b"")
+    with pytest.raises(ValueError):
+        salt.utils.gitindex.TreeIndex(str(path))
+
+
+@pytest.fixture
+def remote_repo(tmp_path):
+    remote = tmp_path / "remote"
+    repo = pygit2.init_repository(str(remote), False)
+    (remote / "sub").mkdir()
+    (remote / "top.sls").write_text("base:\n  '*':\n    - foo\n" * 100)
+    (remote / "sub" / "bin").write_bytes(b"\x00\x01\xff" * 10)
+    os.symlink("../top.sls", str(remote / "sub" / "link"))
+    repo.index.add_all()
+    repo.index.write()
+    signature = pygit2.Signature("Salt", "salt@example.com", int(time.time()), 0)
+    repo.create_commit(
+        "refs/heads/master",
+        signature,
+        signature,
+        "Initial commit",
+        repo.index.write_tree(),
+        [],
+    )
+    return remote
+
+
+@pytest.fixture
+def gitfs(tmp_path, remote_repo):
+    opts = salt.config.master_config(None)
+    opts.update(
+        {
+            "cachedir": str(tmp_path / "cache"),
+            "gitfs_provider": "pygit2",
+            "gitfs_remotes": [f"file://{remote_repo}"],
+            "gitfs_serve_from_odb": True,
+        }
+    )
+    # Do not re-use a GitFS instance left behind by other tests
+    salt.utils.gitfs.GitFS.instance_map.clear()
+    gitfs = salt.utils.gitfs.GitFS(
+        opts,
+        opts["gitfs_remotes"],
+        per_remote_overrides=salt.fileserver.gitfs.PER_REMOTE_OVERRIDES,
+        per_remote_only=salt.fileserver.gitfs.PER_REMOTE_ONLY,
+        init_remotes=True,
+    )
+    gitfs.fetch_remotes()
+    yield gitfs
+    salt.utils.gitfs.GitFS.instance_map.clear()
+
+
+@pytest.mark.skipif(not HAS_PYGIT2, reason="This host lacks proper pygit2 support")
+def test_serve_from_odb(gitfs, remote_repo):
+    content = (remote_repo / "top.sls").read_text()
+    load = {"path": "sub/link", "saltenv": "base", "loc": 0}
+    fnd = gitfs.find_file("sub/link", "base")
+    assert fnd["rel"] == "sub/link"
+    # Nothing is written to the cache directory
+    assert not os.path.exists(fnd["path"])
+    ret = gitfs.serve_file(load, fnd)
+    assert ret == {"data": content, "dest": "sub/link"}
+    assert gitfs.file_hash(load, fnd) == {
+        "hash_type": "sha256",
+        "hsum": salt.utils.hashutils.sha256_digest(content),
+    }
+
+    fnd = gitfs.find_file("sub/bin", "base")
+    ret = gitfs.serve_file({"path": "sub/bin", "saltenv": "base", "loc": 3}, fnd)
+    assert ret["data"] == (b"\x00\x01\xff" * 10)[3:]
+
+    assert not gitfs.find_file("missing.sls", "base")["path"]
+
+    load = {"saltenv": "base"}
+    assert gitfs.file_list(load) == ["sub/bin", "sub/link", "top.sls"]
+    assert gitfs.dir_list(load) == ["sub"]
+    assert gitfs.symlink_list(load) == {"sub/link": "../top.sls"}
+
+
+@pytest.fixture
+def env_branches(remote_repo):
+    """
+    Add more branches than the number of tree indexes kept for superseded
+    trees to the remote, each one with a tree of its own
+    """
+    repo = pygit2.Repository(str(remote_repo))
+    signature = pygit2.Signature("Salt", "salt@example.com", int(time.time()), 0)
+    parent = repo.references["refs/heads/master"].target
+    envs = [f"env{x}" for x in range(salt.utils.gitfs.ODB_INDEXES_PER_REMOTE + 2)]
+    for env in envs:
+        (remote_repo / "env.sls").write_text(env)
+        repo.index.add_all()
+        repo.index.write()
+        repo.create_commit(
+            f"refs/heads/{env}",
+            signature,
+            signature,
+            env,
+            repo.index.write_tree(),
+            [parent],
+        )
+    return envs
+
+
+@pytest.mark.skipif(not HAS_PYGIT2, reason="This host lacks proper pygit2 support")
+def test_serve_from_odb_many_envs(env_branches, gitfs):
+    """
+    The index of every environment is kept, however many environments the
+    remote has
+    """
+    provider = gitfs.remotes[0]
+    index_dir = os.path.join(provider._salt_working_dir, "odb_index")
+
+    for env in env_branches:
+        fnd = gitfs.find_file("env.sls", env)
+        ret = gitfs.serve_file({"path": "env.sls", "saltenv": env, "loc": 0}, fnd)
+        assert ret["data"] == env
+    indexes = sorted(os.listdir(index_dir))
+    assert len(indexes) == len(env_branches)
+
+    # Serving the environments again neither rebuilds nor removes an index
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(
+            provider,
+            "_write_odb_index",
+            lambda *args: pytest.fail("The index was written again"),
+        )
+        for env in env_branches:
+            assert gitfs.find_file("env.sls", env)["rel"] == "env.sls"
+    assert sorted(os.listdir(index_dir)) == indexes
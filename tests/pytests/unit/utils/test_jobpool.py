@@ -0,0 +1,69 @@
+import functools
+import os
+import time
+
+import pytest
+
+import salt.utils.files
+import salt.utils.jobpool
+
+pytestmark = [
+    pytest.mark.skip_on_spawning_platform(
+        reason="The job pool workers are forked in these tests"
+    ),
+]
+
+
+def _init(path):
+    return path
+
+
+def _target(path, data):
+    if data.get("sleep"):
+        time.sleep(data["sleep"])
+    with salt.utils.files.fopen(path, "a") as fp_:
+        fp_.write("{} {}\n".format(data["jid"], os.getpid()))
+
+
+def _wait(path, count, timeout=30):
+    start = time.monotonic()
+    while time.monotonic() - start < timeout:
+        if os.path.exists(path):
+            with salt.utils.files.fopen(path) as fp_:
+                lines = fp_.read().splitlines()
+            if len(lines) >= count:
+                return [line.split() for line in lines]
+        time.sleep(0.05)
+    pytest.fail(f"Only {count} jobs ran")
+
+
+def _wait_idle(pool, timeout=30):
+    start = time.monotonic()
+    while time.monotonic() - start < timeout:
+        if all(worker.conn.poll() for worker in pool.workers if worker.busy):
+            return
+        time.sleep(0.05)
+
+
+def test_job_pool(tmp_path):
+    path = str(tmp_path / "jobs")
+    pool = salt.utils.jobpool.JobPool(
+        1, functools.partial(_init, path), _target, max_jobs=2
+    )
+    try:
+        assert pool.submit({"jid": "1", "sleep": 1})
+        # The only worker is busy
+        assert not pool.submit({"jid": "2"})
+        _wait(path, 1)
+        _wait_idle(pool)
+        assert pool.submit({"jid": "3"})
+        ret = _wait(path, 2)
+        assert [jid for jid, _ in ret] == ["1", "3"]
+        # Both jobs ran in the same worker, which is replaced after two jobs
+        assert ret[0][1] == ret[1][1]
+        _wait_idle(pool)
+        assert pool.submit({"jid": "4"})
+        ret = _wait(path, 3)
+        assert ret[2][1] != ret[0][1]
+    finally:
+        pool.stop()
@@ -0,0 +1,97 @@
+import os
+import time
+
+import pytest
+
+import salt.utils.keyindex
+from tests.support.mock import patch
+
+PUB = "-----BEGIN PUBLIC KEY-----\nMIIB\n-----END PUBLIC KEY-----\n"
+
+
+def _settle(path):
+    """
+    Move the modification time of a path out of the racy window
+    """
+    past = time.time() - 60
+    os.utime(path, (past, past))
+
+
+@pytest.fixture
+def pki_dir(tmp_path):
+    for keydir in salt.utils.keyindex.KEY_DIRS:
+        (tmp_path / keydir).mkdir()
+    for minion_id in ("minion2", "Minion1"):
+        (tmp_path / "minions" / minion_id).write_text(PUB)
+        _settle(tmp_path / "minions" / minion_id)
+    (tmp_path / "minions_pre" / "minion3").write_text(PUB)
+    for keydir in salt.utils.keyindex.KEY_DIRS:
+        _settle(tmp_path / keydir)
+    return tmp_path
+
+
+def test_list_keys(pki_dir):
+    index = salt.utils.keyindex.KeyIndex(str(pki_dir))
+    assert index.list_keys() == {
+        "minions": ["Minion1", "minion2"],
+        "minions_pre": ["minion3"],
+        "minions_rejected": [],
+        "minions_denied": [],
+    }
+    assert index.state("minion2") == "minions"
+    assert index.state("minion3") == "minions_pre"
+    assert index.state("minion4") is None
+
+
+def test_names_cached(pki_dir):
+    index = salt.utils.keyindex.KeyIndex(str(pki_dir))
+    assert index.names("minions") == ("Minion1", "minion2")
+    with patch("os.listdir") as listdir:
+        assert index.names("minions") == ("Minion1", "minion2")
+    listdir.assert_not_called()
+
+
+def test_names_refreshed(pki_dir):
+    index = salt.utils.keyindex.KeyIndex(str(pki_dir))
+    assert index.contains("minions_pre", "minion3")
+    os.rename(pki_dir / "minions_pre" / "minion3", pki_dir / "minions" / "minion3")
+    assert not index.contains("minions_pre", "minion3")
+    assert index.contains("minions", "minion3")
+    assert index.state("minion3") == "minions"
+
+
+def test_names_missing_dir(tmp_path):
+    index = salt.utils.keyindex.KeyIndex(str(tmp_path))
+    assert index.names("minions") is None
+    assert not index.contains("minions", "minion1")
+    assert index.list_keys() == {keydir: [] for keydir in salt.utils.keyindex.KEY_DIRS}
+
+
+def test_pub_cached(pki_dir):
+    index = salt.utils.keyindex.KeyIndex(str(pki_dir))
+    assert index.pub("minions", "minion2") == PUB
+    with patch("salt.utils.files.fopen") as fopen:
+        assert index.pub("minions", "minion2") == PUB
+    fopen.assert_not_called()
+    assert index.pub("minions", "minion4") is None
+
+
+def test_pub_refreshed(pki_dir):
+    index = salt.utils.keyindex.KeyIndex(str(pki_dir))
+    assert index.pub("minions", "minion2") == PUB
+    (pki_dir / "minions" / "minion2").write_text(PUB + "\n")
+    assert index.pub("minions", "minion2") == PUB + "\n"
+
+
+def test_public_key_cached(pki_dir):
+    index = salt.utils.keyindex.KeyIndex(str(pki_dir))
+    with patch("salt.crypt.PublicKey") as public_key:
+        key = index.public_key("minion2")
+        assert index.public_key("minion2") is key
+    public_key.assert_called_once_with(str(pki_dir / "minions" / "minion2"))
+
+
+def test_get_index():
+    index = salt.utils.keyindex.get_index("/tmp/pki")
+    assert salt.utils.keyindex.get_index("/tmp/pki") is index
+    assert salt.utils.keyindex.get_index("/tmp/pki2") is not index
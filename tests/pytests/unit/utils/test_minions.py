@@ -1,5 +1,9 @@
+import os
+
 import pytest
 
+import salt.payload
+import salt.utils.files
 import salt.utils.minions
 import salt.utils.network
 from tests.support.mock import patch
@@ -56,6 +60,63 @@ def test_connected_ids_remote_minions():
         assert ret == {minion2, minion}
 
 
+def _write_presence(opts, present, pid=None):
+    path = salt.utils.minions.presence_path(opts)
+    data = {"pid": pid or os.getpid(), "present": present}
+    with salt.utils.files.fopen(path, "wb") as fp_:
+        fp_.write(salt.payload.dumps(data))
+
+
+def test_connected_ids_transport_presence(tmp_path):
+    """
+    test ckminion connected_ids when the publish daemon
+    records the connected minions
+    """
+    opts = {
+        "cachedir": str(tmp_path),
+        "transport": "tcp",
+        "publish_port": 4505,
+        "detect_remote_minions": False,
+        "minion_data_cache": True,
+        "transport_presence": True,
+    }
+    _write_presence(opts, {"minion": "203.0.113.1", "minion2": "203.0.113.2"})
+    patch_net = patch("salt.utils.network.local_port_tcp")
+    ckminions = salt.utils.minions.CkMinions(opts)
+    with patch_net as local_port_tcp:
+        assert ckminions.connected_ids() == {"minion", "minion2"}
+        assert ckminions.connected_ids(subset=["minion2", "minion3"]) == {"minion2"}
+        assert ckminions.connected_ids(show_ip=True) == {
+            ("minion", "203.0.113.1"),
+            ("minion2", "203.0.113.2"),
+        }
+    local_port_tcp.assert_not_called()
+
+
+def test_connected_ids_transport_presence_stale(tmp_path):
+    """
+    test ckminion connected_ids falls back to scanning the connections
+    when the publish daemon which wrote the presence file is gone
+    """
+    opts = {
+        "cachedir": str(tmp_path),
+        "transport": "tcp",
+        "publish_port": 4505,
+        "detect_remote_minions": False,
+        "minion_data_cache": True,
+        "transport_presence": True,
+    }
+    _write_presence(opts, {"minion2": "203.0.113.2"}, pid=12345)
+    mdata = {"grains": {"ipv4": ["203.0.113.1"], "ipv6": []}}
+    patch_running = patch("salt.utils.process.os_is_running", return_value=False)
+    patch_net = patch("salt.utils.network.local_port_tcp", return_value={"203.0.113.1"})
+    patch_list = patch("salt.cache.Cache.list", return_value=["minion"])
+    patch_fetch = patch("salt.cache.Cache.fetch", return_value=mdata)
+    ckminions = salt.utils.minions.CkMinions(opts)
+    with patch_running, patch_net, patch_list, patch_fetch:
+        assert ckminions.connected_ids() == {"minion"}
+
+
 # These validate_tgt tests make the assumption that CkMinions.check_minions is
 # correct. In other words, these tests are only worthwhile if check_minions is
 # also correct.
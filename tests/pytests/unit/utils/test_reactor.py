@@ -55,3 +55,120 @@ def test_run_master_reactor(master_opts, master_reactor):
                 master_reactor.run()
                 calls = [call(9)]
                 os_nice_mock.assert_has_calls(calls)
+
+
+def test_tag_index():
+    """
+    Ensure that the tag index returns the same reactors, in the same order,
+    as matching the tag against every configured glob.
+    """
+    react_map = [
+        {"salt/minion/*/start": ["/srv/reactor/start.sls"]},
+        {"salt/job/*/ret/*": "/srv/reactor/ret.sls"},
+        {"*": ["/srv/reactor/all.sls"]},
+        {"salt/minion/web1/start": ["/srv/reactor/web1.sls"]},
+        {"salt/minion/web?/start": ["/srv/reactor/web.sls"]},
+        {"salt/key": ["/srv/reactor/key.sls"]},
+        "invalid",
+    ]
+    index = reactor.TagIndex(react_map)
+    assert index.match("salt/minion/web1/start") == [
+        "/srv/reactor/start.sls",
+        "/srv/reactor/all.sls",
+        "/srv/reactor/web1.sls",
+        "/srv/reactor/web.sls",
+    ]
+    assert index.match("salt/job/123/ret/web1") == [
+        "/srv/reactor/ret.sls",
+        "/srv/reactor/all.sls",
+    ]
+    assert index.match("salt/key") == ["/srv/reactor/all.sls", "/srv/reactor/key.sls"]
+    assert index.match("salt/keys") == ["/srv/reactor/all.sls"]
+    # Memoized lookups return the same result
+    assert index.match("salt/key") == ["/srv/reactor/all.sls", "/srv/reactor/key.sls"]
+
+
+def test_tag_index_rebuilt(master_opts):
+    """
+    Ensure that the tag index follows changes of the reactor configuration.
+    """
+    master_opts["reactor"] = [{"salt/key": ["/srv/reactor/key.sls"]}]
+    master_reactor = reactor.Reactor(master_opts)
+    assert master_reactor.list_reactors("salt/key") == ["/srv/reactor/key.sls"]
+    index = master_reactor.tag_index()
+    assert master_reactor.tag_index() is index
+    master_reactor.add_reactor("salt/auth", ["/srv/reactor/auth.sls"])
+    assert master_reactor.list_reactors("salt/auth") == ["/srv/reactor/auth.sls"]
+    master_reactor.delete_reactor("salt/key")
+    assert master_reactor.list_reactors("salt/key") == []
+
+
+def _local_low(tgt, **kwargs):
+    low = {
+        "state": "local",
+        "fun": "state.apply",
+        "__id__": "highstate_run",
+        "__sls__": "/srv/reactor/start.sls",
+        "name": "highstate_run",
+        "order": 1,
+        "tgt": tgt,
+    }
+    low.update(kwargs)
+    return low
+
+
+def test_react_wrap_debounce(master_opts):
+    """
+    Ensure that identical local reactions received within the debounce window
+    are collapsed into one job targeting all of their minions.
+    """
+    wrap = reactor.ReactWrap(master_opts)
+    client_cache = {"local": MagicMock()}
+    with patch.object(wrap, "client_cache", client_cache), patch(
+        "time.time", MagicMock(return_value=1000)
+    ) as time_mock:
+        for minion in ("web1", "web2", "web1"):
+            wrap.run(_local_low(minion, debounce=30))
+        # A reaction with a target which is not a minion id is kept apart
+        wrap.run(_local_low("db*", debounce=30))
+        client_cache["local"].cmd_async.assert_not_called()
+
+        time_mock.return_value = 1031
+        wrap.flush()
+    assert client_cache["local"].cmd_async.call_count == 2
+    tgts = [call_.args[0] for call_ in client_cache["local"].cmd_async.call_args_list]
+    assert tgts == [["web1", "web2"], "db*"]
+    assert (
+        client_cache["local"].cmd_async.call_args_list[0].kwargs["tgt_type"] == "list"
+    )
+    for call_ in client_cache["local"].cmd_async.call_args_list:
+        assert "debounce" not in call_.kwargs
+
+
+def test_react_wrap_concurrency(master_opts):
+    """
+    Ensure that reactions are held back while their concurrency cap is
+    reached, until a job finished.
+    """
+    wrap = reactor.ReactWrap(master_opts)
+    client_cache = {"local": MagicMock()}
+    client_cache["local"].run_job.side_effect = [
+        {"jid": "1", "minions": ["web1"]},
+        {"jid": "2", "minions": ["web2", "web3"]},
+    ]
+    with patch.object(wrap, "client_cache", client_cache):
+        wrap.run(_local_low("web1", concurrency=1))
+        assert client_cache["local"].run_job.call_count == 1
+        wrap.run(_local_low("web2", concurrency=1))
+        wrap.run(_local_low("web3", concurrency=1))
+        assert client_cache["local"].run_job.call_count == 1
+
+        # Returns of other jobs and minions do not free the slot
+        wrap.job_returned("9", "web1")
+        wrap.flush()
+        assert client_cache["local"].run_job.call_count == 1
+
+        wrap.job_returned("1", "web1")
+        wrap.flush()
+        assert client_cache["local"].run_job.call_count == 2
+        assert client_cache["local"].run_job.call_args.args[0] == ["web2", "web3"]
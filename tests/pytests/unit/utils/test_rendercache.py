@@ -0,0 +1,175 @@
+"""
+Tests for salt.utils.rendercache
+"""
+
+import pytest
+
+import salt.template
+import salt.utils.rendercache
+import salt.utils.templates
+from tests.support.mock import MagicMock
+
+
+@pytest.fixture
+def render_cache():
+    return salt.utils.rendercache.RenderCache(maxsize=10)
+
+
+def _render(render_cache, tmplstr, grains, functions=None):
+    kwargs = {
+        "from_str": True,
+        "to_str": True,
+        "opts": {"cachedir": "/D", "__cli": "salt"},
+        "saltenv": None,
+        "grains": grains,
+        "pillar": {},
+    }
+    if functions is not None:
+        kwargs["salt"] = functions
+    with render_cache.activate():
+        ret = salt.utils.templates.JINJA(tmplstr, **kwargs)
+    assert ret["result"] is True
+    return ret["data"]
+
+
+def test_template_cached_by_read_keys(render_cache):
+    tmpl = "{{ grains['os_family'] }}"
+    assert _render(render_cache, tmpl, {"id": "a", "os_family": "Debian"}) == "Debian"
+    assert render_cache.misses == 1
+    # Another minion with the same os_family hits the cache
+    assert _render(render_cache, tmpl, {"id": "b", "os_family": "Debian"}) == "Debian"
+    assert render_cache.hits == 1
+    # A different os_family does not
+    assert _render(render_cache, tmpl, {"id": "c", "os_family": "RedHat"}) == "RedHat"
+    assert render_cache.hits == 1
+    assert render_cache.misses == 2
+    # Both variants are now cached
+    assert _render(render_cache, tmpl, {"id": "d", "os_family": "RedHat"}) == "RedHat"
+    assert render_cache.hits == 2
+
+
+def test_template_whole_dict_read(render_cache):
+    tmpl = "{{ grains | json }}"
+    assert _render(render_cache, tmpl, {"id": "a"}) == '{"id": "a"}'
+    assert _render(render_cache, tmpl, {"id": "b"}) == '{"id": "b"}'
+    assert render_cache.hits == 0
+
+
+def test_template_missing_key_read(render_cache):
+    tmpl = "{{ grains.get('virtual', 'none') }}"
+    assert _render(render_cache, tmpl, {"id": "a"}) == "none"
+    assert _render(render_cache, tmpl, {"id": "b", "virtual": "kvm"}) == "kvm"
+    assert render_cache.hits == 0
+
+
+def test_template_pure_function(render_cache):
+    grains_get = MagicMock(side_effect=["Debian", "Debian", "Debian"])
+    salt_funcs = {"grains.get": grains_get}
+    tmpl = "{{ salt['grains.get']('os_family') }}"
+    assert _render(render_cache, tmpl, {}, functions=salt_funcs) == "Debian"
+    assert _render(render_cache, tmpl, {}, functions=salt_funcs) == "Debian"
+    assert render_cache.hits == 1
+    # The function was called again to validate the cached entry
+    assert grains_get.call_count == 2
+
+
+def test_template_impure_function(render_cache):
+    calls = []
+
+    def cmd_run(cmd):
+        calls.append(cmd)
+        return "out"
+
+    salt_funcs = {"cmd.run": cmd_run}
+    tmpl = "{{ salt['cmd.run']('ls') }}"
+    assert _render(render_cache, tmpl, {}, functions=salt_funcs) == "out"
+    assert _render(render_cache, tmpl, {}, functions=salt_funcs) == "out"
+    assert render_cache.hits == 0
+    assert calls == ["ls", "ls"]
+
+
+def test_template_dependency_mtime(render_cache, tmp_path):
+    dep = tmp_path / "map.jinja"
+    dep.write_text("")
+    tracker = salt.utils.rendercache.RenderTracker()
+    tracker.depend(str(dep), dep.stat().st_mtime)
+    render_cache.store_template("key", tracker, "output")
+    assert render_cache.fetch_template("key", {}) == "output"
+    dep.unlink()
+    assert render_cache.fetch_template("key", {}) is None
+
+
+def test_data_render_cached(render_cache):
+    yaml_render = MagicMock(return_value={"foo": ["bar"]})
+    yaml_render.__module__ = "salt.loaded.int.render.yaml"
+    renderers = {"yaml": yaml_render}
+    for _ in range(2):
+        ret = salt.template.compile_template(
+            ":string:",
+            renderers,
+            "yaml",
+            [],
+            [],
+            input_data="foo: [bar]",
+            render_cache=render_cache,
+        )
+        assert ret == {"foo": ["bar"]}
+        # Callers may modify the result without affecting the cache
+        ret["foo"].append("baz")
+    yaml_render.assert_called_once()
+
+
+def test_template_referenced_only():
+    render_cache = salt.utils.rendercache.RenderCache(maxsize=10, referenced_only=True)
+
+    def _render_event(tmplstr, tag, data):
+        with render_cache.activate():
+            ret = salt.utils.templates.JINJA(
+                tmplstr,
+                from_str=True,
+                to_str=True,
+                opts={"cachedir": "/D", "__cli": "salt"},
+                saltenv=None,
+                tag=tag,
+                data=data,
+            )
+        assert ret["result"] is True
+        return ret["data"]
+
+    tmpl = "{{ data['fun'] }}"
+    assert _render_event(tmpl, "salt/job/1/ret/a", {"fun": "test.ping"}) == "test.ping"
+    assert _render_event(tmpl, "salt/job/2/ret/b", {"fun": "test.ping"}) == "test.ping"
+    assert render_cache.hits == 1
+    # The tag is part of the key of the templates which reference it
+    tmpl = "{{ tag }}"
+    assert _render_event(tmpl, "salt/job/1/ret/a", {}) == "salt/job/1/ret/a"
+    assert _render_event(tmpl, "salt/job/2/ret/b", {}) == "salt/job/2/ret/b"
+    assert render_cache.hits == 1
+    assert render_cache.referenced_names("{% include 'foo' %}") is None
+
+
+def test_eviction():
+    render_cache = salt.utils.rendercache.RenderCache(maxsize=2)
+    for idx in range(3):
+        render_cache.store_data("yaml", "", str(idx), idx)
+    assert render_cache.fetch_data("yaml", "", "0") is None
+    assert render_cache.fetch_data("yaml", "", "2") == 2
+
+
+def test_get_render_cache():
+    assert salt.utils.rendercache.get_render_cache({"render_cache": False}) is None
+    render_cache = salt.utils.rendercache.get_render_cache({"render_cache": True})
+    assert render_cache is salt.utils.rendercache.get_render_cache(
+        {"render_cache": True}
+    )
+
+
+def test_compile_template_without_cache():
+    yaml_render = MagicMock(return_value={"foo": "bar"})
+    yaml_render.__module__ = "salt.loaded.int.render.yaml"
+    for _ in range(2):
+        ret = salt.template.compile_template(
+            ":string:", {"yaml": yaml_render}, "yaml", [], [], input_data="foo: bar"
+        )
+        assert ret == {"foo": "bar"}
+    assert yaml_render.call_count == 2
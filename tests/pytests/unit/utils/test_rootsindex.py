@@ -0,0 +1,217 @@
+import os
+
+import pytest
+
+import salt.fileserver.roots as roots
+import salt.utils.hashutils
+import salt.utils.rootsindex
+from tests.support.mock import patch
+
+
+@pytest.fixture
+def state_tree(tmp_path):
+    root = tmp_path / "state_tree"
+    (root / "sub" / "deep").mkdir(parents=True)
+    (root / "empty").mkdir()
+    (root / "top.sls").write_text("base:\n  '*':\n    - foo\n")
+    (root / "foo.sls").write_text("foo: bar\n")
+    (root / "sub" / "deep" / "file.txt").write_text("deep")
+    (root / "ignored.swp").write_text("ignored")
+    (root / "link.sls").symlink_to("foo.sls")
+    return root
+
+
+@pytest.fixture
+def other_tree(tmp_path):
+    root = tmp_path / "other_tree"
+    root.mkdir()
+    (root / "foo.sls").write_text("other foo\n")
+    (root / "other.sls").write_text("other\n")
+    return root
+
+
+@pytest.fixture
+def configure_loader_modules(state_tree, other_tree, master_opts):
+    master_opts.update(
+        {
+            "file_roots": {"base": [str(state_tree), str(other_tree)]},
+            "file_ignore_glob": ["*.swp"],
+        }
+    )
+    return {roots: {"__opts__": master_opts}}
+
+
+@pytest.fixture
+def indexer(master_opts):
+    indexer = salt.utils.rootsindex.RootsIndexer(master_opts)
+    indexer.build()
+    # Always pick up a replaced hash index
+    with patch.object(salt.utils.rootsindex, "HASH_INDEX_CHECK_INTERVAL", 0):
+        yield indexer
+
+
+def _walked_lists(master_opts):
+    with patch.dict(master_opts, {"roots_index": False}):
+        return {
+            form: roots._file_lists({"saltenv": "base"}, form)
+            for form in ("files", "dirs", "empty_dirs", "links")
+        }
+
+
+def test_lists_match_walk(master_opts, indexer):
+    lists = salt.utils.rootsindex.get_file_lists(master_opts, "base")
+    assert lists == _walked_lists(master_opts)
+    assert "ignored.swp" not in lists["files"]
+    assert lists["empty_dirs"] == ["empty"]
+    assert lists["links"] == {"link.sls": "foo.sls"}
+    with patch.dict(master_opts, {"roots_index": True}), patch(
+        "salt.utils.path.os_walk"
+    ) as os_walk:
+        assert roots.file_list({"saltenv": "base"}) == lists["files"]
+        assert roots.dir_list({"saltenv": "base"}) == lists["dirs"]
+    os_walk.assert_not_called()
+
+
+def test_process_changes(master_opts, indexer, state_tree):
+    (state_tree / "new.sls").write_text("new")
+    (state_tree / "empty" / "child").write_text("child")
+    (state_tree / "foo.sls").write_text("foo: changed\n")
+    os.utime(state_tree / "foo.sls", (1, 1))
+    for path in (state_tree / "sub" / "deep").iterdir():
+        path.unlink()
+    (state_tree / "sub" / "deep").rmdir()
+
+    changes = indexer.process(
+        [
+            str(state_tree / "new.sls"),
+            str(state_tree / "empty"),
+            str(state_tree / "empty" / "child"),
+            str(state_tree / "foo.sls"),
+            str(state_tree / "sub" / "deep"),
+        ]
+    )
+    assert sorted(changes["added"]) == [
+        str(state_tree / "empty" / "child"),
+        str(state_tree / "new.sls"),
+    ]
+    assert changes["removed"] == [str(state_tree / "sub" / "deep" / "file.txt")]
+    assert changes["changed"] == [str(state_tree / "foo.sls")]
+
+    lists = salt.utils.rootsindex.get_file_lists(master_opts, "base")
+    assert lists == _walked_lists(master_opts)
+    assert lists["empty_dirs"] == ["sub"]
+    indexed = salt.utils.rootsindex.get_file_hash(master_opts, "base", "foo.sls")
+    assert indexed["path"] == str(state_tree / "foo.sls")
+    assert indexed["hsum"] == salt.utils.hashutils.get_hash(
+        str(state_tree / "foo.sls"), master_opts["hash_type"]
+    )
+
+
+def test_file_hash_from_index(master_opts, indexer, other_tree):
+    with patch.dict(master_opts, {"roots_index": True}):
+        fnd = roots.find_file("other.sls")
+        with patch("salt.utils.hashutils.get_hash") as get_hash:
+            ret = roots.file_hash({"path": "other.sls", "saltenv": "base"}, fnd)
+        get_hash.assert_not_called()
+    assert ret == {
+        "hash_type": master_opts["hash_type"],
+        "hsum": salt.utils.hashutils.get_hash(
+            str(other_tree / "other.sls"), master_opts["hash_type"]
+        ),
+    }
+
+
+def test_find_file_from_index(master_opts, indexer, state_tree, other_tree):
+    with patch.dict(master_opts, {"roots_index": True}), patch(
+        "os.path.isfile"
+    ) as isfile:
+        fnd = roots.find_file("foo.sls")
+        assert roots.find_file("other.sls")["path"] == str(other_tree / "other.sls")
+        assert roots.find_file("ignored.swp") == {"path": "", "rel": ""}
+        assert roots.find_file("missing.sls") == {"path": "", "rel": ""}
+    isfile.assert_not_called()
+    assert fnd == {
+        "path": str(state_tree / "foo.sls"),
+        "rel": "foo.sls",
+        "stat": list(os.stat(state_tree / "foo.sls")),
+    }
+
+
+def test_hash_index(tmp_path):
+    path = str(tmp_path / "hashes.idx")
+    files = [
+        (
+            saltenv,
+            f"dir/file{num}.sls",
+            f"/srv/{saltenv}/dir/file{num}.sls",
+            str(num),
+            [num] * 10,
+        )
+        for saltenv in ("base", "prod")
+        for num in range(100)
+    ]
+    salt.utils.rootsindex.write_hash_index(path, "sha256", files)
+    index = salt.utils.rootsindex.HashIndex(path)
+    assert len(index) == 200
+    assert index.hash_type == "sha256"
+    for saltenv, rel, abs_path, hsum, stat in files:
+        assert index.lookup(saltenv, rel) == {
+            "path": abs_path,
+            "hsum": hsum,
+            "stat": stat,
+        }
+    assert index.lookup("dev", "dir/file1.sls") is None
+    assert index.lookup("base", "dir/file100.sls") is None
+
+
+def test_hash_index_update(tmp_path):
+    path = str(tmp_path / "hashes.idx")
+    files = [
+        ("base", f"file{num}.sls", f"/srv/file{num}.sls", str(num), [num] * 10)
+        for num in range(10)
+    ]
+    writer = salt.utils.rootsindex.HashIndexWriter(path, "sha256")
+    writer.rewrite(files)
+    inode = os.stat(path).st_ino
+    old = salt.utils.rootsindex.HashIndex(path)
+
+    assert writer.update(
+        [
+            ("base", "file1.sls", "/srv/file1.sls", "changed", [1] * 10),
+            ("base", "new.sls", "/srv/new.sls", "new", [2] * 10),
+        ],
+        [("base", "file2.sls")],
+    )
+    assert os.stat(path).st_ino == inode
+    index = salt.utils.rootsindex.HashIndex(path)
+    assert len(index) == 10
+    assert index.lookup("base", "file1.sls")["hsum"] == "changed"
+    assert index.lookup("base", "new.sls")["hsum"] == "new"
+    assert index.lookup("base", "file2.sls") is None
+    assert index.lookup("base", "file3.sls")["hsum"] == "3"
+    # A mapping from before the update does not return partial records
+    with pytest.raises(ValueError):
+        old.lookup("base", "file1.sls")
+
+    # Growing the table needs a rewrite
+    more = [
+        ("base", f"more{num}.sls", f"/srv/more{num}.sls", "more", [0] * 10)
+        for num in range(20)
+    ]
+    assert not writer.update(more, [])
+
+
+def test_process_unchanged(master_opts, indexer, state_tree):
+    """
+    Indexing paths which did not change does not rewrite the indexes
+    """
+    hash_index = os.path.join(
+        salt.utils.rootsindex.index_dir(master_opts), "hashes.idx"
+    )
+    before = os.stat(hash_index)
+    with patch("salt.utils.atomicfile.atomic_open") as atomic_open:
+        changes = indexer.process([str(state_tree / "foo.sls"), str(state_tree)])
+    assert not any(changes.values())
+    atomic_open.assert_not_called()
+    after = os.stat(hash_index)
+    assert (after.st_ino, after.st_mtime_ns) == (before.st_ino, before.st_mtime_ns)
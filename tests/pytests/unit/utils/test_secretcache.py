@@ -0,0 +1,76 @@
+"""
+Tests for salt.utils.secretcache
+"""
+
+import time
+
+import salt.utils.secretcache
+from tests.support.mock import MagicMock, patch
+
+
+def test_get_set():
+    cache = salt.utils.secretcache.SecretCache(60)
+    assert cache.get("cipher") is None
+    cache.set("cipher", "plain")
+    assert cache.get("cipher") == b"plain"
+    assert cache.get(b"cipher") == b"plain"
+    assert cache.hits == 2
+    assert cache.misses == 1
+    # Only the digest of the ciphertext is kept
+    assert b"cipher" not in cache._secrets
+
+
+def test_empty_secret():
+    cache = salt.utils.secretcache.SecretCache(60)
+    cache.set("cipher", b"")
+    assert cache.get("cipher") == b""
+
+
+def test_ttl_wipes_secret():
+    cache = salt.utils.secretcache.SecretCache(0.1)
+    cache.set("cipher", b"plain")
+    secret = next(iter(cache._secrets.values()))
+    time.sleep(0.2)
+    assert cache.get("cipher") is None
+    assert secret.buf.raw == b"\0" * 5
+    assert len(cache) == 0
+
+
+def test_clear_wipes_secrets():
+    cache = salt.utils.secretcache.SecretCache(60)
+    cache.set("cipher", b"plain")
+    secret = next(iter(cache._secrets.values()))
+    cache.clear()
+    assert secret.buf.raw == b"\0" * 5
+    assert cache.get("cipher") is None
+
+
+def test_mlock():
+    libc = MagicMock()
+    libc.mlock.return_value = 0
+    with patch("salt.utils.secretcache._libc", return_value=libc):
+        cache = salt.utils.secretcache.SecretCache(60, mlock=True)
+        cache.set("cipher", b"plain")
+        assert cache.get("cipher") == b"plain"
+        libc.mlock.assert_called_once()
+        cache.clear()
+        libc.munlock.assert_called_once()
+
+
+def test_mlock_failure_does_not_cache():
+    libc = MagicMock()
+    libc.mlock.return_value = -1
+    with patch("salt.utils.secretcache._libc", return_value=libc):
+        cache = salt.utils.secretcache.SecretCache(60, mlock=True)
+        cache.set("cipher", b"plain")
+        assert cache.get("cipher") is None
+
+
+def test_get_secret_cache():
+    with patch("salt.utils.secretcache._SECRET_CACHE", None):
+        assert salt.utils.secretcache.get_secret_cache({}) is None
+        cache = salt.utils.secretcache.get_secret_cache(
+            {"secret_cache": True, "secret_cache_ttl": 10}
+        )
+        assert cache.ttl == 10
+        assert cache is salt.utils.secretcache.get_secret_cache({"secret_cache": True})